@@ -0,0 +1,82 @@
+"""Latence des commandes courantes avec une archive froide.
+
+Le stockage contient 1 000 tâches récentes et N tâches échues depuis
+3 mois à 10 ans, déplacées ensuite par ``archive --older-than 60`` vers
+l'archive compressée. Pour chaque taille (0 = pas d'archive), on mesure
+``list``, ``list --due-in 3`` et ``add`` : ces opérations ne lisent pas
+l'archive et doivent coûter le même temps quelle que soit sa taille.
+``list --include-archive --limit 20``, qui lit le niveau froid, est mesuré
+à part, avec la taille du fichier courant et de l'archive.
+
+Usage::
+
+    python benchmarks/bench_archive.py --sizes 0 100000 1000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import storage  # noqa: E402  pylint: disable=wrong-import-position
+import task_manager as tm  # noqa: E402  pylint: disable=wrong-import-position
+from bench_partitions import build_store  # noqa: E402  pylint: disable=wrong-import-position
+from bench_suite import cli, measure  # noqa: E402  pylint: disable=wrong-import-position
+from coldstore import ColdStore  # noqa: E402  pylint: disable=wrong-import-position
+
+
+def main() -> None:
+    """Point d'entrée du benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[0, 100000, 1000000],
+                        help="Tailles de l'archive")
+    parser.add_argument("--stores", nargs="+", default=["json", "journal", "sqlite"],
+                        help="Stockages mesurés")
+    parser.add_argument("--codec", default="gzip", help="Compression de l'archive")
+    parser.add_argument("--repeat", type=int, default=5, help="Mesures par opération")
+    parser.add_argument("--seed", type=int, default=42, help="Graine du générateur")
+    args = parser.parse_args()
+
+    print(f"{'archive':>9} {'stockage':<9} {'opération':<30} {'médiane (ms)':>12}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            tasks = build_store(size, args.seed)
+            for kind in args.stores:
+                path = os.path.join(tmp, f"{kind}-{size}")
+                storage.open_backend(f"{kind}:{path}", path).save(tasks)
+                tm.STORE_SPEC = f"{kind}:{path}"
+                start = time.perf_counter()
+                cli(["archive", "--older-than", "60", "--codec", args.codec])()
+                moved = time.perf_counter() - start
+                cli(["list", "--due-in", "3"])()  # construit les index éventuels
+                ops = {
+                    "list": cli(["list"]),
+                    "list --due-in 3": cli(["list", "--due-in", "3"]),
+                    "add": cli(["add", "--title", "Nouvelle", "--desc", "", "--priority", "2",
+                                "--due", date.today().isoformat()]),
+                    "list --include-archive -l 20": cli(["list", "--include-archive",
+                                                         "--limit", "20"]),
+                }
+                for op, func in ops.items():
+                    timing = measure(func, args.repeat)
+                    print(f"{size:>9} {kind:<9} {op:<30} {timing['median_ms']:>12.2f}", flush=True)
+                store = ColdStore(path)
+                hot = sum(os.path.getsize(os.path.join(tmp, name)) for name in os.listdir(tmp)
+                          if name.startswith(os.path.basename(path))
+                          and ".archive" not in name and not name.endswith(".lock"))
+                cold = os.path.getsize(store.archive_path) if store.count else 0
+                print(f"{size:>9} {kind:<9} archivage {moved * 1000:.0f} ms ; courant "
+                      f"{hot / 1e6:.1f} Mo, archive {store.count} tâches / {cold / 1e6:.1f} Mo",
+                      flush=True)
+                tm.STORE_SPEC = None
+
+
+if __name__ == "__main__":
+    main()
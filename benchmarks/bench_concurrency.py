@@ -0,0 +1,88 @@
+"""Débit d'écriture de plusieurs processus concurrents sur un même stockage.
+
+Chaque processus ajoute ``--adds`` tâches via ``add`` ; le stockage est
+ensuite relu pour vérifier qu'aucune écriture n'a été perdue (nombre de
+tâches et IDs uniques). Deux modes sont comparés : verrou par écriture
+(chaque processus prend le verrou, lit, écrit) et écritures groupées (une
+file partagée, persistée en un seul ``commit`` par le premier processus
+qui obtient le verrou). Le débit est exprimé en écritures par seconde.
+
+Usage::
+
+    python benchmarks/bench_concurrency.py --workers 8 --adds 200 --store journal
+    TASKS_FSYNC=0 python benchmarks/bench_concurrency.py   # sans fsync
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import storage  # noqa: E402  pylint: disable=wrong-import-position
+import task_manager as tm  # noqa: E402  pylint: disable=wrong-import-position
+
+
+def writer(spec: str, group: bool, adds: int, worker: int) -> None:
+    """Processus écrivain : *adds* appels à ``add``."""
+    tm.STORE_SPEC = spec
+    tm.GROUP_COMMIT = group
+    with contextlib.redirect_stdout(io.StringIO()):
+        for i in range(adds):
+            tm.add_task(SimpleNamespace(title=f"w{worker}-{i}", desc="", priority=1 + i % 5,
+                                        due="2030-01-01"))
+
+
+def bench(tmp: str, kind: str, group: bool, workers: int, adds: int) -> tuple:
+    """Retourne ``(écritures/s, tâches perdues, IDs en double)`` pour un mode."""
+    extension = storage.DEFAULT_EXTENSIONS.get(kind, ".json")
+    path = os.path.join(tmp, f"{kind}-{'group' if group else 'lock'}{extension}")
+    spec = f"{kind}:{path}"
+    ctx = multiprocessing.get_context("fork")
+    procs = [ctx.Process(target=writer, args=(spec, group, adds, w)) for w in range(workers)]
+    start = time.perf_counter()
+    for proc in procs:
+        proc.start()
+    for proc in procs:
+        proc.join()
+    elapsed = time.perf_counter() - start
+    ids = [t["id"] for t in storage.open_backend(spec, path).load()]
+    lost = workers * adds - len(set(ids))
+    return workers * adds / elapsed, lost, len(ids) - len(set(ids))
+
+
+def main() -> None:
+    """Point d'entrée du benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=8, help="Processus écrivains")
+    parser.add_argument("--adds", type=int, default=200, help="Ajouts par processus")
+    parser.add_argument("--store", choices=["json", "journal", "sqlite", "binary"],
+                        action="append", help="Stockage(s) mesuré(s) (défaut : json et journal)")
+    args = parser.parse_args()
+    if storage.fcntl is None or "fork" not in multiprocessing.get_all_start_methods():
+        parser.error("fcntl et fork sont requis")
+
+    print(f"fsync : {'oui' if storage.FSYNC else 'non'}")
+    print(f"{'stockage':<10} {'mode':<8} {'écritures':>10} {'écritures/s':>12} {'perdues':>8} {'doublons':>9}")
+    failed = False
+    with tempfile.TemporaryDirectory() as tmp:
+        for kind in args.store or ["json", "journal"]:
+            for group in (False, True):
+                rate, lost, duplicates = bench(tmp, kind, group, args.workers, args.adds)
+                failed = failed or bool(lost or duplicates)
+                print(f"{kind:<10} {'groupé' if group else 'verrou':<8} "
+                      f"{args.workers * args.adds:>10} {rate:>12.0f} {lost:>8} {duplicates:>9}")
+    if failed:
+        sys.exit("Des écritures ont été perdues.")
+
+
+if __name__ == "__main__":
+    main()
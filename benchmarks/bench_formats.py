@@ -0,0 +1,88 @@
+"""Débit de l'affichage de ``list`` selon le format de sortie.
+
+Pour chaque taille, les tâches générées sont affichées vers un fichier
+(comme une sortie redirigée vers un autre programme) :
+
+- ``print/ligne`` : l'ancien chemin texte, un ``print`` par tâche ;
+- ``table``, ``jsonl``, ``csv``, ``tsv`` : :func:`task_manager.print_tasks`,
+  qui encode au fil des tâches et écrit par blocs.
+
+La sortie ``table`` est comparée à celle de l'ancien chemin avant mesure.
+Le temps de lecture du stockage n'est pas compté.
+
+Usage::
+
+    python benchmarks/bench_formats.py --sizes 100000 1000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import formats  # noqa: E402  pylint: disable=wrong-import-position
+import task_manager as tm  # noqa: E402  pylint: disable=wrong-import-position
+from bench_suite import generate_tasks  # noqa: E402  pylint: disable=wrong-import-position
+
+
+def print_per_line(tasks: list) -> None:
+    """Ancien chemin texte : un ``print`` par tâche."""
+    for t in tasks:
+        print(tm.format_task(t))
+
+
+def measure(render, path: str, repeat: int) -> tuple:
+    """Retourne ``(meilleur temps en s, octets écrits)`` de *render* vers *path*."""
+    best = float("inf")
+    for _ in range(repeat):
+        with open(path, "w", encoding="utf-8") as out, contextlib.redirect_stdout(out):
+            start = time.perf_counter()
+            render()
+            out.flush()
+            best = min(best, time.perf_counter() - start)
+    return best, os.path.getsize(path)
+
+
+def main() -> None:
+    """Point d'entrée du benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000000], help="Nombres de tâches")
+    parser.add_argument("--repeat", type=int, default=3, help="Mesures par format (meilleure gardée)")
+    parser.add_argument("--seed", type=int, default=42, help="Graine du générateur")
+    args = parser.parse_args()
+
+    print(f"{'tâches':>9} {'format':<12} {'ms':>9} {'Mo/s':>8} {'tâches/s':>11} {'vs print':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "out")
+        for size in args.sizes:
+            tasks = generate_tasks(size, args.seed)
+            sample = tasks[:1000]
+            legacy, table = io.StringIO(), io.StringIO()
+            with contextlib.redirect_stdout(legacy):
+                print_per_line(sample)
+            with contextlib.redirect_stdout(table):
+                tm.print_tasks(sample)
+            if legacy.getvalue() != table.getvalue():
+                raise SystemExit("La sortie table diffère de l'ancien chemin texte")
+            runs = [("print/ligne", lambda: print_per_line(tasks))]
+            runs += [(fmt, lambda fmt=fmt: tm.print_tasks(tasks, fmt=fmt))
+                     for fmt in formats.FORMATS]
+            reference = None
+            for name, render in runs:
+                elapsed, size_bytes = measure(render, path, args.repeat)
+                reference = reference or elapsed
+                print(f"{size:>9} {name:<12} {elapsed * 1000:>9.0f} "
+                      f"{size_bytes / elapsed / 1e6:>8.1f} {size / elapsed:>11.0f} "
+                      f"{reference / elapsed:>8.2f}x", flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Latence d'édition/suppression selon la taille du stockage.
+
+Pour chaque taille, un stockage est généré puis on mesure la médiane d'une
+édition (``get`` + ``commit``) et d'une suppression sur des IDs aléatoires.
+Avec l'index d'IDs du mode journal, ces latences restent stables de 1k à 1M
+tâches ; le mode JSON, lui, croît linéairement.
+
+Usage::
+
+    python benchmarks/bench_id_index.py --sizes 1000 10000 100000 1000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import storage  # noqa: E402  pylint: disable=wrong-import-position
+
+
+def make_tasks(n: int):
+    """Génère *n* tâches synthétiques."""
+    return [{"id": i, "title": f"Tâche {i}", "desc": "", "priority": 1 + i % 5,
+             "due": "2030-01-01", "created": ""} for i in range(1, n + 1)]
+
+
+def measure(backend_cls, path: str, n: int, repeat: int) -> tuple:
+    """Retourne les latences médianes (ms) d'édition et de suppression."""
+    backend_cls(path).save(make_tasks(n))
+    rng = random.Random(n)
+    edits, deletes = [], []
+    for _ in range(repeat):
+        task_id = rng.randint(1, n)
+        start = time.perf_counter()
+        backend = backend_cls(path)
+        task = backend.get(task_id)
+        if task is not None:
+            task["title"] = "modifiée"
+            backend.commit(puts=[task])
+        edits.append(time.perf_counter() - start)
+
+        task_id = rng.randint(1, n)
+        start = time.perf_counter()
+        backend = backend_cls(path)
+        if backend.get(task_id) is not None:
+            backend.commit(deletes=[task_id])
+        deletes.append(time.perf_counter() - start)
+    return statistics.median(edits) * 1000, statistics.median(deletes) * 1000
+
+
+def main() -> None:
+    """Point d'entrée du benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    backends = [("json", storage.JsonBackend), ("journal", storage.JournalBackend),
+                ("sqlite", storage.SqliteBackend)]
+    print(f"{'stockage':<8} {'tâches':>9} {'edit (ms)':>10} {'delete (ms)':>12}")
+    for name, cls in backends:
+        for n in args.sizes:
+            with tempfile.TemporaryDirectory() as tmp:
+                repeat = args.repeat if name != "json" else min(args.repeat, 5)
+                edit_ms, delete_ms = measure(cls, os.path.join(tmp, "tasks"), n, repeat)
+            print(f"{name:<8} {n:>9} {edit_ms:>10.3f} {delete_ms:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
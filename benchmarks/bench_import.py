@@ -0,0 +1,79 @@
+"""Débit d'import en masse comparé au chemin ``add`` ligne par ligne.
+
+Le chemin ``add`` recharge et réécrit le stockage à chaque tâche (coût
+quadratique en JSON) ; ``import`` valide toutes les lignes puis persiste en
+une seule écriture. Le débit est exprimé en lignes par seconde.
+
+Usage::
+
+    python benchmarks/bench_import.py --rows 100000 --add-rows 1000
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import task_manager as tm  # noqa: E402  pylint: disable=wrong-import-position
+
+
+def write_csv(path: str, rows: int) -> None:
+    """Écrit un fichier CSV de *rows* tâches valides."""
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("title,desc,priority,due\n")
+        for i in range(rows):
+            f.write(f"Tâche {i},Description {i},{1 + i % 5},2030-{1 + i % 12:02d}-{1 + i % 28:02d}\n")
+
+
+def bench_import(tmp: str, rows: int, journal: bool) -> float:
+    """Retourne le débit (lignes/s) de la commande ``import``."""
+    tm.TASKS_FILE = os.path.join(tmp, f"import-{journal}.json")
+    tm.USE_JOURNAL = journal
+    source = os.path.join(tmp, "rows.csv")
+    write_csv(source, rows)
+    args = SimpleNamespace(file=source, format=None, batch_size=0)
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        tm.import_tasks(args)
+    return rows / (time.perf_counter() - start)
+
+
+def bench_add(tmp: str, rows: int, journal: bool) -> float:
+    """Retourne le débit (lignes/s) de ``add`` appelé une fois par ligne."""
+    tm.TASKS_FILE = os.path.join(tmp, f"add-{journal}.json")
+    tm.USE_JOURNAL = journal
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for i in range(rows):
+            tm.add_task(SimpleNamespace(title=f"Tâche {i}", desc="", priority=1 + i % 5,
+                                        due="2030-01-01"))
+    return rows / (time.perf_counter() - start)
+
+
+def main() -> None:
+    """Point d'entrée du benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100000, help="Lignes importées")
+    parser.add_argument("--add-rows", type=int, default=1000, help="Lignes du chemin add")
+    args = parser.parse_args()
+
+    print(f"{'chemin':<16} {'lignes':>8} {'lignes/s':>12}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for journal in (False, True):
+            mode = "journal" if journal else "json"
+            rate = bench_add(tmp, args.add_rows, journal)
+            print(f"{'add ' + mode:<16} {args.add_rows:>8} {rate:>12.0f}")
+            rate = bench_import(tmp, args.rows, journal)
+            print(f"{'import ' + mode:<16} {args.rows:>8} {rate:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Pic mémoire et durée de ``list --limit`` selon la taille du stockage.
+
+Pour chaque taille, un stockage journal est généré puis on mesure (via
+:mod:`tracemalloc`) le pic d'allocation et la durée d'une page de 20 tâches
+triée par priorité, comparés au chargement complet suivi d'un tri. Le flux
++ tas borné garde un pic proportionnel à la page, pas au stockage.
+
+Usage::
+
+    python benchmarks/bench_list.py --sizes 10000 100000 1000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import storage  # noqa: E402  pylint: disable=wrong-import-position
+import task_manager  # noqa: E402  pylint: disable=wrong-import-position
+
+
+def make_tasks(n: int):
+    """Génère *n* tâches synthétiques."""
+    return [{"id": i, "title": f"Tâche {i}", "desc": "", "priority": 1 + (i * 7) % 5,
+             "due": f"2030-01-{1 + i % 28:02d}", "created": ""} for i in range(1, n + 1)]
+
+
+def measure(func) -> tuple:
+    """Retourne ``(durée en ms, pic mémoire en Mio)`` d'un appel à *func*.
+
+    La durée est mesurée sans :mod:`tracemalloc`, qui ralentit les allocations.
+    """
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed * 1000, peak / (1 << 20)
+
+
+def main() -> None:
+    """Point d'entrée du benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'tâches':>9} {'mode':<12} {'durée (ms)':>11} {'pic (Mio)':>10}")
+    for n in args.sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "tasks.json")
+            storage.JournalBackend(path).save(make_tasks(n))
+            storage.JournalBackend(path).next_id()  # index construit hors mesure
+
+            def full() -> None:
+                tasks = storage.JournalBackend(path).load()
+                sorted(tasks, key=task_manager.sort_key("priority"))[:args.limit]
+
+            def paged() -> None:
+                task_manager.page_tasks(storage.JournalBackend(path), False, None,
+                                        "priority", limit=args.limit)
+
+            for name, func in (("tri complet", full), ("flux + tas", paged)):
+                ms, peak = measure(func)
+                print(f"{n:>9} {name:<12} {ms:>11.1f} {peak:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Temps de chargement et de requête : JSON indenté contre instantané binaire.
+
+Pour chaque taille, le même jeu de tâches est écrit au format JSON
+historique (``indent=2``), en journal (une tâche par ligne) et au format
+binaire en colonnes. On mesure la médiane d'un chargement complet, puis
+celle de ``list --sort priority --limit 20`` et de ``list --overdue``
+(chargement + filtre + tri pour le JSON, requête sur les colonnes ``mmap``
+pour le binaire).
+
+Usage::
+
+    python benchmarks/bench_load.py --sizes 10000 100000 1000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import storage  # noqa: E402  pylint: disable=wrong-import-position
+import task_manager  # noqa: E402  pylint: disable=wrong-import-position
+
+
+def make_tasks(n: int):
+    """Génère *n* tâches synthétiques."""
+    return [{"id": i, "title": f"Tâche {i}", "desc": "Une description un peu plus longue",
+             "priority": 1 + i % 5, "due": f"20{20 + i % 15}-{1 + i % 12:02d}-{1 + i % 28:02d}",
+             "created": "2025-01-01T12:00:00.000000"} for i in range(1, n + 1)]
+
+
+def median_ms(func, repeat: int) -> float:
+    """Retourne la durée médiane (ms) de *repeat* appels à *func*."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+def main() -> None:
+    """Point d'entrée du benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    today = date.today()
+    print(f"{'tâches':>9} {'format':<8} {'load (ms)':>10} {'top 20 (ms)':>12} "
+          f"{'overdue (ms)':>13} {'taille (Kio)':>13}")
+    for n in args.sizes:
+        tasks = make_tasks(n)
+        with tempfile.TemporaryDirectory() as tmp:
+            backends = [("json", storage.JsonBackend), ("journal", storage.JournalBackend),
+                        ("binary", storage.BinaryBackend)]
+            for name, cls in backends:
+                path = os.path.join(tmp, f"tasks.{name}")
+                cls(path).save(tasks)
+
+                def load(cls=cls, path=path):
+                    return cls(path).load()
+
+                def top(cls=cls, path=path):
+                    return list(task_manager.page_tasks(cls(path), False, None,
+                                                        "priority", limit=20))
+
+                def overdue(cls=cls, path=path):
+                    backend = cls(path)
+                    if backend.supports_query:
+                        return backend.query(True, None, "date", today)
+                    return sorted((t for t in backend.load() if 0 < task_manager.due_ordinal(t)
+                                   < today.toordinal()), key=task_manager.sort_key("date"))
+
+                sizes = sum(os.path.getsize(os.path.join(tmp, f)) for f in os.listdir(tmp)
+                            if f.startswith(f"tasks.{name}"))
+                print(f"{n:>9} {name:<8} {median_ms(load, args.repeat):>10.1f} "
+                      f"{median_ms(top, args.repeat):>12.1f} "
+                      f"{median_ms(overdue, args.repeat):>13.1f} {sizes / 1024:>13.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Mémoire occupée par les tâches selon leur représentation.
+
+Pour chaque taille, un ``tasks.json`` est généré puis on mesure (via
+:mod:`tracemalloc`) la mémoire retenue après chargement sous trois formes :
+la liste de dictionnaires actuelle, des :class:`models.Task` à
+``__slots__`` et une :class:`models.TaskTable` en colonnes (ID, priorité,
+échéance), ainsi que la durée d'un tri par date sur chacune.
+
+Usage::
+
+    python benchmarks/bench_memory.py --sizes 100000 1000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import models  # noqa: E402  pylint: disable=wrong-import-position
+import task_manager  # noqa: E402  pylint: disable=wrong-import-position
+
+
+def make_tasks(n: int):
+    """Génère *n* tâches synthétiques."""
+    return [{"id": i, "title": f"Tâche {i}", "desc": "Description", "priority": 1 + i % 5,
+             "due": f"20{30 + i % 20}-{1 + i % 12:02d}-{1 + i % 28:02d}",
+             "created": "2025-01-01T12:00:00.000000"} for i in range(1, n + 1)]
+
+
+def retained(build):
+    """Retourne ``(objet construit, mémoire retenue en Mio)``."""
+    gc.collect()
+    tracemalloc.start()
+    obj = build()
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return obj, size / (1 << 20)
+
+
+def timed(func) -> float:
+    """Retourne la durée d'un appel à *func*, en millisecondes."""
+    start = time.perf_counter()
+    func()
+    return (time.perf_counter() - start) * 1000
+
+
+def main() -> None:
+    """Point d'entrée du benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    args = parser.parse_args()
+
+    print(f"{'tâches':>9} {'représentation':<16} {'mémoire (Mio)':>14} {'tri date (ms)':>14}")
+    for n in args.sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "tasks.json")
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(make_tasks(n), f)
+
+            def load():
+                with open(path, encoding="utf-8") as f:
+                    return json.load(f)
+
+            dicts, dict_mb = retained(load)
+            records, record_mb = retained(lambda: [models.Task.from_dict(t) for t in load()])
+            table, table_mb = retained(lambda: models.TaskTable.from_tasks(load()))
+            key = task_manager.sort_key("date")
+            rows = [
+                ("dict", dict_mb, timed(lambda: sorted(dicts, key=key))),
+                ("Task (slots)", record_mb,
+                 timed(lambda: sorted(records, key=lambda t: t.due_key))),
+                ("TaskTable", table_mb, timed(lambda: table.ordered_ids("date"))),
+            ]
+            for name, mb, ms in rows:
+                print(f"{n:>9} {name:<16} {mb:>14.1f} {ms:>14.1f}")
+            del dicts, records, table
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Passage à l'échelle de ``list --jobs N`` sur un grand stockage journal.
+
+Pour chaque taille, la suite génère un stockage journal (instantané en
+lignes) puis chronomètre quelques formes de ``list`` en séquentiel et avec
+1, 2, 4 et 8 processus. La sortie de chaque forme est comparée à celle du
+chemin séquentiel : un écart interrompt le benchmark.
+
+Le gain dépend du nombre de processeurs réellement disponibles (affiché en
+tête) ; sur une machine à un seul cœur, le pool ne peut qu'ajouter son coût.
+
+Usage::
+
+    python benchmarks/bench_parallel.py --sizes 1000000 3000000 --jobs 1 2 4 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import parallel  # noqa: E402  pylint: disable=wrong-import-position
+import storage  # noqa: E402  pylint: disable=wrong-import-position
+import task_manager as tm  # noqa: E402  pylint: disable=wrong-import-position
+from bench_suite import generate_tasks  # noqa: E402  pylint: disable=wrong-import-position
+
+QUERIES = {
+    "list --limit 20": ["list", "--limit", "20"],
+    "list --due-in 30": ["list", "--due-in", "30"],
+    "list --sort date": ["list", "--sort", "date"],
+}
+
+
+def run(argv: list, repeat: int) -> tuple:
+    """Exécute *argv* *repeat* fois ; retourne (meilleur temps en ms, sortie)."""
+    best, out = float("inf"), ""
+    for _ in range(repeat):
+        buf = io.StringIO()
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(buf):
+            tm.main(argv)
+        best = min(best, (time.perf_counter() - start) * 1000)
+        out = buf.getvalue()
+    return best, out
+
+
+def main() -> None:
+    """Point d'entrée du benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000000],
+                        help="Nombres de tâches")
+    parser.add_argument("--jobs", type=int, nargs="+", default=[1, 2, 4, 8],
+                        help="Nombres de processus mesurés")
+    parser.add_argument("--repeat", type=int, default=3, help="Mesures par forme (meilleure gardée)")
+    parser.add_argument("--seed", type=int, default=42, help="Graine du générateur")
+    args = parser.parse_args()
+
+    print(f"Processeurs disponibles : {parallel.available_cpus()}")
+    print(f"{'tâches':>9} {'requête':<18} {'processus':>9} {'ms':>9} {'accélération':>12}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            path = os.path.join(tmp, f"tasks-{size}.json")
+            storage.JournalBackend(path).save(generate_tasks(size, args.seed))
+            tm.STORE_SPEC = f"journal:{path}"
+            for name, argv in QUERIES.items():
+                serial, expected = run(argv, args.repeat)
+                print(f"{size:>9} {name:<18} {'séq.':>9} {serial:>9.0f} {1:>11.2f}x", flush=True)
+                for jobs in args.jobs:
+                    elapsed, out = run(argv + ["--jobs", str(jobs)], args.repeat)
+                    if out != expected:
+                        raise SystemExit(f"Sortie différente du chemin séquentiel : {name} --jobs {jobs}")
+                    print(f"{size:>9} {name:<18} {jobs:>9} {elapsed:>9.0f} "
+                          f"{serial / elapsed:>11.2f}x", flush=True)
+            tm.STORE_SPEC = None
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Coût des tâches récentes selon la taille de l'archive.
+
+Le stockage contient 1 000 tâches récentes (échéances autour
+d'aujourd'hui) et une archive de N tâches échues depuis 3 mois à 10 ans.
+Pour chaque taille d'archive, on mesure ``list --due-in 3``, ``add`` et
+``edit`` d'une tâche récente sur le stockage partitionné, le journal
+(index des échéances) et le JSON historique : avec des partitions par mois,
+ces opérations doivent coûter le même temps quelle que soit l'archive.
+
+Usage::
+
+    python benchmarks/bench_partitions.py --sizes 10000 100000 1000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import storage  # noqa: E402  pylint: disable=wrong-import-position
+import task_manager as tm  # noqa: E402  pylint: disable=wrong-import-position
+from bench_suite import cli, generate_tasks, measure  # noqa: E402  pylint: disable=wrong-import-position
+
+RECENT = 1000
+
+
+def build_store(archive: int, seed: int) -> list:
+    """Génère les tâches récentes suivies de l'archive (IDs consécutifs)."""
+    rng = random.Random(seed)
+    today = date.today()
+    tasks = generate_tasks(RECENT + archive, seed)
+    for task in tasks[RECENT:]:
+        task["due"] = (today - timedelta(days=rng.randint(90, 3650))).isoformat()
+    return tasks
+
+
+def main() -> None:
+    """Point d'entrée du benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000],
+                        help="Tailles de l'archive")
+    parser.add_argument("--repeat", type=int, default=5, help="Mesures par opération")
+    parser.add_argument("--seed", type=int, default=42, help="Graine du générateur")
+    args = parser.parse_args()
+
+    print(f"{'archive':>9} {'stockage':<12} {'opération':<16} {'médiane (ms)':>12}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            tasks = build_store(size, args.seed)
+            for kind in ("partitioned", "journal", "json"):
+                path = os.path.join(tmp, f"{kind}-{size}")
+                storage.open_backend(f"{kind}:{path}", path).save(tasks)
+                tm.STORE_SPEC = f"{kind}:{path}"
+                cli(["list", "--due-in", "3"])()  # construit les index éventuels
+                recent = iter(range(1, RECENT + 1))
+                ops = {
+                    "list --due-in 3": cli(["list", "--due-in", "3"]),
+                    "add": cli(["add", "--title", "Nouvelle", "--desc", "", "--priority", "2",
+                                "--due", date.today().isoformat()]),
+                    "edit": lambda: cli(["edit", "--id", str(next(recent)), "--due",
+                                         (date.today() + timedelta(days=40)).isoformat()])(),
+                }
+                for op, func in ops.items():
+                    timing = measure(func, args.repeat)
+                    print(f"{size:>9} {kind:<12} {op:<16} {timing['median_ms']:>12.2f}", flush=True)
+                tm.STORE_SPEC = None
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""Tâches récurrentes : taille du stockage et latence selon l'horizon.
+
+Le stockage contient ``--tasks`` tâches ordinaires et ``--series`` séries
+(hebdomadaires et mensuelles) commencées il y a un an. Pour chaque horizon
+(en années), on compare deux stockages qui affichent la même chose :
+
+- ``lignes`` : chaque occurrence jusqu'à l'horizon est une tâche distincte,
+  comme avant les règles de répétition ;
+- ``règles`` : une tâche par série, avec ``repeat``.
+
+On mesure la taille des fichiers et ``list --due-in 7``, ``list --overdue
+--limit 20`` et ``list --limit 20``. Avec les règles, ces valeurs ne
+dépendent pas de l'horizon.
+
+Usage::
+
+    python benchmarks/bench_recurrence.py --horizons 1 5 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import recurrence  # noqa: E402  pylint: disable=wrong-import-position
+import storage  # noqa: E402  pylint: disable=wrong-import-position
+import task_manager as tm  # noqa: E402  pylint: disable=wrong-import-position
+from bench_suite import cli, measure  # noqa: E402  pylint: disable=wrong-import-position
+
+
+def build(tasks: int, series: int, seed: int) -> tuple:
+    """Retourne les tâches ordinaires et les séries (premières occurrences il y a un an)."""
+    rng = random.Random(seed)
+    today = date.today()
+    plain = [{"id": i, "title": f"Tâche {i}", "desc": "", "priority": rng.randint(1, 5),
+              "due": (today + timedelta(days=rng.randint(-30, 365))).isoformat(), "created": ""}
+             for i in range(1, tasks + 1)]
+    rules = [{"id": tasks + i, "title": f"Corvée {i}", "desc": "", "priority": rng.randint(1, 5),
+              "due": (today - timedelta(days=365 - rng.randint(0, 27))).isoformat(),
+              "created": "", "repeat": "weekly" if i % 3 else "monthly"}
+             for i in range(1, series + 1)]
+    return plain, rules
+
+
+def materialize(plain: list, rules: list, years: int) -> list:
+    """Écrit chaque occurrence jusqu'à l'horizon comme une tâche distincte."""
+    rows = list(plain)
+    high = (date.today() + timedelta(days=365 * years)).toordinal()
+    for task in rules:
+        for occurrence in recurrence.expand(task, 1, high):
+            del occurrence["repeat"]
+            occurrence["id"] = len(rows) + 1
+            rows.append(occurrence)
+    return rows
+
+
+def size(prefix: str) -> int:
+    """Taille totale des fichiers d'un stockage (index compris)."""
+    folder, name = os.path.split(prefix)
+    return sum(os.path.getsize(os.path.join(folder, f)) for f in os.listdir(folder)
+               if f.startswith(name) and not f.endswith(".lock"))
+
+
+def main() -> None:
+    """Point d'entrée du benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--horizons", type=int, nargs="+", default=[1, 5, 20],
+                        help="Horizons des répétitions (années)")
+    parser.add_argument("--tasks", type=int, default=10000, help="Tâches ordinaires")
+    parser.add_argument("--series", type=int, default=500, help="Séries récurrentes")
+    parser.add_argument("--stores", nargs="+", default=["json", "journal", "sqlite"],
+                        help="Stockages mesurés")
+    parser.add_argument("--repeat", type=int, default=5, help="Mesures par opération")
+    parser.add_argument("--seed", type=int, default=42, help="Graine du générateur")
+    args = parser.parse_args()
+
+    plain, rules = build(args.tasks, args.series, args.seed)
+    ops = {"list --due-in 7": ["list", "--due-in", "7"],
+           "list --overdue -l 20": ["list", "--overdue", "--limit", "20"],
+           "list -l 20": ["list", "--limit", "20"]}
+    print(f"{'horizon':>7} {'stockage':<9} {'modèle':<7} {'tâches':>8} {'taille (Mo)':>11} "
+          + " ".join(f"{op:>22}" for op in ops))
+    with tempfile.TemporaryDirectory() as tmp:
+        for years in args.horizons:
+            variants = {"lignes": materialize(plain, rules, years), "règles": plain + rules}
+            for kind in args.stores:
+                for model, tasks in variants.items():
+                    path = os.path.join(tmp, f"{kind}-{years}-{model}")
+                    storage.open_backend(f"{kind}:{path}", path).save(tasks)
+                    tm.STORE_SPEC = f"{kind}:{path}"
+                    for argv in ops.values():
+                        cli(argv)()  # construit les index
+                    timings = [measure(cli(argv), args.repeat)["median_ms"]
+                               for argv in ops.values()]
+                    print(f"{years:>7} {kind:<9} {model:<7} {len(tasks):>8} "
+                          f"{size(path) / 1e6:>11.1f} "
+                          + " ".join(f"{t:>19.2f} ms" for t in timings), flush=True)
+                    tm.STORE_SPEC = None
+
+
+if __name__ == "__main__":
+    main()
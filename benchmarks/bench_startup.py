@@ -0,0 +1,94 @@
+"""Coût de démarrage de la CLI : imports et temps de bout en bout.
+
+Pour chaque commande, on mesure la médiane du temps d'exécution d'un
+processus complet (comparé à ``python -c pass``) et, via
+``python -X importtime``, le temps d'import propre à l'application (hors
+modules déjà chargés par l'interpréteur), avec les modules les plus
+coûteux. Le chemin chaud ``list --due-in 1`` est confronté au budget
+vérifié par ``tests/test_startup.py``.
+
+Usage::
+
+    python benchmarks/bench_startup.py --runs 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+SCRIPT = os.path.join(os.path.dirname(__file__), "..", "src", "task_manager.py")
+IMPORT_BUDGET_MS = 40
+
+
+def import_times(args: List[str], env: Dict[str, str]) -> Dict[str, int]:
+    """Retourne ``{module: cumul en µs}`` (les sous-modules sont indentés)."""
+    proc = subprocess.run([sys.executable, "-X", "importtime"] + args, env=env,
+                          capture_output=True, text=True, check=True)
+    times = {}
+    for line in proc.stderr.splitlines():
+        if line.startswith("import time:") and "self [us]" not in line:
+            _, cumulative, name = line[len("import time:"):].split("|")
+            times[name[1:].rstrip()] = int(cumulative)
+    return times
+
+
+def wall_ms(args: List[str], env: Dict[str, str], runs: int) -> float:
+    """Retourne la durée médiane (ms) de *runs* exécutions de ``python args``."""
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable] + args, env=env, stdout=subprocess.DEVNULL,
+                       stderr=subprocess.DEVNULL, check=False)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+def main() -> None:
+    """Point d'entrée du benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=20, help="Exécutions par commande")
+    parser.add_argument("--top", type=int, default=5, help="Modules les plus coûteux affichés")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Cache .pyc actif (dans tmp) : on mesure un démarrage à chaud.
+        env = dict(os.environ, PYTHONPYCACHEPREFIX=os.path.join(tmp, "pyc"))
+        env.pop("PYTHONDONTWRITEBYTECODE", None)
+        env.pop("TASKS_STORE", None)
+        store = ["--store", "json:" + os.path.join(tmp, "tasks.json")]
+        commands = {
+            "list --due-in 1": store + ["list", "--due-in", "1"],
+            "list --sort date": store + ["list", "--sort", "date"],
+            "add": store + ["add", "--title", "T", "--desc", "", "--priority", "1",
+                            "--due", "2030-01-01"],
+            "--help": ["--help"],
+        }
+        for argv in commands.values():
+            import_times([SCRIPT] + argv, env)  # remplit le cache .pyc
+        baseline = import_times(["-c", "pass"], env)
+        bare = wall_ms(["-c", "pass"], env, args.runs)
+        print(f"python -c pass : {bare:.1f} ms")
+        print(f"{'commande':<18} {'total (ms)':>11} {'CLI (ms)':>9} {'imports (ms)':>13}  modules")
+        for label, argv in commands.items():
+            # Le meilleur de trois mesures, pour écarter le bruit du système.
+            times = min((import_times([SCRIPT] + argv, env) for _ in range(3)),
+                        key=lambda t: sum(t.values()))
+            own = {n: v for n, v in times.items() if not n.startswith(" ") and n not in baseline}
+            total = wall_ms([SCRIPT] + argv, env, args.runs)
+            heaviest = sorted(own.items(), key=lambda item: -item[1])[:args.top]
+            summary = ", ".join(f"{n} {v / 1000:.1f}" for n, v in heaviest)
+            imports = sum(own.values()) / 1000
+            flag = "  > budget" if label == "list --due-in 1" and imports > IMPORT_BUDGET_MS else ""
+            print(f"{label:<18} {total:>11.1f} {total - bare:>9.1f} {imports:>13.1f}  {summary}{flag}")
+    print(f"Budget d'import de list --due-in 1 : {IMPORT_BUDGET_MS} ms")
+
+
+if __name__ == "__main__":
+    main()
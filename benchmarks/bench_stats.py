@@ -0,0 +1,81 @@
+"""Statistiques : compteurs tenus à jour contre parcours complet.
+
+Pour chaque stockage de ``--size`` tâches générées par
+:func:`bench_suite.generate_tasks` (dont 1 % transformées en séries
+récurrentes), on mesure :
+
+- ``stats`` : compteurs lus dans ``<path>.stats`` ;
+- ``parcours`` : les mêmes chiffres recalculés par un parcours complet
+  (``stats --recompute``) ;
+- ``list | compter`` : ``list --format jsonl`` dont on compterait les
+  lignes, ce qu'il fallait faire sans la commande ;
+- le coût d'un ``edit`` sans puis avec les compteurs (lecture de
+  l'ancienne version de la tâche et réécriture du fichier ``.stats``).
+
+Usage::
+
+    python benchmarks/bench_stats.py --size 100000
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import storage  # noqa: E402  pylint: disable=wrong-import-position
+import task_manager as tm  # noqa: E402  pylint: disable=wrong-import-position
+from bench_suite import cli, measure  # noqa: E402  pylint: disable=wrong-import-position
+from bench_suite import generate_tasks  # noqa: E402  pylint: disable=wrong-import-position
+from stats import STATS_SUFFIX  # noqa: E402  pylint: disable=wrong-import-position
+
+
+def make_tasks(n: int, seed: int) -> list:
+    """Génère *n* tâches (voir :func:`bench_suite.generate_tasks`), une sur cent récurrente."""
+    rng = random.Random(seed)
+    tasks = generate_tasks(n, seed)
+    for task in tasks[::100]:
+        task["repeat"] = rng.choice(["daily", "weekly", "monthly"])
+    return tasks
+
+
+def main() -> None:
+    """Point d'entrée du benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=100000, help="Tâches dans le stockage")
+    parser.add_argument("--stores", nargs="+", default=["json", "journal", "sqlite"],
+                        help="Stockages mesurés")
+    parser.add_argument("--repeat", type=int, default=5, help="Mesures par opération")
+    parser.add_argument("--seed", type=int, default=42, help="Graine du générateur")
+    args = parser.parse_args()
+
+    tasks = make_tasks(args.size, args.seed)
+    edit = ["edit", "--id", str(args.size // 2), "--priority", "3"]
+    print(f"{'stockage':<9} {'stats':>10} {'parcours':>10} {'list | compter':>15} "
+          f"{'edit sans':>10} {'edit avec':>10}   (ms)")
+    with tempfile.TemporaryDirectory() as tmp:
+        for kind in args.stores:
+            path = os.path.join(tmp, kind)
+            storage.open_backend(f"{kind}:{path}", path).save(tasks)
+            tm.STORE_SPEC = f"{kind}:{path}"
+            cli(["list", "--limit", "1"])()  # construit les autres index
+            plain_edit = measure(cli(edit), args.repeat)["median_ms"]
+            cli(["stats"])()  # construit les compteurs
+            counted_edit = measure(cli(edit), args.repeat)["median_ms"]
+            timings = [measure(cli(argv), args.repeat)["median_ms"]
+                       for argv in (["stats"], ["stats", "--recompute"],
+                                    ["list", "--format", "jsonl"])]
+            assert os.path.exists(path + STATS_SUFFIX)
+            print(f"{kind:<9} " + " ".join(f"{t:>10.1f}" for t in timings[:2])
+                  + f" {timings[2]:>15.1f} {plain_edit:>10.1f} {counted_edit:>10.1f}",
+                  flush=True)
+            tm.STORE_SPEC = None
+
+
+if __name__ == "__main__":
+    main()
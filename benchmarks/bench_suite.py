@@ -0,0 +1,238 @@
+"""Suite de benchmarks de bout en bout, de 1k à 1M tâches.
+
+Un générateur déterministe (graine fixe) produit des stockages réalistes :
+priorités surtout moyennes, échéances réparties autour d'aujourd'hui (un
+quart en retard), titres et descriptions de longueurs variables. Pour
+chaque taille et chaque stockage, la suite chronomètre chaque commande de
+la CLI (``list`` et ses variantes, ``search``, ``add``, ``edit``,
+``delete``, ``import``) via :func:`task_manager.main`, ainsi que l'aller-retour
+``load_tasks``/``save_tasks``. Les résultats (médiane et minimum, en ms)
+sont écrits en JSON ; ``--compare`` les confronte à une référence et
+signale les régressions (code de sortie 1).
+
+Usage::
+
+    python benchmarks/bench_suite.py --output base.json
+    python benchmarks/bench_suite.py --sizes 1000 10000 100000 1000000 --output base.json
+    python benchmarks/bench_suite.py --compare base.json --threshold 0.25
+    python benchmarks/bench_suite.py --compare base.json --current autre.json  # sans mesurer
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import storage  # noqa: E402  pylint: disable=wrong-import-position
+import task_manager as tm  # noqa: E402  pylint: disable=wrong-import-position
+
+DEFAULT_SIZES = [1000, 10000, 100000]
+# Répartition des priorités 1 (haute) à 5 (basse).
+PRIORITY_WEIGHTS = [10, 20, 40, 20, 10]
+WORDS = ("rapport", "réunion", "client", "facture", "tests", "revue", "budget", "courriel",
+         "planning", "livraison", "sauvegarde", "migration", "documentation", "appel")
+IMPORT_ROWS = 1000
+
+
+def generate_tasks(n: int, seed: int = 42, today: Optional[date] = None) -> List[Dict[str, Any]]:
+    """Génère *n* tâches réalistes, identiques pour une même graine.
+
+    Args:
+        n: Nombre de tâches.
+        seed: Graine du générateur pseudo-aléatoire.
+        today: Date de référence des échéances (aujourd'hui par défaut).
+
+    Returns:
+        Les tâches, d'IDs 1 à *n*.
+    """
+    rng = random.Random(seed)
+    today = today or date.today()
+    priorities = rng.choices(range(1, 6), weights=PRIORITY_WEIGHTS, k=n)
+    tasks = []
+    for i in range(1, n + 1):
+        # Un quart en retard (jusqu'à 60 jours), le reste dans les 120 jours.
+        offset = -rng.randint(1, 60) if rng.random() < 0.25 else rng.randint(0, 120)
+        created = today - timedelta(days=rng.randint(0, 365))
+        tasks.append({
+            "id": i,
+            "title": " ".join(rng.choices(WORDS, k=rng.randint(1, 4))).capitalize(),
+            "desc": " ".join(rng.choices(WORDS, k=rng.randint(0, 12))),
+            "priority": priorities[i - 1],
+            "due": (today + timedelta(days=offset)).isoformat(),
+            "created": f"{created.isoformat()}T{rng.randint(8, 19):02d}:{rng.randint(0, 59):02d}:00",
+        })
+    return tasks
+
+
+def measure(func: Callable[[], Any], repeat: int) -> Dict[str, float]:
+    """Chronomètre *repeat* appels à *func*.
+
+    Returns:
+        ``{"median_ms", "min_ms"}``.
+    """
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return {"median_ms": round(statistics.median(samples) * 1000, 3),
+            "min_ms": round(min(samples) * 1000, 3)}
+
+
+def cli(argv: List[str]) -> Callable[[], None]:
+    """Retourne une fonction qui exécute la CLI sans rien afficher."""
+    def run() -> None:
+        with contextlib.redirect_stdout(io.StringIO()):
+            tm.main(argv)
+    return run
+
+
+def bench_store(tmp: str, kind: str, tasks: List[Dict[str, Any]], repeat: int,
+                seed: int) -> Dict[str, Dict[str, float]]:
+    """Mesure toutes les opérations sur un stockage de *tasks*.
+
+    Args:
+        tmp: Répertoire de travail.
+        kind: Type de stockage (``json``, ``journal``, ``sqlite``, ``binary``).
+        tasks: Contenu initial.
+        repeat: Nombre de mesures par opération.
+        seed: Graine (choix des tâches modifiées, fichier importé).
+
+    Returns:
+        Les mesures, par nom d'opération.
+    """
+    extension = storage.DEFAULT_EXTENSIONS.get(kind, ".json")
+    path = os.path.join(tmp, f"{kind}-{len(tasks)}{extension}")
+    spec = f"{kind}:{path}"
+    storage.open_backend(spec, path).save(tasks)
+    tm.STORE_SPEC = spec
+    rng = random.Random(seed)
+    victims = iter(rng.sample(range(1, len(tasks) + 1), min(len(tasks), 2 * repeat)))
+    source = os.path.join(tmp, "import.jsonl")
+    with open(source, "w", encoding="utf-8") as f:
+        for task in generate_tasks(IMPORT_ROWS, seed + 1):
+            f.write(json.dumps({k: v for k, v in task.items() if k != "id"}, ensure_ascii=False) + "\n")
+
+    results = {
+        "load_tasks": measure(lambda: tm.get_backend().load(), repeat),
+        "save_tasks": measure(lambda: tm.save_tasks(tm.load_tasks()), repeat),
+        "list --sort priority": measure(cli(["list", "--sort", "priority"]), repeat),
+        "list --sort date": measure(cli(["list", "--sort", "date"]), repeat),
+        "list --format jsonl": measure(cli(["list", "--format", "jsonl"]), repeat),
+        "list --limit 20": measure(cli(["list", "--limit", "20"]), repeat),
+        "list --overdue": measure(cli(["list", "--overdue"]), repeat),
+        "list --due-in 7": measure(cli(["list", "--due-in", "7"]), repeat),
+        "list --due-in 7 --cache": measure(cli(["--cache", "list", "--due-in", "7"]), repeat),
+        "search 2 mots": measure(cli(["search", "rapport", "client"]), repeat),
+        "add": measure(cli(["add", "--title", "Nouvelle", "--desc", "", "--priority", "2",
+                            "--due", date.today().isoformat()]), repeat),
+        "edit": measure(lambda: cli(["edit", "--id", str(next(victims)), "--priority", "1"])(),
+                        repeat),
+        "delete": measure(lambda: cli(["delete", "--id", str(next(victims))])(), repeat),
+        f"import {IMPORT_ROWS}": measure(cli(["import", source]), repeat),
+    }
+    tm.STORE_SPEC = None
+    tm.QUERY_CACHE = False
+    return results
+
+
+def run_suite(sizes: List[int], kinds: List[str], repeat: int, seed: int) -> Dict[str, Any]:
+    """Exécute la suite et retourne le document de résultats."""
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in sizes:
+            tasks = generate_tasks(n, seed)
+            for kind in kinds:
+                for op, timing in bench_store(tmp, kind, tasks, repeat, seed).items():
+                    results.append({"size": n, "store": kind, "op": op, **timing})
+                    print(f"{n:>9} {kind:<8} {op:<22} {timing['median_ms']:>11.2f} "
+                          f"{timing['min_ms']:>11.2f}", flush=True)
+    return {
+        "meta": {"date": datetime.now().isoformat(timespec="seconds"), "seed": seed,
+                 "repeat": repeat, "python": platform.python_version(),
+                 "platform": platform.platform(), "fsync": storage.FSYNC},
+        "results": results,
+    }
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float) -> int:
+    """Affiche l'écart de chaque mesure et compte les régressions.
+
+    Une mesure régresse si sa médiane dépasse celle de la référence de plus
+    de *threshold* (fraction), et d'au moins 1 ms pour ignorer le bruit des
+    opérations très courtes.
+
+    Returns:
+        Le nombre de régressions.
+    """
+    def key(r: Dict[str, Any]) -> tuple:
+        return (r["size"], r["store"], r["op"])
+
+    reference = {key(r): r for r in baseline["results"]}
+    regressions = 0
+    print(f"{'tâches':>9} {'stockage':<8} {'opération':<22} {'réf. (ms)':>11} "
+          f"{'actuel (ms)':>11} {'écart':>8}")
+    for result in current["results"]:
+        base = reference.get(key(result))
+        if base is None:
+            continue
+        before, after = base["median_ms"], result["median_ms"]
+        ratio = after / before - 1 if before else 0.0
+        flag = ""
+        if ratio > threshold and after - before >= 1.0:
+            flag = "  RÉGRESSION"
+            regressions += 1
+        print(f"{result['size']:>9} {result['store']:<8} {result['op']:<22} {before:>11.2f} "
+              f"{after:>11.2f} {ratio:>+7.0%}{flag}")
+    print(f"{regressions} régression(s) (seuil : +{threshold:.0%}).")
+    return regressions
+
+
+def main() -> None:
+    """Point d'entrée du benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="Tailles des stockages (défaut : 1k, 10k, 100k)")
+    parser.add_argument("--store", choices=["json", "journal", "sqlite", "binary"],
+                        action="append", help="Stockage(s) mesuré(s) (défaut : json)")
+    parser.add_argument("--repeat", type=int, default=3, help="Mesures par opération")
+    parser.add_argument("--seed", type=int, default=42, help="Graine du générateur")
+    parser.add_argument("--output", help="Fichier JSON où écrire les résultats")
+    parser.add_argument("--compare", metavar="REFERENCE", help="Résultats de référence (JSON)")
+    parser.add_argument("--current", help="Avec --compare : résultats déjà mesurés (JSON)")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="Écart toléré avant de signaler une régression (0.2 = +20 %%)")
+    args = parser.parse_args()
+
+    if args.current:
+        with open(args.current, encoding="utf-8") as f:
+            current = json.load(f)
+    else:
+        print(f"{'tâches':>9} {'stockage':<8} {'opération':<22} {'médiane (ms)':>11} {'min (ms)':>11}")
+        current = run_suite(args.sizes, args.store or ["json"], args.repeat, args.seed)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(current, f, indent=2, ensure_ascii=False)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        print()
+        if compare(baseline, current, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Coût de N éditions via l'API Python : une à une ou dans une transaction.
+
+Pour chaque stockage, on génère ``--size`` tâches puis on modifie ``--edits``
+tâches avec ``TaskStore.edit`` : d'abord appel par appel (une lecture et une
+écriture chacun), puis dans un seul ``with store.transaction():`` (une
+lecture, une écriture). Les tâches viennent de
+:func:`bench_suite.generate_tasks`. Les éditions une à une sur JSON et
+binaire réécrivent tout le fichier à chaque appel, et sur le stockage
+partitionné tout le mois de la tâche : ``--skip-slow`` les omet.
+
+Usage::
+
+    python benchmarks/bench_taskstore.py --size 10000 --edits 5000
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import task_manager as tm  # noqa: E402  pylint: disable=wrong-import-position
+from bench_suite import generate_tasks  # noqa: E402  pylint: disable=wrong-import-position
+
+
+def run(store: tm.TaskStore, edits: int, batched: bool) -> float:
+    """Retourne la durée (ms) de *edits* éditions, groupées ou non."""
+    start = time.perf_counter()
+    if batched:
+        with store.transaction():
+            for task_id in range(1, edits + 1):
+                store.edit(task_id, priority=1)
+    else:
+        for task_id in range(1, edits + 1):
+            store.edit(task_id, priority=2)
+    return (time.perf_counter() - start) * 1000
+
+
+def main() -> None:
+    """Point d'entrée du benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=10000, help="Tâches dans le stockage")
+    parser.add_argument("--edits", type=int, default=5000, help="Éditions mesurées")
+    parser.add_argument("--stores", nargs="+",
+                        default=["json", "journal", "sqlite", "binary", "partitioned"],
+                        help="Stockages mesurés")
+    parser.add_argument("--skip-slow", action="store_true",
+                        help="Omet les éditions une à une sur JSON, binaire et partitionné")
+    parser.add_argument("--seed", type=int, default=42, help="Graine du générateur")
+    args = parser.parse_args()
+
+    tasks = generate_tasks(args.size, args.seed)
+
+    print(f"{'stockage':<12} {'une à une (ms)':>15} {'transaction (ms)':>17}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for kind in args.stores:
+            store = tm.TaskStore.open(f"{kind}:" + os.path.join(tmp, kind))
+            store.backend.save(tasks)
+            batched = run(store, args.edits, True)
+            if args.skip_slow and kind in ("json", "binary", "partitioned"):
+                single = "-"
+            else:
+                single = f"{run(store, args.edits, False):.0f}"
+            print(f"{kind:<12} {single:>15} {batched:>17.0f}", flush=True)
+
+
+if __name__ == "__main__":
+    main()
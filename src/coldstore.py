@@ -0,0 +1,190 @@
+"""Archive froide : tâches anciennes sorties du stockage courant.
+
+La commande ``archive`` déplace les tâches en retard depuis longtemps vers
+``<stockage>.archive.jsonl.gz`` (ou ``.xz`` avec lzma) : une tâche JSON par
+ligne, compressée. Chaque archivage ajoute un *membre* compressé à la fin
+du fichier (gzip et xz lisent les membres concaténés comme un seul flux),
+sans relire ni réécrire l'archive existante.
+
+Les métadonnées (``<stockage>.archive.json``) conservent le codec, le
+nombre de tâches archivées, la politique automatique (« en retard depuis
+plus de N jours ») avec la date de son dernier passage, et le plus grand
+ID archivé : un stockage qui calcule ses IDs à partir de son contenu
+(JSON, SQLite) ne réattribue pas l'ID d'une tâche archivée (voir
+``Backend.id_floor`` et :func:`storage.id_floor`, qui lit ces métadonnées
+sans importer ce module).
+
+Les commandes courantes ne lisent jamais l'archive : ``list`` ne parcourt
+le niveau froid qu'avec ``--include-archive``. Les tâches sont d'abord
+écrites dans l'archive, puis supprimées du stockage courant : après une
+interruption entre les deux, une tâche peut figurer des deux côtés et
+c'est la version courante qui l'emporte. Un membre tronqué en fin
+d'archive est ignoré à la lecture. :mod:`gzip` et :mod:`lzma` ne sont
+importés qu'à l'usage.
+"""
+
+from __future__ import annotations
+
+import json
+from datetime import date
+from typing import Any, Dict, Iterator, List, Optional
+
+from storage import META_SUFFIX, _atomic_write, _fsync, read_meta
+
+# Codec : extension du fichier d'archive.
+CODECS = {"gzip": ".archive.jsonl.gz", "lzma": ".archive.jsonl.xz"}
+DEFAULT_CODEC = "gzip"
+# Niveau gzip : celui de zlib par défaut, bien plus rapide que 9 pour un
+# taux proche sur du JSON.
+GZIP_LEVEL = 6
+# Taille des blocs décompressés lus par :meth:`ColdStore.iter_tasks`.
+READ_BYTES = 1 << 20
+
+
+class ColdStore:
+    """Niveau froid d'un stockage : archive compressée et métadonnées.
+
+    Args:
+        path: Chemin du stockage courant.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.meta = read_meta(path) or {"codec": DEFAULT_CODEC, "count": 0, "next_id": 1,
+                                        "policy_days": None, "last_run": None}
+
+    @property
+    def codec(self) -> str:
+        """Codec de l'archive (``gzip`` ou ``lzma``)."""
+        return self.meta["codec"]
+
+    @property
+    def archive_path(self) -> str:
+        """Fichier de l'archive compressée."""
+        return self.path + CODECS[self.codec]
+
+    @property
+    def count(self) -> int:
+        """Nombre de tâches archivées."""
+        return self.meta["count"]
+
+    def _save_meta(self) -> None:
+        _atomic_write(self.path + META_SUFFIX, json.dumps(self.meta, indent=2))
+
+    def set_codec(self, codec: str) -> None:
+        """Choisit le codec d'une archive encore vide.
+
+        Args:
+            codec: ``"gzip"`` ou ``"lzma"``.
+
+        Raises:
+            ValueError: Si le codec est inconnu, ou différent de celui d'une
+                archive qui contient déjà des tâches.
+        """
+        if codec not in CODECS:
+            raise ValueError(f"Codec inconnu : {codec} (attendu : {', '.join(CODECS)})")
+        if codec != self.codec and self.count:
+            raise ValueError(f"L'archive existante est en {self.codec} ; "
+                             f"impossible d'y ajouter en {codec}")
+        self.meta["codec"] = codec
+
+    def append(self, tasks: List[Dict[str, Any]]) -> None:
+        """Ajoute des tâches à l'archive (un membre compressé), de façon durable.
+
+        Args:
+            tasks: Tâches à archiver.
+        """
+        if tasks:
+            encode = json.JSONEncoder(ensure_ascii=False).encode
+            data = ("\n".join(map(encode, tasks)) + "\n").encode("utf-8")
+            with open(self.archive_path, "ab") as f:
+                f.write(_compress(self.codec, data))
+                _fsync(f)
+            self.meta["count"] += len(tasks)
+            self.meta["next_id"] = max([self.meta["next_id"]] + [t["id"] + 1 for t in tasks])
+        self._save_meta()
+
+    def iter_tasks(self) -> Iterator[Dict[str, Any]]:
+        """Parcourt en flux les tâches archivées (dans l'ordre d'archivage).
+
+        L'archive est décompressée par blocs (au plus :data:`READ_BYTES`), décodés
+        chacun en un seul appel à :func:`json.loads`.
+
+        Yields:
+            Chaque tâche archivée ; un membre tronqué en fin d'archive arrête
+            la lecture.
+        """
+        try:
+            f = _open(self.codec, self.archive_path)
+        except FileNotFoundError:
+            return
+        tail = b""
+        with f:
+            while True:
+                try:
+                    block = f.read1(READ_BYTES)
+                except EOFError:
+                    return
+                if not block:
+                    break
+                lines = (tail + block).split(b"\n")
+                tail = lines.pop()
+                yield from _decode(lines)
+        yield from _decode([tail])
+
+    def set_policy(self, days: Optional[int]) -> None:
+        """Enregistre (ou supprime avec None) la politique d'archivage automatique.
+
+        Args:
+            days: Archiver les tâches en retard depuis plus de *days* jours.
+        """
+        self.meta["policy_days"] = days
+        self.meta["last_run"] = None
+        self._save_meta()
+
+    def policy_pending(self, today: date) -> Optional[int]:
+        """Retourne le délai de la politique si elle n'a pas encore tourné aujourd'hui.
+
+        Args:
+            today: Date du jour.
+
+        Returns:
+            Le nombre de jours de la politique, ou None.
+        """
+        days = self.meta.get("policy_days")
+        if days is None or self.meta.get("last_run") == today.isoformat():
+            return None
+        return days
+
+    def mark_run(self, today: date) -> None:
+        """Note le passage de la politique automatique pour *today*."""
+        self.meta["last_run"] = today.isoformat()
+        self._save_meta()
+
+
+def _compress(codec: str, data: bytes) -> bytes:
+    if codec == "lzma":
+        import lzma  # pylint: disable=import-outside-toplevel
+
+        return lzma.compress(data)
+    import gzip  # pylint: disable=import-outside-toplevel
+
+    return gzip.compress(data, compresslevel=GZIP_LEVEL)
+
+
+def _open(codec: str, path: str) -> Any:
+    if codec == "lzma":
+        import lzma  # pylint: disable=import-outside-toplevel
+
+        return lzma.open(path, "rb")
+    import gzip  # pylint: disable=import-outside-toplevel
+
+    return gzip.open(path, "rb")
+
+
+def _decode(lines: List[bytes]) -> List[Dict[str, Any]]:
+    """Décode des lignes JSON en un seul appel (lignes vides ignorées)."""
+    lines = [line for line in lines if line.strip()]
+    if not lines:
+        return []
+    return json.loads(b"[" + b",".join(lines) + b"]")
@@ -0,0 +1,465 @@
+"""Mode démon : tâches gardées en mémoire derrière une socket Unix.
+
+``serve`` charge le stockage une fois, puis répond aux commandes reçues sur
+une socket Unix locale. Les lectures sont servies depuis la mémoire et les
+écritures sont regroupées avant d'être persistées (:class:`CachedBackend`).
+Côté client, :func:`forward` transmet la ligne de commande au démon s'il
+tourne (socket :func:`storage.socket_path`) ; sinon la CLI retombe sur
+l'accès direct aux fichiers.
+
+Protocole : une requête JSON par connexion (``argv``, ``cwd``, ``store``),
+suivie d'une réponse JSON (``status``, ``stdout``, ``stderr``, ``exit``).
+Ce module ne dépend pas de :mod:`task_manager` : l'exécution des commandes
+est fournie par l'appelant. :mod:`socket` et :mod:`socketserver` ne sont
+importés que si une socket existe ou si le démon démarre, et ce module
+lui-même n'est importé par la CLI que dans ce cas : sans démon, elle n'en
+paie pas le coût au lancement.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import functools
+import heapq
+import json
+import operator
+import os
+import time
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from models import Task
+from storage import LOCK_SUFFIX, Backend, file_lock
+
+if TYPE_CHECKING:
+    import socket
+    import threading
+
+# Délai maximal (secondes) entre une écriture et sa persistance.
+FLUSH_INTERVAL = 0.5
+# Nombre d'écritures en attente qui déclenche une persistance immédiate.
+FLUSH_MAX_PENDING = 1000
+# Délai d'attente du client pour joindre le démon avant de retomber sur
+# l'accès direct ; la réponse est ensuite attendue sans limite, la commande
+# pouvant déjà être appliquée.
+CLIENT_TIMEOUT = 5.0
+
+
+class CachedBackend(Backend):
+    """Stockage en mémoire avec écriture différée vers un autre stockage.
+
+    Les tâches sont chargées une fois depuis *inner* sous forme de
+    :class:`models.Task` (enregistrements à ``__slots__`` dont l'ordinal
+    d'échéance est précalculé) ; les lectures, filtres et tris se font en
+    mémoire sur ces valeurs natives. Les écritures sont accumulées puis
+    persistées par :meth:`flush` en un seul ``commit`` sur *inner*.
+
+    Une écriture prend le verrou du fichier de *inner* et relit le stockage
+    si un autre processus l'a modifié (:meth:`refresh`) : les IDs sont donc
+    attribués sous ce verrou. Il reste détenu tant que des écritures sont en
+    attente, si bien qu'un autre processus qui écrit attend leur
+    persistance au lieu de travailler sur un état périmé.
+
+    Args:
+        inner: Stockage persistant sous-jacent.
+    """
+
+    supports_query = True
+
+    def __init__(self, inner: Backend) -> None:
+        super().__init__()
+        self.inner = inner
+        self.path = inner.path
+        self._by_id: Dict[int, Task] = {}
+        self._next_id = 1
+        self._version = (0, 0, 0, 0)
+        self._held: Optional[contextlib.ExitStack] = None  # verrou de *inner*
+        self._depth = 0  # imbrication de :meth:`lock`
+        self._puts: Dict[int, None] = {}  # IDs modifiés, dans l'ordre d'écriture
+        self._deletes: set = set()
+        self._rewrite = False
+        self.dirty_since: Optional[float] = None
+        self._reload()
+
+    @property
+    def pending(self) -> int:
+        """Nombre d'écritures en attente de persistance."""
+        return len(self._puts) + len(self._deletes) + (len(self._by_id) if self._rewrite else 0)
+
+    def load(self) -> List[Dict[str, Any]]:
+        """Retourne des copies des tâches en mémoire."""
+        return [t.to_dict() for t in self._by_id.values()]
+
+    def iter_tasks(self) -> Iterator[Dict[str, Any]]:
+        """Parcourt des copies des tâches en mémoire."""
+        return (t.to_dict() for t in self._by_id.values())
+
+    def get(self, task_id: int) -> Optional[Dict[str, Any]]:
+        """Retourne une copie de la tâche *task_id* (ou None)."""
+        task = self._by_id.get(task_id)
+        return task.to_dict() if task is not None else None
+
+    def get_many(self, task_ids: Iterable[int]) -> List[Dict[str, Any]]:
+        """Retourne des copies des tâches existantes parmi *task_ids*."""
+        return [self._by_id[i].to_dict() for i in task_ids if i in self._by_id]
+
+    def next_id(self) -> int:
+        """Retourne le prochain ID (compteur en mémoire)."""
+        return self._next_id
+
+    def version(self) -> Tuple[int, int, int, int]:
+        """Signature du stockage persistant sous-jacent."""
+        return self.inner.version()
+
+    def _reload(self) -> None:
+        """Charge les tâches et le compteur d'IDs depuis *inner*."""
+        self._version = self.inner.version()
+        self._by_id = {t["id"]: Task.from_dict(t) for t in self.inner.iter_tasks()}
+        self._next_id = self.inner.next_id()
+
+    def refresh(self) -> bool:
+        """Relit *inner* si un autre processus y a écrit depuis le dernier chargement.
+
+        Sans effet tant que le verrou est détenu avec des écritures en
+        attente : personne d'autre n'a alors pu écrire.
+
+        Returns:
+            True si les tâches ont été rechargées.
+        """
+        if self.dirty_since is not None or self.inner.version() == self._version:
+            return False
+        self.inner.invalidate()
+        self._reload()
+        return True
+
+    @contextlib.contextmanager
+    def lock(self) -> Iterator[None]:
+        """Détient le verrou du fichier de *inner*, sur un état relu au besoin.
+
+        Le verrou est réentrant. À la sortie, il est relâché si rien n'est en
+        attente ; sinon il reste détenu jusqu'à :meth:`flush`. Le verrou est
+        celui de *inner* lui-même, que son ``commit`` reprend sans bloquer
+        (``flock`` n'est pas réentrant d'un descripteur à l'autre).
+
+        Yields:
+            None.
+        """
+        if self._held is None:
+            held = contextlib.ExitStack()
+            held.enter_context(self.inner.lock())
+            self._held = held
+            self.refresh()
+        self._depth += 1
+        try:
+            yield
+        finally:
+            self._depth -= 1
+            if not self._depth and self.dirty_since is None:
+                self._release()
+
+    def _release(self) -> None:
+        """Relâche le verrou du fichier s'il est détenu."""
+        held, self._held = self._held, None
+        if held is not None:
+            held.close()
+
+    def _mark_dirty(self) -> None:
+        """Note l'instant de la première écriture non persistée."""
+        if self.dirty_since is None:
+            self.dirty_since = time.monotonic()
+
+    def _write(self, puts: List[Dict[str, Any]], deletes: List[int]) -> None:
+        """Applique le lot en mémoire et le met en attente de persistance."""
+        for task in puts:
+            self._by_id[task["id"]] = Task.from_dict(task)
+            self._puts[task["id"]] = None
+            self._deletes.discard(task["id"])
+            self._next_id = max(self._next_id, task["id"] + 1)
+        for task_id in deletes:
+            self._by_id.pop(task_id, None)
+            self._puts.pop(task_id, None)
+            self._deletes.add(task_id)
+        self._mark_dirty()
+
+    def _save(self, tasks: List[Dict[str, Any]]) -> None:
+        """Remplace le contenu en mémoire ; la réécriture complète est différée."""
+        self._by_id = {t["id"]: Task.from_dict(t) for t in tasks}
+        self._puts.clear()
+        self._deletes.clear()
+        self._rewrite = True
+        self._mark_dirty()
+
+    def compact(self) -> int:
+        """Persiste les écritures en attente puis compacte le stockage sous-jacent."""
+        self.flush()
+        count = self.inner.compact()
+        self._version = self.inner.version()
+        return count
+
+    def query(self, overdue: bool, due_in: Optional[int], sort: str, today: Any,
+              limit: Optional[int] = None, offset: int = 0) -> List[Dict[str, Any]]:
+        """Filtre, trie et pagine en mémoire, sans réanalyser les dates.
+
+        Avec *limit*, seules les ``offset + limit`` premières tâches sont
+        sélectionnées (tas borné) au lieu de trier tout le résultat.
+
+        Args:
+            overdue: Ne garder que les tâches en retard.
+            due_in: Ne garder que les tâches à échéance dans ce nombre de jours.
+            sort: ``"priority"`` ou ``"date"``.
+            today: Date de référence.
+            limit: Nombre maximal de tâches retournées (None = toutes).
+            offset: Nombre de tâches à sauter en tête de résultat.
+
+        Returns:
+            Des copies des tâches filtrées et triées.
+        """
+        day = today.toordinal()
+        tasks: Iterable[Task] = self._by_id.values()
+        if overdue:
+            tasks = (t for t in tasks if 0 < t.due_ord < day)
+        elif due_in is not None:
+            tasks = (t for t in tasks if day <= t.due_ord <= day + due_in)
+        key = operator.attrgetter("rank" if sort == "priority" else "due_key")
+        if limit is None:
+            selected = sorted(tasks, key=key)[offset:]
+        else:
+            selected = heapq.nsmallest(offset + limit, tasks, key=key)[offset:]
+        return [t.to_dict() for t in selected]
+
+    def flush(self) -> None:
+        """Persiste les écritures en attente en une seule opération.
+
+        Le verrou du fichier est ensuite relâché, sauf au sein d'un
+        :meth:`lock` en cours.
+        """
+        if self._rewrite:
+            self.inner.save(self.load())
+        elif self._puts or self._deletes:
+            self.inner.commit(puts=[self._by_id[i].to_dict() for i in self._puts],
+                              deletes=sorted(self._deletes))
+        self._puts.clear()
+        self._deletes.clear()
+        self._rewrite = False
+        self.dirty_since = None
+        self._version = self.inner.version()
+        if not self._depth:
+            self._release()
+
+
+def _recv_json(sock: socket.socket) -> Dict[str, Any]:
+    """Lit un message JSON terminé par un saut de ligne.
+
+    Raises:
+        ConnectionError: Si la connexion se ferme avant la fin du message.
+    """
+    chunks = []
+    while True:
+        chunk = sock.recv(65536)
+        if not chunk:
+            break
+        chunks.append(chunk)
+        if chunk.endswith(b"\n"):
+            break
+    if not chunks:
+        raise ConnectionError("réponse vide du démon")
+    return json.loads(b"".join(chunks))
+
+
+def forward(path: str, argv: List[str], store: Optional[str]) -> Optional[Dict[str, Any]]:
+    """Transmet une ligne de commande au démon, s'il tourne.
+
+    Args:
+        path: Chemin de la socket.
+        argv: Arguments de la CLI (sans le nom du programme).
+        store: Spécification de stockage du client (ou None).
+
+    Returns:
+        La réponse du démon, ou None s'il est absent, injoignable ou s'il
+        refuse la commande (le client exécute alors la commande lui-même).
+    """
+    if not os.path.exists(path):
+        return None
+    import socket  # pylint: disable=import-outside-toplevel,redefined-outer-name
+
+    if not hasattr(socket, "AF_UNIX"):
+        return None
+    request = {"argv": argv, "cwd": os.getcwd(), "store": store}
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(CLIENT_TIMEOUT)
+        try:
+            sock.connect(path)
+        except OSError:
+            return None  # socket orpheline : pas de démon
+        try:
+            sock.sendall(json.dumps(request).encode("utf-8") + b"\n")
+            sock.settimeout(None)
+            response = _recv_json(sock)
+        except (OSError, ValueError) as exc:
+            # La commande a pu être exécutée : ne pas la rejouer en local.
+            return {"status": "ok", "stdout": "", "exit": 1,
+                    "stderr": f"Erreur: pas de réponse du démon ({exc})\n"}
+    return response if response.get("status") == "ok" else None
+
+
+def listening(path: str) -> bool:
+    """Indique si un démon accepte les connexions sur la socket *path*.
+
+    Args:
+        path: Chemin de la socket.
+
+    Returns:
+        True si une connexion aboutit ; False si la socket est absente ou
+        orpheline (démon arrêté, ou qui n'écoute pas encore).
+    """
+    import socket  # pylint: disable=import-outside-toplevel,redefined-outer-name
+
+    if not hasattr(socket, "AF_UNIX") or not os.path.exists(path):
+        return False
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        try:
+            probe.connect(path)
+        except OSError:
+            return False
+    return True
+
+
+Handler = Callable[[Dict[str, Any]], Dict[str, Any]]
+
+
+class _Stopped(Exception):
+    """Levée par le gestionnaire de SIGTERM pour interrompre l'attente."""
+
+
+@functools.lru_cache(maxsize=None)
+def _server_class() -> type:
+    """Construit la classe du serveur (import de :mod:`socketserver` différé).
+
+    Returns:
+        La classe ``_Server``.
+    """
+    import socketserver  # pylint: disable=import-outside-toplevel
+
+    class _RequestHandler(socketserver.StreamRequestHandler):
+        """Décode une requête, l'exécute via le serveur et renvoie la réponse."""
+
+        def handle(self) -> None:
+            try:
+                request = json.loads(self.rfile.readline())
+                response = self.server.dispatch(request)  # type: ignore[attr-defined]
+            except ValueError as exc:
+                response = {"status": "error", "stderr": f"Requête invalide : {exc}\n"}
+            self.wfile.write(json.dumps(response, ensure_ascii=False).encode("utf-8") + b"\n")
+
+    class _Server(socketserver.UnixStreamServer):
+        """Serveur mono-thread : les commandes sont exécutées une à une.
+
+        ``busy`` est vrai pendant le traitement d'une requête ou une
+        persistance : un SIGTERM reçu à ce moment est différé jusqu'à la fin
+        de l'opération.
+        """
+
+        def __init__(self, path: str, dispatch: Handler) -> None:
+            self.dispatch = dispatch
+            self.busy = False
+            super().__init__(path, _RequestHandler)
+
+        def process_request(self, request: Any, client_address: Any) -> None:
+            self.busy = True
+            try:
+                super().process_request(request, client_address)
+            finally:
+                self.busy = False
+
+    return _Server
+
+
+def serve(path: str, backend: CachedBackend, dispatch: Handler,
+          flush_interval: float = FLUSH_INTERVAL,
+          ready: Optional[threading.Event] = None) -> None:
+    """Sert les commandes sur la socket *path* jusqu'à SIGTERM ou Ctrl-C.
+
+    Les écritures sont persistées au plus tard *flush_interval* secondes
+    après la première écriture en attente, dès que
+    :data:`FLUSH_MAX_PENDING` écritures sont accumulées, et à l'arrêt.
+    Avant chaque requête, *backend* est relu si un autre processus a
+    modifié le stockage (:meth:`CachedBackend.refresh`).
+
+    La socket existe dès ``bind()``, avant ``listen()`` : un démon qui
+    démarre refuse encore les connexions. Le démarrage se fait donc sous
+    un verrou exclusif (``<socket>.lock``), si bien qu'un second démon
+    lancé en même temps ne prend pas cette socket pour une socket
+    orpheline et ne la supprime pas ; l'arrêt la supprime sous le même
+    verrou.
+
+    Args:
+        path: Chemin de la socket Unix.
+        backend: Stockage en mémoire partagé par les commandes.
+        dispatch: Exécute une requête et retourne la réponse.
+        flush_interval: Délai maximal avant persistance (0 = immédiate).
+        ready: Événement signalé une fois la socket à l'écoute, ou None.
+
+    Raises:
+        ValueError: Si les sockets Unix ne sont pas disponibles ou si un
+            démon répond déjà sur *path*.
+    """
+    # pylint: disable=import-outside-toplevel,redefined-outer-name
+    import signal
+    import socket
+
+    if not hasattr(socket, "AF_UNIX"):
+        raise ValueError("Le mode démon nécessite les sockets Unix")
+    with contextlib.ExitStack() as held:
+        held.enter_context(file_lock(path + LOCK_SUFFIX))
+        if listening(path):
+            raise ValueError(f"Un démon écoute déjà sur {path}")
+        if os.path.exists(path):
+            os.remove(path)  # socket orpheline d'un démon arrêté
+        starting = held.pop_all()  # verrou rendu une fois la socket à l'écoute
+
+    def dispatch_fresh(request: Dict[str, Any]) -> Dict[str, Any]:
+        backend.refresh()  # écritures d'autres processus depuis la requête précédente
+        return dispatch(request)
+
+    stopping = []
+    server: Any = None
+
+    def stop(signum: int, frame: Any) -> None:  # pylint: disable=unused-argument
+        stopping.append(signum)
+        if server is None or not server.busy:
+            raise _Stopped  # l'attente de connexion serait sinon reprise
+
+    # Gestionnaire installé avant la création de la socket : un SIGTERM reçu
+    # dès qu'elle apparaît arrête proprement le démon.
+    with starting:  # verrou rendu si l'installation échoue (hors du thread principal)
+        previous = signal.signal(signal.SIGTERM, stop)
+        starting = starting.pop_all()
+    try:
+        server = _server_class()(path, dispatch_fresh)  # bind() puis listen()
+        starting.close()
+        if ready is not None:
+            ready.set()
+        server.timeout = flush_interval if flush_interval > 0 else 1.0
+        while not stopping:
+            server.handle_request()
+            due = (backend.dirty_since is not None
+                   and time.monotonic() - backend.dirty_since >= flush_interval)
+            if due or backend.pending >= FLUSH_MAX_PENDING:
+                server.busy = True
+                backend.flush()
+                server.busy = False
+    except (KeyboardInterrupt, _Stopped):
+        pass
+    finally:
+        starting.close()
+        # Sous le verrou : un démon qui démarre ne prend pas la socket fermée
+        # pour une orpheline avant qu'elle soit supprimée (il supprimerait
+        # sinon la sienne).
+        with file_lock(path + LOCK_SUFFIX):
+            if server is not None:
+                server.server_close()
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        backend.flush()
+        signal.signal(signal.SIGTERM, previous)
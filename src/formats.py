@@ -0,0 +1,155 @@
+"""Formats de sortie de ``list`` et ``search`` (``--format``).
+
+- ``table`` (défaut) : une ligne lisible par tâche, avec indicateur de rappel ;
+- ``jsonl`` : un objet JSON par ligne ;
+- ``csv`` / ``tsv`` : une ligne d'en-tête puis une ligne par tâche.
+
+Les formats machine contiennent les colonnes :data:`COLUMNS` : les champs
+d'une tâche, dont ``repeat`` (règle de répétition, vide pour une tâche
+simple) pour qu'un export puisse être réimporté par ``import``, et
+``status``, l'état de rappel calculé (``overdue``, ``soon`` ou vide), à la
+place des indicateurs à émoji de l'affichage ; celui d'une tâche récurrente
+porte sur sa prochaine occurrence, comme dans ``list``.
+
+Les tâches sont encodées au fil du flux, par lots de :data:`BATCH_ROWS`
+(:func:`encode`), dans un :class:`ChunkedWriter` qui n'écrit sur la sortie
+que par blocs d'environ :data:`CHUNK_CHARS` caractères : un long listing
+redirigé vers un autre programme ne coûte plus un appel d'écriture par
+tâche. :mod:`csv` n'est importé que pour les formats qui en ont besoin.
+"""
+
+from __future__ import annotations
+
+import io
+import itertools
+import json
+from datetime import date
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, TextIO
+
+from recurrence import next_occurrence
+from watcher import SOON_DAYS, due_status
+
+FORMATS = ("table", "jsonl", "csv", "tsv")
+# Colonnes des formats machine, dans l'ordre.
+COLUMNS = ("id", "title", "desc", "priority", "due", "created", "repeat", "status")
+# Taille (caractères) à partir de laquelle le tampon est écrit sur la sortie.
+CHUNK_CHARS = 1 << 16
+# Tâches encodées ensemble (un appel à l'encodeur JSON ou CSV par lot).
+BATCH_ROWS = 1000
+
+
+class ChunkedWriter:
+    """Tampon d'écriture qui ne vide son contenu que par gros blocs.
+
+    S'utilise comme gestionnaire de contexte : le reste du tampon est écrit
+    à la sortie du bloc, même sur exception.
+
+    Args:
+        stream: Flux de sortie (texte).
+        capture: Liste qui reçoit aussi chaque bloc écrit (pour le cache).
+        size: Taille des blocs, en caractères.
+
+    Attributes:
+        written: Nombre total de caractères reçus.
+    """
+
+    def __init__(self, stream: TextIO, capture: Optional[List[str]] = None,
+                 size: int = CHUNK_CHARS) -> None:
+        self.stream = stream
+        self.capture = capture
+        self.size = size
+        self.written = 0
+        self._parts: List[str] = []
+        self._pending = 0
+
+    def write(self, text: str) -> None:
+        """Ajoute *text* au tampon (écrit le bloc si le tampon est plein)."""
+        self._parts.append(text)
+        self._pending += len(text)
+        self.written += len(text)
+        if self._pending >= self.size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Écrit le contenu du tampon sur le flux."""
+        if not self._parts:
+            return
+        chunk = "".join(self._parts)
+        self._parts.clear()
+        self._pending = 0
+        self.stream.write(chunk)
+        if self.capture is not None:
+            self.capture.append(chunk)
+
+    def __enter__(self) -> ChunkedWriter:
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.flush()
+
+
+def task_row(task: Dict[str, Any], today: int) -> Dict[str, Any]:
+    """Retourne les colonnes d'une tâche pour les formats machine.
+
+    Args:
+        task: Tâche affichée.
+        today: Ordinal du jour (pour ``status``).
+
+    Returns:
+        ``{colonne: valeur}`` dans l'ordre de :data:`COLUMNS`.
+    """
+    get = task.get
+    return {"id": get("id", ""), "title": get("title", ""), "desc": get("desc", ""),
+            "priority": get("priority", ""), "due": get("due", ""), "created": get("created", ""),
+            "repeat": get("repeat", ""), "status": due_status(next_occurrence(task, today), today, SOON_DAYS)}
+
+
+def _batches(tasks: Iterable[Dict[str, Any]]) -> Iterator[List[Dict[str, Any]]]:
+    """Découpe un flux de tâches en lots de :data:`BATCH_ROWS`."""
+    it = iter(tasks)
+    return iter(lambda: list(itertools.islice(it, BATCH_ROWS)), [])
+
+
+def encode(fmt: str, tasks: Iterable[Dict[str, Any]], table_line: Callable[[Dict[str, Any]], str],
+           today: Optional[date] = None) -> Iterator[str]:
+    """Encode des tâches dans un format de sortie, un lot à la fois.
+
+    Args:
+        fmt: Format (voir :data:`FORMATS`).
+        tasks: Tâches à encoder, éventuellement en flux.
+        table_line: Ligne affichée pour une tâche au format ``table``.
+        today: Date de référence de ``status`` (aujourd'hui par défaut).
+
+    Yields:
+        Le texte de chaque lot (l'en-tête d'abord pour ``csv``/``tsv``).
+
+    Raises:
+        ValueError: Si le format est inconnu.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Format de sortie inconnu : {fmt} (attendu : {', '.join(FORMATS)})")
+    ordinal = (today or date.today()).toordinal()
+    if fmt == "table":
+        for batch in _batches(tasks):
+            yield "\n".join(map(table_line, batch)) + "\n"
+    elif fmt == "jsonl":
+        # Un seul appel à l'encodeur C par lot. Les chaînes JSON échappent les
+        # caractères de contrôle : un NUL ne peut venir que du séparateur et,
+        # les colonnes étant scalaires, « }NUL{ » ne sépare que deux objets.
+        encoder = json.JSONEncoder(ensure_ascii=False, separators=("\0", ": "))
+        for batch in _batches(tasks):
+            text = encoder.encode([task_row(t, ordinal) for t in batch])
+            yield text[1:-1].replace("}\0{", "}\n{").replace("\0", ", ") + "\n"
+    else:
+        import csv  # pylint: disable=import-outside-toplevel
+
+        buf = io.StringIO()
+        writer = csv.writer(buf, dialect="excel-tab" if fmt == "tsv" else "excel",
+                            lineterminator="\n")
+        writer.writerow(COLUMNS)
+        for batch in _batches(tasks):
+            writer.writerows([tuple(task_row(t, ordinal).values()) for t in batch])
+            yield buf.getvalue()
+            buf.seek(0)
+            buf.truncate()
+        yield buf.getvalue()
@@ -0,0 +1,260 @@
+"""Écritures groupées (*group commit*) pour les accès concurrents.
+
+Quand plusieurs processus écrivent dans le même stockage, chacun doit
+prendre le verrou du stockage (:meth:`storage.Backend.lock`) puis
+réécrire ou compléter les fichiers : les écritures se font une à une. En
+mode groupé, un écrivain se contente d'ajouter ses modifications à une
+file d'attente partagée (``<path>.queue``) puis de demander une
+persistance ; le premier processus qui obtient le verrou du stockage
+applique **toutes** les modifications en attente en un seul ``commit``,
+et les écrivains suivants trouvent leur travail déjà fait.
+
+Format de la file (JSONL) : une ligne d'en-tête de largeur fixe
+``{"next": N}`` (prochain ID réservé, réécrite en place) puis un
+enregistrement par ligne :
+
+- ``{"op": "put", "task": {...}}`` : ajout d'une tâche (ID déjà attribué) ;
+- ``{"op": "patch", "id": 3, "fields": {...}}`` : modification de champs ;
+- ``{"op": "delete", "id": 3}`` : suppression.
+
+Les enregistrements ne sont retirés de la file qu'après le ``commit`` :
+un arrêt entre les deux ne fait que les rejouer (ils sont idempotents).
+Verrous : toujours celui du stockage avant celui de la file.
+
+Les écrivains en mode verrouillé attribuent leurs IDs par
+:func:`reserve_ids`, qui avance aussi l'en-tête d'une file existante : les
+deux modes peuvent écrire en même temps sans jamais partager un ID.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from contextlib import nullcontext
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from storage import Backend, file_lock
+
+QUEUE_SUFFIX = ".queue"
+# En-tête de largeur fixe, pour être réécrit sans déplacer la suite du fichier.
+_HEADER = '{"next": %19d}\n'
+_HEADER_SIZE = len(_HEADER % 0)
+
+
+def _read_next(f: Any) -> int:
+    """Lit le prochain ID réservé (et initialise l'en-tête d'une file vide).
+
+    Args:
+        f: File ouverte en lecture-écriture binaire.
+
+    Returns:
+        Le prochain ID réservé, 0 si aucun.
+    """
+    f.seek(0)
+    line = f.read(_HEADER_SIZE)
+    if len(line) < _HEADER_SIZE:
+        f.seek(0)
+        f.truncate()
+        f.write((_HEADER % 0).encode("ascii"))
+        return 0
+    return int(json.loads(line)["next"])
+
+
+def reserve_ids(backend: Backend, count: int = 1, start: Optional[int] = None) -> int:
+    """Réserve des IDs pour un écrivain qui détient le verrou du stockage.
+
+    Les IDs déjà réservés dans la file (pas encore persistés) sont sautés,
+    et l'en-tête de la file est avancé au-delà des IDs retournés.
+
+    Args:
+        backend: Stockage, dont le verrou est détenu par l'appelant.
+        count: Nombre d'IDs consécutifs à réserver.
+        start: Premier ID envisagé (par défaut ``backend.next_id()``).
+
+    Returns:
+        Le premier des *count* IDs réservés.
+    """
+    first = backend.next_id() if start is None else start
+    path = backend.path + QUEUE_SUFFIX
+    if not os.path.exists(path):
+        return first  # un écrivain groupé prendra d'abord le verrou du stockage
+    with file_lock(path), open(path, "r+b") as f:
+        first = max(first, _read_next(f))
+        f.seek(0)
+        f.write((_HEADER % (first + count)).encode("ascii"))
+    return first
+
+
+class GroupCommit:
+    """File d'écritures partagée par les processus d'un même stockage.
+
+    Les écrivains en mode verrouillé peuvent écrire en même temps, pourvu
+    qu'ils attribuent leurs IDs par :func:`reserve_ids`.
+
+    Args:
+        backend: Stockage dans lequel les modifications sont persistées.
+    """
+
+    def __init__(self, backend: Backend) -> None:
+        self.backend = backend
+        self.path = backend.path + QUEUE_SUFFIX
+
+    def submit(self, adds: Iterable[Dict[str, Any]] = (),
+               patches: Optional[Dict[int, Dict[str, Any]]] = None,
+               deletes: Iterable[int] = ()) -> List[int]:
+        """Ajoute des modifications à la file, sans les persister.
+
+        Args:
+            adds: Nouvelles tâches ; leur ``id`` est attribué ici.
+            patches: Champs à modifier, par ID de tâche.
+            deletes: IDs des tâches à supprimer.
+
+        Returns:
+            Les IDs attribués aux nouvelles tâches, dans l'ordre de *adds*.
+        """
+        adds = list(adds)
+        first_reservation = bool(adds) and not self._reserved()
+        # Première réservation : compteur du stockage, lu sous son verrou pour
+        # ne pas croiser un écrivain verrouillé qui n'a pas vu de file.
+        with self.backend.lock() if first_reservation else nullcontext():
+            base = self.backend.next_id() if first_reservation else 0
+            return self._append(adds, base, patches, deletes)
+
+    def _append(self, adds: List[Dict[str, Any]], base: int,
+                patches: Optional[Dict[int, Dict[str, Any]]],
+                deletes: Iterable[int]) -> List[int]:
+        """Attribue les IDs de *adds* (au moins *base*) et ajoute le tout à la file."""
+        # Le verrou crée la file au besoin : elle existe une fois acquis.
+        with file_lock(self.path), open(self.path, "r+b") as f:
+            first = max(base, _read_next(f))
+            ids = list(range(first, first + len(adds)))
+            records = [{"op": "put", "task": dict(task, id=i)} for task, i in zip(adds, ids)]
+            records += [{"op": "patch", "id": i, "fields": fields}
+                        for i, fields in (patches or {}).items()]
+            records += [{"op": "delete", "id": i} for i in deletes]
+            if adds:
+                f.seek(0)
+                f.write((_HEADER % (first + len(adds))).encode("ascii"))
+            f.seek(0, os.SEEK_END)
+            f.write(b"".join((json.dumps(r, ensure_ascii=False) + "\n").encode("utf-8")
+                             for r in records))
+        return ids
+
+    def flush(self) -> int:
+        """Persiste en un seul ``commit`` toutes les modifications en attente.
+
+        Le verrou du stockage est pris d'abord : si un autre processus
+        persiste déjà la file, l'appel attend puis ne trouve plus que les
+        modifications arrivées entre-temps.
+
+        Returns:
+            Le nombre d'enregistrements appliqués.
+        """
+        with self.backend.lock():
+            with file_lock(self.path):
+                records, end = self._read_records()
+            if not records:
+                return 0
+            puts, deletes = self._apply(records)
+            self.backend.commit(puts=puts, deletes=deletes)
+            next_id = self.backend.next_id()
+            with file_lock(self.path), open(self.path, "r+b") as f:
+                reserved = max(next_id, _read_next(f))
+                f.seek(end)
+                rest = f.read()
+                # Recale la réservation sur le stockage (écritures hors file).
+                f.seek(0)
+                f.write((_HEADER % reserved).encode("ascii"))
+                f.write(rest)
+                f.truncate()
+        return len(records)
+
+    def write(self, adds: Iterable[Dict[str, Any]] = (),
+              patches: Optional[Dict[int, Dict[str, Any]]] = None,
+              deletes: Iterable[int] = ()) -> List[int]:
+        """Met des modifications en file puis attend qu'elles soient persistées.
+
+        Args:
+            adds: Nouvelles tâches (voir :meth:`submit`).
+            patches: Champs à modifier, par ID de tâche.
+            deletes: IDs des tâches à supprimer.
+
+        Returns:
+            Les IDs attribués aux nouvelles tâches.
+        """
+        ids = self.submit(adds, patches, deletes)
+        self.flush()
+        return ids
+
+    # ---------- Lecture de la file ----------
+    def _reserved(self) -> int:
+        """Lit sans verrou le prochain ID réservé (0 si la file est neuve).
+
+        Returns:
+            La valeur de l'en-tête, ou 0.
+        """
+        try:
+            with open(self.path, "rb") as f:
+                line = f.read(_HEADER_SIZE)
+        except FileNotFoundError:
+            return 0
+        return int(json.loads(line)["next"]) if len(line) == _HEADER_SIZE else 0
+
+    def _read_records(self) -> Tuple[List[Dict[str, Any]], int]:
+        """Lit les enregistrements en attente.
+
+        Une ligne illisible (écriture interrompue) est ignorée.
+
+        Returns:
+            Les enregistrements et la position de fin de la dernière ligne lue.
+        """
+        try:
+            f = open(self.path, "rb")
+        except FileNotFoundError:
+            return [], 0
+        with f:
+            f.seek(_HEADER_SIZE)
+            data = f.read()
+        end = data.rfind(b"\n") + 1
+        records = []
+        for line in data[:end].splitlines():
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                continue
+        return records, _HEADER_SIZE + end
+
+    def _apply(self, records: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[int]]:
+        """Réduit des enregistrements à un lot ``(puts, deletes)``.
+
+        Un ``patch`` porte sur l'état courant de la tâche (persistée ou
+        ajoutée plus tôt dans la file) ; il est ignoré si elle n'existe plus.
+
+        Args:
+            records: Enregistrements, dans l'ordre de la file.
+
+        Returns:
+            Les tâches complètes à écrire et les IDs à supprimer.
+        """
+        puts: Dict[int, Dict[str, Any]] = {}
+        deletes: Dict[int, None] = {}
+        for record in records:
+            op = record.get("op")
+            if op == "put":
+                task = record["task"]
+                puts[task["id"]] = task
+                deletes.pop(task["id"], None)
+            elif op == "patch":
+                task_id = record["id"]
+                task = puts.get(task_id)
+                if task is None and task_id not in deletes:
+                    task = self.backend.get(task_id)
+                if task is not None:
+                    task = dict(task, **record["fields"])
+                    if task.get("repeat") == "":
+                        del task["repeat"]  # récurrence retirée (``--repeat none``)
+                    puts[task_id] = task
+            elif op == "delete":
+                puts.pop(record["id"], None)
+                deletes[record["id"]] = None
+        return list(puts.values()), list(deletes)
@@ -0,0 +1,727 @@
+"""Index secondaires persistés à côté du stockage.
+
+:class:`DueIndex` maintient la liste des tâches triée par date d'échéance
+afin que ``list --overdue`` et ``list --due-in N`` deviennent des recherches
+par dichotomie sur une plage, sans décoder ni comparer chaque tâche.
+
+:class:`SearchIndex` est un index inversé (mot → IDs) du titre et de la
+description, utilisé par ``search`` : les mots sont normalisés sans casse
+ni accents (:func:`tokenize`) et une recherche à plusieurs mots intersecte
+les listes d'IDs correspondantes.
+
+Les index sont des observateurs de :class:`storage.Backend` : ils sont mis
+à jour à chaque écriture et reconstruits automatiquement s'ils sont absents
+ou si le stockage a été modifié sans eux.
+
+:class:`JsonIndex` est la base des petits index JSON réécrits en entier à
+chaque écriture (séries récurrentes, compteurs de ``stats``).
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import mmap
+import os
+import re
+import struct
+import sys
+import unicodedata
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+# Même format que ``task_manager.DATE_FMT``.
+DATE_FMT = "%Y-%m-%d"
+
+DUE_SUFFIX = ".due"
+DELTA_SUFFIX = ".due.delta"
+# En-tête : magic (ordre des octets natif), signature du stockage (4 entiers), nombre d'entrées.
+_DUE_MAGIC = b"TASKDUE" + (b"L" if sys.byteorder == "little" else b"B")
+_DUE_HEADER = struct.Struct("=8s4qq")
+# Entrée du delta : (id, ordinal) ; un ordinal nul retire la tâche de l'index.
+_DELTA_ENTRY = struct.Struct("=qq")
+# Taille minimale du delta avant son repli dans le fichier principal.
+DELTA_MIN_FOLD = 1024
+
+SEARCH_SUFFIX = ".search"
+SEARCH_DELTA_SUFFIX = ".search.delta"
+# En-tête : magic, signature du stockage, nombres de mots, d'entrées, d'octets de mots et de tâches.
+_SEARCH_MAGIC = b"TASKSRC" + (b"L" if sys.byteorder == "little" else b"B")
+_SEARCH_HEADER = struct.Struct("=8s4q4q")
+# Ligatures que la décomposition Unicode ne sépare pas.
+_LIGATURES = str.maketrans({"œ": "oe", "Œ": "oe", "æ": "ae", "Æ": "ae"})
+_MARKS = re.compile("[\u0300-\u036f]")
+_WORD = re.compile(r"\w+")
+
+
+@lru_cache(maxsize=4096)
+def _parse_ordinal(text: str) -> int:
+    """Analyse une date (résultat mis en cache : les échéances se répètent)."""
+    try:
+        return datetime.strptime(text, DATE_FMT).toordinal()
+    except ValueError:
+        return 0
+
+
+def date_ordinal(due: Any) -> int:
+    """Retourne l'ordinal d'une date ``YYYY-MM-DD``.
+
+    Args:
+        due: Valeur du champ ``due``.
+
+    Returns:
+        ``date.toordinal()`` de *due*, ou 0 si ce n'est pas une date valide.
+    """
+    return _parse_ordinal(due) if isinstance(due, str) else 0
+
+
+def due_ordinal(task: Dict[str, Any]) -> int:
+    """Retourne l'ordinal de l'échéance d'une tâche.
+
+    Args:
+        task: Dictionnaire représentant la tâche.
+
+    Returns:
+        ``date.toordinal()`` de ``task["due"]``, ou 0 si la date est absente
+        ou mal formée (la tâche n'apparaît alors dans aucun filtre).
+    """
+    try:
+        return date_ordinal(task["due"])
+    except (KeyError, TypeError):
+        return 0
+
+
+class DueIndex:
+    """Index trié ``(ordinal d'échéance, id)`` d'un stockage fichier.
+
+    Le fichier principal ``<path>.due`` contient deux colonnes triées
+    (ordinaux puis IDs) lues via :mod:`mmap` ; une recherche de plage ne
+    touche que les entrées correspondantes. Les écritures ajoutent des
+    paires ``(id, ordinal)`` à ``<path>.due.delta``, qui surchargent le
+    fichier principal et y sont repliées quand le delta grossit.
+
+    L'index expose aussi le protocole de plages de :class:`storage.Backend`
+    (``range_fields``, ``range_count``, ``iter_range``) pour le champ
+    ``due`` : le planificateur de ``--where`` peut le choisir comme chemin
+    d'accès.
+
+    Args:
+        backend: Stockage indexé (doit exposer ``path``, ``version()``,
+            ``load()`` et ``lock()``).
+    """
+
+    range_fields = ("due",)
+    ordered_ranges = ("due",)
+
+    def __init__(self, backend: Any) -> None:
+        self.backend = backend
+        self.path = backend.path + DUE_SUFFIX
+        self.delta_path = backend.path + DELTA_SUFFIX
+
+    # ---------- Protocole observateur ----------
+    def is_fresh(self) -> bool:
+        """Indique si l'index correspond à l'état actuel du stockage.
+
+        Returns:
+            True si l'en-tête porte la signature courante du stockage.
+        """
+        header = self._read_header()
+        return header is not None and tuple(header[1:5]) == self.backend.version()
+
+    def apply(self, puts: List[Dict[str, Any]], deletes: List[int]) -> None:
+        """Reporte un lot d'écritures dans le delta.
+
+        Args:
+            puts: Tâches ajoutées ou modifiées.
+            deletes: IDs supprimés.
+        """
+        pairs = [(t["id"], due_ordinal(t)) for t in puts] + [(i, 0) for i in deletes]
+        with open(self.delta_path, "ab") as f:
+            f.write(b"".join(_DELTA_ENTRY.pack(i, o) for i, o in pairs))
+            delta_count = f.tell() // _DELTA_ENTRY.size
+        header = self._read_header()
+        count = header[5] if header else 0
+        if delta_count > max(DELTA_MIN_FOLD, count // 8):
+            self._fold()
+        else:
+            self._stamp()
+
+    def reset(self, tasks: List[Dict[str, Any]]) -> None:
+        """Reconstruit un index existant après une réécriture complète.
+
+        Args:
+            tasks: Contenu complet du stockage.
+        """
+        if os.path.exists(self.path):
+            self.rebuild(tasks)
+
+    # ---------- Construction ----------
+    def rebuild(self, tasks: Optional[Iterable[Dict[str, Any]]] = None) -> None:
+        """Reconstruit entièrement l'index.
+
+        Args:
+            tasks: Contenu du stockage (chargé via le backend si omis).
+        """
+        if tasks is None:
+            tasks = self.backend.load()
+        pairs = [(o, t["id"]) for t in tasks for o in (due_ordinal(t),) if o]
+        self._write(pairs)
+
+    def _write(self, pairs: List[Tuple[int, int]]) -> None:
+        """Écrit le fichier principal à partir de paires ``(ordinal, id)`` et vide le delta.
+
+        Args:
+            pairs: Entrées de l'index, dans un ordre quelconque.
+        """
+        pairs.sort()
+        ordinals = array("q", (o for o, _ in pairs))
+        ids = array("q", (i for _, i in pairs))
+        header = _DUE_HEADER.pack(_DUE_MAGIC, *self.backend.version(), len(pairs))
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(header)
+            ordinals.tofile(f)
+            ids.tofile(f)
+        os.replace(tmp_path, self.path)
+        try:
+            os.remove(self.delta_path)
+        except FileNotFoundError:
+            pass
+
+    def _fold(self) -> None:
+        """Replie le delta dans le fichier principal (sans relire le stockage)."""
+        delta = self._read_delta()
+        base = self._read_base()
+        pairs = [(o, i) for o, i in base if i not in delta]
+        pairs += [(o, i) for i, o in delta.items() if o]
+        self._write(pairs)
+
+    def _stamp(self) -> None:
+        """Réécrit la signature du stockage dans l'en-tête."""
+        with open(self.path, "r+b") as f:
+            header = _DUE_HEADER.unpack(f.read(_DUE_HEADER.size))
+            f.seek(0)
+            f.write(_DUE_HEADER.pack(_DUE_MAGIC, *self.backend.version(), header[5]))
+
+    # ---------- Lecture ----------
+    def _read_header(self) -> Optional[tuple]:
+        """Lit l'en-tête du fichier principal.
+
+        Returns:
+            Le tuple décodé, ou None si l'index est absent ou invalide.
+        """
+        try:
+            with open(self.path, "rb") as f:
+                header = _DUE_HEADER.unpack(f.read(_DUE_HEADER.size))
+        except (OSError, struct.error):
+            return None
+        return header if header[0] == _DUE_MAGIC else None
+
+    def _read_delta(self) -> Dict[int, int]:
+        """Charge le delta (la dernière valeur par ID l'emporte).
+
+        Returns:
+            Un dictionnaire ``id -> ordinal`` (0 pour une tâche retirée).
+        """
+        try:
+            with open(self.delta_path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return {}
+        usable = len(data) - len(data) % _DELTA_ENTRY.size
+        return dict(_DELTA_ENTRY.iter_unpack(data[:usable]))
+
+    def _read_base(self) -> List[Tuple[int, int]]:
+        """Charge toutes les paires ``(ordinal, id)`` du fichier principal.
+
+        Returns:
+            Les entrées triées.
+        """
+        return self._scan(1, sys.maxsize)
+
+    def _scan(self, low: int, high: int) -> List[Tuple[int, int]]:
+        """Retourne les paires du fichier principal dont l'ordinal est dans ``[low, high]``.
+
+        Args:
+            low: Ordinal minimal (inclus).
+            high: Ordinal maximal (inclus).
+
+        Returns:
+            Les paires ``(ordinal, id)`` triées.
+        """
+        with open(self.path, "rb") as f:
+            count = _DUE_HEADER.unpack(f.read(_DUE_HEADER.size))[5]
+            if count == 0:
+                return []
+            start = _DUE_HEADER.size
+            middle = start + 8 * count
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped, \
+                    memoryview(mapped) as view, \
+                    view[start:middle].cast("q") as ordinals, \
+                    view[middle:middle + 8 * count].cast("q") as ids:
+                first = bisect_left(ordinals, low)
+                last = bisect_right(ordinals, high)
+                pairs = list(zip(ordinals[first:last].tolist(), ids[first:last].tolist()))
+        return pairs
+
+    def lookup(self, low: int, high: int) -> List[int]:
+        """Retourne les IDs dont l'échéance est dans ``[low, high]``.
+
+        L'index est reconstruit au préalable s'il est absent ou périmé. Si
+        c'est impossible (stockage en lecture seule), les tâches sont
+        parcourues sans index.
+
+        Args:
+            low: Ordinal minimal (inclus).
+            high: Ordinal maximal (inclus).
+
+        Returns:
+            Les IDs correspondants, triés par échéance puis par ID.
+        """
+        if not self.is_fresh():
+            try:
+                with self.backend.lock():  # pas de reconstruction concurrente
+                    if not self.is_fresh():
+                        self.rebuild()
+            except OSError:
+                pairs = [(o, t["id"]) for t in self.backend.iter_tasks()
+                         for o in (due_ordinal(t),) if o and low <= o <= high]
+                return [i for _, i in sorted(pairs)]
+        delta = self._read_delta()
+        pairs = [(o, i) for o, i in self._scan(low, high) if i not in delta]
+        pairs += [(o, i) for i, o in delta.items() if o and low <= o <= high]
+        pairs.sort()
+        return [i for _, i in pairs]
+
+    def range_count(self, field: str, low: Optional[int],  # pylint: disable=unused-argument
+                    high: Optional[int]) -> int:
+        """Compte les tâches dont l'échéance est dans ``[low, high]``.
+
+        Args:
+            field: ``"due"``.
+            low: Ordinal minimal inclus (None = aucun).
+            high: Ordinal maximal inclus (None = aucun).
+
+        Returns:
+            Le nombre exact de tâches de la plage.
+        """
+        return len(self.lookup(1 if low is None else low, sys.maxsize if high is None else high))
+
+    def iter_range(self, field: str, low: Optional[int],  # pylint: disable=unused-argument
+                   high: Optional[int]) -> Iterator[Dict[str, Any]]:
+        """Lit les tâches de la plage, par échéance puis par ID.
+
+        Args:
+            field: ``"due"``.
+            low: Ordinal minimal inclus (None = aucun).
+            high: Ordinal maximal inclus (None = aucun).
+
+        Returns:
+            Un itérateur sur les tâches de la plage.
+        """
+        ids = self.lookup(1 if low is None else low, sys.maxsize if high is None else high)
+        return self.backend.iter_many(ids)
+
+
+# ---------- Recherche plein texte ----------
+class JsonIndex:
+    """Index JSON à côté du stockage, signé par :meth:`storage.Backend.version`.
+
+    Le fichier ``<path><suffix>`` contient ``{"version": [...], field:
+    contenu}`` et il est réécrit en entier à chaque écriture. Les classes
+    dérivées fixent :attr:`suffix` et :attr:`field`, calculent le contenu
+    par :meth:`compute` et le tiennent à jour dans ``apply``.
+
+    Args:
+        backend: Stockage indexé (doit exposer ``path``, ``version()``,
+            ``iter_tasks()`` et ``lock()``).
+    """
+
+    suffix = ""
+    field = ""
+
+    def __init__(self, backend: Any) -> None:
+        self.backend = backend
+        self.path = backend.path + self.suffix
+
+    def _read(self) -> Optional[Dict[str, Any]]:
+        """Charge le fichier de l'index, ou None s'il est absent ou illisible."""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return data if isinstance(data, dict) and self.field in data else None
+
+    def _write(self, content: Any) -> None:
+        """Écrit l'index avec la signature courante du stockage."""
+        data = {"version": list(self.backend.version()), self.field: content}
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.path)
+
+    def _fresh(self, data: Optional[Dict[str, Any]]) -> bool:
+        """Indique si *data* (lu par :meth:`_read`) correspond au stockage."""
+        return data is not None and tuple(data["version"]) == self.backend.version()
+
+    def is_fresh(self) -> bool:
+        """Indique si l'index correspond à l'état actuel du stockage."""
+        return self._fresh(self._read())
+
+    def reset(self, tasks: List[Dict[str, Any]]) -> None:
+        """Reconstruit un index existant après une réécriture complète.
+
+        Args:
+            tasks: Contenu complet du stockage.
+        """
+        if os.path.exists(self.path):
+            self.rebuild(tasks)
+
+    def compute(self, tasks: Iterable[Dict[str, Any]]) -> Any:
+        """Calcule le contenu de l'index à partir des tâches (à définir)."""
+        raise NotImplementedError
+
+    def rebuild(self, tasks: Optional[Iterable[Dict[str, Any]]] = None) -> Any:
+        """Reconstruit l'index en parcourant le stockage.
+
+        Args:
+            tasks: Contenu du stockage (lu via le backend si omis).
+
+        Returns:
+            Le contenu écrit.
+        """
+        content = self.compute(self.backend.iter_tasks() if tasks is None else tasks)
+        self._write(content)
+        return content
+
+    def current(self) -> Any:
+        """Retourne le contenu, reconstruit au préalable s'il est absent ou périmé.
+
+        Si la reconstruction est impossible (stockage en lecture seule), le
+        contenu est calculé par un parcours, sans être écrit.
+
+        Returns:
+            Le contenu de l'index.
+        """
+        data = self._read()
+        if self._fresh(data):
+            return data[self.field]  # type: ignore[index]
+        try:
+            with self.backend.lock():  # pas de reconstruction concurrente
+                data = self._read()
+                return data[self.field] if self._fresh(data) else self.rebuild()  # type: ignore[index]
+        except OSError:
+            return self.compute(self.backend.iter_tasks())
+
+
+def fold(text: str) -> str:
+    """Normalise un texte pour les comparaisons : minuscules, sans accents.
+
+    Args:
+        text: Texte libre.
+
+    Returns:
+        Le texte replié (``"Œuvre Réunie"`` donne ``"oeuvre reunie"``).
+    """
+    if not text.isascii():
+        text = _MARKS.sub("", unicodedata.normalize("NFKD", text.translate(_LIGATURES)))
+    return text.casefold()
+
+
+def tokenize(text: str) -> List[str]:
+    """Découpe un texte en mots normalisés (minuscules, sans accents).
+
+    Args:
+        text: Texte libre.
+
+    Returns:
+        Les mots, dans l'ordre du texte (``"Réunion d'équipe"`` donne
+        ``["reunion", "d", "equipe"]``).
+    """
+    return _WORD.findall(fold(text))
+
+
+def task_terms(task: Dict[str, Any]) -> Set[str]:
+    """Retourne les mots indexés d'une tâche (titre et description).
+
+    Args:
+        task: Dictionnaire représentant la tâche.
+
+    Returns:
+        L'ensemble des mots normalisés.
+    """
+    return set(tokenize(f"{task.get('title') or ''} {task.get('desc') or ''}"))
+
+
+def intersect(postings: Sequence[Sequence[int]]) -> List[int]:
+    """Intersecte des listes d'IDs triées.
+
+    Les listes sont parcourues de la plus courte à la plus longue ; chaque
+    candidat est recherché par dichotomie à partir de la dernière position
+    atteinte, si bien que le coût dépend surtout de la liste la plus courte.
+
+    Args:
+        postings: Listes d'IDs triées par ordre croissant (au moins une).
+
+    Returns:
+        Les IDs présents dans toutes les listes, triés.
+    """
+    ordered = sorted(postings, key=len)
+    result = list(ordered[0])
+    for other in ordered[1:]:
+        kept, low = [], 0
+        for task_id in result:
+            low = bisect_left(other, task_id, low)
+            if low == len(other):
+                break
+            if other[low] == task_id:
+                kept.append(task_id)
+        result = kept
+    return result
+
+
+class _Terms:
+    """Vue triée des mots du fichier principal, pour :func:`bisect.bisect_left`."""
+
+    def __init__(self, blob: memoryview, starts: memoryview) -> None:
+        self.blob = blob
+        self.starts = starts
+
+    def __len__(self) -> int:
+        return len(self.starts) - 1
+
+    def __getitem__(self, i: int) -> bytes:
+        return bytes(self.blob[self.starts[i]:self.starts[i + 1]])
+
+
+class SearchIndex:
+    """Index inversé ``mot -> IDs`` du titre et de la description des tâches.
+
+    Le fichier principal ``<path>.search`` contient les mots triés (en
+    UTF-8) et, pour chacun, la liste triée des IDs qui le contiennent ; il
+    est lu via :mod:`mmap` et une recherche ne décode que les listes des
+    mots demandés. Les écritures ajoutent à ``<path>.search.delta`` une
+    ligne JSON ``[id, [mots]]`` par tâche modifiée (liste vide pour une
+    suppression), qui remplace la tâche dans le fichier principal ; le
+    delta y est replié quand il grossit.
+
+    Args:
+        backend: Stockage indexé (doit exposer ``path``, ``version()``,
+            ``iter_tasks()`` et ``lock()``).
+    """
+
+    def __init__(self, backend: Any) -> None:
+        self.backend = backend
+        self.path = backend.path + SEARCH_SUFFIX
+        self.delta_path = backend.path + SEARCH_DELTA_SUFFIX
+
+    # ---------- Protocole observateur ----------
+    def is_fresh(self) -> bool:
+        """Indique si l'index correspond à l'état actuel du stockage.
+
+        Returns:
+            True si l'en-tête porte la signature courante du stockage.
+        """
+        header = self._read_header()
+        return header is not None and tuple(header[1:5]) == self.backend.version()
+
+    def apply(self, puts: List[Dict[str, Any]], deletes: List[int]) -> None:
+        """Reporte un lot d'écritures dans le delta.
+
+        Args:
+            puts: Tâches ajoutées ou modifiées.
+            deletes: IDs supprimés.
+        """
+        lines = [json.dumps([t["id"], sorted(task_terms(t))], ensure_ascii=False) for t in puts]
+        lines += [json.dumps([i, []]) for i in deletes]
+        with open(self.delta_path, "a+b") as f:
+            f.write("".join(line + "\n" for line in lines).encode("utf-8"))
+            f.seek(0)
+            delta_count = f.read().count(b"\n")
+        header = self._read_header()
+        documents = header[8] if header else 0
+        if delta_count > max(DELTA_MIN_FOLD, documents // 8):
+            self._fold()
+        else:
+            self._stamp()
+
+    def reset(self, tasks: List[Dict[str, Any]]) -> None:
+        """Reconstruit un index existant après une réécriture complète.
+
+        Args:
+            tasks: Contenu complet du stockage.
+        """
+        if os.path.exists(self.path):
+            self.rebuild(tasks)
+
+    # ---------- Construction ----------
+    def rebuild(self, tasks: Optional[Iterable[Dict[str, Any]]] = None) -> None:
+        """Reconstruit entièrement l'index.
+
+        Args:
+            tasks: Contenu du stockage (parcouru via le backend si omis).
+        """
+        if tasks is None:
+            tasks = self.backend.iter_tasks()
+        self._write({t["id"]: task_terms(t) for t in tasks})
+
+    def _write(self, documents: Dict[int, Iterable[str]]) -> None:
+        """Écrit le fichier principal à partir des mots de chaque tâche et vide le delta.
+
+        Args:
+            documents: Mots indexés, par ID de tâche.
+        """
+        postings: Dict[bytes, List[int]] = {}
+        for task_id in sorted(documents):
+            for term in documents[task_id]:
+                postings.setdefault(term.encode("utf-8"), []).append(task_id)
+        terms = sorted(postings)
+        term_starts, posting_starts, ids = array("q", [0]), array("q", [0]), array("q")
+        for term in terms:
+            term_starts.append(term_starts[-1] + len(term))
+            ids.extend(postings[term])
+            posting_starts.append(len(ids))
+        blob = b"".join(terms)
+        header = _SEARCH_HEADER.pack(_SEARCH_MAGIC, *self.backend.version(), len(terms),
+                                     len(ids), len(blob), len(documents))
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(header)
+            term_starts.tofile(f)
+            posting_starts.tofile(f)
+            ids.tofile(f)
+            f.write(blob)
+        os.replace(tmp_path, self.path)
+        try:
+            os.remove(self.delta_path)
+        except FileNotFoundError:
+            pass
+
+    def _fold(self) -> None:
+        """Replie le delta dans le fichier principal (sans relire le stockage)."""
+        documents: Dict[int, List[str]] = {}
+        with self._mapped() as (terms, starts, ids):
+            for i in range(len(terms)):
+                term = terms[i].decode("utf-8")
+                for task_id in ids[starts[i]:starts[i + 1]].tolist():
+                    documents.setdefault(task_id, []).append(term)
+        for task_id, words in self._read_delta().items():
+            if words:
+                documents[task_id] = words
+            else:
+                documents.pop(task_id, None)
+        self._write(documents)
+
+    def _stamp(self) -> None:
+        """Réécrit la signature du stockage dans l'en-tête."""
+        with open(self.path, "r+b") as f:
+            header = _SEARCH_HEADER.unpack(f.read(_SEARCH_HEADER.size))
+            f.seek(0)
+            f.write(_SEARCH_HEADER.pack(_SEARCH_MAGIC, *self.backend.version(), *header[5:]))
+
+    # ---------- Lecture ----------
+    def _read_header(self) -> Optional[tuple]:
+        """Lit l'en-tête du fichier principal.
+
+        Returns:
+            Le tuple décodé, ou None si l'index est absent ou invalide.
+        """
+        try:
+            with open(self.path, "rb") as f:
+                header = _SEARCH_HEADER.unpack(f.read(_SEARCH_HEADER.size))
+        except (OSError, struct.error):
+            return None
+        return header if header[0] == _SEARCH_MAGIC else None
+
+    def _read_delta(self) -> Dict[int, List[str]]:
+        """Charge le delta (la dernière ligne par ID l'emporte).
+
+        Returns:
+            Un dictionnaire ``id -> mots`` (liste vide pour une tâche retirée).
+        """
+        try:
+            with open(self.delta_path, encoding="utf-8") as f:
+                lines = f.read().splitlines()
+        except FileNotFoundError:
+            return {}
+        delta = {}
+        for line in lines:
+            try:
+                task_id, words = json.loads(line)
+            except ValueError:
+                continue  # ligne tronquée par une écriture interrompue
+            delta[task_id] = words
+        return delta
+
+    @contextlib.contextmanager
+    def _mapped(self) -> Iterator[Tuple[_Terms, memoryview, memoryview]]:
+        """Projette le fichier principal en mémoire.
+
+        Yields:
+            ``(mots, débuts des listes, IDs)`` : les mots triés, l'indice du
+            début de la liste de chaque mot (plus la fin) et les listes mises
+            bout à bout.
+        """
+        with open(self.path, "rb") as f:
+            header = _SEARCH_HEADER.unpack(f.read(_SEARCH_HEADER.size))
+            count, postings, size = header[5:8]
+            if count == 0:
+                yield _Terms(memoryview(b""), memoryview(array("q", [0]))), \
+                    memoryview(array("q", [0])), memoryview(array("q"))
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped, \
+                    memoryview(mapped) as view:
+                pos = _SEARCH_HEADER.size
+                term_starts = view[pos:pos + 8 * (count + 1)].cast("q")
+                pos += 8 * (count + 1)
+                posting_starts = view[pos:pos + 8 * (count + 1)].cast("q")
+                pos += 8 * (count + 1)
+                ids = view[pos:pos + 8 * postings].cast("q")
+                pos += 8 * postings
+                blob = view[pos:pos + size]
+                try:
+                    yield _Terms(blob, term_starts), posting_starts, ids
+                finally:
+                    for part in (term_starts, posting_starts, ids, blob):
+                        part.release()
+
+    def lookup(self, terms: Iterable[str]) -> List[int]:
+        """Retourne les IDs des tâches qui contiennent tous les mots *terms*.
+
+        L'index est reconstruit au préalable s'il est absent ou périmé ;
+        s'il ne peut pas l'être (stockage en lecture seule), les tâches sont
+        parcourues et comparées une à une.
+
+        Args:
+            terms: Mots normalisés (voir :func:`tokenize`), au moins un.
+
+        Returns:
+            Les IDs correspondants, triés.
+        """
+        if not self.is_fresh():
+            try:
+                with self.backend.lock():  # pas de reconstruction concurrente
+                    if not self.is_fresh():
+                        self.rebuild()
+            except OSError:
+                wanted = set(terms)
+                return sorted(t["id"] for t in self.backend.iter_tasks()
+                              if wanted <= task_terms(t))
+        delta = self._read_delta()
+        postings = []
+        with self._mapped() as (words, starts, ids):
+            for term in dict.fromkeys(terms):
+                key = term.encode("utf-8")
+                i = bisect_left(words, key)
+                found = ids[starts[i]:starts[i + 1]].tolist() if i < len(words) \
+                    and words[i] == key else []
+                found = [t for t in found if t not in delta]
+                found += [t for t, w in delta.items() if term in w]
+                if not found:
+                    return []
+                postings.append(sorted(found))
+        return intersect(postings) if postings else []
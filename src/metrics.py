@@ -0,0 +1,178 @@
+"""Mesure du temps passé dans chaque phase d'une commande.
+
+Les phases (``load``, ``validate``, ``filter``, ``sort``, ``render``,
+``save``…) sont délimitées par :func:`span` ; les étapes paresseuses
+(itérateurs consommés plus loin) sont mesurées par :func:`timed`, qui ne
+compte que le temps passé à produire chaque élément. Les phases peuvent
+s'imbriquer : chacune ne se voit attribuer que son temps propre (le temps
+de ses sous-phases en est retiré), si bien que les durées s'additionnent.
+
+Hors de :func:`recording`, :func:`span` et :func:`timed` ne mesurent rien
+et ne coûtent qu'un test.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+_NULL = contextlib.nullcontext()
+
+
+class _Span:
+    """Phase en cours de mesure (voir :meth:`Recorder.span`)."""
+
+    __slots__ = ("recorder", "name", "start", "child")
+
+    def __init__(self, recorder: "Recorder", name: str) -> None:
+        self.recorder = recorder
+        self.name = name
+        self.start = 0.0
+        self.child = 0.0
+
+    def __enter__(self) -> "_Span":
+        self.recorder.stack.append(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        elapsed = time.perf_counter() - self.start
+        recorder = self.recorder
+        recorder.stack.pop()
+        if recorder.stack:
+            recorder.stack[-1].child += elapsed
+        recorder.totals[self.name] = recorder.totals.get(self.name, 0.0) + elapsed - self.child
+        recorder.calls[self.name] = recorder.calls.get(self.name, 0) + 1
+
+
+class Recorder:
+    """Cumule le temps propre et le nombre d'appels de chaque phase.
+
+    Attributes:
+        totals: Temps propre cumulé par phase (secondes).
+        calls: Nombre de passages par phase.
+        elapsed: Durée totale de l'enregistrement (secondes).
+    """
+
+    def __init__(self) -> None:
+        self.totals: Dict[str, float] = {}
+        self.calls: Dict[str, int] = {}
+        self.stack: List[_Span] = []
+        self.elapsed = 0.0
+
+    def span(self, name: str) -> _Span:
+        """Retourne le gestionnaire de contexte qui mesure la phase *name*."""
+        return _Span(self, name)
+
+    def other(self) -> float:
+        """Temps non attribué à une phase (analyse des arguments, etc.)."""
+        return max(self.elapsed - sum(self.totals.values()), 0.0)
+
+    def report(self) -> str:
+        """Formate la répartition du temps, phases les plus coûteuses en tête.
+
+        Returns:
+            Le tableau, une phase par ligne.
+        """
+        total = self.elapsed or 1e-12
+        lines = [f"Profil : {self.elapsed * 1000:.1f} ms au total"]
+        rows = sorted(self.totals.items(), key=lambda item: -item[1])
+        rows.append(("(autre)", self.other()))
+        for name, seconds in rows:
+            calls = self.calls.get(name)
+            suffix = f"  {calls} appel(s)" if calls else ""
+            share = 100 * seconds / total
+            lines.append(f"  {name:<10} {seconds * 1000:>9.1f} ms {share:>5.1f} %{suffix}")
+        return "\n".join(lines)
+
+    def as_record(self, **fields: Any) -> Dict[str, Any]:
+        """Retourne les mesures sous forme d'enregistrement JSON.
+
+        Args:
+            **fields: Champs ajoutés en tête (commande, etc.).
+
+        Returns:
+            ``{"ts", **fields, "total_ms", "spans": {phase: {"ms", "calls"}}}``.
+        """
+        return {
+            "ts": datetime.now().isoformat(timespec="milliseconds"),
+            **fields,
+            "total_ms": round(self.elapsed * 1000, 3),
+            "spans": {name: {"ms": round(seconds * 1000, 3), "calls": self.calls[name]}
+                      for name, seconds in self.totals.items()},
+        }
+
+
+_active: Optional[Recorder] = None
+
+
+def span(name: str) -> Any:
+    """Mesure la phase *name* si un enregistrement est en cours.
+
+    Args:
+        name: Nom de la phase.
+
+    Returns:
+        Un gestionnaire de contexte (sans effet hors enregistrement).
+    """
+    return _active.span(name) if _active is not None else _NULL
+
+
+def timed(name: str, iterable: Iterable[T]) -> Iterable[T]:
+    """Attribue à la phase *name* le temps passé à produire chaque élément.
+
+    Args:
+        name: Nom de la phase.
+        iterable: Itérable consommé en flux.
+
+    Returns:
+        *iterable* tel quel hors enregistrement, sinon un itérateur mesuré.
+    """
+    if _active is None:
+        return iterable
+    return _timed(_active, name, iter(iterable))
+
+
+def _timed(recorder: Recorder, name: str, iterator: Iterator[T]) -> Iterator[T]:
+    """Générateur de :func:`timed`."""
+    while True:
+        with recorder.span(name):
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+        yield item
+
+
+@contextlib.contextmanager
+def recording() -> Iterator[Recorder]:
+    """Active la mesure des phases le temps du bloc.
+
+    Yields:
+        Le :class:`Recorder` qui reçoit les mesures.
+    """
+    global _active  # pylint: disable=global-statement
+    previous, recorder = _active, Recorder()
+    _active = recorder
+    start = time.perf_counter()
+    try:
+        yield recorder
+    finally:
+        recorder.elapsed = time.perf_counter() - start
+        _active = previous
+
+
+def append_jsonl(path: str, record: Dict[str, Any]) -> None:
+    """Ajoute un enregistrement de mesures à un fichier JSON lines.
+
+    Args:
+        path: Fichier de destination (créé au besoin).
+        record: Enregistrement à écrire.
+    """
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(record, ensure_ascii=False) + "\n")
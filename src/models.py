@@ -0,0 +1,179 @@
+"""Représentations compactes des tâches en mémoire.
+
+Les stockages échangent des dictionnaires (le format JSON). Pour garder
+beaucoup de tâches en mémoire, ou pour filtrer et trier un grand nombre
+d'entre elles, ce module propose deux représentations construites une
+seule fois au chargement :
+
+- :class:`Task` : un enregistrement à ``__slots__`` (pas de ``__dict__``
+  par instance) qui porte en plus l'ordinal de son échéance, calculé une
+  fois pour toutes ;
+- :class:`TaskTable` : une table en colonnes (:class:`array.array`) des
+  seuls champs utiles aux filtres et aux tris : ID, priorité et ordinal
+  d'échéance, soit quelques octets par tâche.
+"""
+
+from __future__ import annotations
+
+from array import array
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from indexes import date_ordinal
+
+# Champs connus, dans l'ordre de sérialisation de ``add``.
+FIELDS = ("id", "title", "desc", "priority", "due", "created")
+# Valeur de tri d'une échéance absente ou mal formée (classée en dernier).
+NO_DUE = 1 << 62
+# Bornes de la colonne des priorités (``array("b")``).
+_PRIORITY_MIN, _PRIORITY_MAX = -128, 127
+
+
+class _Missing:
+    """Marque un champ absent du dictionnaire d'origine."""
+
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        return "MISSING"
+
+
+MISSING: Any = _Missing()
+
+
+class Task:
+    """Tâche en mémoire, sans dictionnaire d'attributs par instance.
+
+    La conversion dictionnaire → :class:`Task` → dictionnaire est exacte :
+    les champs absents restent absents et les champs inconnus sont conservés
+    dans ``extra``.
+
+    Attributes:
+        id: Identifiant de la tâche.
+        title: Titre.
+        desc: Description.
+        priority: Priorité (1 = haute, 5 = basse).
+        due: Échéance ``YYYY-MM-DD`` telle que saisie.
+        created: Horodatage de création (ISO 8601).
+        due_ord: Ordinal de ``due`` (0 si absente ou mal formée).
+        extra: Champs supplémentaires, ou None.
+    """
+
+    __slots__ = ("id", "title", "desc", "priority", "due", "created", "due_ord", "extra")
+
+    def __init__(self, id: int, title: Any = MISSING,  # pylint: disable=redefined-builtin
+                 desc: Any = MISSING, priority: Any = MISSING, due: Any = MISSING,
+                 created: Any = MISSING, extra: Optional[Dict[str, Any]] = None) -> None:
+        self.id = id
+        self.title = title
+        self.desc = desc
+        self.priority = priority
+        self.due = due
+        self.created = created
+        self.due_ord = date_ordinal(due)
+        self.extra = extra
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Task":
+        """Construit une tâche à partir de son dictionnaire.
+
+        Args:
+            data: Dictionnaire de la tâche (clé ``id`` obligatoire).
+
+        Returns:
+            L'enregistrement correspondant.
+        """
+        extra = {k: v for k, v in data.items() if k not in FIELDS} or None
+        return cls(data["id"], data.get("title", MISSING), data.get("desc", MISSING),
+                   data.get("priority", MISSING), data.get("due", MISSING),
+                   data.get("created", MISSING), extra)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Retourne le dictionnaire de la tâche (nouvel objet à chaque appel).
+
+        Returns:
+            Les champs présents, dans l'ordre de :data:`FIELDS`, puis ``extra``.
+        """
+        data = {"id": self.id}
+        for name in FIELDS[1:]:
+            value = getattr(self, name)
+            if value is not MISSING:
+                data[name] = value
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    @property
+    def rank(self) -> int:
+        """Priorité numérique utilisée par le tri (5 si absente)."""
+        return 5 if self.priority is MISSING else int(self.priority)
+
+    @property
+    def due_key(self) -> int:
+        """Valeur de tri par échéance (les dates invalides en dernier)."""
+        return self.due_ord or NO_DUE
+
+    def __repr__(self) -> str:
+        return f"Task({self.to_dict()!r})"
+
+
+class TaskTable:
+    """Table en colonnes des champs de filtre et de tri.
+
+    Chaque ligne occupe 8 octets d'ID, 1 octet de priorité et 4 octets
+    d'ordinal d'échéance ; les autres champs ne sont pas conservés. Les
+    tris portent directement sur ces valeurs natives, et
+    :func:`storage.encode_binary` en reprend les colonnes telles quelles.
+    """
+
+    def __init__(self) -> None:
+        self.ids = array("q")
+        self.priorities = array("b")
+        self.dues = array("i")
+
+    @classmethod
+    def from_tasks(cls, tasks: Iterable[Dict[str, Any]]) -> "TaskTable":
+        """Construit la table en une passe sur *tasks* (qui peut être un flux).
+
+        Args:
+            tasks: Dictionnaires des tâches.
+
+        Returns:
+            La table remplie.
+        """
+        table = cls()
+        add_id, add_priority, add_due = (table.ids.append, table.priorities.append,
+                                         table.dues.append)
+        for task in tasks:
+            add_id(task["id"])
+            priority = int(task.get("priority", 5))
+            if not _PRIORITY_MIN <= priority <= _PRIORITY_MAX:
+                priority = min(max(priority, _PRIORITY_MIN), _PRIORITY_MAX)
+            add_priority(priority)
+            add_due(date_ordinal(task.get("due")))
+        return table
+
+    def sort_key(self, sort: str) -> Callable[[int], int]:
+        """Retourne la clé de tri d'une ligne.
+
+        Args:
+            sort: ``"priority"`` ou ``"date"``.
+
+        Returns:
+            La fonction ``ligne -> valeur de tri``.
+        """
+        if sort == "priority":
+            return self.priorities.__getitem__
+        dues = self.dues
+        return lambda r: dues[r] or NO_DUE
+
+    def ordered_ids(self, sort: str) -> List[int]:
+        """Retourne les IDs triés (tri stable).
+
+        Args:
+            sort: ``"priority"`` ou ``"date"``.
+
+        Returns:
+            Les IDs dans l'ordre d'affichage.
+        """
+        ids = self.ids
+        return [ids[r] for r in sorted(range(len(ids)), key=self.sort_key(sort))]
@@ -0,0 +1,199 @@
+"""Lecture parallèle d'un instantané en lignes (``list --jobs N``).
+
+L'instantané du mode journal contient une tâche par ligne
+(:func:`storage.dump_lines`). Il est découpé en plages d'octets alignées
+sur les fins de ligne ; chaque plage est décodée, filtrée et triée par un
+processus d'un pool (:func:`scan_chunk`), qui ne renvoie que sa *série*
+triée (ses ``offset + limit`` meilleures tâches si la page est bornée).
+Les séries, plus celle des tâches réécrites dans le journal, sont ensuite
+fusionnées (fusion à k voies, :func:`heapq.merge`).
+
+L'ordre est exactement celui du chemin séquentiel : la clé de tri de
+``list`` complétée par l'ID, puisque les ex aequo y sont départagés par ID
+croissant. :mod:`concurrent.futures` n'est importé que si ``--jobs`` est
+demandé.
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import json
+import os
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from indexes import due_ordinal
+from models import NO_DUE
+from storage import JournalBackend
+
+# En dessous de cette taille d'instantané, le pool coûte plus qu'il ne rapporte.
+PARALLEL_MIN_BYTES = 4 << 20
+# Plages par processus : des plages plus petites équilibrent mieux la charge.
+CHUNKS_PER_JOB = 4
+# Nombre de relectures si le stockage change pendant la lecture (ensuite : sous verrou).
+READ_RETRIES = 2
+
+Bounds = Optional[Tuple[int, int]]
+
+
+def available_cpus() -> int:
+    """Nombre de processeurs utilisables par ce processus (au moins 1)."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0)) or 1
+    return os.cpu_count() or 1
+
+
+def rank_key(sort: str) -> Callable[[Dict[str, Any]], Tuple[int, int]]:
+    """Retourne la clé d'ordre total de ``list --sort`` (clé de tri, puis ID).
+
+    Args:
+        sort: ``"priority"`` ou ``"date"``.
+
+    Returns:
+        La fonction clé.
+    """
+    if sort == "priority":
+        return lambda t: (int(t.get("priority", 5)), t["id"])
+    return lambda t: (due_ordinal(t) or NO_DUE, t["id"])
+
+
+def chunk_ranges(path: str, count: int) -> List[Tuple[int, int]]:
+    """Découpe un fichier en au plus *count* plages alignées sur les lignes.
+
+    Args:
+        path: Fichier à découper.
+        count: Nombre de plages souhaité.
+
+    Returns:
+        Les plages ``(début, fin)`` en octets, contiguës et non vides.
+    """
+    size = os.path.getsize(path)
+    step = max(1, -(-size // max(1, count)))
+    bounds = [0]
+    with open(path, "rb") as f:
+        while bounds[-1] + step < size:
+            f.seek(bounds[-1] + step)
+            f.readline()
+            bounds.append(min(f.tell(), size))
+    if bounds[-1] < size:
+        bounds.append(size)
+    return list(zip(bounds, bounds[1:]))
+
+
+def select(tasks: Iterable[Dict[str, Any]], bounds: Bounds, sort: str,
+           keep: Optional[int]) -> List[Dict[str, Any]]:
+    """Filtre par plage d'échéances puis trie (ou garde les *keep* premières).
+
+    Args:
+        tasks: Tâches candidates.
+        bounds: Plage ``(min, max)`` d'ordinaux, ou None.
+        sort: ``"priority"`` ou ``"date"``.
+        keep: Nombre de tâches à garder (None = toutes).
+
+    Returns:
+        La série triée.
+    """
+    if bounds is not None:
+        low, high = bounds
+        tasks = [t for t in tasks if low <= due_ordinal(t) <= high]
+    key = rank_key(sort)
+    if keep is None:
+        return sorted(tasks, key=key)
+    return heapq.nsmallest(keep, tasks, key=key)
+
+
+def scan_chunk(path: str, start: int, end: int, bounds: Bounds, sort: str,
+               keep: Optional[int], skip: FrozenSet[int]) -> List[Dict[str, Any]]:
+    """Décode, filtre et trie les tâches d'une plage de l'instantané.
+
+    Exécutée dans un processus du pool : les arguments et le résultat
+    doivent pouvoir être sérialisés par :mod:`pickle`.
+
+    Args:
+        path: Instantané (une tâche par ligne).
+        start: Début de la plage (début de ligne).
+        end: Fin de la plage (après une fin de ligne).
+        bounds: Plage d'ordinaux d'échéance, ou None.
+        sort: ``"priority"`` ou ``"date"``.
+        keep: Nombre de tâches à garder (None = toutes).
+        skip: IDs réécrits ou supprimés par le journal, à ignorer.
+
+    Returns:
+        La série triée de la plage.
+    """
+    with open(path, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start)
+    lines = [line.rstrip(b"\r,") for line in data.split(b"\n")]
+    records = [line for line in lines if line.startswith(b"{")]
+    tasks = json.loads(b"[" + b",".join(records) + b"]")
+    if skip:
+        tasks = [t for t in tasks if t["id"] not in skip]
+    return select(tasks, bounds, sort, keep)
+
+
+def _runs(backend: JournalBackend, bounds: Bounds, sort: str, keep: Optional[int],
+          jobs: int) -> List[List[Dict[str, Any]]]:
+    """Calcule les séries triées de l'instantané et du journal."""
+    puts, deletes, _ = backend.read_journal(0)
+    latest = {t["id"]: t for t in puts}
+    skip = frozenset(latest) | frozenset(deletes)
+    for task_id in deletes:
+        latest.pop(task_id, None)
+    runs = [select(latest.values(), bounds, sort, keep)]
+    if not os.path.exists(backend.path):
+        return runs
+    chunks = chunk_ranges(backend.path, jobs * CHUNKS_PER_JOB)
+    args = [(backend.path, start, end, bounds, sort, keep, skip) for start, end in chunks]
+    if jobs == 1:
+        return runs + [scan_chunk(*a) for a in args]
+    from concurrent.futures import ProcessPoolExecutor  # pylint: disable=import-outside-toplevel
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        return runs + list(pool.map(scan_chunk, *zip(*args)))
+
+
+def parallel_page(backend: Any, bounds: Bounds, sort: str, limit: Optional[int] = None,
+                  offset: int = 0, jobs: int = 0) -> Optional[List[Dict[str, Any]]]:
+    """Retourne une page de tâches filtrées et triées, lue en parallèle.
+
+    Si le stockage change pendant la lecture (repli du journal par un
+    autre processus), la lecture est refaite, puis faite sous verrou.
+
+    Args:
+        backend: Stockage interrogé (mode journal).
+        bounds: Plage ``(min, max)`` d'ordinaux d'échéance, ou None.
+        sort: ``"priority"`` ou ``"date"``.
+        limit: Nombre maximal de tâches (None = toutes).
+        offset: Nombre de tâches à sauter.
+        jobs: Nombre de processus (0 = :func:`available_cpus`).
+
+    Returns:
+        Les tâches de la page, ou None si l'instantané est trop petit pour
+        que le pool soit rentable ou ne peut pas être mis en lignes
+        (stockage en lecture seule) : le chemin séquentiel s'applique alors.
+
+    Raises:
+        ValueError: Si le stockage n'est pas en lignes (mode journal).
+    """
+    if not isinstance(backend, JournalBackend):
+        raise ValueError("--jobs nécessite le stockage journal (--journal ou --store journal:)")
+    try:
+        if os.path.getsize(backend.path) < PARALLEL_MIN_BYTES:
+            return None
+        # Un instantané historique (JSON indenté) est d'abord réécrit en lignes.
+        backend._ensure_index()  # pylint: disable=protected-access
+    except OSError:
+        return None
+    jobs = jobs or available_cpus()
+    keep = None if limit is None else offset + limit
+    for _ in range(READ_RETRIES):
+        version = backend.version()
+        runs = _runs(backend, bounds, sort, keep, jobs)
+        if backend.version() == version:
+            break
+    else:
+        with backend.lock():
+            runs = _runs(backend, bounds, sort, keep, jobs)
+    merged = heapq.merge(*runs, key=rank_key(sort))
+    return list(itertools.islice(merged, offset, None if keep is None else keep))
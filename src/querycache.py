@@ -0,0 +1,225 @@
+"""Cache sur disque des résultats de ``list``.
+
+Les tableaux de bord et les invites de shell relancent souvent la même
+requête (``list --sort priority --due-in 3``) entre deux écritures. Le
+texte affiché est conservé dans ``<stockage>.cache/``, un fichier par
+requête : le nom est l'empreinte SHA-1 des arguments normalisés et de la
+date du jour (les indicateurs « en retard » / « bientôt » en dépendent ;
+une expression ``--where`` peut contenir ``/`` ou être trop longue pour
+un nom de fichier), et la première ligne
+la signature du stockage (:meth:`storage.Backend.version`). Une entrée dont
+la signature ne correspond plus est un échec, puis est remplacée.
+
+Le cache est aussi un observateur du stockage : toute écriture le vide.
+Sa taille est bornée (:data:`CACHE_MAX_BYTES`) ; les entrées les moins
+récemment lues sont évincées en premier. Les compteurs de succès et
+d'échecs tiennent dans un enregistrement de taille fixe (:data:`COUNTERS`),
+réécrit en place sous un verrou ``fcntl`` : ils ne grossissent pas avec le
+nombre de lectures. Ce fichier n'est pas une entrée et ne compte donc pas
+dans la borne de taille ; il n'est jamais évincé.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import struct
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows : pas de verrou consultatif
+    fcntl = None  # type: ignore[assignment]
+
+CACHE_SUFFIX = ".cache"
+ENTRY_SUFFIX = ".txt"
+COUNTERS_FILE = "counters"
+# Enregistrement des compteurs : succès puis échecs, en entiers de 64 bits.
+COUNTERS = struct.Struct("<QQ")
+HITS, MISSES = 0, 1
+# Taille totale maximale des entrées, et taille maximale d'une entrée.
+CACHE_MAX_BYTES = 4 << 20
+CACHE_MAX_ENTRY = 256 << 10
+
+
+class QueryCache:
+    """Cache LRU borné des résultats de requêtes d'un stockage.
+
+    Args:
+        backend: Stockage dont les résultats sont mis en cache (doit
+            exposer ``path`` et ``version()``).
+    """
+
+    def __init__(self, backend: Any) -> None:
+        self.backend = backend
+        self.path = backend.path + CACHE_SUFFIX
+
+    # ---------- Protocole observateur ----------
+    def is_fresh(self) -> bool:
+        """Toujours vrai : le cache doit être vidé à chaque écriture."""
+        return True
+
+    def apply(self, puts: List[Dict[str, Any]], deletes: List[int]) -> None:  # pylint: disable=unused-argument
+        """Vide le cache après un lot d'écritures."""
+        self.clear()
+
+    def reset(self, tasks: List[Dict[str, Any]]) -> None:  # pylint: disable=unused-argument
+        """Vide le cache après une réécriture complète."""
+        self.clear()
+
+    # ---------- Entrées ----------
+    @staticmethod
+    def key(command: str, today: str, **params: Any) -> str:
+        """Construit la clé (et le nom de fichier) d'une requête.
+
+        Args:
+            command: Nom de la commande.
+            today: Date du jour (``YYYY-MM-DD``).
+            **params: Arguments de la requête, une fois normalisés.
+
+        Returns:
+            Une clé stable, indépendante de l'ordre des arguments : l'empreinte
+            SHA-1 (hexadécimale) de leur forme normalisée.
+        """
+        normalized = json.dumps([command, today, sorted(params.items())], ensure_ascii=False)
+        return hashlib.sha1(normalized.encode("utf-8")).hexdigest()
+
+    def signature(self) -> str:
+        """Signature courante du stockage, en tête de chaque entrée."""
+        return json.dumps(list(self.backend.version()))
+
+    def _entry_path(self, key: str) -> str:
+        """Retourne le fichier de l'entrée *key*."""
+        return os.path.join(self.path, key + ENTRY_SUFFIX)
+
+    def _read_counters(self, fd: int) -> Tuple[int, int]:
+        """Lit l'enregistrement des compteurs (zéros s'il est absent ou tronqué)."""
+        os.lseek(fd, 0, os.SEEK_SET)
+        data = os.read(fd, COUNTERS.size)
+        return COUNTERS.unpack(data) if len(data) == COUNTERS.size else (0, 0)
+
+    def _count(self, field: int) -> None:
+        """Incrémente un compteur (:data:`HITS` ou :data:`MISSES`), en place."""
+        os.makedirs(self.path, exist_ok=True)
+        fd = os.open(os.path.join(self.path, COUNTERS_FILE), os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX)  # relâché à la fermeture
+            counts = list(self._read_counters(fd))
+            counts[field] += 1
+            os.lseek(fd, 0, os.SEEK_SET)
+            os.write(fd, COUNTERS.pack(*counts))
+        finally:
+            os.close(fd)
+
+    def get(self, key: str) -> Optional[str]:
+        """Retourne le résultat mis en cache pour *key*, s'il est à jour.
+
+        Args:
+            key: Clé de la requête (voir :meth:`key`).
+
+        Returns:
+            Le texte affiché, ou None (échec compté).
+        """
+        path = self._entry_path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                signature = f.readline().rstrip("\n")
+                text = f.read()
+        except FileNotFoundError:
+            text = None
+        else:
+            if signature != self.signature():
+                text = None
+        if text is None:
+            self._count(MISSES)
+            return None
+        os.utime(path)  # plus récemment utilisée : évincée en dernier
+        self._count(HITS)
+        return text
+
+    def put(self, key: str, text: str, signature: Optional[str] = None) -> None:
+        """Enregistre le résultat d'une requête, puis évince au besoin.
+
+        Args:
+            key: Clé de la requête.
+            text: Texte affiché par la requête.
+            signature: Signature du stockage au moment de la lecture
+                (relue si omise).
+        """
+        content = ((signature or self.signature()) + "\n" + text).encode("utf-8")
+        if len(content) > CACHE_MAX_ENTRY:
+            return
+        os.makedirs(self.path, exist_ok=True)
+        path = self._entry_path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+        self._evict()
+
+    def _entries(self) -> List[os.DirEntry]:
+        """Liste les entrées du cache (sans les compteurs)."""
+        try:
+            with os.scandir(self.path) as it:
+                return [e for e in it if e.name.endswith(ENTRY_SUFFIX)]
+        except FileNotFoundError:
+            return []
+
+    def _evict(self) -> None:
+        """Supprime les entrées les moins récemment utilisées au-delà de :data:`CACHE_MAX_BYTES`."""
+        entries = [(e.stat().st_mtime_ns, e.stat().st_size, e.path) for e in self._entries()]
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= CACHE_MAX_BYTES:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def clear(self, counters: bool = False) -> int:
+        """Supprime toutes les entrées.
+
+        Args:
+            counters: Remettre aussi les compteurs à zéro.
+
+        Returns:
+            Le nombre d'entrées supprimées.
+        """
+        removed = 0
+        for entry in self._entries():
+            try:
+                os.remove(entry.path)
+                removed += 1
+            except FileNotFoundError:
+                pass
+        if counters:
+            try:
+                os.remove(os.path.join(self.path, COUNTERS_FILE))
+            except FileNotFoundError:
+                pass
+        return removed
+
+    def stats(self) -> Dict[str, int]:
+        """Retourne l'état du cache.
+
+        Returns:
+            ``{"hits", "misses", "entries", "bytes", "max_bytes"}`` ;
+            ``bytes`` ne compte que les entrées, comme :data:`CACHE_MAX_BYTES`.
+        """
+        try:
+            fd = os.open(os.path.join(self.path, COUNTERS_FILE), os.O_RDONLY)
+        except OSError:
+            hits, misses = 0, 0
+        else:
+            try:
+                hits, misses = self._read_counters(fd)
+            finally:
+                os.close(fd)
+        entries = self._entries()
+        return {"hits": hits, "misses": misses,
+                "entries": len(entries), "bytes": sum(e.stat().st_size for e in entries),
+                "max_bytes": CACHE_MAX_BYTES}
@@ -0,0 +1,267 @@
+"""Tâches récurrentes : règles de répétition et expansion paresseuse.
+
+Une tâche récurrente est stockée une seule fois, avec un champ ``repeat``
+(:func:`parse_rule`) ; son ``due`` est la date de sa première occurrence.
+Les occurrences suivantes ne sont jamais écrites : :func:`occurrences` les
+engendre à la demande, seulement dans la fenêtre d'échéances interrogée
+(``list --due-in N`` ou plage ``due`` bornée de ``--where``), en sautant
+directement à la première occurrence de la fenêtre. La taille du stockage
+et le coût d'une requête ne dépendent donc pas de l'horizon des
+répétitions.
+
+Comme pour :mod:`watcher`, une série n'est jamais en retard : seules ses
+occurrences d'aujourd'hui ou à venir sont listées, une occurrence manquée
+disparaît le lendemain, et une liste sans borne d'échéance montre chaque
+série une fois, à sa prochaine occurrence (:func:`next_occurrence`).
+
+:class:`RecurrenceIndex` est un observateur de :class:`storage.Backend`
+(comme les index de :mod:`indexes`) : il garde à côté du stockage la liste
+des tâches récurrentes et de leur première échéance, si bien qu'une requête
+trouve ses séries sans parcourir le stockage.
+"""
+
+from __future__ import annotations
+
+import re
+from datetime import date
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from indexes import JsonIndex, due_ordinal
+
+REPEAT_SUFFIX = ".repeat"
+# Règles nommées et leur pas en jours (None = même jour de chaque mois).
+RULES: Dict[str, Optional[int]] = {"daily": 1, "weekly": 7, "monthly": None}
+# Valeur de ``--repeat`` qui retire la récurrence d'une tâche.
+NO_RULE = "none"
+_EVERY = re.compile(r"(\d+)d")
+_LAST_MONTH = date.max.year * 12 + date.max.month - 1
+
+
+def parse_rule(text: str) -> str:
+    """Valide une règle de répétition et retourne sa forme normalisée.
+
+    Args:
+        text: ``daily``, ``weekly``, ``monthly``, ``Nd`` (tous les N jours)
+            ou ``none`` (pas de récurrence).
+
+    Returns:
+        La règle en minuscules (``7d`` devient ``weekly``), ou une chaîne
+        vide pour ``none``.
+
+    Raises:
+        ValueError: Si la règle est inconnue.
+    """
+    rule = text.strip().lower()
+    if rule == NO_RULE:
+        return ""
+    if rule in RULES:
+        return rule
+    match = _EVERY.fullmatch(rule)
+    if match is None or int(match.group(1)) < 1:
+        raise ValueError(f"Règle de répétition invalide : {text!r} "
+                         "(attendu daily, weekly, monthly, Nd ou none)")
+    days = int(match.group(1))
+    return next((name for name, step in RULES.items() if step == days), f"{days}d")
+
+
+def is_recurring(task: Dict[str, Any]) -> bool:
+    """Indique si la tâche porte une règle de répétition."""
+    return bool(task.get("repeat"))
+
+
+def _month_day(month: int, day: int) -> int:
+    """Ordinal du jour *day* du mois *month* (``année * 12 + mois - 1``), borné à sa fin."""
+    year, index = divmod(month, 12)
+    start = date(year, index + 1, 1).toordinal()
+    if month == _LAST_MONTH:
+        return min(start + day - 1, date.max.toordinal())
+    following = date(year + 1, 1, 1) if index == 11 else date(year, index + 2, 1)
+    return min(start + day - 1, following.toordinal() - 1)
+
+
+def occurrences(first: int, rule: str, low: int, high: int) -> Iterator[int]:
+    """Engendre les occurrences d'une série comprises dans ``[low, high]``.
+
+    Le générateur commence directement à la première occurrence ``>= low``
+    (sans parcourir les précédentes) et s'arrête après *high* : son coût ne
+    dépend que du nombre d'occurrences de la fenêtre.
+
+    Args:
+        first: Ordinal de la première occurrence (``due`` de la tâche).
+        rule: Règle normalisée (voir :func:`parse_rule`).
+        low: Ordinal minimal inclus.
+        high: Ordinal maximal inclus.
+
+    Yields:
+        Les ordinaux des occurrences, dans l'ordre chronologique.
+    """
+    low = max(low, first)
+    step = RULES[rule] if rule in RULES else int(rule[:-1])
+    if step:
+        current = first + -(-(low - first) // step) * step
+        while current <= high:
+            yield current
+            current += step
+        return
+    start = date.fromordinal(first)
+    anchor = start.year * 12 + start.month - 1
+    target = date.fromordinal(low)
+    month = max(anchor, target.year * 12 + target.month - 1)
+    while month <= _LAST_MONTH:
+        current = _month_day(month, start.day)
+        if current > high:
+            return
+        if current >= low:
+            yield current
+        month += 1
+
+
+def count_occurrences(first: int, rule: str, low: int, high: int) -> int:
+    """Compte les occurrences d'une série dans ``[low, high]`` sans les engendrer.
+
+    Args:
+        first: Ordinal de la première occurrence.
+        rule: Règle normalisée (voir :func:`parse_rule`).
+        low: Ordinal minimal inclus.
+        high: Ordinal maximal inclus.
+
+    Returns:
+        Le nombre d'occurrences (calcul direct pour un pas en jours, un
+        parcours des mois de la fenêtre pour ``monthly``).
+    """
+    low = max(low, first)
+    if low > high:
+        return 0
+    step = RULES[rule] if rule in RULES else int(rule[:-1])
+    if step:
+        return (high - first) // step - (low - 1 - first) // step
+    return sum(1 for _ in occurrences(first, rule, low, high))
+
+
+def expand(task: Dict[str, Any], low: int, high: int) -> Iterator[Dict[str, Any]]:
+    """Engendre les occurrences d'une tâche récurrente dans ``[low, high]``.
+
+    Args:
+        task: Tâche récurrente (``due`` = première occurrence).
+        low: Ordinal minimal inclus.
+        high: Ordinal maximal inclus.
+
+    Yields:
+        Une copie de la tâche par occurrence, ``due`` valant sa date.
+    """
+    first = due_ordinal(task)
+    if not first:
+        return
+    for ordinal in occurrences(first, task["repeat"], low, high):
+        yield dict(task, due=date.fromordinal(ordinal).isoformat())
+
+
+def next_occurrence(task: Dict[str, Any], today: int) -> int:
+    """Retourne l'échéance en cours d'une tâche, vue le jour *today*.
+
+    Pour une série, c'est sa prochaine occurrence (*today* compris) ; pour
+    une tâche simple, son ``due``.
+
+    Args:
+        task: Tâche.
+        today: Ordinal du jour.
+
+    Returns:
+        L'ordinal de l'échéance (0 si absente, invalide ou, pour une série,
+        sans occurrence à venir).
+    """
+    ordinal = due_ordinal(task)
+    if ordinal and is_recurring(task):
+        return next(occurrences(ordinal, task["repeat"], today, date.max.toordinal()), 0)
+    return ordinal
+
+
+def upcoming(task: Dict[str, Any], today: int) -> Dict[str, Any]:
+    """Retourne la tâche telle qu'elle est listée : une série à sa prochaine occurrence.
+
+    Args:
+        task: Tâche.
+        today: Ordinal du jour.
+
+    Returns:
+        La tâche elle-même, ou une copie dont ``due`` est la prochaine
+        occurrence de la série.
+    """
+    if not is_recurring(task):
+        return task
+    ordinal = next_occurrence(task, today)
+    return dict(task, due=date.fromordinal(ordinal).isoformat()) if ordinal else task
+
+
+class RecurrenceIndex(JsonIndex):
+    """Liste des tâches récurrentes d'un stockage (``<path>.repeat``).
+
+    Le fichier JSON associe chaque ID récurrent à l'ordinal de sa première
+    occurrence et porte la signature du stockage. Il est petit (une entrée
+    par série, et non par occurrence) : chaque écriture le réécrit en entier.
+
+    Args:
+        backend: Stockage indexé (doit exposer ``path``, ``version()``,
+            ``iter_tasks()`` et ``lock()``).
+    """
+
+    suffix = REPEAT_SUFFIX
+    field = "series"
+
+    # ---------- Protocole observateur ----------
+    def apply(self, puts: List[Dict[str, Any]], deletes: List[int]) -> None:
+        """Reporte un lot d'écritures.
+
+        Args:
+            puts: Tâches ajoutées ou modifiées.
+            deletes: IDs supprimés.
+        """
+        data = self._read()
+        series = dict(data["series"]) if data else {}
+        for task in puts:
+            series.pop(str(task["id"]), None)
+            if is_recurring(task):
+                series[str(task["id"])] = due_ordinal(task)
+        for task_id in deletes:
+            series.pop(str(task_id), None)
+        self._write(series)
+
+    # ---------- Construction ----------
+    def compute(self, tasks: Iterable[Dict[str, Any]]) -> Dict[str, int]:
+        """Associe l'ID de chaque tâche récurrente à sa première échéance.
+
+        Args:
+            tasks: Tâches du stockage.
+
+        Returns:
+            Un dictionnaire ``str(id) -> ordinal``.
+        """
+        return {str(t["id"]): due_ordinal(t) for t in tasks if is_recurring(t)}
+
+    # ---------- Lecture ----------
+    def lookup(self, high: int) -> List[int]:
+        """Retourne les IDs des séries qui commencent au plus tard à *high*.
+
+        L'index est reconstruit au préalable s'il est absent ou périmé.
+
+        Args:
+            high: Ordinal maximal de la fenêtre interrogée.
+
+        Returns:
+            Les IDs, par ordre croissant (les séries sans échéance valide
+            sont ignorées).
+        """
+        return sorted(int(i) for i, first in self.current().items() if 0 < first <= high)
+
+
+def window_series(tasks: Iterable[Dict[str, Any]], high: int) -> List[Dict[str, Any]]:
+    """Filtre les séries qui commencent au plus tard à *high* (parcours en mémoire).
+
+    Args:
+        tasks: Tâches parcourues.
+        high: Ordinal maximal de la fenêtre interrogée.
+
+    Returns:
+        Les tâches récurrentes retenues.
+    """
+    return [t for t in tasks if is_recurring(t) and 0 < due_ordinal(t) <= high]
@@ -0,0 +1,217 @@
+"""Statistiques agrégées des tâches, tenues à jour à chaque écriture.
+
+:class:`StatsIndex` est un observateur de :class:`storage.Backend` (comme
+les index de :mod:`indexes`) : il garde à côté du stockage des compteurs
+— nombre de tâches, répartition par priorité, tâches sans échéance — et
+le nombre d'échéances par jour. Chaque ``commit`` les corrige des seules
+tâches écrites (leur ancienne version est lue juste avant l'écriture,
+voir :meth:`StatsIndex.before_write`), sans parcourir le stockage.
+
+Les comptes qui dépendent du jour (en retard, bientôt, histogramme des
+prochaines échéances) sont dérivés de ces casiers par :func:`summarize`
+pour n'importe quelle date. Les tâches récurrentes (:mod:`recurrence`)
+sont gardées à part, avec leur règle, et comptées par occurrence à venir
+dans chaque fenêtre, comme ``list`` : une série n'est jamais en retard.
+"""
+
+from __future__ import annotations
+
+from datetime import date
+from typing import Any, Dict, Iterable, List, Optional
+
+from indexes import JsonIndex, due_ordinal
+from recurrence import count_occurrences, is_recurring, occurrences
+from watcher import SOON_DAYS
+
+STATS_SUFFIX = ".stats"
+# Jours couverts par défaut par l'histogramme des échéances (comme ``--due-in``).
+HISTOGRAM_DAYS = 30
+
+Counters = Dict[str, Any]
+
+
+def empty() -> Counters:
+    """Retourne les compteurs d'un stockage vide."""
+    return {"total": 0, "undated": 0, "priority": {}, "days": {}, "series": {}}
+
+
+def _bump(counts: Dict[str, int], key: str, delta: int) -> None:
+    """Ajoute *delta* à ``counts[key]`` (les entrées nulles sont retirées)."""
+    value = counts.get(key, 0) + delta
+    if value:
+        counts[key] = value
+    else:
+        counts.pop(key, None)
+
+
+def count(counters: Counters, task: Dict[str, Any], sign: int) -> None:
+    """Ajoute (``sign=1``) ou retire (``sign=-1``) une tâche des compteurs.
+
+    Args:
+        counters: Compteurs modifiés sur place.
+        task: Tâche comptée.
+        sign: 1 ou -1.
+    """
+    counters["total"] += sign
+    _bump(counters["priority"], str(task.get("priority", 5)), sign)
+    ordinal = due_ordinal(task)
+    if not ordinal:
+        counters["undated"] += sign
+    elif is_recurring(task):
+        if sign > 0:
+            counters["series"][str(task["id"])] = [ordinal, task["repeat"]]
+        else:
+            counters["series"].pop(str(task["id"]), None)
+    else:
+        _bump(counters["days"], str(ordinal), sign)
+
+
+def tally(tasks: Iterable[Dict[str, Any]]) -> Counters:
+    """Calcule les compteurs par un parcours complet.
+
+    Args:
+        tasks: Tâches du stockage.
+
+    Returns:
+        Les compteurs (voir :func:`empty`).
+    """
+    counters = empty()
+    for task in tasks:
+        count(counters, task, 1)
+    return counters
+
+
+def differences(stored: Counters, scanned: Counters) -> int:
+    """Compte les compteurs de *stored* qui diffèrent de ceux de *scanned*.
+
+    Args:
+        stored: Compteurs enregistrés.
+        scanned: Compteurs recalculés (référence).
+
+    Returns:
+        Le nombre de valeurs différentes (un casier ou une série manquant
+        d'un côté compte pour une).
+    """
+    wrong = sum(stored.get(key) != scanned[key] for key in ("total", "undated"))
+    for key in ("priority", "days", "series"):
+        left, right = stored.get(key, {}), scanned[key]
+        wrong += sum(left.get(k) != right.get(k) for k in set(left) | set(right))
+    return wrong
+
+
+def summarize(counters: Counters, today: int, days: int = HISTOGRAM_DAYS) -> Dict[str, Any]:
+    """Dérive les statistiques affichées par ``stats`` pour le jour *today*.
+
+    Le coût dépend du nombre de jours distincts et de séries, et non du
+    nombre de tâches.
+
+    Args:
+        counters: Compteurs (voir :func:`empty`).
+        today: Ordinal du jour de référence.
+        days: Taille de l'histogramme (``today`` à ``today + days``).
+
+    Returns:
+        Un dictionnaire : ``today``, ``total``, ``priority`` (1 à 5),
+        ``undated``, ``recurring``, ``overdue``, ``soon`` (échéances à
+        ``soon_days`` jours au plus) et ``due`` (liste de ``[date,
+        nombre]``). Les séries comptent une fois dans les totaux, une fois
+        par occurrence dans ``soon`` et ``due``, et jamais dans ``overdue``.
+    """
+    per_day = {int(k): n for k, n in counters["days"].items()}
+    series = list(counters["series"].values())
+    soon_end = today + SOON_DAYS
+    overdue = sum(n for d, n in per_day.items() if d < today)
+    soon = sum(n for d, n in per_day.items() if today <= d <= soon_end)
+    soon += sum(count_occurrences(first, rule, today, soon_end) for first, rule in series)
+    high = min(today + days, date.max.toordinal())
+    histogram = {d: per_day.get(d, 0) for d in range(today, high + 1)}
+    for first, rule in series:
+        for ordinal in occurrences(first, rule, today, high):
+            histogram[ordinal] += 1
+    return {
+        "today": date.fromordinal(today).isoformat(),
+        "total": counters["total"],
+        "priority": {p: counters["priority"].get(str(p), 0) for p in range(1, 6)},
+        "undated": counters["undated"],
+        "recurring": len(series),
+        "overdue": overdue,
+        "soon": soon,
+        "soon_days": SOON_DAYS,
+        "due": [[date.fromordinal(d).isoformat(), n] for d, n in histogram.items()],
+    }
+
+
+class StatsIndex(JsonIndex):
+    """Compteurs agrégés d'un stockage (``<path>.stats``).
+
+    Le fichier JSON est petit (une entrée par jour d'échéance et par
+    série) et porte la signature du stockage ; chaque écriture le réécrit
+    en entier. Tant qu'il n'existe pas (avant la première commande
+    ``stats``), l'index n'est pas à jour et les écritures ne lisent rien
+    de plus.
+
+    Args:
+        backend: Stockage indexé (doit exposer ``path``, ``version()``,
+            ``get_many()``, ``iter_tasks()`` et ``lock()``).
+    """
+
+    suffix = STATS_SUFFIX
+    field = "counters"
+
+    def __init__(self, backend: Any) -> None:
+        super().__init__(backend)
+        self._previous: List[Dict[str, Any]] = []
+
+    # ---------- Protocole observateur ----------
+    def before_write(self, puts: List[Dict[str, Any]], deletes: List[int]) -> None:
+        """Lit l'ancienne version des tâches qu'un lot va remplacer ou supprimer.
+
+        Args:
+            puts: Tâches ajoutées ou modifiées.
+            deletes: IDs supprimés.
+        """
+        ids = dict.fromkeys([t["id"] for t in puts] + list(deletes))
+        self._previous = self.backend.get_many(ids)
+
+    def apply(self, puts: List[Dict[str, Any]], deletes: List[int]) -> None:
+        """Reporte un lot d'écritures.
+
+        Args:
+            puts: Tâches ajoutées ou modifiées.
+            deletes: IDs supprimés.
+        """
+        data = self._read()
+        counters = data["counters"] if data else empty()
+        current = {t["id"]: t for t in self._previous}
+        self._previous = []
+        for task in puts:
+            if task["id"] in current:
+                count(counters, current[task["id"]], -1)
+            count(counters, task, 1)
+            current[task["id"]] = task
+        for task_id in deletes:
+            if task_id in current:
+                count(counters, current.pop(task_id), -1)
+        self._write(counters)
+
+    # ---------- Construction ----------
+    def compute(self, tasks: Iterable[Dict[str, Any]]) -> Counters:
+        """Calcule les compteurs par un parcours complet (voir :func:`tally`)."""
+        return tally(tasks)
+
+    # ---------- Lecture ----------
+    def counters(self) -> Counters:
+        """Retourne les compteurs, reconstruits au préalable s'ils sont absents ou périmés."""
+        return self.current()
+
+    def recompute(self) -> Optional[int]:
+        """Vérifie les compteurs enregistrés par un parcours complet et les corrige.
+
+        Returns:
+            Le nombre de compteurs corrigés (voir :func:`differences`), ou
+            None si aucun compteur n'était enregistré.
+        """
+        with self.backend.lock():
+            data = self._read()
+            counters = self.rebuild()
+        return None if data is None else differences(data["counters"], counters)
@@ -0,0 +1,2320 @@
+"""Couches de stockage du gestionnaire de tâches.
+
+Cinq modes de persistance sont disponibles :
+
+- :class:`JsonBackend` : le format historique, un tableau JSON réécrit en
+  entier à chaque modification ;
+- :class:`JournalBackend` : un instantané JSON (lisible comme un
+  ``tasks.json`` classique) complété par un journal JSONL en ajout seul.
+  Chaque modification ajoute une ligne au journal au lieu de réécrire tout
+  le fichier ; l'état est reconstruit en rejouant le journal sur
+  l'instantané, et :meth:`JournalBackend.compact` replie le journal dans un
+  nouvel instantané ;
+- :class:`SqliteBackend` : une base SQLite indexée sur ``due`` et
+  ``priority``, qui exécute les filtres de rappel et le tri en SQL ;
+- :class:`BinaryBackend` : un instantané binaire en colonnes (ID,
+  priorité, échéance) suivi d'un tas JSON, lu via :mod:`mmap` ; filtres
+  et tris ne décodent que les tâches retenues ;
+- :class:`PartitionedBackend` : un répertoire avec un fichier JSON par
+  mois d'échéance et un petit manifeste ; les filtres de rappel n'ouvrent
+  que les mois de la plage demandée.
+
+Toutes les classes dérivent de :class:`Backend` et exposent la même
+interface (``load``, ``iter_tasks``, ``save``, ``commit``, ``get``,
+``next_id``, ``compact``) ; :func:`open_backend` choisit la classe à partir d'une
+spécification ``type:chemin``.
+
+Les écritures (``save``, ``commit``) se font sous un verrou exclusif
+``fcntl`` sur ``<path>.lock`` (:meth:`Backend.lock`), que les commandes
+détiennent aussi pendant leur lecture préalable. Les fichiers réécrits
+sont remplacés atomiquement et synchronisés sur disque (:data:`FSYNC`).
+
+Ce module connaît aussi les fichiers annexes que toute commande consulte
+(métadonnées de l'archive, socket du démon), pour que :mod:`coldstore` et
+:mod:`daemon` ne soient importés que par les commandes qui s'en servent ;
+de même, les phases ne sont mesurées (:func:`span`) que si :mod:`metrics`
+a été chargé.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import heapq
+import json
+import mmap
+import os
+import stat
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from datetime import date, timedelta
+from typing import (TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, List, Optional,
+                    Tuple, TypeVar, Union)
+
+from indexes import due_ordinal
+from models import NO_DUE, TaskTable
+
+if TYPE_CHECKING:
+    import sqlite3
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows : pas de verrou consultatif
+    fcntl = None  # type: ignore[assignment]
+
+T = TypeVar("T")
+
+JOURNAL_SUFFIX = ".journal"
+INDEX_SUFFIX = ".idx"
+# En-tête de l'index : magic, mtime/taille de l'instantané, taille du journal, next_id.
+_INDEX_HEADER = struct.Struct("<8sqqqq")
+_INDEX_MAGIC = b"TASKIDX1"
+# Une entrée par ID : 0 = absente, > 0 = position + 1 dans le journal,
+# < 0 = -(position + 1) dans l'instantané.
+_INDEX_ENTRY = struct.Struct("<q")
+# Taille minimale du journal (en octets) avant un compactage automatique.
+JOURNAL_MIN_COMPACT_BYTES = 1 << 20
+# Nombre d'entrées d'index lues (et de tâches décodées) à la fois par ``iter_tasks``.
+ITER_BLOCK = 1024
+LOCK_SUFFIX = ".lock"
+# Métadonnées de l'archive froide (voir :mod:`coldstore`).
+META_SUFFIX = ".archive.json"
+# Socket du démon (voir :mod:`daemon`).
+SOCKET_SUFFIX = ".sock"
+# Synchronisation disque (fsync) des écritures ; ``TASKS_FSYNC=0`` la désactive.
+FSYNC = os.environ.get("TASKS_FSYNC", "1") not in ("", "0")
+_NO_SPAN = contextlib.nullcontext()
+
+
+def span(name: str) -> Any:
+    """Mesure la phase *name* via :func:`metrics.span`, si :mod:`metrics` est chargé.
+
+    :mod:`metrics` n'est importé que par ``--profile`` ou ``TASKS_METRICS`` ;
+    sans lui aucune mesure n'est en cours.
+
+    Args:
+        name: Nom de la phase.
+
+    Returns:
+        Un gestionnaire de contexte (sans effet hors enregistrement).
+    """
+    recorder = sys.modules.get("metrics")
+    return _NO_SPAN if recorder is None else recorder.span(name)
+
+
+def timed(name: str, iterable: Iterable[T]) -> Iterable[T]:
+    """Mesure un itérable via :func:`metrics.timed`, si :mod:`metrics` est chargé.
+
+    Args:
+        name: Nom de la phase.
+        iterable: Itérable consommé en flux.
+
+    Returns:
+        *iterable* tel quel hors enregistrement, sinon un itérateur mesuré.
+    """
+    recorder = sys.modules.get("metrics")
+    return iterable if recorder is None else recorder.timed(name, iterable)
+
+
+def read_meta(path: str) -> Optional[Dict[str, Any]]:
+    """Lit les métadonnées de l'archive du stockage *path*.
+
+    Args:
+        path: Chemin du stockage courant.
+
+    Returns:
+        Les métadonnées, ou None s'il n'y a pas d'archive.
+    """
+    try:
+        with open(path + META_SUFFIX, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def id_floor(path: str) -> int:
+    """Plus petit ID encore libre compte tenu de l'archive (1 sans archive)."""
+    meta = read_meta(path)
+    return meta.get("next_id", 1) if meta else 1
+
+
+def socket_path(store_path: str) -> str:
+    """Retourne le chemin de la socket du démon associé à un stockage.
+
+    Args:
+        store_path: Chemin du fichier de stockage.
+
+    Returns:
+        ``$TASKS_SOCKET`` s'il est défini, sinon ``<store_path>.sock``.
+    """
+    return os.environ.get("TASKS_SOCKET") or os.path.abspath(store_path) + SOCKET_SUFFIX
+
+
+def _fsync(f: Any) -> None:
+    """Force l'écriture de *f* sur disque si :data:`FSYNC` est actif.
+
+    Args:
+        f: Fichier ouvert en écriture.
+    """
+    if FSYNC:
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def _fsync_dir(path: str) -> None:
+    """Rend durable le renommage d'une entrée du répertoire de *path*.
+
+    Args:
+        path: Fichier dont le répertoire parent est synchronisé.
+    """
+    if not FSYNC or not hasattr(os, "O_DIRECTORY"):
+        return
+    fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _file_mode(path: str) -> int:
+    """Permissions à donner à *path* lors de sa réécriture.
+
+    Args:
+        path: Fichier réécrit.
+
+    Returns:
+        Les permissions actuelles du fichier, ou celles d'un fichier créé
+        par ``open`` (``0o666`` moins le umask) s'il n'existe pas encore.
+    """
+    try:
+        return stat.S_IMODE(os.stat(path).st_mode)
+    except OSError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+
+def _atomic_write(path: str, content: Union[str, bytes], durable: bool = True) -> None:
+    """Écrit *content* dans *path* via un fichier temporaire puis un renommage.
+
+    Un lecteur voit l'ancien ou le nouveau contenu, jamais un fichier à
+    moitié écrit. Le fichier garde ses permissions (``mkstemp`` crée le
+    fichier temporaire en ``0600``).
+
+    Args:
+        path: Fichier de destination.
+        content: Contenu complet à écrire (texte UTF-8 ou octets).
+        durable: Synchroniser fichier et répertoire (si :data:`FSYNC`) ;
+            inutile pour un index reconstructible.
+    """
+    import tempfile  # pylint: disable=import-outside-toplevel  # écritures seulement
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=".tmp-", dir=directory)
+    if isinstance(content, str):
+        content = content.encode("utf-8")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(content)
+            if durable:
+                _fsync(f)
+        os.chmod(tmp_path, _file_mode(path))
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+    if durable:
+        _fsync_dir(path)
+
+
+@contextlib.contextmanager
+def file_lock(path: str) -> Iterator[None]:
+    """Verrou exclusif inter-processus (``fcntl.flock``) sur le fichier *path*.
+
+    Sans :mod:`fcntl` (Windows), le verrou est sans effet.
+
+    Args:
+        path: Fichier verrou (créé au besoin, jamais supprimé).
+
+    Yields:
+        None, tant que le verrou est détenu.
+    """
+    if fcntl is None:
+        yield
+        return
+    with open(path, "a+b") as f:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def _read_json_list(path: str) -> List[Dict[str, Any]]:
+    """Lit un tableau JSON de tâches, ``[]`` si le fichier est absent ou vide.
+
+    Args:
+        path: Chemin du fichier JSON.
+
+    Returns:
+        La liste des tâches contenues dans le fichier.
+
+    Raises:
+        ValueError: Si le fichier n'est pas un JSON valide : le traiter comme
+            vide ferait perdre toutes les tâches à la prochaine écriture.
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            text = f.read()
+    except FileNotFoundError:
+        return []
+    if not text.strip():
+        return []
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError as exc:
+        raise ValueError(f"Fichier de tâches illisible ({path}) : {exc}") from exc
+
+
+def dump_lines(tasks: Iterable[Dict[str, Any]]) -> str:
+    """Sérialise les tâches en tableau JSON à raison d'une tâche par ligne.
+
+    Le résultat reste un document JSON valide (compatible avec un
+    ``tasks.json`` classique) tout en étant adressable ligne par ligne.
+
+    Args:
+        tasks: Tâches à sérialiser.
+
+    Returns:
+        Le texte JSON correspondant.
+    """
+    lines = [json.dumps(t, ensure_ascii=False) for t in tasks]
+    if not lines:
+        return "[]\n"
+    return "[\n" + ",\n".join(lines) + "\n]\n"
+
+
+class Backend:
+    """Interface commune des couches de stockage.
+
+    :meth:`save` et :meth:`commit` délèguent l'écriture aux classes dérivées
+    (``_save`` / ``_write``) puis préviennent les *observateurs* (index
+    secondaires) afin qu'ils se tiennent à jour. Un observateur expose
+    ``is_fresh()``, ``apply(puts, deletes)`` et ``reset(tasks)``, et
+    éventuellement ``before_write(puts, deletes)``, appelé sous le verrou
+    juste avant l'écriture (pour lire l'ancienne version des tâches).
+
+    Les méthodes ``get``, ``get_many`` et ``next_id`` ont une implémentation
+    générique fondée sur :meth:`load` ; les classes dérivées peuvent la
+    remplacer par un accès direct.
+
+    Attributes:
+        supports_query: True si la classe définit ``query(overdue, due_in,
+            sort, today, limit=None, offset=0)``, qui exécute les filtres,
+            le tri et la pagination dans le stockage lui-même. Sinon,
+            l'appelant filtre un parcours de :meth:`iter_tasks`.
+        streams: True si :meth:`iter_tasks` et :meth:`iter_many` lisent les
+            tâches en flux sans charger tout le stockage.
+        observers: Index secondaires à prévenir après chaque écriture.
+        range_fields: Champs dont :meth:`iter_range` lit directement une
+            plage (voir :mod:`where`).
+        ordered_ranges: Parmi ceux-ci, les champs dont la plage est
+            parcourue dans l'ordre ``(valeur, id)``.
+        id_floor: Plus petit ID attribuable : :meth:`next_id` ne descend
+            jamais en dessous (IDs réservés par l'archive, voir
+            :mod:`coldstore`).
+    """
+
+    supports_query = False
+    streams = False
+    path = ""
+    range_fields: Tuple[str, ...] = ("id",)
+    ordered_ranges: Tuple[str, ...] = ("id",)
+    id_floor = 1
+
+    def __init__(self) -> None:
+        self.observers: List[Any] = []
+        self._lock_depth = 0
+
+    @contextlib.contextmanager
+    def lock(self) -> Iterator[None]:
+        """Détient le verrou d'écriture du stockage (``<path>.lock``).
+
+        Le verrou est réentrant et couvre tout un cycle lecture-modification-
+        écriture : les caches de l'instance sont invalidés à l'acquisition
+        pour relire l'état laissé par les autres processus.
+
+        Yields:
+            None, tant que le verrou est détenu.
+        """
+        if self._lock_depth:
+            self._lock_depth += 1
+            try:
+                yield
+            finally:
+                self._lock_depth -= 1
+            return
+        with file_lock(self.path + LOCK_SUFFIX):
+            self._lock_depth = 1
+            try:
+                self.invalidate()
+                yield
+            finally:
+                self._lock_depth = 0
+
+    def invalidate(self) -> None:
+        """Oublie les données mises en cache par l'instance."""
+
+    def load(self) -> List[Dict[str, Any]]:
+        """Charge toutes les tâches."""
+        raise NotImplementedError
+
+    def _save(self, tasks: List[Dict[str, Any]]) -> None:
+        """Remplace toutes les tâches par *tasks* (sans prévenir les observateurs)."""
+        raise NotImplementedError
+
+    def _write(self, puts: List[Dict[str, Any]], deletes: List[int]) -> None:
+        """Persiste un lot non vide (sans prévenir les observateurs)."""
+        raise NotImplementedError
+
+    def _after_write(self) -> None:
+        """Maintenance après un lot, une fois les observateurs à jour (rien par défaut).
+
+        Une réécriture complète faite ici (par exemple :meth:`compact`)
+        réinitialise les observateurs après qu'ils ont reçu le lot, et non
+        avant : un observateur incrémental ne compte jamais le lot deux fois.
+        """
+
+    def compact(self) -> int:
+        """Réorganise le stockage et retourne le nombre de tâches."""
+        raise NotImplementedError
+
+    def iter_tasks(self) -> Iterator[Dict[str, Any]]:
+        """Parcourt les tâches une à une.
+
+        L'implémentation générique s'appuie sur :meth:`load` ; les classes
+        dérivées dont le format s'y prête lisent les tâches en flux.
+
+        Yields:
+            Les tâches, dans l'ordre de :meth:`load`.
+        """
+        yield from self.load()
+
+    def iter_many(self, task_ids: Iterable[int]) -> Iterator[Dict[str, Any]]:
+        """Parcourt les tâches existantes parmi *task_ids*, dans cet ordre.
+
+        Args:
+            task_ids: IDs recherchés.
+
+        Yields:
+            Les dictionnaires des tâches trouvées.
+        """
+        yield from self.get_many(task_ids)
+
+    def _id_span(self, field: str, low: Optional[int], high: Optional[int]) -> range:
+        """Retourne les IDs possibles de la plage ``[low, high]``.
+
+        Raises:
+            ValueError: Si *field* n'est pas ``"id"`` (seule plage connue ici).
+        """
+        if field != "id":
+            raise ValueError(f"{type(self).__name__} ne lit pas de plage sur {field!r}")
+        stop = self.next_id()
+        if high is not None:
+            stop = min(stop, high + 1)
+        return range(max(1, low or 1), max(1, stop))
+
+    def range_count(self, field: str, low: Optional[int], high: Optional[int]) -> int:
+        """Estime (par excès) le nombre de tâches lues par :meth:`iter_range`.
+
+        L'implémentation générique ne connaît que les plages d'IDs.
+
+        Args:
+            field: Champ de :attr:`range_fields`.
+            low: Borne inférieure incluse (None = aucune).
+            high: Borne supérieure incluse (None = aucune).
+
+        Returns:
+            Le nombre de tâches candidates.
+        """
+        return len(self._id_span(field, low, high))
+
+    def iter_range(self, field: str, low: Optional[int],
+                   high: Optional[int]) -> Iterator[Dict[str, Any]]:
+        """Parcourt au moins les tâches dont *field* est dans ``[low, high]``.
+
+        Le résultat peut contenir d'autres tâches : l'appelant applique
+        toujours son filtre complet.
+
+        Args:
+            field: Champ de :attr:`range_fields`.
+            low: Borne inférieure incluse (None = aucune).
+            high: Borne supérieure incluse (None = aucune).
+
+        Returns:
+            Un itérateur sur les tâches candidates.
+        """
+        return self.iter_many(self._id_span(field, low, high))
+
+    def save(self, tasks: List[Dict[str, Any]]) -> None:
+        """Remplace toutes les tâches par *tasks* et réinitialise les index.
+
+        Args:
+            tasks: Liste de tâches à persister.
+        """
+        with self.lock(), span("save"):
+            self._save(tasks)
+            for observer in self.observers:
+                observer.reset(tasks)
+
+    def commit(self, puts: Iterable[Dict[str, Any]] = (), deletes: Iterable[int] = ()) -> None:
+        """Applique un lot d'ajouts/modifications et de suppressions.
+
+        Seuls les observateurs à jour avant l'écriture reçoivent le lot ; les
+        autres seront reconstruits à leur prochaine utilisation. L'écriture
+        se fait sous :meth:`lock`, et la maintenance du stockage
+        (:meth:`_after_write`) seulement une fois les observateurs à jour.
+
+        Args:
+            puts: Tâches complètes à insérer ou remplacer (clé ``id``).
+            deletes: IDs des tâches à supprimer.
+        """
+        puts = list(puts)
+        deletes = list(deletes)
+        if not puts and not deletes:
+            return
+        with self.lock(), span("save"):
+            fresh = [o for o in self.observers if o.is_fresh()]
+            for observer in fresh:
+                if hasattr(observer, "before_write"):
+                    observer.before_write(puts, deletes)
+            self._write(puts, deletes)
+            for observer in fresh:
+                observer.apply(puts, deletes)
+            self._after_write()
+
+    def version(self) -> Tuple[int, int, int, int]:
+        """Signature du contenu persisté, qui change à chaque écriture.
+
+        Returns:
+            ``(inode, mtime_ns, taille, 0)`` du fichier principal, ou des
+            zéros s'il n'existe pas.
+        """
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return (0, 0, 0, 0)
+        return (st.st_ino, st.st_mtime_ns, st.st_size, 0)
+
+    def get(self, task_id: int) -> Optional[Dict[str, Any]]:
+        """Retourne la tâche *task_id*.
+
+        Args:
+            task_id: ID recherché.
+
+        Returns:
+            Le dictionnaire de la tâche, ou None si elle n'existe pas.
+        """
+        for task in self.load():
+            if task["id"] == task_id:
+                return task
+        return None
+
+    def get_many(self, task_ids: Iterable[int]) -> List[Dict[str, Any]]:
+        """Retourne les tâches existantes parmi *task_ids*, dans cet ordre.
+
+        Args:
+            task_ids: IDs recherchés.
+
+        Returns:
+            Les dictionnaires des tâches trouvées.
+        """
+        by_id = {t["id"]: t for t in self.load()}
+        return [by_id[i] for i in task_ids if i in by_id]
+
+    def next_id(self) -> int:
+        """Retourne l'ID à attribuer à la prochaine tâche.
+
+        Sans compteur persisté (JSON), l'ID de la dernière tâche supprimée
+        est réattribué ; les autres stockages conservent leur compteur.
+
+        Returns:
+            Le plus grand ID existant plus un (au moins :attr:`id_floor`).
+        """
+        return max(max([t["id"] for t in self.load()], default=0) + 1, self.id_floor)
+
+
+class JsonBackend(Backend):
+    """Stockage historique : un tableau JSON indenté, réécrit à chaque écriture.
+
+    Args:
+        path: Chemin du fichier ``tasks.json``.
+    """
+
+    def __init__(self, path: str) -> None:
+        super().__init__()
+        self.path = path
+        self._tasks: Optional[List[Dict[str, Any]]] = None
+
+    def load(self) -> List[Dict[str, Any]]:
+        """Charge (une seule fois par instance) la liste des tâches.
+
+        Returns:
+            La liste des tâches.
+        """
+        if self._tasks is None:
+            self._tasks = _read_json_list(self.path)
+        return self._tasks
+
+    def _save(self, tasks: List[Dict[str, Any]]) -> None:
+        """Réécrit entièrement le fichier.
+
+        Args:
+            tasks: Liste de tâches à persister.
+        """
+        _atomic_write(self.path, json.dumps(tasks, indent=2, ensure_ascii=False))
+        self._tasks = tasks
+
+    def invalidate(self) -> None:
+        """Oublie la liste chargée : la prochaine lecture relit le fichier."""
+        self._tasks = None
+
+    def _write(self, puts: List[Dict[str, Any]], deletes: List[int]) -> None:
+        """Applique le lot en mémoire puis réécrit le fichier.
+
+        Args:
+            puts: Tâches complètes à insérer ou remplacer (clé ``id``).
+            deletes: IDs des tâches à supprimer.
+        """
+        by_id = {t["id"]: t for t in self.load()}
+        for task in puts:
+            by_id[task["id"]] = task
+        for task_id in deletes:
+            by_id.pop(task_id, None)
+        self._save(list(by_id.values()))
+
+    def compact(self) -> int:
+        """Réécrit le fichier (aucun journal à replier dans ce mode).
+
+        Returns:
+            Le nombre de tâches persistées.
+        """
+        tasks = self.load()
+        self.save(tasks)
+        return len(tasks)
+
+
+class JournalBackend(JsonBackend):
+    """Instantané JSON + journal JSONL en ajout seul.
+
+    Le journal (``<path>.journal``) contient un enregistrement par ligne :
+    ``{"op": "put", "task": {...}}`` pour un ajout ou une modification (la
+    tâche complète) et ``{"op": "delete", "id": N}`` pour une suppression.
+    Les deux opérations sont idempotentes : rejouer un journal déjà replié
+    dans l'instantané ne change pas l'état.
+
+    Un index binaire (``<path>.idx``) conserve le compteur ``next_id`` et,
+    pour chaque ID, la position en octets de la dernière version de la
+    tâche (dans le journal ou dans l'instantané, écrit une tâche par ligne).
+    Attribuer un ID, lire, modifier ou supprimer une tâche ne parcourt donc
+    pas les autres enregistrements. L'index est reconstruit automatiquement
+    s'il est absent ou si les fichiers ont changé sans lui.
+
+    Args:
+        path: Chemin de l'instantané (``tasks.json``).
+    """
+
+    streams = True
+
+    def __init__(self, path: str) -> None:
+        super().__init__(path)
+        self.journal_path = path + JOURNAL_SUFFIX
+        self.index_path = path + INDEX_SUFFIX
+        self._index_ready = False
+
+    def invalidate(self) -> None:
+        """Oublie l'état chargé et revérifie l'index à la prochaine lecture."""
+        super().invalidate()
+        self._index_ready = False
+
+    def _replay(self, by_id: Dict[int, Dict[str, Any]]) -> None:
+        """Rejoue le journal sur l'état *by_id* (modifié en place).
+
+        Une ligne illisible (écriture interrompue) est ignorée.
+
+        Args:
+            by_id: Tâches indexées par ID, dans l'ordre d'insertion.
+        """
+        try:
+            f = open(self.journal_path, "r", encoding="utf-8")
+        except FileNotFoundError:
+            return
+        with f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if record.get("op") == "put":
+                    task = record["task"]
+                    by_id[task["id"]] = task
+                elif record.get("op") == "delete":
+                    by_id.pop(record["id"], None)
+
+    def load(self) -> List[Dict[str, Any]]:
+        """Reconstruit l'état : instantané puis rejeu du journal.
+
+        Returns:
+            La liste des tâches.
+        """
+        if self._tasks is None:
+            by_id = {t["id"]: t for t in _read_json_list(self.path)}
+            self._replay(by_id)
+            self._tasks = list(by_id.values())
+        return self._tasks
+
+    def _save(self, tasks: List[Dict[str, Any]]) -> None:
+        """Écrit un nouvel instantané, vide le journal et réindexe.
+
+        L'instantané est remplacé atomiquement avant la troncature du
+        journal : un arrêt entre les deux étapes ne fait que rejouer des
+        enregistrements déjà présents.
+
+        Args:
+            tasks: Liste de tâches à persister.
+        """
+        next_id = self._read_header()[4] if os.path.exists(self.index_path) else 1
+        _atomic_write(self.path, dump_lines(tasks))
+        with open(self.journal_path, "w", encoding="utf-8"):
+            pass
+        self._tasks = tasks
+        self._write_index(self._scan() or {}, next_id)
+
+    def _write(self, puts: List[Dict[str, Any]], deletes: List[int]) -> None:
+        """Ajoute les modifications au journal en une seule écriture.
+
+        Si la dernière ligne du journal est incomplète (écriture
+        interrompue), un saut de ligne la termine d'abord : elle reste
+        ignorée au rejeu sans emporter le premier enregistrement du lot.
+        Le repli automatique du journal est fait ensuite par
+        :meth:`_after_write`.
+
+        Args:
+            puts: Tâches complètes à insérer ou remplacer (clé ``id``).
+            deletes: IDs des tâches à supprimer.
+        """
+        records = [{"op": "put", "task": t} for t in puts]
+        records += [{"op": "delete", "id": i} for i in deletes]
+        self._ensure_index()
+        chunks = []
+        entries: Dict[int, int] = {}
+        with open(self.journal_path, "a+b") as f:
+            pos = f.seek(0, os.SEEK_END)
+            if pos and (f.seek(pos - 1), f.read(1))[1] != b"\n":
+                chunks.append(b"\n")  # ligne interrompue : ne pas s'y coller
+                pos += 1
+            for record in records:
+                data = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+                entries[record["task"]["id"] if "task" in record else record["id"]] = (
+                    pos + 1 if "task" in record else 0)
+                chunks.append(data)
+                pos += len(data)
+            f.write(b"".join(chunks))
+            _fsync(f)
+        self._update_index(entries)
+        if self._tasks is not None:
+            by_id = {t["id"]: t for t in self._tasks}
+            for task in puts:
+                by_id[task["id"]] = task
+            for task_id in deletes:
+                by_id.pop(task_id, None)
+            self._tasks = list(by_id.values())
+
+    def _after_write(self) -> None:
+        """Replie le journal dans l'instantané s'il est devenu trop gros.
+
+        Le repli a lieu dès que le journal dépasse la taille de l'instantané
+        (et au moins :data:`JOURNAL_MIN_COMPACT_BYTES`), ce qui garde un
+        coût amorti constant par écriture.
+        """
+        if self._should_compact():
+            self.compact()
+
+    def get(self, task_id: int) -> Optional[Dict[str, Any]]:
+        """Lit la tâche *task_id* à sa position indexée (une seule ligne).
+
+        Args:
+            task_id: ID recherché.
+
+        Returns:
+            Le dictionnaire de la tâche, ou None si elle n'existe pas.
+        """
+        found = self.get_many([task_id])
+        return found[0] if found else None
+
+    def get_many(self, task_ids: Iterable[int]) -> List[Dict[str, Any]]:
+        """Lit les tâches *task_ids* à leurs positions indexées.
+
+        Args:
+            task_ids: IDs recherchés.
+
+        Returns:
+            Les dictionnaires des tâches trouvées, dans l'ordre demandé.
+        """
+        return list(self.iter_many(task_ids))
+
+    def iter_many(self, task_ids: Iterable[int]) -> Iterator[Dict[str, Any]]:
+        """Lit en flux les tâches *task_ids* à leurs positions indexées.
+
+        Chaque fichier n'est ouvert qu'une fois ; seules les lignes des
+        tâches demandées sont lues, puis décodées par blocs de
+        :data:`ITER_BLOCK`.
+
+        Args:
+            task_ids: IDs recherchés.
+
+        Yields:
+            Les dictionnaires des tâches trouvées, dans l'ordre demandé.
+        """
+        self._ensure_index()
+        with contextlib.ExitStack() as stack:
+            index = stack.enter_context(open(self.index_path, "rb"))
+            read = self._line_reader(stack)
+            values = []
+            for task_id in task_ids:
+                if not isinstance(task_id, int) or task_id < 1:
+                    continue
+                index.seek(_INDEX_HEADER.size + (task_id - 1) * _INDEX_ENTRY.size)
+                raw = index.read(_INDEX_ENTRY.size)
+                if len(raw) < _INDEX_ENTRY.size:
+                    continue
+                (value,) = _INDEX_ENTRY.unpack(raw)
+                if value != 0:
+                    values.append(value)
+                if len(values) >= ITER_BLOCK:
+                    yield from self._decode_block(values, read)
+                    values = []
+            yield from self._decode_block(values, read)
+
+    def iter_tasks(self) -> Iterator[Dict[str, Any]]:
+        """Parcourt les tâches par ID croissant sans charger tout le stockage.
+
+        L'index est lu par blocs ; les lignes d'un bloc sont lues à leurs
+        positions (lecture quasi séquentielle de l'instantané) puis décodées
+        en un seul appel JSON. La mémoire occupée dépend de la taille d'un
+        bloc, pas du nombre de tâches. Si l'état est déjà en mémoire, il est
+        parcouru directement.
+
+        Yields:
+            Les tâches vivantes.
+        """
+        if self._tasks is not None:
+            yield from self._tasks
+            return
+        self._ensure_index()
+        with contextlib.ExitStack() as stack:
+            index = stack.enter_context(open(self.index_path, "rb"))
+            index.seek(_INDEX_HEADER.size)
+            read = self._line_reader(stack)
+            zeros = bytes(_INDEX_ENTRY.size * ITER_BLOCK)
+            while True:
+                raw = index.read(_INDEX_ENTRY.size * ITER_BLOCK)
+                if not raw:
+                    break
+                if raw == zeros:
+                    continue  # IDs libérés (supprimés ou archivés)
+                block = array("q", raw)
+                if sys.byteorder != "little":
+                    block.byteswap()
+                yield from self._decode_block([v for v in block if v != 0], read)
+
+    @staticmethod
+    def _decode_block(values: List[int],
+                      read: Callable[[int], bytes]) -> Iterator[Dict[str, Any]]:
+        """Lit puis décode en un seul appel JSON les tâches d'un bloc.
+
+        Args:
+            values: Positions codées (non nulles) des tâches du bloc.
+            read: Lecteur de lignes retourné par :meth:`_line_reader`.
+
+        Yields:
+            Les tâches, dans l'ordre de *values*.
+        """
+        if not values:
+            return
+        records = json.loads(b"[" + b",".join(read(v) for v in values) + b"]")
+        for value, record in zip(values, records):
+            yield record["task"] if value > 0 else record
+
+    def _line_reader(self, stack: contextlib.ExitStack) -> Callable[[int], bytes]:
+        """Retourne une fonction qui lit la ligne JSON d'une position codée.
+
+        Chaque fichier est ouvert au premier besoin et fermé avec *stack*.
+
+        Args:
+            stack: Pile de contextes qui possède les fichiers ouverts.
+
+        Returns:
+            La fonction ``position codée -> ligne JSON`` (sans séparateur).
+        """
+        files: Dict[str, Any] = {}
+
+        def read(value: int) -> bytes:
+            path, offset = ((self.journal_path, value - 1) if value > 0
+                            else (self.path, -value - 1))
+            if path not in files:
+                files[path] = stack.enter_context(open(path, "rb"))
+            files[path].seek(offset)
+            return files[path].readline().rstrip(b"\r\n").rstrip(b",")
+        return read
+
+    def version(self) -> Tuple[int, int, int, int]:
+        """Signature de l'instantané complétée par la taille du journal.
+
+        Returns:
+            ``(inode, mtime_ns, taille de l'instantané, taille du journal)``.
+        """
+        return super().version()[:3] + self._stamp()[2:]
+
+    def read_journal(self, offset: int) -> Tuple[List[Dict[str, Any]], List[int], int]:
+        """Lit les enregistrements ajoutés au journal depuis *offset*.
+
+        Seules les lignes complètes sont lues : une écriture en cours sera
+        relue au passage suivant. Une ligne illisible est ignorée.
+
+        Args:
+            offset: Position (en octets) déjà lue dans le journal.
+
+        Returns:
+            ``(puts, deletes, position atteinte)``, dans l'ordre du journal.
+        """
+        puts: List[Dict[str, Any]] = []
+        deletes: List[int] = []
+        try:
+            with open(self.journal_path, "rb") as f:
+                f.seek(offset)
+                data = f.read()
+        except FileNotFoundError:
+            return puts, deletes, offset
+        data = data[:data.rfind(b"\n") + 1]
+        for line in data.splitlines():
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if record.get("op") == "put":
+                puts.append(record["task"])
+            elif record.get("op") == "delete":
+                deletes.append(record["id"])
+        return puts, deletes, offset + len(data)
+
+    def next_id(self) -> int:
+        """Retourne le compteur d'IDs persisté (les IDs ne sont jamais réutilisés).
+
+        Returns:
+            L'ID à attribuer à la prochaine tâche.
+        """
+        self._ensure_index()
+        return max(self._read_header()[4], self.id_floor)
+
+    def _stamp(self) -> Tuple[int, int, int]:
+        """Signature des fichiers indexés : instantané (mtime, taille) et journal.
+
+        Returns:
+            Le triplet ``(mtime_ns, taille de l'instantané, taille du journal)``.
+        """
+        try:
+            st = os.stat(self.path)
+            snapshot = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            snapshot = (0, 0)
+        try:
+            journal_size = os.path.getsize(self.journal_path)
+        except OSError:
+            journal_size = 0
+        return snapshot + (journal_size,)
+
+    def _read_header(self) -> tuple:
+        """Lit l'en-tête de l'index.
+
+        Returns:
+            ``(magic, mtime_ns, taille instantané, taille journal, next_id)``.
+
+        Raises:
+            OSError: Si l'index est absent.
+            struct.error: Si l'en-tête est tronqué.
+        """
+        with open(self.index_path, "rb") as f:
+            return _INDEX_HEADER.unpack(f.read(_INDEX_HEADER.size))
+
+    def _ensure_index(self) -> None:
+        """Reconstruit l'index s'il est absent ou périmé (une fois par instance).
+
+        La vérification est refaite sous :meth:`lock` : un autre processus a
+        pu reconstruire l'index ou écrire dans le journal entre-temps.
+        """
+        if self._index_ready:
+            return
+        with self.lock():
+            if not self._index_ready:
+                self._check_index()
+
+    def _check_index(self) -> None:
+        """Compare l'en-tête de l'index aux fichiers et le reconstruit au besoin."""
+        try:
+            header = self._read_header()
+        except (OSError, struct.error):
+            header = None
+        if header is None or header[0] != _INDEX_MAGIC:
+            self._rebuild_index(1)
+        elif header[1:4] != self._stamp():
+            self._rebuild_index(header[4])
+        self._index_ready = True
+
+    def _rebuild_index(self, next_id: int) -> None:
+        """Reconstruit l'index en parcourant instantané et journal.
+
+        Un instantané qui n'est pas écrit une tâche par ligne (``tasks.json``
+        indenté historique) est d'abord réécrit par un compactage.
+
+        Args:
+            next_id: Valeur minimale du compteur à conserver.
+        """
+        entries = self._scan()
+        if entries is None:
+            self._tasks = None
+            tasks = self.load()
+            _atomic_write(self.path, dump_lines(tasks))
+            with open(self.journal_path, "w", encoding="utf-8"):
+                pass
+            entries = self._scan() or {}
+        self._write_index(entries, next_id)
+
+    def _scan(self) -> Optional[Dict[int, int]]:
+        """Calcule la position de chaque tâche vivante.
+
+        Returns:
+            Les entrées d'index (``ID -> position codée``), ou None si
+            l'instantané n'est pas adressable ligne par ligne.
+        """
+        entries: Dict[int, int] = {}
+        try:
+            f = open(self.path, "rb")
+        except FileNotFoundError:
+            f = None
+        if f is not None:
+            with f:
+                first = f.readline().strip()
+                if first not in (b"", b"[", b"[]"):
+                    return None
+                while first == b"[":
+                    pos = f.tell()
+                    line = f.readline().rstrip(b"\r\n")
+                    if not line or line == b"]":
+                        break
+                    try:
+                        entries[json.loads(line.rstrip(b","))["id"]] = -pos - 1
+                    except (ValueError, KeyError, TypeError):
+                        return None
+        try:
+            f = open(self.journal_path, "rb")
+        except FileNotFoundError:
+            return entries
+        with f:
+            pos = 0
+            for line in f:
+                try:
+                    record = json.loads(line)
+                    if record.get("op") == "put":
+                        entries[record["task"]["id"]] = pos + 1
+                    elif record.get("op") == "delete":
+                        entries.pop(record["id"], None)
+                except (ValueError, KeyError, TypeError):
+                    pass
+                pos += len(line)
+        return entries
+
+    def _write_index(self, entries: Dict[int, int], next_id: int) -> None:
+        """Écrit un index complet (en-tête + une entrée par ID).
+
+        Args:
+            entries: Positions codées des tâches vivantes.
+            next_id: Valeur minimale du compteur d'IDs.
+        """
+        ids = [i for i in entries if isinstance(i, int) and i > 0]
+        next_id = max(next_id, max(ids, default=0) + 1)
+        table = array("q", bytes(_INDEX_ENTRY.size * (next_id - 1)))
+        for task_id in ids:
+            table[task_id - 1] = entries[task_id]
+        if sys.byteorder != "little":
+            table.byteswap()
+        header = _INDEX_HEADER.pack(_INDEX_MAGIC, *self._stamp(), next_id)
+        _atomic_write(self.index_path, header + table.tobytes(), durable=False)
+        self._index_ready = True
+
+    def _update_index(self, entries: Dict[int, int]) -> None:
+        """Met à jour les entrées de l'index en place.
+
+        Les IDs existants sont réécrits un par un ; les nouveaux IDs (en fin
+        de table) sont ajoutés en une seule écriture.
+
+        Args:
+            entries: Nouvelles positions codées (0 pour une suppression).
+        """
+        with open(self.index_path, "r+b") as f:
+            header = _INDEX_HEADER.unpack(f.read(_INDEX_HEADER.size))
+            next_id = header[4]
+            valid = [i for i in entries if isinstance(i, int) and i > 0]
+            for task_id in sorted(i for i in valid if i < next_id):
+                f.seek(_INDEX_HEADER.size + (task_id - 1) * _INDEX_ENTRY.size)
+                f.write(_INDEX_ENTRY.pack(entries[task_id]))
+            new_ids = [i for i in valid if i >= next_id]
+            if new_ids:
+                tail = array("q", bytes(_INDEX_ENTRY.size * (max(new_ids) - next_id + 1)))
+                for task_id in new_ids:
+                    tail[task_id - next_id] = entries[task_id]
+                if sys.byteorder != "little":
+                    tail.byteswap()
+                f.seek(_INDEX_HEADER.size + (next_id - 1) * _INDEX_ENTRY.size)
+                f.write(tail.tobytes())
+                next_id = max(new_ids) + 1
+            f.seek(0)
+            f.write(_INDEX_HEADER.pack(_INDEX_MAGIC, *self._stamp(), next_id))
+
+    def _should_compact(self) -> bool:
+        """Indique si le journal est devenu assez gros pour être replié.
+
+        Returns:
+            True si un compactage automatique est recommandé.
+        """
+        try:
+            journal_size = os.path.getsize(self.journal_path)
+        except OSError:
+            return False
+        try:
+            snapshot_size = os.path.getsize(self.path)
+        except OSError:
+            snapshot_size = 0
+        return journal_size > max(JOURNAL_MIN_COMPACT_BYTES, snapshot_size)
+
+    def compact(self) -> int:
+        """Replie le journal dans un nouvel instantané.
+
+        Returns:
+            Le nombre de tâches de l'instantané.
+        """
+        self._tasks = None
+        tasks = self.load()
+        self.save(tasks)
+        return len(tasks)
+
+
+# Colonnes dédiées de la table SQLite ; les autres champs vont dans ``extra``.
+SQL_COLUMNS = ("id", "title", "desc", "priority", "due", "created")
+# Nombre d'IDs par requête ``IN (...)`` (sous la limite de variables de SQLite).
+SQL_IN_IDS = 500
+# Motif GLOB d'une date ``YYYY-MM-DD`` bien formée.
+SQL_DATE_GLOB = "[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9]"
+SQL_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY,
+    title TEXT NOT NULL,
+    "desc" TEXT NOT NULL DEFAULT '',
+    priority INTEGER NOT NULL DEFAULT 5,
+    due TEXT NOT NULL DEFAULT '',
+    created TEXT NOT NULL DEFAULT '',
+    extra TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_due ON tasks(due);
+CREATE INDEX IF NOT EXISTS idx_tasks_priority ON tasks(priority);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+# Relève le compteur ``next_id`` de ``meta`` (il ne redescend jamais).
+SQL_RAISE_NEXT_ID = """
+INSERT OR REPLACE INTO meta (key, value)
+SELECT 'next_id', MAX(?, COALESCE((SELECT value FROM meta WHERE key = 'next_id'), 1))
+"""
+
+
+class SqliteBackend(Backend):
+    """Stockage dans une base SQLite (module standard :mod:`sqlite3`).
+
+    ``id`` est la clé primaire (l'index ``rowid``) et des index secondaires
+    couvrent ``due`` et ``priority`` : modifier ou supprimer une tâche ne
+    touche qu'une ligne, et :meth:`query` traduit ``--overdue``,
+    ``--due-in`` et ``--sort`` en parcours d'index. La table ``meta``
+    conserve le compteur ``next_id`` : comme en journal, binaire et
+    partitionné, l'ID d'une tâche supprimée n'est jamais réattribué.
+
+    Args:
+        path: Chemin du fichier de base de données.
+    """
+
+    supports_query = True
+    streams = True
+    range_fields = ("id", "due", "priority")
+    ordered_ranges = range_fields
+
+    def __init__(self, path: str) -> None:
+        super().__init__()
+        self.path = path
+        self._schema_ready = False
+
+    def _open(self) -> sqlite3.Connection:
+        """Ouvre une connexion (:mod:`sqlite3` n'est importé qu'à ce moment).
+
+        Returns:
+            Une connexion à la base.
+        """
+        import sqlite3  # pylint: disable=import-outside-toplevel,redefined-outer-name
+
+        return sqlite3.connect(self.path)
+
+    @contextlib.contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Ouvre une connexion dans une transaction, fermée à la sortie.
+
+        Yields:
+            La connexion SQLite, avec le schéma créé si besoin.
+        """
+        conn = self._open()
+        try:
+            with conn:
+                if not self._schema_ready:
+                    conn.executescript(SQL_SCHEMA)
+                    self._schema_ready = True
+                yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _to_row(task: Dict[str, Any]) -> tuple:
+        """Convertit une tâche en ligne SQL (les champs inconnus vont dans ``extra``)."""
+        extra = {k: v for k, v in task.items() if k not in SQL_COLUMNS}
+        return (task["id"], task.get("title", ""), task.get("desc", ""),
+                task.get("priority", 5), task.get("due", ""), task.get("created", ""),
+                json.dumps(extra, ensure_ascii=False) if extra else None)
+
+    @staticmethod
+    def _to_task(row: tuple) -> Dict[str, Any]:
+        """Convertit une ligne SQL en dictionnaire de tâche."""
+        task = dict(zip(SQL_COLUMNS, row[:len(SQL_COLUMNS)]))
+        if row[-1]:
+            task.update(json.loads(row[-1]))
+        return task
+
+    _SELECT = 'SELECT id, title, "desc", priority, due, created, extra FROM tasks'
+
+    def load(self) -> List[Dict[str, Any]]:
+        """Charge toutes les tâches, par ID croissant.
+
+        Returns:
+            La liste des tâches.
+        """
+        with self._connect() as conn:
+            rows = conn.execute(self._SELECT + " ORDER BY id").fetchall()
+        return [self._to_task(r) for r in rows]
+
+    def _save(self, tasks: List[Dict[str, Any]]) -> None:
+        """Remplace le contenu de la table par *tasks*.
+
+        Args:
+            tasks: Liste de tâches à persister.
+        """
+        with self._connect() as conn:
+            conn.execute("DELETE FROM tasks")
+            conn.executemany("INSERT INTO tasks VALUES (?, ?, ?, ?, ?, ?, ?)",
+                             (self._to_row(t) for t in tasks))
+            conn.execute(SQL_RAISE_NEXT_ID, (max((t["id"] for t in tasks), default=0) + 1,))
+
+    def _write(self, puts: List[Dict[str, Any]], deletes: List[int]) -> None:
+        """Applique le lot dans une seule transaction.
+
+        Args:
+            puts: Tâches complètes à insérer ou remplacer (clé ``id``).
+            deletes: IDs des tâches à supprimer.
+        """
+        with self._connect() as conn:
+            conn.executemany("INSERT OR REPLACE INTO tasks VALUES (?, ?, ?, ?, ?, ?, ?)",
+                             (self._to_row(t) for t in puts))
+            conn.executemany("DELETE FROM tasks WHERE id = ?", ((i,) for i in deletes))
+            if puts:
+                conn.execute(SQL_RAISE_NEXT_ID, (max(t["id"] for t in puts) + 1,))
+
+    def get(self, task_id: int) -> Optional[Dict[str, Any]]:
+        """Lit une seule ligne par clé primaire.
+
+        Args:
+            task_id: ID recherché.
+
+        Returns:
+            Le dictionnaire de la tâche, ou None si elle n'existe pas.
+        """
+        with self._connect() as conn:
+            row = conn.execute(self._SELECT + " WHERE id = ?", (task_id,)).fetchone()
+        return self._to_task(row) if row else None
+
+    def get_many(self, task_ids: Iterable[int]) -> List[Dict[str, Any]]:
+        """Lit les tâches *task_ids* par clé primaire, :data:`SQL_IN_IDS` à la fois.
+
+        Args:
+            task_ids: IDs recherchés.
+
+        Returns:
+            Les dictionnaires des tâches trouvées, dans l'ordre demandé.
+        """
+        ids = [i for i in task_ids if isinstance(i, int)]
+        by_id: Dict[int, Dict[str, Any]] = {}
+        with self._connect() as conn:
+            for start in range(0, len(ids), SQL_IN_IDS):
+                chunk = ids[start:start + SQL_IN_IDS]
+                sql = f"{self._SELECT} WHERE id IN ({', '.join('?' * len(chunk))})"
+                by_id.update((row[0], row) for row in conn.execute(sql, chunk))
+        return [self._to_task(by_id[i]) for i in ids if i in by_id]
+
+    def next_id(self) -> int:
+        """Retourne le compteur de ``meta``, ou ``MAX(id) + 1`` s'il est plus grand.
+
+        ``MAX(id)`` est lu sur l'index de clé primaire ; il couvre aussi les
+        bases créées avant la table ``meta``.
+
+        Returns:
+            L'ID à attribuer à la prochaine tâche.
+        """
+        with self._connect() as conn:
+            (value,) = conn.execute(
+                "SELECT MAX(COALESCE((SELECT value FROM meta WHERE key = 'next_id'), 1), "
+                "(SELECT COALESCE(MAX(id), 0) + 1 FROM tasks))").fetchone()
+        return max(value, self.id_floor)
+
+    def compact(self) -> int:
+        """Défragmente la base (``VACUUM``).
+
+        Returns:
+            Le nombre de tâches de la base.
+        """
+        with self._connect() as conn:
+            (count,) = conn.execute("SELECT COUNT(*) FROM tasks").fetchone()
+        conn = self._open()
+        try:
+            conn.execute("VACUUM")
+        finally:
+            conn.close()
+        return count
+
+    def iter_tasks(self) -> Iterator[Dict[str, Any]]:
+        """Parcourt les tâches par ID croissant, au fil du curseur SQL.
+
+        Yields:
+            Les tâches, une ligne décodée à la fois.
+        """
+        with self._connect() as conn:
+            for row in conn.execute(self._SELECT + " ORDER BY id"):
+                yield self._to_task(row)
+
+    @staticmethod
+    def _range_clause(field: str, low: Optional[int],
+                      high: Optional[int]) -> Tuple[str, List[Any]]:
+        """Traduit une plage en clause ``WHERE`` (échéances en ordinaux)."""
+        clauses: List[str] = []
+        params: List[Any] = []
+        if field == "due":
+            clauses.append("due GLOB ?")
+            params.append(SQL_DATE_GLOB)
+            low = None if low is None else date.fromordinal(low).isoformat()
+            high = None if high is None else date.fromordinal(high).isoformat()
+        if low is not None:
+            clauses.append(f"{field} >= ?")
+            params.append(low)
+        if high is not None:
+            clauses.append(f"{field} <= ?")
+            params.append(high)
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def range_count(self, field: str, low: Optional[int], high: Optional[int]) -> int:
+        """Compte les tâches de la plage via l'index de *field* (``COUNT(*)``).
+
+        Args:
+            field: ``"id"``, ``"due"`` (ordinaux) ou ``"priority"``.
+            low: Borne inférieure incluse (None = aucune).
+            high: Borne supérieure incluse (None = aucune).
+
+        Returns:
+            Le nombre exact de tâches de la plage.
+        """
+        where, params = self._range_clause(field, low, high)
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM tasks" + where, params).fetchone()[0]
+
+    def iter_range(self, field: str, low: Optional[int],
+                   high: Optional[int]) -> Iterator[Dict[str, Any]]:
+        """Parcourt la plage dans l'ordre ``(field, id)``, au fil du curseur.
+
+        Args:
+            field: ``"id"``, ``"due"`` (ordinaux) ou ``"priority"``.
+            low: Borne inférieure incluse (None = aucune).
+            high: Borne supérieure incluse (None = aucune).
+
+        Yields:
+            Les tâches de la plage.
+        """
+        where, params = self._range_clause(field, low, high)
+        with self._connect() as conn:
+            for row in conn.execute(f"{self._SELECT}{where} ORDER BY {field}, id", params):
+                yield self._to_task(row)
+
+    def query(self, overdue: bool, due_in: Optional[int], sort: str, today: date,
+              limit: Optional[int] = None, offset: int = 0) -> List[Dict[str, Any]]:
+        """Exécute les filtres de rappel, le tri et la pagination en SQL.
+
+        Les dates ``YYYY-MM-DD`` se comparent comme des chaînes, ce qui
+        permet un parcours de plage sur ``idx_tasks_due``. Les dates mal
+        formées sont exclues des filtres et placées en fin de tri par date,
+        comme dans le chemin Python.
+
+        Args:
+            overdue: Ne garder que les tâches en retard.
+            due_in: Ne garder que les tâches à échéance dans ce nombre de jours.
+            sort: ``"priority"`` ou ``"date"``.
+            today: Date de référence.
+            limit: Nombre maximal de tâches retournées (None = toutes).
+            offset: Nombre de tâches à sauter en tête de résultat.
+
+        Returns:
+            Les tâches filtrées et triées.
+        """
+        sql = self._SELECT
+        params: List[Any] = []
+        if overdue:
+            sql += " WHERE due < ? AND due GLOB ?"
+            params += [today.isoformat(), SQL_DATE_GLOB]
+        elif due_in is not None:
+            sql += " WHERE due BETWEEN ? AND ? AND due GLOB ?"
+            params += [today.isoformat(), (today + timedelta(days=due_in)).isoformat(),
+                       SQL_DATE_GLOB]
+        if sort == "priority":
+            sql += " ORDER BY priority, id"
+        else:
+            sql += f" ORDER BY due NOT GLOB '{SQL_DATE_GLOB}', due, id"
+        if limit is not None or offset:
+            sql += " LIMIT ? OFFSET ?"
+            params += [-1 if limit is None else limit, offset]
+        with self._connect() as conn:
+            rows = conn.execute(sql, params).fetchall()
+        return [self._to_task(r) for r in rows]
+
+
+# En-tête du format binaire : magic, nombre de tâches, next_id.
+_BINARY_HEADER = struct.Struct("<8sqq")
+BINARY_MAGIC = b"TASKBIN2"
+
+
+def encode_binary(tasks: Iterable[Dict[str, Any]], next_id: int = 1) -> bytes:
+    """Sérialise les tâches au format binaire de :class:`BinaryBackend`.
+
+    Args:
+        tasks: Tâches à sérialiser (dans un ordre quelconque).
+        next_id: Valeur minimale du compteur d'IDs.
+
+    Returns:
+        Le contenu complet du fichier.
+    """
+    tasks = sorted(tasks, key=lambda t: t["id"])
+    table = TaskTable.from_tasks(tasks)
+    offsets = array("q", [0])
+    chunks = []
+    for task in tasks:
+        blob = json.dumps(task, ensure_ascii=False).encode("utf-8") + b","
+        chunks.append(blob)
+        offsets.append(offsets[-1] + len(blob))
+    by_due = array("i", sorted(range(len(tasks)), key=table.dues.__getitem__))
+    columns = [table.ids, offsets, table.dues, by_due, table.priorities]
+    if sys.byteorder != "little":
+        for column in columns:
+            column.byteswap()
+    next_id = max(next_id, max(table.ids, default=0) + 1)
+    body = b"".join(c.tobytes() for c in columns)
+    padding = b"\0" * (-len(body) % 8)
+    return (_BINARY_HEADER.pack(BINARY_MAGIC, len(tasks), next_id) + body + padding
+            + b"".join(chunks))
+
+
+class _Columns:
+    """Vue en colonnes d'un fichier binaire projeté en mémoire.
+
+    Attributes:
+        count: Nombre de tâches.
+        next_id: Compteur d'IDs persisté.
+        ids, offsets, dues, priorities: Colonnes (``memoryview`` ou ``array``).
+        by_due: Numéros de ligne triés par échéance (puis par ID).
+        heap: Tas des enregistrements JSON, chacun suivi d'une virgule.
+    """
+
+    def __init__(self, data: Any, stack: contextlib.ExitStack) -> None:
+        _, self.count, self.next_id = _BINARY_HEADER.unpack_from(data)
+        n = self.count
+        pos = _BINARY_HEADER.size
+        self.ids, pos = self._column(data, pos, "q", n, stack)
+        self.offsets, pos = self._column(data, pos, "q", n + 1, stack)
+        self.dues, pos = self._column(data, pos, "i", n, stack)
+        self.by_due, pos = self._column(data, pos, "i", n, stack)
+        self.priorities, pos = self._column(data, pos, "b", n, stack)
+        pos += -pos % 8
+        self.heap = stack.enter_context(memoryview(data)[pos:])
+
+    @staticmethod
+    def _column(data: Any, pos: int, typecode: str, length: int,
+                stack: contextlib.ExitStack) -> Tuple[Any, int]:
+        """Lit la colonne de *length* valeurs qui commence à l'octet *pos*.
+
+        Returns:
+            La colonne, sans copie (ordre des octets natif) ou copiée et
+            convertie, et la position de la colonne suivante.
+        """
+        end = pos + array(typecode).itemsize * length
+        if sys.byteorder == "little":
+            view = stack.enter_context(memoryview(data)[pos:end])
+            return stack.enter_context(view.cast(typecode)), end
+        column = array(typecode, data[pos:end])
+        column.byteswap()
+        return column, end
+
+    def record(self, row: int) -> bytes:
+        """Retourne l'enregistrement JSON brut de la ligne *row*."""
+        return bytes(self.heap[self.offsets[row]:self.offsets[row + 1] - 1])
+
+    def decode(self, rows: Iterable[int]) -> List[Dict[str, Any]]:
+        """Décode les tâches des lignes *rows* en un seul appel JSON."""
+        rows = list(rows)
+        if not rows:
+            return []
+        return json.loads(b"[" + b",".join(self.record(r) for r in rows) + b"]")
+
+    def decode_range(self, start: int, stop: int) -> List[Dict[str, Any]]:
+        """Décode les lignes contiguës ``[start, stop)`` (une seule copie du tas)."""
+        if start >= stop:
+            return []
+        return json.loads(b"[" + self.heap[self.offsets[start]:self.offsets[stop] - 1] + b"]")
+
+    def find(self, task_id: int) -> Optional[int]:
+        """Retourne la ligne de *task_id* (colonne des IDs triée), ou None."""
+        row = bisect_left(self.ids, task_id)
+        return row if row < self.count and self.ids[row] == task_id else None
+
+    def _due_position(self, ordinal: int) -> int:
+        """Retourne la première position de ``by_due`` dont l'échéance est >= *ordinal*."""
+        order, dues = self.by_due, self.dues
+        low, high = 0, self.count
+        while low < high:
+            mid = (low + high) // 2
+            if dues[order[mid]] < ordinal:
+                low = mid + 1
+            else:
+                high = mid
+        return low
+
+    def due_rows(self, low: Optional[int], high: Optional[int]) -> List[int]:
+        """Retourne les lignes dont l'échéance est dans ``[low, high]``, par ID croissant.
+
+        La plage est trouvée par dichotomie sur ``by_due`` : seules les
+        lignes retenues sont lues. Les échéances invalides (ordinal 0) sont
+        exclues.
+
+        Args:
+            low: Ordinal minimal (inclus), ou None.
+            high: Ordinal maximal (inclus), ou None.
+
+        Returns:
+            Les numéros de ligne.
+        """
+        start = self._due_position(1 if low is None else max(low, 1))
+        stop = self.count if high is None else self._due_position(high + 1)
+        return sorted(self.by_due[start:stop])
+
+
+class BinaryBackend(Backend):
+    """Instantané binaire en colonnes, lu via :mod:`mmap`.
+
+    Le fichier contient un en-tête (magic, nombre de tâches, ``next_id``),
+    des colonnes de largeur fixe triées par ID (ID, position dans le tas,
+    ordinal d'échéance, priorité), les numéros de ligne triés par échéance
+    (une plage d'échéances se trouve par dichotomie), puis un tas des
+    tâches complètes en JSON (titre, description, etc.), séparées par des
+    virgules pour qu'une plage de lignes contiguës se décode d'un seul
+    appel. Les filtres de rappel, le tri et la pagination lisent
+    uniquement les colonnes ; seules les tâches retenues sont décodées.
+    Chaque écriture réécrit l'instantané (comme le JSON).
+
+    Args:
+        path: Chemin du fichier binaire.
+    """
+
+    supports_query = True
+    streams = True
+    range_fields = ("id", "due", "priority")
+
+    def __init__(self, path: str) -> None:
+        super().__init__()
+        self.path = path
+
+    @contextlib.contextmanager
+    def _columns(self) -> Iterator[Optional[_Columns]]:
+        """Projette le fichier en mémoire le temps d'une lecture.
+
+        Yields:
+            Les colonnes, ou None si le fichier est absent ou vide.
+
+        Raises:
+            ValueError: Si le fichier n'est pas au format binaire.
+        """
+        stack = contextlib.ExitStack()
+        try:
+            yield self._open_columns(stack)
+        finally:
+            stack.close()
+
+    def _open_columns(self, stack: contextlib.ExitStack) -> Optional[_Columns]:
+        """Ouvre et projette le fichier ; les ressources sont confiées à *stack*."""
+        try:
+            fd = os.open(self.path, os.O_RDONLY)
+        except FileNotFoundError:
+            return None
+        stack.callback(os.close, fd)
+        if os.fstat(fd).st_size == 0:
+            return None
+        mapped = stack.enter_context(mmap.mmap(fd, 0, access=mmap.ACCESS_READ))
+        if mapped[:len(BINARY_MAGIC)] != BINARY_MAGIC:
+            raise ValueError(f"{self.path} n'est pas un instantané binaire")
+        return _Columns(mapped, stack)
+
+    def load(self) -> List[Dict[str, Any]]:
+        """Décode toutes les tâches, par ID croissant.
+
+        Returns:
+            La liste des tâches.
+        """
+        with self._columns() as cols:
+            return cols.decode_range(0, cols.count) if cols else []
+
+    def iter_tasks(self) -> Iterator[Dict[str, Any]]:
+        """Décode les tâches par blocs de :data:`ITER_BLOCK`.
+
+        Yields:
+            Les tâches, par ID croissant.
+        """
+        with self._columns() as cols:
+            if cols is None:
+                return
+            for start in range(0, cols.count, ITER_BLOCK):
+                yield from cols.decode_range(start, min(start + ITER_BLOCK, cols.count))
+
+    @staticmethod
+    def _range_rows(cols: _Columns, field: str, low: Optional[int],
+                    high: Optional[int]) -> List[int]:
+        """Retourne les lignes de la plage ``[low, high]`` de *field*, par ID croissant."""
+        if field == "due":
+            return cols.due_rows(low, high)
+        column = cols.priorities
+        low = -128 if low is None else low
+        high = 127 if high is None else high
+        return [r for r in range(cols.count) if low <= column[r] <= high]
+
+    def range_count(self, field: str, low: Optional[int], high: Optional[int]) -> int:
+        """Compte les tâches de la plage en lisant la seule colonne *field*.
+
+        Args:
+            field: ``"id"``, ``"due"`` (ordinaux) ou ``"priority"``.
+            low: Borne inférieure incluse (None = aucune).
+            high: Borne supérieure incluse (None = aucune).
+
+        Returns:
+            Le nombre de tâches de la plage.
+        """
+        if field == "id":
+            return super().range_count(field, low, high)
+        with self._columns() as cols:
+            return len(self._range_rows(cols, field, low, high)) if cols else 0
+
+    def iter_range(self, field: str, low: Optional[int],
+                   high: Optional[int]) -> Iterator[Dict[str, Any]]:
+        """Décode seulement les tâches de la plage, repérées sur les colonnes.
+
+        Args:
+            field: ``"id"``, ``"due"`` (ordinaux) ou ``"priority"``.
+            low: Borne inférieure incluse (None = aucune).
+            high: Borne supérieure incluse (None = aucune).
+
+        Yields:
+            Les tâches de la plage, par ID croissant.
+        """
+        if field == "id":
+            yield from super().iter_range(field, low, high)
+            return
+        with self._columns() as cols:
+            if cols is None:
+                return
+            rows = self._range_rows(cols, field, low, high)
+            for start in range(0, len(rows), ITER_BLOCK):
+                yield from cols.decode(rows[start:start + ITER_BLOCK])
+
+    def get_many(self, task_ids: Iterable[int]) -> List[Dict[str, Any]]:
+        """Lit les tâches *task_ids* par dichotomie sur la colonne des IDs.
+
+        Args:
+            task_ids: IDs recherchés.
+
+        Returns:
+            Les tâches trouvées, dans l'ordre demandé.
+        """
+        with self._columns() as cols:
+            if cols is None:
+                return []
+            rows = (cols.find(i) for i in task_ids if isinstance(i, int))
+            return cols.decode(r for r in rows if r is not None)
+
+    def get(self, task_id: int) -> Optional[Dict[str, Any]]:
+        """Lit une seule tâche.
+
+        Args:
+            task_id: ID recherché.
+
+        Returns:
+            Le dictionnaire de la tâche, ou None si elle n'existe pas.
+        """
+        found = self.get_many([task_id])
+        return found[0] if found else None
+
+    def next_id(self) -> int:
+        """Retourne le compteur d'IDs lu dans l'en-tête.
+
+        Returns:
+            L'ID à attribuer à la prochaine tâche.
+        """
+        with self._columns() as cols:
+            return max(cols.next_id if cols else 1, self.id_floor)
+
+    def _save(self, tasks: List[Dict[str, Any]]) -> None:
+        """Réécrit l'instantané (le compteur d'IDs est conservé).
+
+        Args:
+            tasks: Liste de tâches à persister.
+        """
+        _atomic_write(self.path, encode_binary(tasks, self.next_id()))
+
+    def _write(self, puts: List[Dict[str, Any]], deletes: List[int]) -> None:
+        """Applique le lot puis réécrit l'instantané.
+
+        Args:
+            puts: Tâches complètes à insérer ou remplacer (clé ``id``).
+            deletes: IDs des tâches à supprimer.
+        """
+        by_id = {t["id"]: t for t in self.load()}
+        for task in puts:
+            by_id[task["id"]] = task
+        for task_id in deletes:
+            by_id.pop(task_id, None)
+        self._save(list(by_id.values()))
+
+    def compact(self) -> int:
+        """Réécrit l'instantané.
+
+        Returns:
+            Le nombre de tâches persistées.
+        """
+        tasks = self.load()
+        self.save(tasks)
+        return len(tasks)
+
+    def query(self, overdue: bool, due_in: Optional[int], sort: str, today: date,
+              limit: Optional[int] = None, offset: int = 0) -> List[Dict[str, Any]]:
+        """Filtre, trie et pagine sur les colonnes, puis décode la page.
+
+        Args:
+            overdue: Ne garder que les tâches en retard.
+            due_in: Ne garder que les tâches à échéance dans ce nombre de jours.
+            sort: ``"priority"`` ou ``"date"``.
+            today: Date de référence.
+            limit: Nombre maximal de tâches retournées (None = toutes).
+            offset: Nombre de tâches à sauter en tête de résultat.
+
+        Returns:
+            Les tâches filtrées et triées.
+        """
+        with self._columns() as cols:
+            if cols is None:
+                return []
+            day = today.toordinal()
+            dues = cols.dues
+            rows: Iterable[int] = range(cols.count)
+            if overdue:
+                rows = cols.due_rows(None, day - 1)
+            elif due_in is not None:
+                rows = cols.due_rows(day, day + due_in)
+
+            def by_date(row: int) -> int:
+                return dues[row] or NO_DUE
+            key = cols.priorities.__getitem__ if sort == "priority" else by_date
+            if limit is None:
+                selected = sorted(rows, key=key)[offset:]
+            else:
+                selected = heapq.nsmallest(offset + limit, rows, key=key)[offset:]
+            return cols.decode(selected)
+
+
+PARTITION_MANIFEST = "manifest.json"
+PARTITION_LOCATOR = "ids.bin"
+# Partition des tâches sans échéance valide.
+UNDATED_PARTITION = "sans-echeance"
+# En-tête du localisateur : magic et génération du manifeste ; suivi d'un code de
+# partition par ID (0 = tâche absente).
+_LOCATOR_HEADER = struct.Struct("<8sq")
+_LOCATOR_MAGIC = b"TASKLOC1"
+_LOCATOR_ENTRY = struct.Struct("<i")
+
+
+def month_key(ordinal: int) -> str:
+    """Retourne le mois ``YYYY-MM`` d'un ordinal de date.
+
+    Args:
+        ordinal: ``date.toordinal()`` d'une date valide.
+
+    Returns:
+        Le nom de la partition de ce mois.
+    """
+    day = date.fromordinal(ordinal)
+    return f"{day.year:04d}-{day.month:02d}"
+
+
+def partition_key(task: Dict[str, Any]) -> str:
+    """Retourne la partition d'une tâche (mois de son échéance).
+
+    Args:
+        task: Dictionnaire représentant la tâche.
+
+    Returns:
+        ``YYYY-MM``, ou :data:`UNDATED_PARTITION` si l'échéance est absente
+        ou mal formée.
+    """
+    ordinal = due_ordinal(task)
+    return month_key(ordinal) if ordinal else UNDATED_PARTITION
+
+
+class PartitionedBackend(Backend):
+    """Stockage partitionné par mois d'échéance.
+
+    *path* est un répertoire qui contient un fichier par mois
+    (``2025-01.json``, tableau JSON d'une tâche par ligne, trié par ID),
+    ``sans-echeance.json`` pour les échéances invalides et un manifeste
+    (``manifest.json`` : compteur d'IDs, code et taille de chaque
+    partition, génération). Un localisateur binaire (``ids.bin``) donne la
+    partition de chaque ID : lire, modifier ou supprimer une tâche ne
+    réécrit que sa partition (et celle d'arrivée si l'échéance change de
+    mois). Les filtres de rappel n'ouvrent que les partitions de la plage :
+    le coût des tâches récentes ne dépend pas de la taille de l'archive.
+
+    Les partitions sont écrites avant le localisateur, lui-même écrit
+    avant le manifeste ; un localisateur d'une autre génération que le
+    manifeste est reconstruit à partir des partitions.
+
+    Args:
+        path: Chemin du répertoire (créé à la première écriture).
+    """
+
+    supports_query = True
+    streams = True
+    range_fields = ("id", "due")
+
+    def __init__(self, path: str) -> None:
+        super().__init__()
+        self.path = path
+        self.manifest_path = os.path.join(path, PARTITION_MANIFEST)
+        self.locator_path = os.path.join(path, PARTITION_LOCATOR)
+        self._manifest: Optional[Dict[str, Any]] = None
+        self._partitions: Dict[str, List[Dict[str, Any]]] = {}
+
+    def invalidate(self) -> None:
+        """Oublie le manifeste et les partitions chargés : la prochaine lecture les relit."""
+        self._manifest = None
+        self._partitions = {}
+
+    # ---------- Manifeste et partitions ----------
+    def _read_manifest(self) -> Dict[str, Any]:
+        """Charge (une fois par instance) le manifeste.
+
+        Returns:
+            ``{"generation", "next_id", "partitions": {mois: {"code", "count"}}}``.
+
+        Raises:
+            ValueError: Si le manifeste n'est pas un JSON valide.
+        """
+        if self._manifest is None:
+            try:
+                with open(self.manifest_path, encoding="utf-8") as f:
+                    self._manifest = json.load(f)
+            except FileNotFoundError:
+                self._manifest = {"generation": 0, "next_id": 1, "partitions": {}}
+            except json.JSONDecodeError as exc:
+                raise ValueError(f"Manifeste illisible ({self.manifest_path}) : {exc}") from exc
+        return self._manifest
+
+    def _write_manifest(self, manifest: Dict[str, Any]) -> None:
+        """Remplace le manifeste (dernière étape d'une écriture).
+
+        Args:
+            manifest: Nouveau manifeste.
+        """
+        _atomic_write(self.manifest_path, json.dumps(manifest, indent=2, sort_keys=True))
+        self._manifest = manifest
+
+    def _partition_path(self, key: str) -> str:
+        """Retourne le fichier de la partition *key*."""
+        return os.path.join(self.path, key + ".json")
+
+    def _read_partition(self, key: str) -> List[Dict[str, Any]]:
+        """Charge les tâches d'une partition.
+
+        Sous le verrou, une partition n'est décodée qu'une fois : aucun autre
+        processus ne peut l'écrire (une suite de lectures ponctuelles, par
+        exemple dans une transaction, ne relit pas le même mois).
+
+        Args:
+            key: Nom de la partition.
+
+        Returns:
+            Ses tâches, par ID croissant.
+        """
+        if self._lock_depth and key in self._partitions:
+            return self._partitions[key]
+        with span("load"):
+            tasks = _read_json_list(self._partition_path(key))
+        if self._lock_depth:
+            self._partitions[key] = tasks
+        return tasks
+
+    def _write_partition(self, key: str, tasks: List[Dict[str, Any]]) -> None:
+        """Réécrit une partition, ou la supprime si elle est vide.
+
+        Args:
+            key: Nom de la partition.
+            tasks: Ses tâches, par ID croissant.
+        """
+        self._partitions.pop(key, None)
+        if tasks:
+            _atomic_write(self._partition_path(key), dump_lines(tasks))
+            return
+        try:
+            os.remove(self._partition_path(key))
+        except FileNotFoundError:
+            pass
+
+    def _keys(self, low: Optional[int] = None, high: Optional[int] = None) -> List[str]:
+        """Retourne les partitions, dans l'ordre chronologique.
+
+        Args:
+            low: Ordinal minimal des échéances recherchées (None = tout).
+            high: Ordinal maximal des échéances recherchées.
+
+        Returns:
+            Les partitions qui peuvent contenir une échéance dans
+            ``[low, high]`` (toutes, sans-échéance en dernier, si *low* est None).
+        """
+        partitions = self._read_manifest()["partitions"]
+        keys = sorted(k for k in partitions if k != UNDATED_PARTITION)
+        if low is None or high is None:
+            return keys + [k for k in partitions if k == UNDATED_PARTITION]
+        if low > high:
+            return []
+        first, last = month_key(max(low, 1)), month_key(high)
+        return [k for k in keys if first <= k <= last]
+
+    # ---------- Localisateur ----------
+    def _locator_generation(self) -> Optional[int]:
+        """Lit la génération inscrite dans le localisateur (None s'il est absent ou invalide)."""
+        try:
+            with open(self.locator_path, "rb") as f:
+                magic, generation = _LOCATOR_HEADER.unpack(f.read(_LOCATOR_HEADER.size))
+        except (OSError, struct.error):
+            return None
+        return generation if magic == _LOCATOR_MAGIC else None
+
+    def _ensure_locator(self) -> None:
+        """Reconstruit le localisateur s'il ne correspond pas au manifeste."""
+        if self._locator_generation() == self._read_manifest()["generation"]:
+            return
+        with self.lock():  # pas de reconstruction concurrente
+            manifest = self._read_manifest()
+            if self._locator_generation() != manifest["generation"]:
+                codes = array("i", bytes(_LOCATOR_ENTRY.size * manifest["next_id"]))
+                for key, info in manifest["partitions"].items():
+                    for task in self._read_partition(key):
+                        codes[task["id"]] = info["code"]
+                self._write_locator(codes, manifest["generation"])
+
+    def _write_locator(self, codes: array, generation: int) -> None:
+        """Réécrit entièrement le localisateur.
+
+        Args:
+            codes: Code de partition par ID (indice = ID).
+            generation: Génération du manifeste correspondant.
+        """
+        if sys.byteorder != "little":  # pragma: no cover - format petit-boutiste
+            codes.byteswap()
+        _atomic_write(self.locator_path,
+                      _LOCATOR_HEADER.pack(_LOCATOR_MAGIC, generation) + codes.tobytes(),
+                      durable=False)
+
+    def _update_locator(self, entries: Dict[int, int], generation: int) -> None:
+        """Met à jour quelques entrées du localisateur en place.
+
+        Args:
+            entries: Nouveau code de partition par ID (0 = supprimée).
+            generation: Génération du manifeste qui sera écrit.
+        """
+        with open(self.locator_path, "r+b") as f:
+            for task_id, code in sorted(entries.items()):
+                f.seek(_LOCATOR_HEADER.size + _LOCATOR_ENTRY.size * task_id)
+                f.write(_LOCATOR_ENTRY.pack(code))
+            f.seek(0)
+            f.write(_LOCATOR_HEADER.pack(_LOCATOR_MAGIC, generation))
+
+    def _locate(self, task_ids: Iterable[int]) -> Dict[int, str]:
+        """Retourne la partition de chacun des IDs existants parmi *task_ids*.
+
+        Args:
+            task_ids: IDs recherchés.
+
+        Returns:
+            Un dictionnaire ``id -> partition`` (les IDs absents sont omis).
+        """
+        manifest = self._read_manifest()
+        if not manifest["partitions"]:
+            return {}
+        self._ensure_locator()
+        names = {info["code"]: key for key, info in manifest["partitions"].items()}
+        found = {}
+        with open(self.locator_path, "rb") as f, \
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            for task_id in task_ids:
+                if not isinstance(task_id, int) or task_id < 1:
+                    continue
+                offset = _LOCATOR_HEADER.size + _LOCATOR_ENTRY.size * task_id
+                if offset + _LOCATOR_ENTRY.size <= len(data):
+                    key = names.get(_LOCATOR_ENTRY.unpack_from(data, offset)[0])
+                    if key is not None:
+                        found[task_id] = key
+        return found
+
+    # ---------- Lecture ----------
+    def load(self) -> List[Dict[str, Any]]:
+        """Charge toutes les tâches, par ID croissant.
+
+        Returns:
+            La liste des tâches.
+        """
+        return sorted(self.iter_tasks(), key=lambda t: t["id"])
+
+    def iter_tasks(self) -> Iterator[Dict[str, Any]]:
+        """Parcourt les partitions une à une (la mémoire dépend du plus gros mois).
+
+        Yields:
+            Les tâches, par mois d'échéance puis par ID.
+        """
+        for key in self._keys():
+            yield from self._read_partition(key)
+
+    def get_many(self, task_ids: Iterable[int]) -> List[Dict[str, Any]]:
+        """Lit les tâches *task_ids* en n'ouvrant que leurs partitions.
+
+        Args:
+            task_ids: IDs recherchés.
+
+        Returns:
+            Les tâches trouvées, dans l'ordre demandé.
+        """
+        task_ids = list(task_ids)
+        located = self._locate(task_ids)
+        by_id = {}
+        for key in sorted(set(located.values())):
+            by_id.update((t["id"], t) for t in self._read_partition(key))
+        return [by_id[i] for i in task_ids if i in by_id]
+
+    def get(self, task_id: int) -> Optional[Dict[str, Any]]:
+        """Lit une seule tâche (une partition ouverte).
+
+        Args:
+            task_id: ID recherché.
+
+        Returns:
+            Le dictionnaire de la tâche, ou None si elle n'existe pas.
+        """
+        found = self.get_many([task_id])
+        return found[0] if found else None
+
+    def next_id(self) -> int:
+        """Retourne le compteur d'IDs du manifeste (les IDs ne sont jamais réutilisés).
+
+        Returns:
+            L'ID à attribuer à la prochaine tâche.
+        """
+        return max(self._read_manifest()["next_id"], self.id_floor)
+
+    def range_count(self, field: str, low: Optional[int], high: Optional[int]) -> int:
+        """Estime la plage d'échéances par les tailles des mois concernés.
+
+        Args:
+            field: ``"id"`` ou ``"due"`` (ordinaux).
+            low: Borne inférieure incluse (None = aucune).
+            high: Borne supérieure incluse (None = aucune).
+
+        Returns:
+            Le nombre de tâches des partitions à ouvrir.
+        """
+        if field == "id":
+            return super().range_count(field, low, high)
+        partitions = self._read_manifest()["partitions"]
+        return sum(partitions[key]["count"] for key in self._keys(low, high))
+
+    def iter_range(self, field: str, low: Optional[int],
+                   high: Optional[int]) -> Iterator[Dict[str, Any]]:
+        """Parcourt les seules partitions des mois de la plage d'échéances.
+
+        Args:
+            field: ``"id"`` ou ``"due"`` (ordinaux).
+            low: Borne inférieure incluse (None = aucune).
+            high: Borne supérieure incluse (None = aucune).
+
+        Yields:
+            Les tâches de ces partitions (mois entiers).
+        """
+        if field == "id":
+            yield from super().iter_range(field, low, high)
+            return
+        for key in self._keys(low, high):
+            yield from self._read_partition(key)
+
+    def version(self) -> Tuple[int, int, int, int]:
+        """Signature du manifeste, réécrit à chaque écriture.
+
+        Returns:
+            ``(inode, mtime_ns, taille, génération)`` du manifeste.
+        """
+        try:
+            st = os.stat(self.manifest_path)
+        except OSError:
+            return (0, 0, 0, 0)
+        return (st.st_ino, st.st_mtime_ns, st.st_size, self._read_manifest()["generation"])
+
+    def query(self, overdue: bool, due_in: Optional[int], sort: str, today: date,
+              limit: Optional[int] = None, offset: int = 0) -> List[Dict[str, Any]]:
+        """Filtre, trie et pagine en n'ouvrant que les partitions de la plage.
+
+        Args:
+            overdue: Ne garder que les tâches en retard.
+            due_in: Ne garder que les tâches à échéance dans ce nombre de jours.
+            sort: ``"priority"`` ou ``"date"``.
+            today: Date de référence.
+            limit: Nombre maximal de tâches retournées (None = toutes).
+            offset: Nombre de tâches à sauter en tête de résultat.
+
+        Returns:
+            Les tâches filtrées et triées (par ID à valeur de tri égale).
+        """
+        day = today.toordinal()
+        low: Optional[int] = None
+        high: Optional[int] = None
+        if overdue:
+            low, high = 1, day - 1
+        elif due_in is not None:
+            low, high = day, day + due_in
+        tasks: Iterable[Dict[str, Any]] = (t for key in self._keys(low, high)
+                                           for t in self._read_partition(key))
+        if low is not None and high is not None:
+            tasks = (t for t in tasks if low <= due_ordinal(t) <= high)
+
+        def rank(task: Dict[str, Any]) -> Tuple[int, int]:
+            if sort == "priority":
+                return (int(task.get("priority", 5)), task["id"])
+            return (due_ordinal(task) or NO_DUE, task["id"])
+        if limit is None:
+            return sorted(tasks, key=rank)[offset:]
+        return heapq.nsmallest(offset + limit, tasks, key=rank)[offset:]
+
+    # ---------- Écriture ----------
+    def _save(self, tasks: List[Dict[str, Any]]) -> None:
+        """Réécrit toutes les partitions (le compteur d'IDs est conservé).
+
+        Args:
+            tasks: Liste de tâches à persister.
+        """
+        self.rewrite(tasks, self.next_id())
+
+    def rewrite(self, tasks: List[Dict[str, Any]], next_id: int = 1) -> None:
+        """Répartit *tasks* dans de nouvelles partitions, à l'appelant de verrouiller.
+
+        Args:
+            tasks: Contenu complet du stockage.
+            next_id: Compteur d'IDs minimal à conserver.
+        """
+        groups: Dict[str, List[Dict[str, Any]]] = {}
+        for task in sorted(tasks, key=lambda t: t["id"]):
+            groups.setdefault(partition_key(task), []).append(task)
+        old = set(self._read_manifest()["partitions"])
+        generation = self._read_manifest()["generation"] + 1
+        next_id = max([next_id] + [t["id"] + 1 for t in tasks])
+        os.makedirs(self.path, exist_ok=True)
+        partitions = {}
+        codes = array("i", bytes(_LOCATOR_ENTRY.size * next_id))
+        for code, key in enumerate(sorted(groups), start=1):
+            self._write_partition(key, groups[key])
+            partitions[key] = {"code": code, "count": len(groups[key])}
+            for task in groups[key]:
+                codes[task["id"]] = code
+        self._write_locator(codes, generation)
+        self._write_manifest({"generation": generation, "next_id": next_id,
+                              "partitions": partitions})
+        for key in old - set(partitions):
+            self._write_partition(key, [])
+
+    def _write(self, puts: List[Dict[str, Any]], deletes: List[int]) -> None:
+        """Réécrit seulement les partitions touchées par le lot.
+
+        Une tâche dont l'échéance change de mois est retirée de son ancienne
+        partition et ajoutée à la nouvelle.
+
+        Args:
+            puts: Tâches complètes à insérer ou remplacer (clé ``id``).
+            deletes: IDs des tâches à supprimer.
+        """
+        manifest = self._read_manifest()
+        if not manifest["partitions"]:
+            os.makedirs(self.path, exist_ok=True)
+        targets = {t["id"]: partition_key(t) for t in puts}
+        for task_id in deletes:
+            targets.pop(task_id, None)  # la suppression l'emporte, comme en JSON
+        changed = set(targets) | set(deletes)
+        sources = self._locate(changed)
+        partitions = {key: dict(info) for key, info in manifest["partitions"].items()}
+        for key in sorted(set(sources.values()) | set(targets.values())):
+            kept = [t for t in self._read_partition(key) if t["id"] not in changed] \
+                if key in partitions else []
+            kept += [t for t in puts if targets.get(t["id"]) == key]
+            kept.sort(key=lambda t: t["id"])
+            self._write_partition(key, kept)
+            if not kept:
+                partitions.pop(key, None)
+                continue
+            if key not in partitions:
+                code = max((info["code"] for info in partitions.values()), default=0) + 1
+                partitions[key] = {"code": code}
+            partitions[key]["count"] = len(kept)
+        generation = manifest["generation"] + 1
+        entries = {i: partitions[key]["code"] for i, key in targets.items()}
+        entries.update((i, 0) for i in deletes if i in sources)
+        if self._locator_generation() == manifest["generation"]:
+            self._update_locator(entries, generation)  # sinon reconstruit à la prochaine lecture
+        next_id = max([manifest["next_id"]] + [i + 1 for i in targets])
+        self._write_manifest({"generation": generation, "next_id": next_id,
+                              "partitions": partitions})
+
+    def compact(self) -> int:
+        """Réécrit toutes les partitions et le localisateur.
+
+        Returns:
+            Le nombre de tâches persistées.
+        """
+        tasks = self.load()
+        self.save(tasks)
+        return len(tasks)
+
+
+BACKENDS = {
+    "json": JsonBackend,
+    "journal": JournalBackend,
+    "sqlite": SqliteBackend,
+    "binary": BinaryBackend,
+    "partitioned": PartitionedBackend,
+}
+
+
+# Formats d'instantané acceptés par ``export`` et ``convert``.
+SNAPSHOT_FORMATS = ("json", "binary", "partitioned")
+
+
+def detect_format(path: str) -> str:
+    """Identifie le format d'un instantané d'après son contenu.
+
+    Args:
+        path: Chemin du fichier (ou du répertoire d'un stockage partitionné).
+
+    Returns:
+        ``"partitioned"`` pour un répertoire avec manifeste, ``"binary"``
+        si le fichier commence par :data:`BINARY_MAGIC`, ``"journal"``
+        s'il est accompagné d'un journal, sinon ``"json"``.
+
+    Raises:
+        ValueError: Si le fichier est introuvable.
+    """
+    if os.path.isfile(os.path.join(path, PARTITION_MANIFEST)):
+        return "partitioned"
+    try:
+        with open(path, "rb") as f:
+            head = f.read(len(BINARY_MAGIC))
+    except FileNotFoundError as exc:
+        raise ValueError(f"Fichier introuvable : {path}") from exc
+    if head == BINARY_MAGIC:
+        return "binary"
+    return "journal" if os.path.exists(path + JOURNAL_SUFFIX) else "json"
+
+
+def write_snapshot(path: str, tasks: List[Dict[str, Any]], fmt: str, next_id: int = 1) -> None:
+    """Écrit un instantané autonome (JSON indenté, binaire ou partitionné).
+
+    Args:
+        path: Fichier (ou répertoire) de destination, remplacé atomiquement.
+        tasks: Tâches à écrire.
+        fmt: ``"json"``, ``"binary"`` ou ``"partitioned"``.
+        next_id: Compteur d'IDs à conserver (formats binaire et partitionné).
+    """
+    if fmt == "partitioned":
+        backend = PartitionedBackend(path)
+        with backend.lock():
+            backend.rewrite(tasks, next_id)
+    elif fmt == "binary":
+        _atomic_write(path, encode_binary(tasks, next_id))
+    else:
+        _atomic_write(path, json.dumps(tasks, indent=2, ensure_ascii=False))
+
+
+# Extension du fichier par défaut quand la spécification omet le chemin.
+DEFAULT_EXTENSIONS = {"sqlite": ".db", "binary": ".bin", "partitioned": ".d"}
+
+
+def open_backend(spec: str, default_path: str) -> Backend:
+    """Instancie la couche de stockage décrite par *spec*.
+
+    Args:
+        spec: Spécification ``type:chemin`` (par ex. ``sqlite:tasks.db``).
+            Si le chemin est vide, *default_path* est utilisé (avec
+            l'extension ``.db`` pour SQLite et ``.bin`` pour le binaire).
+        default_path: Chemin du ``tasks.json`` par défaut.
+
+    Returns:
+        La couche de stockage correspondante.
+
+    Raises:
+        ValueError: Si le type de stockage est inconnu.
+    """
+    kind, _, path = spec.partition(":")
+    if kind not in BACKENDS:
+        raise ValueError(f"Stockage inconnu '{kind}', attendu : {', '.join(BACKENDS)}")
+    if not path:
+        extension = DEFAULT_EXTENSIONS.get(kind)
+        path = os.path.splitext(default_path)[0] + extension if extension else default_path
+    return BACKENDS[kind](path)
@@ -2,7 +2,41 @@
 
 Ce module fournit un petit gestionnaire de tâches en ligne de commande (Option A) :
 - CRUD partiel : add, list (avec tri et filtres de rappel), edit, delete
-- Persistance JSON (``tasks.json`` à la racine du dépôt)
+- Recherche plein texte (``search``) sur le titre et la description, via
+  un index inversé tenu à jour à chaque écriture (voir :mod:`indexes`)
+- Filtres composés (``list --where``) : expression compilée une fois et
+  plan d'accès choisi selon les index du stockage, affiché par
+  ``--explain`` (voir :mod:`where`)
+- Sorties machine (``--format jsonl|csv|tsv``) écrites par blocs, avec
+  l'état de rappel en colonne (voir :mod:`formats`)
+- Lecture parallèle des gros stockages journal (``list --jobs N``, voir
+  :mod:`parallel`)
+- Import en masse depuis un fichier CSV ou JSONL
+- Tâches récurrentes (``add --repeat weekly``) stockées une seule fois, dont
+  les occurrences sont développées à la demande dans la fenêtre interrogée
+  (voir :mod:`recurrence`)
+- Statistiques (``stats``) : compteurs par priorité et casiers d'échéances
+  tenus à jour à chaque écriture, d'où sont dérivés les retards et
+  l'histogramme des prochains jours (voir :mod:`stats`)
+- Archive froide compressée (``archive``, politique automatique
+  ``--policy N``) lue seulement par ``list --include-archive`` (voir
+  :mod:`coldstore`)
+- Instantané binaire en colonnes (``--store binary:``) et commandes
+  ``export``/``convert`` entre JSON et binaire
+- Stockage partitionné par mois d'échéance (``--store partitioned:``) :
+  les filtres de rappel n'ouvrent que les mois concernés
+- Mode démon (``serve``) : tâches en mémoire derrière une socket Unix, la
+  CLI lui transmet les commandes quand il tourne (voir :mod:`daemon`)
+- Persistance JSON (``tasks.json`` à la racine du dépôt), avec un mode
+  journal en ajout seul et un stockage SQLite (voir :mod:`storage`)
+- Écritures sûres entre processus : verrou par écriture, ou écritures
+  groupées avec ``--group-commit`` (voir :mod:`groupcommit`)
+- Surveillance (``watch``) : notification quand une tâche devient proche
+  ou en retard, sans relire le stockage à intervalle fixe (voir :mod:`watcher`)
+- Cache sur disque des résultats de ``list`` avec ``--cache`` (voir
+  :mod:`querycache`) et commande ``cache stats``
+- API Python (:class:`TaskStore`) : opérations typées, regroupées en une
+  seule écriture par ``with store.transaction():``
 - Validations basiques (priorité / date)
 - Exécutable via ``python src/task_manager.py <commande>``
 
@@ -11,15 +45,66 @@ Les fonctions exposées sont pensées pour être testées avec ``unittest``.
 
 from __future__ import annotations
 
-import argparse
+import heapq
+import itertools
 import json
 import os
+import sys
+from contextlib import contextmanager, nullcontext, redirect_stderr, redirect_stdout
+from io import StringIO
 from datetime import date, datetime, timedelta
-from typing import Any, Dict, List
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Modules du chemin de ``list`` : chaque commande attache les index du
+# stockage (voir :func:`prepare_backend`) et l'affichage passe par
+# :mod:`formats`. Les modules propres à une commande (``argparse``,
+# :mod:`groupcommit`, :mod:`where`, :mod:`parallel`, :mod:`daemon`,
+# :mod:`coldstore`, :mod:`stats`, :mod:`querycache`, :mod:`metrics`, ``csv``,
+# ``cProfile``) sont importés dans les fonctions qui s'en servent (voir
+# :func:`parse_fast`).
+from formats import FORMATS, ChunkedWriter
+from formats import encode as encode_tasks
+from indexes import DueIndex, SearchIndex, due_ordinal, task_terms, tokenize
+from models import NO_DUE, TaskTable
+from recurrence import (RecurrenceIndex, expand, is_recurring, next_occurrence, parse_rule,
+                        upcoming, window_series)
+from storage import (JOURNAL_SUFFIX, SNAPSHOT_FORMATS, Backend, JournalBackend, JsonBackend,
+                     detect_format, id_floor, open_backend, socket_path, span, timed,
+                     write_snapshot)
+
+# Imports réservés aux annotations (chargés à l'usage, voir ci-dessus).
+if TYPE_CHECKING:
+    import argparse
+
+    from coldstore import ColdStore
+    from groupcommit import GroupCommit
+    from querycache import QueryCache
+    from stats import StatsIndex
 
 # Fichier de persistance (à la racine du repo)
 TASKS_FILE = os.path.join(os.path.dirname(__file__), "..", "tasks.json")
 DATE_FMT = "%Y-%m-%d"
+# Mode journal (ajout seul) activé par ``--journal`` ou ``TASKS_JOURNAL=1``
+USE_JOURNAL = os.environ.get("TASKS_JOURNAL", "") not in ("", "0")
+# Stockage explicite ``type:chemin`` choisi par ``--store`` ou ``TASKS_STORE``
+STORE_SPEC: Optional[str] = os.environ.get("TASKS_STORE") or None
+# Écritures groupées entre processus, activées par ``--group-commit`` ou ``TASKS_GROUP_COMMIT=1``
+GROUP_COMMIT = os.environ.get("TASKS_GROUP_COMMIT", "") not in ("", "0")
+# Cache des résultats de ``list``, activé par ``--cache`` ou ``TASKS_CACHE=1``
+QUERY_CACHE = os.environ.get("TASKS_CACHE", "") not in ("", "0")
+# Stockage imposé (mémoire du démon) : prioritaire sur tout le reste
+ACTIVE_BACKEND: Optional[Backend] = None
+# Fichier JSON lines où ajouter les mesures de chaque commande (``TASKS_METRICS``)
+METRICS_ENV = "TASKS_METRICS"
+# Nombre maximal de lignes rejetées détaillées par ``import``
+IMPORT_REPORT_LIMIT = 20
+# Message affiché par ``list``/``search`` quand aucune tâche ne correspond
+NO_TASKS = "Aucune tâche à afficher."
+# Largeur maximale des barres de l'histogramme de ``stats``
+STATS_BAR_WIDTH = 40
+# Fenêtre d'échéances d'une requête qui ne borne pas ``due``
+ALL_DUES = (1, date.max.toordinal())
 
 
 # ---------- Helpers ----------
@@ -89,7 +174,8 @@ def is_due_within(due_str: str, days: int) -> bool:
         True si ``today <= due <= today + days``.
     """
     d_day = parse_date(due_str)
-    return date.today() <= d_day <= date.today() + timedelta(days=days)
+    today = date.today()
+    return today <= d_day <= today + timedelta(days=days)
 
 
 def status_flag(task: Dict[str, Any]) -> str:
@@ -101,29 +187,184 @@ def status_flag(task: Dict[str, Any]) -> str:
     Returns:
         Une chaîne vide, ``"⚠️ OVERDUE"`` si en retard, ou ``"⏳ soon"`` si <= 3 jours.
     """
-    try:
-        if is_overdue(task["due"]):
-            return "⚠️ OVERDUE"
-        if is_due_within(task["due"], 3):
-            return "⏳ soon"
-    except Exception:
-        # On évite de casser l'affichage si un champ est manquant/mal formé.
-        pass
+    # Ordinal mis en cache : pas de strptime par ligne affichée. Un champ
+    # manquant ou mal formé donne 0 et n'affiche rien. Une série est jugée
+    # sur sa prochaine occurrence (voir :func:`recurrence.next_occurrence`).
+    today = date.today().toordinal()
+    ordinal = next_occurrence(task, today)
+    if not ordinal:
+        return ""
+    if ordinal < today:
+        return "⚠️ OVERDUE"
+    if ordinal <= today + 3:
+        return "⏳ soon"
     return ""
 
 
 # ---------- I/O JSON ----------
+def get_backend() -> Backend:
+    """Retourne la couche de stockage courante.
+
+    :data:`STORE_SPEC` est prioritaire. Sinon :data:`TASKS_FILE` est utilisé,
+    en mode journal s'il est demandé ou si un journal existe déjà à côté du
+    fichier (pour ne jamais ignorer des écritures en attente). Le stockage
+    est préparé par :func:`prepare_backend`.
+
+    Returns:
+        Une instance de :class:`storage.Backend`.
+
+    Raises:
+        ValueError: Si :data:`STORE_SPEC` désigne un stockage inconnu.
+    """
+    if ACTIVE_BACKEND is not None:
+        return ACTIVE_BACKEND
+    if STORE_SPEC:
+        backend = open_backend(STORE_SPEC, TASKS_FILE)
+    elif USE_JOURNAL or os.path.exists(TASKS_FILE + JOURNAL_SUFFIX):
+        backend = JournalBackend(TASKS_FILE)
+    else:
+        backend = JsonBackend(TASKS_FILE)
+    return prepare_backend(backend)
+
+
+class LazyObserver:
+    """Observateur d'un stockage dont le module n'est importé qu'à l'usage.
+
+    Les statistiques et le cache ne servent pas aux lectures de ``list`` :
+    leur module est importé au premier accès (une écriture, ``stats``,
+    ``cache``, ou ``list --cache``). Le protocole observateur
+    (``is_fresh``, ``apply``…) et les autres attributs sont délégués à
+    :attr:`target`.
+
+    Args:
+        backend: Stockage observé.
+        module: Module qui définit l'observateur.
+        name: Nom de la classe de l'observateur.
+    """
+
+    def __init__(self, backend: Backend, module: str, name: str) -> None:
+        self.backend = backend
+        self.module = module
+        self.name = name
+        self._target: Any = None
+
+    @property
+    def target(self) -> Any:
+        """L'observateur lui-même, créé (et son module importé) au premier accès."""
+        if self._target is None:
+            import importlib  # pylint: disable=import-outside-toplevel
+
+            cls = getattr(importlib.import_module(self.module), self.name)
+            self._target = cls(self.backend)
+        return self._target
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self.target, attr)
+
+
+def attached(backend: Backend, name: str) -> Any:
+    """Retourne l'observateur de classe *name* attaché au stockage, ou None.
+
+    Args:
+        backend: Stockage courant.
+        name: Nom de la classe (observateur chargé à l'usage, voir :class:`LazyObserver`).
+
+    Returns:
+        L'observateur (son module est alors importé), ou None.
+    """
+    found = next((o for o in backend.observers
+                  if isinstance(o, LazyObserver) and o.name == name), None)
+    return None if found is None else found.target
+
+
+def prepare_backend(backend: Backend) -> Backend:
+    """Attache les index et le cache à un stockage qui vient d'être ouvert.
+
+    Les stockages qui n'exécutent pas eux-mêmes les filtres reçoivent un
+    :class:`indexes.DueIndex`, et tous un :class:`indexes.SearchIndex`, un
+    :class:`recurrence.RecurrenceIndex`, un :class:`stats.StatsIndex` et un
+    :class:`querycache.QueryCache` (vidé à chaque écriture, même quand le
+    cache n'est pas utilisé par ce processus) ; ces deux derniers ne sont
+    chargés qu'à l'usage (:class:`LazyObserver`). Les IDs réservés par
+    l'archive (voir :mod:`coldstore`) ne sont pas réattribués.
+
+    Args:
+        backend: Stockage ouvert.
+
+    Returns:
+        Le même stockage.
+    """
+    if not backend.supports_query:
+        backend.observers.append(DueIndex(backend))
+    backend.observers.append(SearchIndex(backend))
+    backend.observers.append(RecurrenceIndex(backend))
+    backend.observers.append(LazyObserver(backend, "stats", "StatsIndex"))
+    backend.observers.append(LazyObserver(backend, "querycache", "QueryCache"))
+    backend.id_floor = id_floor(backend.path)
+    return backend
+
+
+def group_commit(backend: Backend) -> Optional[GroupCommit]:
+    """Retourne la file d'écritures groupées si le mode est actif.
+
+    Le démon exécute déjà les commandes une à une et regroupe ses
+    écritures : la file n'est utilisée qu'en accès direct.
+
+    Args:
+        backend: Stockage courant.
+
+    Returns:
+        Une :class:`groupcommit.GroupCommit`, ou None en mode verrouillé.
+    """
+    if GROUP_COMMIT and ACTIVE_BACKEND is None:
+        from groupcommit import GroupCommit  # pylint: disable=import-outside-toplevel
+
+        return GroupCommit(backend)
+    return None
+
+
+def query_cache(backend: Backend) -> Optional[QueryCache]:
+    """Retourne le cache des résultats de ``list`` si le mode est actif.
+
+    Le démon garde déjà les tâches en mémoire : le cache n'y est pas utilisé.
+
+    Args:
+        backend: Stockage courant.
+
+    Returns:
+        Le :class:`querycache.QueryCache` du stockage, ou None.
+    """
+    if not QUERY_CACHE or ACTIVE_BACKEND is not None:
+        return None
+    return attached(backend, "QueryCache")
+
+
+def due_range(overdue: bool, due_in: Optional[int]) -> Optional[tuple]:
+    """Traduit les filtres de rappel en plage d'ordinaux de dates.
+
+    Args:
+        overdue: Filtre ``--overdue``.
+        due_in: Filtre ``--due-in`` (nombre de jours) ou None.
+
+    Returns:
+        ``(min, max)`` inclusifs au sens de :meth:`datetime.date.toordinal`,
+        ou None si aucun filtre n'est demandé.
+    """
+    today = date.today().toordinal()
+    if overdue:
+        return (1, today - 1)
+    if due_in is not None:
+        return (today, today + int(due_in))
+    return None
+
+
 def load_tasks() -> List[Dict[str, Any]]:
     """Charge la liste des tâches depuis le fichier JSON.
 
     Returns:
         Une liste de dictionnaires représentant les tâches.
     """
-    try:
-        with open(TASKS_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
-        return []
+    return get_backend().load()
 
 
 def save_tasks(tasks: List[Dict[str, Any]]) -> None:
@@ -132,158 +373,2112 @@ def save_tasks(tasks: List[Dict[str, Any]]) -> None:
     Args:
         tasks: Liste de tâches à persister.
     """
-    with open(TASKS_FILE, "w", encoding="utf-8") as f:
-        json.dump(tasks, f, indent=2, ensure_ascii=False)
+    get_backend().save(tasks)
+
+
+# ---------- API Python ----------
+def edit_fields(title: Optional[str] = None, desc: Optional[str] = None,
+                priority: Optional[int] = None, due: Optional[str] = None,
+                repeat: Optional[str] = None) -> Dict[str, Any]:
+    """Valide et retourne les champs fournis pour une modification.
+
+    Args:
+        title: Nouveau titre, ou None.
+        desc: Nouvelle description, ou None.
+        priority: Nouvelle priorité, ou None.
+        due: Nouvelle échéance ``YYYY-MM-DD``, ou None.
+        repeat: Nouvelle règle de répétition (``none`` la retire), ou None.
+
+    Returns:
+        ``{champ: valeur}`` pour les seuls champs fournis (``repeat`` vaut
+        ``""`` pour une récurrence retirée).
+
+    Raises:
+        ValueError: Si la priorité, la date ou la règle est invalide.
+    """
+    if priority is not None:
+        validate_priority(priority)
+    if due is not None:
+        validate_due(due)
+    if repeat is not None:
+        repeat = parse_rule(repeat)
+    fields = {"title": title, "desc": desc, "priority": priority, "due": due, "repeat": repeat}
+    return {name: value for name, value in fields.items() if value is not None}
+
+
+class PendingView:
+    """Tâches d'un stockage vues à travers les écritures d'une transaction.
+
+    Source de :func:`where.plan` (parcours complet) pour les requêtes
+    faites dans une transaction qui a déjà modifié des tâches.
+
+    Args:
+        tasks: Tâches visibles, écritures en attente comprises.
+    """
+
+    range_fields: Tuple[str, ...] = ()
+
+    def __init__(self, tasks: List[Dict[str, Any]]) -> None:
+        self.tasks = tasks
+        self.observers: List[Any] = []
+
+    def range_count(self, field: str, low: Optional[int], high: Optional[int]) -> int:  # pylint: disable=unused-argument
+        """Nombre de tâches lues par un parcours complet."""
+        return len(self.tasks)
+
+    def iter_tasks(self) -> Iterator[Dict[str, Any]]:
+        """Parcourt les tâches visibles."""
+        return iter(self.tasks)
+
+
+class _Batch:
+    """Écritures en attente d'une opération ou d'une transaction.
+
+    Args:
+        group: File d'écritures groupées qui persistera le lot, ou None
+            (``commit`` sous le verrou).
+    """
+
+    def __init__(self, group: Optional[GroupCommit]) -> None:
+        self.group = group
+        self.puts: Dict[int, Dict[str, Any]] = {}
+        self.patches: Dict[int, Dict[str, Any]] = {}
+        self.deletes: set = set()
+        self.added: set = set()
+        self.next_id: Optional[int] = None
+        self.snapshot: Optional[Dict[int, Dict[str, Any]]] = None
+
+    @property
+    def dirty(self) -> bool:
+        """True si le lot contient des écritures."""
+        return bool(self.puts or self.deletes)
+
+
+class TaskStore:
+    """API Python des tâches : opérations typées, sans affichage.
+
+    Chaque méthode d'écriture appelée seule est une opération complète :
+    verrou (ou file d'écritures groupées), lecture, écriture. Dans un bloc
+    :meth:`transaction`, les opérations partagent un seul verrou et une
+    seule lecture du stockage ; leurs écritures sont appliquées en mémoire
+    (et visibles des lectures du bloc), puis persistées en un seul
+    ``commit`` à la sortie.
+
+    Args:
+        backend: Stockage (celui de la CLI par défaut, voir :func:`get_backend`).
+        group: File d'écritures groupées des opérations isolées, ou None.
+
+    Attributes:
+        last_plan: Plan de la dernière lecture filtrée (voir :meth:`page`).
+    """
+
+    def __init__(self, backend: Optional[Backend] = None,
+                 group: Optional[GroupCommit] = None) -> None:
+        self.backend = backend if backend is not None else get_backend()
+        self.group = group
+        self.last_plan: Any = None
+        self._batch: Optional[_Batch] = None
+
+    @classmethod
+    def open(cls, spec: str) -> TaskStore:
+        """Ouvre un stockage ``type:chemin`` (par ex. ``sqlite:tasks.db``).
+
+        Args:
+            spec: Spécification du stockage (voir :func:`storage.open_backend`).
+
+        Returns:
+            Le :class:`TaskStore` de ce stockage.
+
+        Raises:
+            ValueError: Si le type de stockage est inconnu.
+        """
+        return cls(prepare_backend(open_backend(spec, TASKS_FILE)))
+
+    # ---------- Lots ----------
+    @contextmanager
+    def transaction(self) -> Iterator[TaskStore]:
+        """Regroupe des opérations : un verrou, une lecture, une écriture.
+
+        Les transactions imbriquées rejoignent la transaction en cours. Si
+        le bloc lève une exception, rien n'est écrit. Une transaction prend
+        toujours le verrou du stockage, même en mode écritures groupées.
+
+        Yields:
+            Le store lui-même.
+        """
+        with self._batching(None):
+            yield self
+
+    @contextmanager
+    def _batching(self, group: Optional[GroupCommit]) -> Iterator[_Batch]:
+        """Ouvre un lot (ou rejoint la transaction en cours) et le persiste à la fin."""
+        if self._batch is not None:
+            yield self._batch
+            return
+        batch = _Batch(group)
+        with self.backend.lock() if group is None else nullcontext():
+            self._batch = batch
+            try:
+                yield batch
+            finally:
+                self._batch = None
+            if batch.dirty and group is None:
+                self.backend.commit(puts=list(batch.puts.values()), deletes=sorted(batch.deletes))
+            elif batch.dirty:
+                group.write(patches=batch.patches, deletes=sorted(batch.deletes))
+
+    def _put(self, batch: _Batch, task: Dict[str, Any], fields: Dict[str, Any]) -> None:
+        """Met en attente une tâche modifiée (et ses champs, pour la file groupée)."""
+        if task.get("repeat") == "":
+            del task["repeat"]  # récurrence retirée (``--repeat none``)
+        batch.puts[task["id"]] = task
+        batch.patches.setdefault(task["id"], {}).update(fields)
+
+    def _visible(self) -> List[Dict[str, Any]]:
+        """Toutes les tâches, écritures en attente comprises (par ID croissant)."""
+        batch = self._batch
+        assert batch is not None
+        tasks = batch.snapshot.values() if batch.snapshot is not None else self.backend.iter_tasks()
+        view = [batch.puts.get(t["id"], t) for t in tasks if t["id"] not in batch.deletes]
+        view.extend(batch.puts[i] for i in sorted(batch.added))
+        return sorted(view, key=lambda t: t["id"])
+
+    def _series(self, window: Tuple[int, int]) -> List[Dict[str, Any]]:
+        """Tâches récurrentes qui commencent au plus tard à la fin de *window*."""
+        if window[0] > window[1]:
+            return []
+        if self._batch is not None and self._batch.dirty:
+            return window_series(self._visible(), window[1])
+        return find_series(self.backend, window[1])
+
+    # ---------- Lecture ----------
+    def get(self, task_id: int) -> Optional[Dict[str, Any]]:
+        """Retourne une copie de la tâche *task_id*, ou None."""
+        found = self.get_many([task_id])
+        return found[0] if found else None
+
+    def get_many(self, task_ids: Iterable[int]) -> List[Dict[str, Any]]:
+        """Retourne des copies des tâches existantes parmi *task_ids*, dans cet ordre.
+
+        Dans un lot, les écritures en attente sont prises en compte, et un
+        stockage sans lecture indexée (JSON) n'est lu qu'une fois.
+
+        Args:
+            task_ids: IDs recherchés.
+
+        Returns:
+            Les tâches trouvées.
+        """
+        ids = list(task_ids)
+        batch = self._batch
+        if batch is None:
+            return [dict(t) for t in self.backend.get_many(ids)]
+        found = {i: batch.puts[i] for i in ids if i in batch.puts}
+        rest = [i for i in ids if i not in found and i not in batch.deletes]
+        if rest and batch.snapshot is None and not (self.backend.streams
+                                                    or self.backend.supports_query):
+            batch.snapshot = {t["id"]: t for t in self.backend.load()}
+        if rest and batch.snapshot is not None:
+            found.update((i, batch.snapshot[i]) for i in rest if i in batch.snapshot)
+        elif rest:
+            found.update((t["id"], t) for t in self.backend.get_many(rest))
+        return [dict(found[i]) for i in ids if i in found]
+
+    def page(self, sort: str = "priority", overdue: bool = False, due_in: Optional[int] = None,
+             limit: Optional[int] = None, offset: int = 0, where: Optional[str] = None,
+             include_archive: bool = False, jobs: Optional[int] = None) -> Iterable[Dict[str, Any]]:
+        """Retourne une page de tâches filtrées et triées, comme ``list``.
+
+        Sans ``where`` ni archive, voir :func:`page_tasks` ; sinon la requête
+        passe par le planificateur (:mod:`where`), dont le plan est gardé
+        dans :attr:`last_plan`. Dans une transaction qui a déjà écrit, les
+        tâches visibles sont parcourues en mémoire. Les tâches récurrentes
+        sont remplacées par leurs occurrences à venir dans la fenêtre
+        d'échéances de la requête, ou par leur seule prochaine occurrence si
+        elle n'est pas bornée (voir :func:`merge_occurrences`).
+
+        Args:
+            sort: ``"priority"`` ou ``"date"``.
+            overdue: Ne garder que les tâches en retard.
+            due_in: Ne garder que les échéances dans ce nombre de jours, ou None.
+            limit: Nombre maximal de tâches (None = toutes).
+            offset: Nombre de tâches à sauter.
+            where: Expression de filtre (voir :mod:`where`), ou None.
+            include_archive: Inclure les tâches archivées (voir :mod:`coldstore`).
+            jobs: Processus de lecture (voir :func:`page_tasks`), ou None.
+
+        Returns:
+            Les tâches de la page, dans l'ordre de ``list`` (éventuellement en flux).
+
+        Raises:
+            ValueError: Si l'expression est invalide, ou si *jobs* est combiné
+                à *where* ou *include_archive*.
+        """
+        pending = self._batch is not None and self._batch.dirty
+        if where is None and not include_archive and not pending:
+            window = due_range(overdue, due_in) or ALL_DUES
+            series = self._series(window)
+            if not series:
+                return page_tasks(self.backend, overdue, due_in, sort, limit, offset, jobs)
+            rows = page_tasks(self.backend, overdue, due_in, sort,
+                              widen(limit, offset, series, window), 0, jobs)
+            return merge_occurrences(rows, series, window, sort, limit, offset)
+        if jobs is not None and not pending:
+            raise ValueError("--jobs ne se combine pas avec --where, --explain "
+                             "ou --include-archive")
+        query = where_query(where, overdue, due_in)
+        window = query.ranges.get("due") or ALL_DUES
+        series = self._series(window)
+        page_limit, page_offset = limit, offset
+        if include_archive:  # page complète des deux niveaux, découpée après fusion
+            page_limit, page_offset = None if limit is None else offset + limit, 0
+        source = PendingView(self._visible()) if pending else self.backend
+        if series:
+            self.last_plan = where_plan(source, query, sort,
+                                        widen(page_limit, page_offset, series, window), 0)
+        else:
+            self.last_plan = where_plan(source, query, sort, page_limit, page_offset)
+        with span("filter"):
+            rows = self.last_plan.run()
+        if series:
+            rows = list(merge_occurrences(rows, series, window, sort, page_limit, page_offset,
+                                          query.predicate))
+            self.last_plan.shown = len(rows)
+            self.last_plan.notes.append(f"  Récurrences : {len(series)} série(s) "
+                                        + occurrence_span(window))
+        if not include_archive:
+            return rows
+        with span("archive"):
+            return merge_archive(self.backend, rows, query, self.last_plan, limit, offset)
+
+    def list(self, sort: str = "priority", **filters: Any) -> List[Dict[str, Any]]:
+        """Retourne les tâches de :meth:`page` sous forme de liste.
+
+        Args:
+            sort: ``"priority"`` ou ``"date"``.
+            **filters: Autres arguments de :meth:`page`.
+
+        Returns:
+            Les tâches, dans l'ordre de ``list``.
+        """
+        return list(self.page(sort, **filters))
+
+    def select(self, ids: Optional[Iterable[int]] = None, overdue: bool = False,
+               due_in: Optional[int] = None, min_priority: Optional[int] = None,
+               max_priority: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Sélectionne les tâches visées par une opération en masse.
+
+        Les critères se cumulent : IDs, filtres de rappel (comme ``list``)
+        et plage de priorités. Une tâche récurrente est une seule tâche :
+        les filtres de rappel portent sur sa prochaine occurrence, comme
+        dans ``list`` (une série n'est donc jamais en retard).
+
+        Args:
+            ids: IDs visés, ou None.
+            overdue: Ne garder que les tâches en retard.
+            due_in: Ne garder que les échéances dans ce nombre de jours, ou None.
+            min_priority: Priorité minimale (1 par défaut).
+            max_priority: Priorité maximale (5 par défaut).
+
+        Returns:
+            Des copies des tâches sélectionnées.
+
+        Raises:
+            ValueError: Si aucun critère n'est fourni.
+        """
+        ids = list(ids or [])
+        if not ids and not overdue and due_in is None and min_priority is None \
+                and max_priority is None:
+            raise ValueError("Indiquez --id, --ids ou au moins un filtre")
+        bounds = due_range(overdue, due_in)
+        if ids:
+            tasks = self.get_many(dict.fromkeys(ids))
+        elif self._batch is not None and self._batch.dirty:
+            tasks = self._visible()
+        else:
+            tasks = [dict(t) for t in find_tasks(self.backend, overdue, due_in)]
+            if bounds is not None:  # séries commencées avant la fenêtre
+                found = {t["id"] for t in tasks}
+                extra = [dict(t) for t in self._series(bounds) if t["id"] not in found]
+                if extra:
+                    tasks = sorted(tasks + extra, key=lambda t: t["id"])
+        if bounds is not None:
+            today = date.today().toordinal()
+            tasks = [t for t in tasks if bounds[0] <= next_occurrence(t, today) <= bounds[1]]
+        if min_priority is not None or max_priority is not None:
+            low = 1 if min_priority is None else min_priority
+            high = 5 if max_priority is None else max_priority
+            tasks = [t for t in tasks if low <= int(t.get("priority", 5)) <= high]
+        return tasks
+
+    def stats(self, today: Optional[date] = None, days: Optional[int] = None) -> Dict[str, Any]:
+        """Retourne les statistiques agrégées des tâches, comme ``stats``.
+
+        Les compteurs viennent du :class:`stats.StatsIndex` du stockage,
+        sans parcours tant qu'il est à jour ; dans une transaction qui a
+        déjà écrit, ou sans cet index (mémoire du démon), les tâches
+        visibles sont parcourues.
+
+        Args:
+            today: Jour de référence des retards et de l'histogramme
+                (aujourd'hui par défaut).
+            days: Jours couverts par l'histogramme des échéances
+                (:data:`stats.HISTOGRAM_DAYS` par défaut).
+
+        Returns:
+            Le résumé de :func:`stats.summarize`.
+        """
+        from stats import HISTOGRAM_DAYS, summarize, tally  # pylint: disable=import-outside-toplevel
+
+        today = today or date.today()
+        index = stats_index(self.backend)
+        if self._batch is not None and self._batch.dirty:
+            counters = tally(self._visible())
+        elif index is None:
+            counters = tally(self.backend.iter_tasks())
+        else:
+            with span("filter"):
+                counters = index.counters()
+        return summarize(counters, today.toordinal(), HISTOGRAM_DAYS if days is None else days)
+
+    # ---------- Écriture ----------
+    def add(self, title: str, desc: str, priority: int, due: str,
+            repeat: Optional[str] = None) -> Dict[str, Any]:
+        """Ajoute une tâche.
+
+        Args:
+            title: Titre.
+            desc: Description.
+            priority: Priorité, de 1 (haute) à 5 (basse).
+            due: Échéance ``YYYY-MM-DD`` (première occurrence d'une tâche récurrente).
+            repeat: Règle de répétition (voir :func:`recurrence.parse_rule`), ou None.
+
+        Returns:
+            La tâche créée, avec son ID.
+
+        Raises:
+            ValueError: Si la priorité, la date ou la règle est invalide.
+        """
+        with span("validate"):
+            validate_priority(priority)
+            validate_due(due)
+            rule = parse_rule(repeat) if repeat is not None else ""
+        task = {"id": 0, "title": title, "desc": desc, "priority": priority, "due": due,
+                "created": datetime.now().isoformat()}
+        if rule:
+            task["repeat"] = rule
+        if self._batch is None and self.group is not None:
+            task["id"] = self.group.write(adds=[task])[0]  # ID attribué par la file
+            return task
+        from groupcommit import reserve_ids  # pylint: disable=import-outside-toplevel
+
+        with self._batching(None) as batch:
+            task["id"] = reserve_ids(self.backend, 1, batch.next_id)  # IDs de la file exclus
+            batch.next_id = task["id"] + 1
+            batch.added.add(task["id"])
+            batch.puts[task["id"]] = task
+        return dict(task)
+
+    def edit(self, task_id: int, **fields: Any) -> Optional[Dict[str, Any]]:
+        """Modifie une tâche (seuls les champs fournis sont mis à jour).
+
+        Args:
+            task_id: ID de la tâche.
+            **fields: ``title``, ``desc``, ``priority``, ``due`` et/ou ``repeat``.
+
+        Returns:
+            La tâche modifiée, ou None si elle n'existe pas.
+
+        Raises:
+            ValueError: Si la priorité, la date ou la règle est invalide.
+        """
+        with span("validate"):
+            fields = edit_fields(**fields)
+        with self._batching(self.group) as batch:
+            task = self.get(task_id)
+            if task is not None and fields:
+                task.update(fields)
+                self._put(batch, task, fields)
+        return task
+
+    def edit_many(self, fields: Dict[str, Any], dry_run: bool = False,
+                  **criteria: Any) -> List[Dict[str, Any]]:
+        """Modifie en un seul lot toutes les tâches de :meth:`select`.
+
+        Args:
+            fields: Champs à modifier (voir :meth:`edit`).
+            dry_run: Sélectionner seulement, sans rien écrire.
+            **criteria: Critères de :meth:`select`.
+
+        Returns:
+            Les tâches concernées (modifiées, sauf avec *dry_run*).
+
+        Raises:
+            ValueError: Si aucun champ ou aucun critère n'est fourni, ou si
+                un champ est invalide.
+        """
+        if not any(value is not None for value in fields.values()):
+            raise ValueError("Aucun champ à modifier")
+        with span("validate"):
+            fields = edit_fields(**fields)
+        with self._batching(self.group) as batch:
+            tasks = self.select(**criteria)
+            if not dry_run:
+                for task in tasks:
+                    task.update(fields)
+                    self._put(batch, task, fields)
+        return tasks
+
+    def delete(self, task_id: int) -> bool:
+        """Supprime une tâche.
+
+        Args:
+            task_id: ID de la tâche.
+
+        Returns:
+            True si la tâche existait.
+        """
+        with self._batching(self.group) as batch:
+            found = self.get(task_id) is not None
+            if found:
+                self._drop(batch, task_id)
+        return found
+
+    def delete_many(self, dry_run: bool = False, **criteria: Any) -> List[Dict[str, Any]]:
+        """Supprime en un seul lot toutes les tâches de :meth:`select`.
+
+        Args:
+            dry_run: Sélectionner seulement, sans rien écrire.
+            **criteria: Critères de :meth:`select`.
+
+        Returns:
+            Les tâches concernées.
+
+        Raises:
+            ValueError: Si aucun critère n'est fourni.
+        """
+        with self._batching(self.group) as batch:
+            tasks = self.select(**criteria)
+            if not dry_run:
+                for task in tasks:
+                    self._drop(batch, task["id"])
+        return tasks
+
+    @staticmethod
+    def _drop(batch: _Batch, task_id: int) -> None:
+        """Met en attente la suppression de *task_id*."""
+        batch.puts.pop(task_id, None)
+        batch.patches.pop(task_id, None)
+        if task_id in batch.added:
+            batch.added.discard(task_id)  # ajoutée dans ce lot : rien à supprimer
+        else:
+            batch.deletes.add(task_id)
 
 
 # ---------- Opérations (utilisées par la CLI et les tests) ----------
+def cli_store() -> TaskStore:
+    """Retourne le :class:`TaskStore` de la CLI (stockage et mode d'écriture courants)."""
+    backend = get_backend()
+    return TaskStore(backend, group_commit(backend))
+
+
 def add_task(args: argparse.Namespace) -> None:
     """Ajoute une nouvelle tâche.
 
     Args:
-        args: Arguments de la CLI. Attendus : ``title``, ``desc``, ``priority``, ``due``.
+        args: Arguments de la CLI. Attendus : ``title``, ``desc``, ``priority``, ``due``
+            et, optionnellement, ``repeat``.
     """
-    tasks = load_tasks()
-    validate_priority(args.priority)
-    validate_due(args.due)
+    store = cli_store()
+    repeat = getattr(args, "repeat", None)
+    task = store.add(args.title, args.desc, args.priority, args.due,
+                     repeat if isinstance(repeat, str) else None)
+    print(f"Tâche ajoutée (ID {task['id']})")
+    apply_archive_policy(store.backend)
 
-    next_id = max([t["id"] for t in tasks], default=0) + 1
-    task = {
-        "id": next_id,
-        "title": args.title,
-        "desc": args.desc,
-        "priority": args.priority,
-        "due": args.due,
-        "created": datetime.now().isoformat(),
-    }
-    tasks.append(task)
-    save_tasks(tasks)
-    print(f"Tâche ajoutée (ID {next_id})")
 
+def stream_tasks(backend: Backend, overdue: bool,
+                 due_in: Optional[int]) -> Iterator[Dict[str, Any]]:
+    """Parcourt en flux les tâches qui passent les filtres de rappel.
 
-def list_tasks(args: argparse.Namespace) -> None:
-    """Affiche les tâches triées, avec filtres de rappel.
+    Sans filtre, le stockage est parcouru tâche par tâche ; avec filtre,
+    l'index des échéances fournit les IDs de la plage et seules ces tâches
+    sont lues.
 
     Args:
-        args: Arguments de la CLI. Attendus : ``sort``, ``overdue`` (bool),
-            ``due_in`` (int ou None).
+        backend: Stockage interrogé (sans ``supports_query``).
+        overdue: Filtre ``--overdue``.
+        due_in: Filtre ``--due-in`` (nombre de jours) ou None.
+
+    Returns:
+        Un itérateur sur les tâches retenues.
     """
-    tasks = load_tasks()
-    filtered = list(tasks)
+    bounds = due_range(overdue, due_in)
+    if bounds is None:
+        return timed("load", backend.iter_tasks())
+    index = next(o for o in backend.observers if isinstance(o, DueIndex))
+    with span("filter"):
+        # Par ID croissant, comme sans filtre : les ex aequo d'un tri gardent cet ordre.
+        ids = sorted(index.lookup(*bounds))
+    return timed("load", backend.iter_many(ids))
 
-    # Filtres de rappel
-    if getattr(args, "overdue", False):
-        filtered = [t for t in filtered if t.get("due") and is_overdue(t["due"])]
-    elif getattr(args, "due_in", None) is not None:
-        n = int(args.due_in)
-        filtered = [t for t in filtered if t.get("due") and is_due_within(t["due"], n)]
 
-    # Tri
-    if args.sort == "priority":
-        filtered.sort(key=lambda t: int(t.get("priority", 5)))
-    else:
-        def key_date(t: Dict[str, Any]) -> date:
-            try:
-                return parse_date(t.get("due", "9999-12-31"))
-            except Exception:
-                return date.max
-        filtered.sort(key=key_date)
+def find_tasks(backend: Backend, overdue: bool, due_in: Optional[int],
+               sort: str = "priority") -> List[Dict[str, Any]]:
+    """Retourne les tâches qui passent les filtres de rappel.
 
-    if not filtered:
-        print("Aucune tâche à afficher.")
-        return
+    Les stockages SQL exécutent filtre et tri eux-mêmes ; les autres passent
+    par l'index des échéances et ne lisent que les tâches de la plage.
+
+    Args:
+        backend: Stockage interrogé.
+        overdue: Filtre ``--overdue``.
+        due_in: Filtre ``--due-in`` (nombre de jours) ou None.
+        sort: Tri appliqué par le stockage SQL (ignoré ailleurs).
 
-    for t in filtered:
-        flag = status_flag(t)
-        flag = f" {flag}" if flag else ""
-        print(f"[{t['id']}] {t['title']} (Priorité: {t['priority']} – Due: {t['due']}){flag}")
+    Returns:
+        Les tâches retenues (triées seulement pour un stockage SQL).
+    """
+    if backend.supports_query:
+        with span("query"):
+            return backend.query(overdue=overdue, due_in=None if due_in is None else int(due_in),
+                                 sort=sort, today=date.today())
+    return list(stream_tasks(backend, overdue, due_in))
 
 
-def delete_task(args: argparse.Namespace) -> None:
-    """Supprime une tâche par ID.
+def sort_key(sort: str) -> Callable[[Dict[str, Any]], Any]:
+    """Retourne la clé de tri de ``list --sort``.
 
     Args:
-        args: Arguments de la CLI. Attendu : ``id`` (int).
+        sort: ``"priority"`` ou ``"date"``.
+
+    Returns:
+        La fonction clé ; une échéance mal formée est classée en dernier.
     """
-    tasks = load_tasks()
-    filtered = [t for t in tasks if t["id"] != args.id]
-    if len(filtered) == len(tasks):
-        print(f"Aucune tâche trouvée avec l'ID {args.id}")
-    else:
-        save_tasks(filtered)
-        print(f"Tâche {args.id} supprimée.")
+    if sort == "priority":
+        return lambda t: int(t.get("priority", 5))
+    return lambda t: due_ordinal(t) or NO_DUE
 
 
-def edit_task(args: argparse.Namespace) -> None:
-    """Modifie une tâche existante (seuls les champs fournis sont mis à jour).
+def page_tasks(backend: Backend, overdue: bool, due_in: Optional[int], sort: str,
+               limit: Optional[int] = None, offset: int = 0,
+               jobs: Optional[int] = None) -> Iterable[Dict[str, Any]]:
+    """Retourne une page de tâches filtrées et triées.
+
+    Les tâches sont consommées en flux : avec *limit*, seules les
+    ``offset + limit`` meilleures sont conservées (tas borné,
+    :func:`heapq.nsmallest`), si bien que la mémoire dépend de la taille de
+    la page et non de celle du stockage. Sans *limit*, un stockage lu en flux
+    est trié via une :class:`models.TaskTable` (quelques octets par tâche)
+    puis relu dans l'ordre obtenu. Un tri par date sur une plage
+    d'échéances suit directement l'ordre de l'index et ne lit que la page.
+
+    Avec *jobs*, l'instantané du journal est lu, filtré et trié par un pool
+    de processus (voir :mod:`parallel`), pour le même résultat. Le démon,
+    qui sert les tâches depuis la mémoire, ignore *jobs*.
 
     Args:
-        args: Arguments de la CLI. Attendus : ``id`` et, optionnellement,
-            ``title``, ``desc``, ``priority``, ``due``.
-    """
-    tasks = load_tasks()
-    for task in tasks:
-        if task["id"] == args.id:
-            if args.title is not None:
-                task["title"] = args.title
-            if args.desc is not None:
-                task["desc"] = args.desc
-            if args.priority is not None:
-                validate_priority(args.priority)
-                task["priority"] = args.priority
-            if args.due is not None:
-                validate_due(args.due)
-                task["due"] = args.due
-            save_tasks(tasks)
-            print(f"Tâche {args.id} mise à jour.")
-            return
-    print(f"Aucune tâche trouvée avec l'ID {args.id}")
+        backend: Stockage interrogé.
+        overdue: Filtre ``--overdue``.
+        due_in: Filtre ``--due-in`` (nombre de jours) ou None.
+        sort: ``"priority"`` ou ``"date"``.
+        limit: Nombre maximal de tâches (None = toutes).
+        offset: Nombre de tâches à sauter.
+        jobs: Nombre de processus de lecture (0 = un par processeur), ou
+            None pour la lecture séquentielle.
 
+    Returns:
+        Les tâches de la page, dans l'ordre d'affichage (éventuellement en flux).
 
-# ---------- CLI ----------
-def main() -> None:
-    """Point d'entrée de l'application CLI."""
-    parser = argparse.ArgumentParser(description="Gestionnaire de tâches CLI")
-    subparsers = parser.add_subparsers(title="Commandes", dest="command")
+    Raises:
+        ValueError: Si *jobs* est demandé sur un stockage qui n'est pas en lignes.
+    """
+    if jobs is not None and ACTIVE_BACKEND is None:
+        from parallel import parallel_page  # pylint: disable=import-outside-toplevel
 
-    # add
-    p_add = subparsers.add_parser("add", help="Ajouter une nouvelle tâche")
-    p_add.add_argument("--title", required=True, help="Titre de la tâche")
-    p_add.add_argument("--desc", required=True, help="Description de la tâche")
-    p_add.add_argument("--priority", type=int, required=True, help="Priorité (1=haute,5=basse)")
-    p_add.add_argument("--due", required=True, help="Date limite (YYYY-MM-DD)")
-    p_add.set_defaults(func=add_task)
-
-    # list
-    p_list = subparsers.add_parser("list", help="Lister les tâches")
-    p_list.add_argument("--sort", choices=["priority", "date"], default="priority", help="Tri")
-    mg = p_list.add_mutually_exclusive_group()
-    mg.add_argument("--overdue", action="store_true", help="Afficher uniquement les tâches en retard")
-    mg.add_argument("--due-in", type=int, metavar="JOURS", help="Afficher les tâches à échéance ≤ N jours")
-    p_list.set_defaults(func=list_tasks)
-
-    # delete
-    p_del = subparsers.add_parser("delete", help="Supprimer une tâche")
-    p_del.add_argument("--id", type=int, required=True, help="ID de la tâche")
-    p_del.set_defaults(func=delete_task)
-
-    # edit
-    p_edit = subparsers.add_parser("edit", help="Modifier une tâche existante")
-    p_edit.add_argument("--id", type=int, required=True, help="ID de la tâche")
-    p_edit.add_argument("--title", help="Nouveau titre")
-    p_edit.add_argument("--desc", help="Nouvelle description")
-    p_edit.add_argument("--priority", type=int, help="Nouvelle priorité (1-5)")
-    p_edit.add_argument("--due", help="Nouvelle date (YYYY-MM-DD)")
-    p_edit.set_defaults(func=edit_task)
-
-    args = parser.parse_args()
-    if hasattr(args, "func"):
+        with span("parallel"):
+            page = parallel_page(backend, due_range(overdue, due_in), sort, limit, offset, jobs)
+        if page is not None:
+            return page
+    if backend.supports_query:
+        with span("query"):
+            return backend.query(overdue=overdue, due_in=None if due_in is None else int(due_in),
+                                 sort=sort, today=date.today(), limit=limit, offset=offset)
+    bounds = due_range(overdue, due_in)
+    if bounds is not None and sort == "date":
+        index = next(o for o in backend.observers if isinstance(o, DueIndex))
+        with span("filter"):
+            ids = index.lookup(*bounds)
+        with span("load"):
+            return backend.get_many(ids[offset:None if limit is None else offset + limit])
+    tasks = stream_tasks(backend, overdue, due_in)
+    with span("sort"):
+        if limit is None and backend.streams:
+            # Tri complet sur une table en colonnes (ID, priorité, échéance) ;
+            # les tâches sont relues dans l'ordre au moment de l'affichage.
+            ids = TaskTable.from_tasks(tasks).ordered_ids(sort)
+            return timed("load", backend.iter_many(ids[offset:]))
+        if limit is None:
+            return sorted(tasks, key=sort_key(sort))[offset:]
+        return heapq.nsmallest(offset + limit, tasks, key=sort_key(sort))[offset:]
+
+
+def find_series(backend: Backend, high: int) -> List[Dict[str, Any]]:
+    """Retourne les tâches récurrentes dont la première occurrence est au plus tard *high*.
+
+    Les IDs viennent du :class:`recurrence.RecurrenceIndex` du stockage et
+    seules ces tâches sont lues ; un stockage sans cet index (mémoire du
+    démon) est parcouru.
+
+    Args:
+        backend: Stockage interrogé.
+        high: Ordinal de la fin de la fenêtre interrogée.
+
+    Returns:
+        Les séries, par ID croissant.
+    """
+    index = next((o for o in backend.observers if isinstance(o, RecurrenceIndex)), None)
+    if index is None:
+        return window_series(backend.iter_tasks(), high)
+    with span("filter"):
+        ids = index.lookup(high)
+    return window_series(backend.get_many(ids), high) if ids else []
+
+
+def stats_index(backend: Backend) -> Optional[StatsIndex]:
+    """Retourne le :class:`stats.StatsIndex` attaché au stockage, ou None."""
+    return attached(backend, "StatsIndex")
+
+
+def widen(limit: Optional[int], offset: int, series: List[Dict[str, Any]],
+          window: Tuple[int, int]) -> Optional[int]:
+    """Taille de la page à lire avant :func:`merge_occurrences`.
+
+    Le chemin habituel filtre sur ``due`` : il ne renvoie que les séries
+    dont la première occurrence est dans la fenêtre. Ces lignes sont
+    retirées avant la fusion ; la page lue doit en contenir assez pour que
+    ``offset + limit`` lignes restent.
+
+    Args:
+        limit: Taille de la page demandée (None = toutes).
+        offset: Nombre de tâches à sauter.
+        series: Séries développées.
+        window: Fenêtre d'échéances ``(min, max)``.
+
+    Returns:
+        La limite à passer au chemin habituel (avec un décalage nul).
+    """
+    if limit is None:
+        return None
+    return offset + limit + sum(1 for t in series if due_ordinal(t) >= window[0])
+
+
+def occurrence_span(window: Tuple[int, int], today: Optional[int] = None) -> str:
+    """Décrit, pour ``--explain``, les occurrences listées dans *window*.
+
+    Args:
+        window: Fenêtre d'échéances ``(min, max)`` de la requête.
+        today: Ordinal du jour (aujourd'hui par défaut).
+
+    Returns:
+        La fin de la note « Récurrences » du plan.
+    """
+    today = date.today().toordinal() if today is None else today
+    low, high = max(window[0], today), window[1]
+    if high >= ALL_DUES[1]:
+        return "à leur prochaine occurrence"
+    if low > high:
+        return "sans occurrence à venir dans la fenêtre"
+    return (f"développée(s) du {date.fromordinal(low).isoformat()} "
+            f"au {date.fromordinal(high).isoformat()}")
+
+
+def merge_occurrences(rows: Iterable[Dict[str, Any]], series: List[Dict[str, Any]],
+                      window: Tuple[int, int], sort: str, limit: Optional[int], offset: int,
+                      predicate: Optional[Callable[[Dict[str, Any]], bool]] = None,
+                      today: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+    """Remplace les séries d'une page par leurs occurrences dans la fenêtre.
+
+    Comme pour ``watch``, une série n'est jamais en retard : seules ses
+    occurrences d'aujourd'hui ou à venir sont listées, et une fenêtre sans
+    borne haute ne garde que la prochaine. Chaque série est développée par
+    un générateur (:func:`recurrence.expand`) déjà trié ; :func:`heapq.merge`
+    fusionne ces générateurs avec la page, si bien que seules les
+    occurrences nécessaires à la page sont produites.
+
+    Args:
+        rows: Les premières tâches du chemin habituel (voir :func:`widen`), triées.
+        series: Tâches récurrentes (voir :func:`find_series`).
+        window: Fenêtre d'échéances ``(min, max)`` en ordinaux inclus.
+        sort: ``"priority"`` ou ``"date"``.
+        limit: Nombre maximal de tâches (None = toutes).
+        offset: Nombre de tâches à sauter.
+        predicate: Filtre ``--where`` appliqué à chaque occurrence, ou None.
+        today: Ordinal du jour (aujourd'hui par défaut).
+
+    Returns:
+        La page fusionnée, en flux, dans l'ordre de ``list``.
+    """
+    from parallel import rank_key  # pylint: disable=import-outside-toplevel
+
+    ids = {t["id"] for t in series}
+    today = date.today().toordinal() if today is None else today
+    low, high = max(window[0], today), window[1]
+    keep = 1 if high >= ALL_DUES[1] else None
+    expanded: List[Iterator[Dict[str, Any]]] = [
+        itertools.islice(expand(t, low, high), keep) for t in series]
+    if predicate is not None:
+        expanded = [filter(predicate, occurrences) for occurrences in expanded]
+    merged = heapq.merge((t for t in rows if t["id"] not in ids), *expanded, key=rank_key(sort))
+    return itertools.islice(merged, offset, None if limit is None else offset + limit)
+
+
+def format_task(task: Dict[str, Any]) -> str:
+    """Formate une tâche sur une ligne, avec sa règle de répétition et son indicateur de rappel.
+
+    Args:
+        task: Dictionnaire représentant la tâche.
+
+    Returns:
+        La ligne affichée par ``list``.
+    """
+    flag = status_flag(task)
+    flag = f" {flag}" if flag else ""
+    rule = f" – ↻ {task['repeat']}" if task.get("repeat") else ""
+    return (f"[{task['id']}] {task['title']} (Priorité: {task['priority']} – "
+            f"Due: {task['due']}{rule}){flag}")
+
+
+def print_tasks(tasks: Iterable[Dict[str, Any]], capture: Optional[List[str]] = None,
+                fmt: str = "table") -> None:
+    """Affiche des tâches, une par ligne (ou un message si aucune).
+
+    La sortie est écrite par blocs (voir :class:`formats.ChunkedWriter`).
+
+    Args:
+        tasks: Tâches à afficher, éventuellement en flux.
+        capture: Liste qui reçoit aussi le texte écrit, par blocs (pour le cache).
+        fmt: Format de sortie (voir :data:`formats.FORMATS`) ; seul ``table``
+            affiche un message quand il n'y a aucune tâche.
+    """
+    with span("render"), ChunkedWriter(sys.stdout, capture) as out:
+        for chunk in encode_tasks(fmt, tasks, format_task):
+            out.write(chunk)
+        if fmt == "table" and not out.written:
+            out.write(NO_TASKS + "\n")
+
+
+def list_tasks(args: argparse.Namespace) -> None:
+    """Affiche les tâches triées, avec filtres de rappel et pagination.
+
+    Avec le cache actif (:func:`query_cache`), le texte affiché est servi
+    tel quel tant que le stockage, les arguments et la date du jour n'ont
+    pas changé.
+
+    Args:
+        args: Arguments de la CLI. Attendus : ``sort``, ``overdue`` (bool),
+            ``due_in`` (int ou None), ``limit`` (int ou None), ``offset`` (int),
+            ``format`` (voir :data:`formats.FORMATS`), ``jobs`` (int ou None),
+            ``where`` (expression ou None), ``explain`` et ``include_archive``
+            (bool).
+
+    Raises:
+        ValueError: Si l'expression ``--where`` est invalide, ou si ``--jobs``
+            est combiné à ``--where``/``--explain``/``--include-archive``.
+    """
+    store = cli_store()
+    params = {"sort": args.sort, "overdue": bool(getattr(args, "overdue", False)),
+              "due_in": getattr(args, "due_in", None), "limit": getattr(args, "limit", None),
+              "offset": getattr(args, "offset", 0) or 0}
+    jobs = getattr(args, "jobs", None)
+    fmt = getattr(args, "format", "table")
+    fmt = fmt if isinstance(fmt, str) else "table"
+    where = getattr(args, "where", None)
+    where = where if isinstance(where, str) else None
+    explain = getattr(args, "explain", False) is True
+    include_archive = getattr(args, "include_archive", False) is True
+    planned = "" if explain and where is None else where  # --explain passe par le planificateur
+
+    def page() -> Iterable[Dict[str, Any]]:
+        return store.page(where=planned, include_archive=include_archive, jobs=jobs, **params)
+
+    cache = None if explain else query_cache(store.backend)
+    if cache is None:
+        print_tasks(page(), fmt=fmt)
+        if explain:
+            # Les formats machine gardent une sortie standard analysable.
+            print("\n".join(store.last_plan.explain()),
+                  file=sys.stdout if fmt == "table" else sys.stderr)
+        return
+    extra = {} if where is None else {"where": where}
+    if fmt != "table":
+        extra["format"] = fmt
+    if include_archive:
+        extra["include_archive"] = True
+    key = cache.key("list", date.today().isoformat(), **params, **extra)
+    with span("cache"):
+        try:
+            text = cache.get(key)
+        except OSError:
+            text = None  # cache inutilisable (droits, disque plein) : lecture directe
+    if text is not None:
+        sys.stdout.write(text)
+        return
+    signature = cache.signature()  # avant la lecture : une écriture concurrente l'invalide
+    chunks: List[str] = []
+    print_tasks(page(), capture=chunks, fmt=fmt)
+    with span("cache"):
         try:
-            args.func(args)
-        except ValueError as exc:
-            print(f"Erreur: {exc}")
+            cache.put(key, "".join(chunks), signature)
+        except OSError:
+            pass  # le résultat est déjà affiché
+
+
+def where_query(where: Optional[str], overdue: bool, due_in: Optional[int]) -> Any:
+    """Compile ``--where`` et les filtres de rappel en une seule requête.
+
+    Args:
+        where: Expression ``--where`` (voir :mod:`where`), ou None.
+        overdue: Filtre ``--overdue``.
+        due_in: Filtre ``--due-in`` (nombre de jours) ou None.
+
+    Returns:
+        La :class:`where.Query` compilée.
+
+    Raises:
+        ValueError: Si l'expression est invalide.
+    """
+    import where as where_lang  # pylint: disable=import-outside-toplevel
+
+    return where_lang.parse(where) & where_lang.parse(where_lang.reminder_clause(overdue, due_in))
+
+
+def where_plan(backend: Backend, query: Any, sort: str, limit: Optional[int],
+               offset: int) -> Any:
+    """Choisit le chemin d'accès d'une requête ``--where`` (voir :func:`where.plan`)."""
+    import where as where_lang  # pylint: disable=import-outside-toplevel
+
+    with span("plan"):
+        return where_lang.plan(backend, query, sort, limit, offset)
+
+
+def merge_archive(backend: Backend, rows: List[Dict[str, Any]], query: Any, plan: Any,
+                  limit: Optional[int], offset: int) -> List[Dict[str, Any]]:
+    """Fusionne une page du stockage courant avec les tâches archivées.
+
+    L'archive est lue en flux et filtrée par le prédicat de *query* ; une
+    tâche présente des deux côtés (archivage interrompu) est prise dans le
+    stockage courant.
+
+    Args:
+        backend: Stockage courant.
+        rows: Les ``offset + limit`` premières tâches courantes, triées.
+        query: Requête compilée (voir :func:`where_query`).
+        plan: Plan exécuté pour *rows* (reçoit les mesures de l'archive).
+        limit: Nombre maximal de tâches (None = toutes).
+        offset: Nombre de tâches à sauter.
+
+    Returns:
+        La page fusionnée, dans l'ordre de ``list``.
+    """
+    # pylint: disable=import-outside-toplevel
+    from coldstore import ColdStore
+    from parallel import rank_key
+
+    examined = 0
+    archived = []
+    for task in ColdStore(backend.path).iter_tasks():
+        examined += 1
+        if query.predicate(task):
+            archived.append(task)
+
+    def archived_only(tasks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        current = {t["id"] for t in backend.get_many([t["id"] for t in tasks])}
+        return [t for t in tasks if t["id"] not in current]
+
+    key = rank_key(plan.sort)
+    stop = None if limit is None else offset + limit
+    if stop is None:
+        archived = sorted(archived_only(archived), key=key)
+    else:
+        # Seules les premières candidates peuvent entrer dans la page :
+        # on n'interroge le stockage courant que pour elles.
+        want = stop
+        while True:
+            head = heapq.nsmallest(want, archived, key=key)
+            kept = archived_only(head)
+            if len(kept) >= stop or len(head) < want:
+                break
+            want += stop
+        archived = kept[:stop]
+    page = list(itertools.islice(heapq.merge(rows, archived, key=key), offset, stop))
+    plan.shown = len(page)
+    plan.notes.append(f"  Archive : {examined} tâche(s) examinée(s), {len(archived)} retenue(s)")
+    return page
+
+
+def archive_query(days: Optional[int], where: Optional[str]) -> Any:
+    """Sélection d'archivage : retard de plus de *days* jours et/ou ``--where``.
+
+    Args:
+        days: Nombre de jours de retard au-delà duquel archiver, ou None.
+        where: Expression ``--where`` supplémentaire, ou None.
+
+    Returns:
+        La :class:`where.Query` compilée.
+
+    Raises:
+        ValueError: Si aucun critère n'est fourni, ou si l'expression est invalide.
+    """
+    import where as where_lang  # pylint: disable=import-outside-toplevel
+
+    if days is None and not (where and where.strip()):
+        raise ValueError("Indiquez --older-than N, --where ou une politique (--policy N)")
+    query = where_lang.parse(where)
+    if days is not None:
+        query = query & where_lang.parse(f"due<today-{int(days)}")
+    return query
+
+
+def move_to_archive(backend: Backend, store: ColdStore, query: Any,
+                    dry_run: bool = False) -> List[Dict[str, Any]]:
+    """Déplace vers l'archive les tâches qui satisfont *query*.
+
+    Les tâches sont écrites dans l'archive (de façon durable) avant d'être
+    supprimées du stockage courant, qui est ensuite compacté (journal
+    replié, ``VACUUM`` en SQLite) pour retrouver sa taille. Les tâches
+    récurrentes, qui ont toujours des occurrences à venir, ne sont jamais
+    archivées. L'appelant détient le verrou.
+
+    Args:
+        backend: Stockage courant.
+        store: Archive du stockage.
+        query: Sélection (voir :func:`archive_query`).
+        dry_run: Ne rien écrire.
+
+    Returns:
+        Les tâches archivées (ou qui le seraient), par échéance.
+    """
+    with span("filter"):
+        tasks = [t for t in where_plan(backend, query, "date", None, 0).run()
+                 if not is_recurring(t)]
+    if dry_run or not tasks:
+        return tasks
+    with span("archive"):
+        store.append(tasks)
+    backend.commit(deletes=[t["id"] for t in tasks])
+    backend.id_floor = max(backend.id_floor, store.meta["next_id"])
+    with span("compact"):
+        backend.compact()
+    return tasks
+
+
+def archive_tasks(args: argparse.Namespace) -> None:
+    """Déplace les tâches anciennes vers l'archive compressée, ou règle la politique.
+
+    Args:
+        args: Arguments de la CLI. Attendus : ``older_than`` (int ou None),
+            ``where`` (ou None), ``codec`` (ou None), ``policy`` (int, ``"off"``
+            ou None) et ``dry_run``.
+
+    Raises:
+        ValueError: Si aucun critère n'est fourni, ou si le codec diffère de
+            celui de l'archive existante.
+    """
+    from coldstore import ColdStore  # pylint: disable=import-outside-toplevel
+
+    backend = get_backend()
+    policy = getattr(args, "policy", None)
+    with backend.lock():
+        store = ColdStore(backend.path)
+        if args.codec:
+            store.set_codec(args.codec)
+        if policy is not None:
+            store.set_policy(None if policy == "off" else policy)
+            if policy == "off":
+                print("Archivage automatique désactivé.")
+                return
+            print(f"Archivage automatique : tâches en retard depuis plus de {policy} jour(s), "
+                  "au premier ajout de chaque jour.")
+        days = args.older_than if args.older_than is not None else store.meta["policy_days"]
+        tasks = move_to_archive(backend, store, archive_query(days, args.where), args.dry_run)
+        if policy is not None and not args.dry_run:
+            store.mark_run(date.today())
+    report_bulk(tasks, "archivée(s)", args.dry_run)
+    if store.count:
+        print(f"Archive : {store.count} tâche(s) dans {store.archive_path}.")
+
+
+def apply_archive_policy(backend: Backend) -> None:
+    """Applique la politique d'archivage automatique, au plus une fois par jour.
+
+    Appelée après ``add`` et ``import`` : sans archive ni politique, le
+    coût se limite à la lecture (manquée) des métadonnées.
+
+    Args:
+        backend: Stockage courant.
+    """
+    from coldstore import ColdStore  # pylint: disable=import-outside-toplevel
+
+    today = date.today()
+    if ColdStore(backend.path).policy_pending(today) is None:
+        return
+    with backend.lock():
+        store = ColdStore(backend.path)  # relue sous verrou
+        days = store.policy_pending(today)
+        if days is None:
+            return
+        tasks = move_to_archive(backend, store, archive_query(days, None))
+        store.mark_run(today)
+    if tasks:
+        print(f"{len(tasks)} tâche(s) archivée(s) automatiquement "
+              f"(en retard depuis plus de {days} jour(s)).")
+
+
+def search_backend(backend: Backend, terms: List[str]) -> List[Dict[str, Any]]:
+    """Retourne les tâches dont le titre ou la description contient tous les mots.
+
+    L'index inversé fournit les IDs (intersection des listes de chaque mot)
+    et seules ces tâches sont lues. Sans index (tâches en mémoire du démon),
+    les tâches sont parcourues et comparées une à une.
+
+    Args:
+        backend: Stockage interrogé.
+        terms: Mots normalisés (voir :func:`indexes.tokenize`).
+
+    Returns:
+        Les tâches trouvées, par ID croissant.
+    """
+    index = next((o for o in backend.observers if isinstance(o, SearchIndex)), None)
+    if index is None:
+        with span("filter"):
+            wanted = set(terms)
+            return [t for t in backend.iter_tasks() if wanted <= task_terms(t)]
+    with span("filter"):
+        ids = index.lookup(terms)
+    with span("load"):
+        return backend.get_many(ids)
+
+
+def search_tasks(args: argparse.Namespace) -> None:
+    """Affiche les tâches qui contiennent tous les mots recherchés.
+
+    La recherche ignore la casse et les accents (``reunion`` trouve
+    « Réunion »). Les filtres de rappel, le tri et la pagination
+    s'appliquent au résultat comme pour ``list`` ; une tâche récurrente y
+    figure une fois, à sa prochaine occurrence.
+
+    Args:
+        args: Arguments de la CLI. Attendus : ``terms`` (mots recherchés),
+            ``sort``, ``overdue``, ``due_in``, ``limit``, ``offset`` et ``format``.
+
+    Raises:
+        ValueError: Si la recherche ne contient aucun mot.
+    """
+    terms = tokenize(" ".join(args.terms))
+    if not terms:
+        raise ValueError("Recherche vide : indiquez au moins un mot")
+    today = date.today().toordinal()
+    tasks = [upcoming(t, today) for t in search_backend(get_backend(), terms)]
+    bounds = due_range(getattr(args, "overdue", False), getattr(args, "due_in", None))
+    if bounds is not None:
+        with span("filter"):
+            tasks = [t for t in tasks if bounds[0] <= due_ordinal(t) <= bounds[1]]
+    offset = getattr(args, "offset", 0) or 0
+    limit = getattr(args, "limit", None)
+    with span("sort"):
+        tasks = sorted(tasks, key=sort_key(args.sort))
+    print_tasks(tasks[offset:None if limit is None else offset + limit],
+                fmt=getattr(args, "format", "table"))
+
+
+def parse_count(text: str) -> int:
+    """Convertit un entier positif ou nul (type ``argparse``).
+
+    Args:
+        text: Valeur saisie.
+
+    Returns:
+        L'entier correspondant.
+
+    Raises:
+        argparse.ArgumentTypeError: Si la valeur n'est pas un entier ≥ 0.
+    """
+    import argparse  # pylint: disable=import-outside-toplevel,redefined-outer-name
+
+    try:
+        value = int(text)
+    except ValueError:
+        value = -1
+    if value < 0:
+        raise argparse.ArgumentTypeError("entier positif ou nul attendu")
+    return value
+
+
+def parse_ids(text: str) -> List[int]:
+    """Convertit une liste d'IDs ``1,2,3`` (type ``argparse``).
+
+    Args:
+        text: IDs séparés par des virgules.
+
+    Returns:
+        La liste des IDs.
+
+    Raises:
+        argparse.ArgumentTypeError: Si un élément n'est pas un entier.
+    """
+    import argparse  # pylint: disable=import-outside-toplevel,redefined-outer-name
+
+    try:
+        return [int(part) for part in text.split(",") if part.strip()]
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError("liste d'IDs attendue, ex. 1,2,3") from exc
+
+
+def is_bulk(args: argparse.Namespace) -> bool:
+    """Indique si ``edit``/``delete`` portent sur une sélection plutôt qu'un seul ID.
+
+    Args:
+        args: Arguments de la CLI.
+
+    Returns:
+        True si ``--ids``, un filtre ou ``--dry-run`` est fourni.
+    """
+    selectors = ("ids", "overdue", "due_in", "min_priority", "max_priority", "dry_run")
+    return any(getattr(args, name, None) not in (None, False) for name in selectors)
+
+
+def selection(args: argparse.Namespace) -> Dict[str, Any]:
+    """Critères de :meth:`TaskStore.select` d'une opération en masse.
+
+    ``--id`` s'ajoute aux IDs de ``--ids`` ; les filtres de rappel et la
+    plage de priorités se cumulent.
+
+    Args:
+        args: Arguments de la CLI.
+
+    Returns:
+        Les arguments nommés de :meth:`TaskStore.select`.
+    """
+    ids = list(getattr(args, "ids", None) or [])
+    if getattr(args, "id", None) is not None:
+        ids.append(args.id)
+    return {"ids": ids, "overdue": bool(getattr(args, "overdue", False)),
+            "due_in": getattr(args, "due_in", None),
+            "min_priority": getattr(args, "min_priority", None),
+            "max_priority": getattr(args, "max_priority", None)}
+
+
+def report_bulk(tasks: List[Dict[str, Any]], verb: str, dry_run: bool) -> None:
+    """Affiche le résultat d'une opération en masse.
+
+    Args:
+        tasks: Tâches concernées.
+        verb: Participe passé de l'opération (``"supprimée(s)"``…).
+        dry_run: True si rien n'a été écrit.
+    """
+    if dry_run:
+        print(f"{len(tasks)} tâche(s) seraient {verb} (simulation) :")
+        for t in tasks:
+            print(f"  {format_task(t)}")
+    else:
+        print(f"{len(tasks)} tâche(s) {verb}.")
+
+
+def delete_task(args: argparse.Namespace) -> None:
+    """Supprime une tâche par ID, ou une sélection de tâches en une écriture.
+
+    Args:
+        args: Arguments de la CLI. Attendu : ``id`` (int) ou des critères de
+            sélection (``ids``, ``overdue``, ``due_in``, ``min_priority``,
+            ``max_priority``) et éventuellement ``dry_run``.
+    """
+    if not is_bulk(args) and args.id is None:
+        raise ValueError("Indiquez --id, --ids ou au moins un filtre")
+    store = cli_store()
+    if is_bulk(args):
+        tasks = store.delete_many(dry_run=args.dry_run, **selection(args))
+        report_bulk(tasks, "supprimée(s)", args.dry_run)
+    elif store.delete(args.id):
+        print(f"Tâche {args.id} supprimée.")
+    else:
+        print(f"Aucune tâche trouvée avec l'ID {args.id}")
+
+
+def edit_task(args: argparse.Namespace) -> None:
+    """Modifie une tâche existante (seuls les champs fournis sont mis à jour).
+
+    En mode sélection (``--ids`` ou filtres), toutes les tâches visées sont
+    modifiées puis persistées en une seule écriture.
+
+    Args:
+        args: Arguments de la CLI. Attendus : ``id`` (ou des critères de
+            sélection, voir :func:`selection`) et, optionnellement,
+            ``title``, ``desc``, ``priority``, ``due``, ``repeat``.
+    """
+    fields = {name: getattr(args, name) for name in ("title", "desc", "priority", "due")}
+    repeat = getattr(args, "repeat", None)
+    if isinstance(repeat, str):
+        fields["repeat"] = repeat
+    store = cli_store()
+    if is_bulk(args):
+        tasks = store.edit_many(fields, dry_run=args.dry_run, **selection(args))
+        report_bulk(tasks, "mise(s) à jour", args.dry_run)
+        return
+    if args.id is None:
+        raise ValueError("Indiquez --id, --ids ou au moins un filtre")
+    if store.edit(args.id, **fields) is None:
+        print(f"Aucune tâche trouvée avec l'ID {args.id}")
+    else:
+        print(f"Tâche {args.id} mise à jour.")
+
+
+def read_import_rows(path: str, fmt: Optional[str] = None) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """Lit un fichier d'import ligne par ligne (sans le charger en entier).
+
+    Args:
+        path: Fichier CSV (avec en-tête) ou JSONL (un objet par ligne).
+        fmt: ``"csv"`` ou ``"jsonl"`` ; déduit de l'extension si None.
+
+    Yields:
+        Des couples ``(numéro de ligne, enregistrement)``. Une ligne JSONL
+        illisible produit un enregistrement ``{"_error": message}``.
+
+    Raises:
+        ValueError: Si le fichier ne peut pas être ouvert.
+    """
+    fmt = fmt or ("csv" if path.lower().endswith(".csv") else "jsonl")
+    try:
+        f = open(path, "r", encoding="utf-8", newline="")  # pylint: disable=consider-using-with
+    except OSError as exc:
+        raise ValueError(f"Impossible de lire {path} ({exc.strerror})") from exc
+    with f:
+        if fmt == "csv":
+            import csv  # pylint: disable=import-outside-toplevel
+
+            reader = csv.DictReader(f)
+            for row in reader:
+                yield reader.line_num, row
+            return
+        for line_no, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as exc:
+                record = {"_error": f"JSON invalide ({exc.msg})"}
+            if not isinstance(record, dict):
+                record = {"_error": "objet JSON attendu"}
+            yield line_no, record
+
+
+def task_from_record(record: Dict[str, Any], task_id: int) -> Dict[str, Any]:
+    """Construit et valide une tâche à partir d'un enregistrement importé.
+
+    Args:
+        record: Champs lus (``title``, ``desc``, ``priority``, ``due``,
+            ``created`` et ``repeat`` optionnels ; un éventuel ``id`` est ignoré).
+        task_id: ID attribué à la nouvelle tâche.
+
+    Returns:
+        La tâche prête à être persistée.
+
+    Raises:
+        ValueError: Si un champ est manquant ou invalide.
+    """
+    if "_error" in record:
+        raise ValueError(record["_error"])
+    title = (record.get("title") or "").strip()
+    if not title:
+        raise ValueError("Titre manquant")
+    try:
+        priority = int(record.get("priority"))
+    except (TypeError, ValueError) as exc:
+        raise ValueError("Priorité manquante ou non numérique") from exc
+    validate_priority(priority)
+    due = record.get("due") or ""
+    validate_due(due)
+    task = {
+        "id": task_id,
+        "title": title,
+        "desc": record.get("desc") or "",
+        "priority": priority,
+        "due": due,
+        "created": record.get("created") or datetime.now().isoformat(),
+    }
+    rule = parse_rule(record["repeat"]) if record.get("repeat") else ""
+    if rule:
+        task["repeat"] = rule
+    return task
+
+
+def import_tasks(args: argparse.Namespace) -> None:
+    """Importe en masse des tâches depuis un fichier CSV ou JSONL.
+
+    Chaque ligne est validée comme pour ``add`` ; les lignes invalides sont
+    signalées sans interrompre l'import. Les IDs sont attribués en une passe
+    et les tâches persistées en une seule écriture, ou par lots de
+    ``batch_size`` lignes pour borner la mémoire. L'import entier se fait
+    sous le verrou du stockage (ou via la file en mode groupé).
+
+    Args:
+        args: Arguments de la CLI. Attendus : ``file``, ``format`` (ou None)
+            et ``batch_size`` (0 = une seule écriture).
+    """
+    from groupcommit import reserve_ids  # pylint: disable=import-outside-toplevel
+
+    backend = get_backend()
+    group = group_commit(backend)
+    batch_size = getattr(args, "batch_size", 0) or 0
+    batch: List[Dict[str, Any]] = []
+    imported = 0
+    rejected: List[Tuple[int, str]] = []
+
+    def persist(tasks: List[Dict[str, Any]]) -> None:
+        """Persiste un lot (sous le verrou, ou via la file)."""
+        if group is not None:
+            group.write(adds=tasks)  # IDs attribués par la file
+            return
+        first = reserve_ids(backend, len(tasks))  # IDs réservés par la file exclus
+        for offset, task in enumerate(tasks):
+            task["id"] = first + offset
+        backend.commit(puts=tasks)
+
+    with backend.lock() if group is None else nullcontext():
+        next_id = backend.next_id()
+        rows = read_import_rows(args.file, getattr(args, "format", None))
+        for line_no, record in timed("load", rows):
+            try:
+                with span("validate"):
+                    task = task_from_record(record, next_id)
+            except ValueError as exc:
+                rejected.append((line_no, str(exc)))
+                continue
+            batch.append(task)
+            next_id += 1
+            if batch_size and len(batch) >= batch_size:
+                persist(batch)
+                imported += len(batch)
+                batch = []
+        if batch:
+            persist(batch)
+            imported += len(batch)
+
+    print(f"{imported} tâche(s) importée(s), {len(rejected)} ligne(s) rejetée(s).")
+    for line_no, reason in rejected[:IMPORT_REPORT_LIMIT]:
+        print(f"  Ligne {line_no} rejetée : {reason}")
+    if len(rejected) > IMPORT_REPORT_LIMIT:
+        print(f"  … et {len(rejected) - IMPORT_REPORT_LIMIT} autre(s).")
+    apply_archive_policy(backend)
+
+
+def compact_store(args: argparse.Namespace) -> None:  # pylint: disable=unused-argument
+    """Replie le journal dans un nouvel instantané (``VACUUM`` en SQLite).
+
+    Args:
+        args: Arguments de la CLI (aucun attendu).
+    """
+    count = get_backend().compact()
+    print(f"Stockage compacté ({count} tâches).")
+
+
+def cache_command(args: argparse.Namespace) -> None:
+    """Affiche l'état du cache des résultats de ``list``, ou le vide.
+
+    Args:
+        args: Arguments de la CLI. Attendu : ``action`` (``"stats"`` ou ``"clear"``).
+    """
+    from querycache import QueryCache  # pylint: disable=import-outside-toplevel
+
+    cache = QueryCache(get_backend())
+    if args.action == "clear":
+        removed = cache.clear(counters=True)
+        print(f"Cache vidé ({removed} entrée(s)).")
+        return
+    stats = cache.stats()
+    lookups = stats["hits"] + stats["misses"]
+    ratio = f"{100 * stats['hits'] / lookups:.0f} %" if lookups else "n/a"
+    state = "actif" if QUERY_CACHE else "inactif (--cache ou TASKS_CACHE=1)"
+    print(f"Cache des requêtes : {cache.path} ({state})")
+    print(f"  Succès : {stats['hits']}  Échecs : {stats['misses']}  Taux de succès : {ratio}")
+    print(f"  Entrées : {stats['entries']}  Taille : {stats['bytes'] / 1024:.1f} Kio "
+          f"/ {stats['max_bytes'] / 1024:.0f} Kio")
+
+
+def stats_command(args: argparse.Namespace) -> None:
+    """Affiche les statistiques agrégées des tâches (voir :mod:`stats`).
+
+    Args:
+        args: Arguments de la CLI. Attendus : ``today`` (date ou None),
+            ``days`` (taille de l'histogramme), ``format`` (``"table"`` ou
+            ``"json"``) et ``recompute`` (vérifier les compteurs par un
+            parcours complet).
+    """
+    store = TaskStore(get_backend())
+    if args.recompute:
+        index = stats_index(store.backend)
+        fixed = index.recompute() if index is not None else None
+        if index is None:
+            print("Compteurs calculés par un parcours complet (démon).")
+        elif fixed is None:
+            print("Compteurs construits par un parcours complet.")
+        elif fixed:
+            print(f"Compteurs vérifiés : {fixed} compteur(s) corrigé(s).")
+        else:
+            print("Compteurs vérifiés : conformes au parcours complet.")
+    summary = store.stats(args.today, args.days)
+    if args.format == "json":
+        print(json.dumps(summary, ensure_ascii=False))
+        return
+    priorities = "  ".join(f"{p}: {n}" for p, n in summary["priority"].items())
+    print(f"Tâches : {summary['total']} (dont {summary['recurring']} récurrente(s), "
+          f"{summary['undated']} sans échéance valide)")
+    print(f"Par priorité : {priorities}")
+    print(f"Au {summary['today']} : {summary['overdue']} échéance(s) en retard, "
+          f"{summary['soon']} bientôt (≤ {summary['soon_days']} jours)")
+    peak = max([n for _, n in summary["due"]], default=0)
+    print(f"Échéances du {summary['due'][0][0]} au {summary['due'][-1][0]} :")
+    for day, n in summary["due"]:
+        histogram_bar = "█" * (round(STATS_BAR_WIDTH * n / peak) if peak else 0)
+        print(f"  {day} {n:>5} {histogram_bar}")
+
+
+def watch_tasks(args: argparse.Namespace) -> None:
+    """Surveille le stockage et signale les tâches qui deviennent proches ou en retard.
+
+    Les tâches sont chargées une fois ; la commande dort ensuite jusqu'à la
+    prochaine transition et ne relit que les écritures nouvelles (voir
+    :mod:`watcher`). Elle s'arrête avec Ctrl-C.
+
+    Args:
+        args: Arguments de la CLI. Attendus : ``due_in`` (jours),
+            ``interval`` (secondes) et ``exec`` (commande ou None).
+
+    Raises:
+        ValueError: Si l'intervalle n'est pas strictement positif.
+    """
+    import watcher  # pylint: disable=import-outside-toplevel
+
+    if args.interval <= 0:
+        raise ValueError("L'intervalle doit être strictement positif")
+    watch = watcher.Watcher(get_backend(), args.due_in)
+    watch.refresh()
+    next_change = date.fromordinal(watch.next_day).isoformat() if watch.next_day else "aucune"
+    print(f"Surveillance de {len(watch)} tâche(s) (bientôt = {args.due_in} jour(s)) ; "
+          f"prochaine transition : {next_change}. Ctrl-C pour arrêter.", flush=True)
+
+    def notify(event: Dict[str, Any]) -> None:
+        print(f"{event['day']} [{event['id']}] {event['title']} : "
+              f"{watcher.STATUS_LABELS[event['status']]} (échéance {event['due']})", flush=True)
+        if args.exec:
+            code = watcher.run_hook(args.exec, event)
+            if code:
+                print(f"Commande de notification en échec (code {code}).", file=sys.stderr)
+
+    try:
+        watch.run(notify, args.interval)
+    except KeyboardInterrupt:
+        pass
+    print("Surveillance arrêtée.")
+
+
+def snapshot_format(path: str, fmt: Optional[str]) -> str:
+    """Choisit le format d'un instantané à écrire.
+
+    Args:
+        path: Fichier de destination.
+        fmt: Format demandé (``--format``/``--to``) ou None.
+
+    Returns:
+        *fmt*, sinon ``"binary"`` pour une extension ``.bin``,
+        ``"partitioned"`` pour ``.d`` et ``"json"`` ailleurs.
+    """
+    if fmt:
+        return fmt
+    return {".bin": "binary", ".d": "partitioned"}.get(os.path.splitext(path)[1], "json")
+
+
+def export_tasks(args: argparse.Namespace) -> None:
+    """Exporte le stockage courant vers un instantané JSON ou binaire.
+
+    Args:
+        args: Arguments de la CLI. Attendus : ``file`` et ``format`` (ou None).
+    """
+    backend = get_backend()
+    fmt = snapshot_format(args.file, args.format)
+    tasks = list(backend.iter_tasks())
+    write_snapshot(args.file, tasks, fmt, backend.next_id())
+    print(f"{len(tasks)} tâche(s) exportée(s) vers {args.file} ({fmt}).")
+
+
+def convert_snapshot(args: argparse.Namespace) -> None:
+    """Convertit un instantané entre les formats JSON et binaire.
+
+    Args:
+        args: Arguments de la CLI. Attendus : ``source``, ``dest`` et ``to``
+            (ou None : le format opposé à celui de la source).
+
+    Raises:
+        ValueError: Si la source est introuvable ou illisible.
+    """
+    source_fmt = detect_format(args.source)
+    fmt = args.to or ("json" if source_fmt == "binary" else "binary")
+    source = open_backend(f"{source_fmt}:{args.source}", TASKS_FILE)
+    tasks = source.load()
+    write_snapshot(args.dest, tasks, fmt, source.next_id())
+    print(f"{len(tasks)} tâche(s) convertie(s) : {args.source} ({source_fmt}) → "
+          f"{args.dest} ({fmt}).")
+
+
+def store_path() -> str:
+    """Retourne le chemin du fichier de stockage courant.
+
+    Returns:
+        Le chemin désigné par :data:`STORE_SPEC`, sinon :data:`TASKS_FILE`.
+    """
+    if STORE_SPEC:
+        return open_backend(STORE_SPEC, TASKS_FILE).path
+    return TASKS_FILE
+
+
+def handle_request(request: Dict[str, Any]) -> Dict[str, Any]:
+    """Exécute dans le démon une commande transmise par un client.
+
+    La commande est refusée (le client l'exécute alors lui-même) si elle
+    vise un autre stockage que celui du démon, ou si c'est ``serve`` ou
+    ``watch`` (qui ne rendent pas la main). ``--journal`` ne change pas le
+    fichier visé : la commande est servie sur le stockage du démon.
+
+    Args:
+        request: Requête décodée (``argv``, ``cwd``, ``store``).
+
+    Returns:
+        La réponse : ``status`` (``"ok"`` ou ``"refused"``), ``stdout``,
+        ``stderr`` et ``exit`` (code de sortie d'``argparse``, ou None).
+    """
+    out, err = StringIO(), StringIO()
+    try:
+        with redirect_stdout(out), redirect_stderr(err):
+            _, args = parse_command_line(request.get("argv") or [])
+    except SystemExit as exc:
+        return {"status": "ok", "stdout": out.getvalue(), "stderr": err.getvalue(),
+                "exit": exc.code}
+    cwd = request.get("cwd") or ""
+    spec = args.store or request.get("store")
+    target = open_backend(spec, TASKS_FILE).path if spec else TASKS_FILE
+    if (args.command in (None, "serve", "watch")
+            or os.path.abspath(os.path.join(cwd, target)) != os.path.abspath(store_path())):
+        return {"status": "refused"}
+    for name in ("file", "source", "dest"):
+        if getattr(args, name, None):
+            setattr(args, name, os.path.join(cwd, getattr(args, name)))
+    with redirect_stdout(out), redirect_stderr(err):
+        run_command(args)
+    return {"status": "ok", "stdout": out.getvalue(), "stderr": err.getvalue(), "exit": None}
+
+
+def run_command(args: argparse.Namespace) -> None:
+    """Exécute la sous-commande de *args*, mesurée si demandé.
+
+    Avec ``--profile`` (ou ``--profile-top N``), la répartition du temps par
+    phase (voir :mod:`metrics`) est affichée sur la sortie d'erreur, suivie
+    des *N* fonctions les plus coûteuses selon :mod:`cProfile`. Si
+    :data:`METRICS_ENV` désigne un fichier, les mesures y sont ajoutées en
+    JSON lines.
+
+    Args:
+        args: Arguments analysés (``func`` est la commande).
+    """
+    top = getattr(args, "profile_top", None)
+    profile = getattr(args, "profile", False) or top is not None
+    sink = os.environ.get(METRICS_ENV)
+    if not profile and not sink:
+        execute(args)
+        return
+    profiler = None
+    if top:
+        import cProfile  # pylint: disable=import-outside-toplevel
+        profiler = cProfile.Profile()
+    import metrics  # pylint: disable=import-outside-toplevel
+
+    with metrics.recording() as recorder:
+        if profiler is not None:
+            profiler.enable()
+        try:
+            execute(args)
+        finally:
+            if profiler is not None:
+                profiler.disable()
+    if profile:
+        print(recorder.report(), file=sys.stderr)
+    if profiler is not None:
+        import pstats  # pylint: disable=import-outside-toplevel
+        pstats.Stats(profiler, stream=sys.stderr).sort_stats("cumulative").print_stats(top)
+    if sink:
+        metrics.append_jsonl(sink, recorder.as_record(command=args.command))
+
+
+def execute(args: argparse.Namespace) -> None:
+    """Exécute la sous-commande et affiche les erreurs de validation.
+
+    Args:
+        args: Arguments analysés (``func`` est la commande).
+    """
+    try:
+        args.func(args)
+    except ValueError as exc:
+        print(f"Erreur: {exc}")
+
+
+def serve_tasks(args: argparse.Namespace) -> None:
+    """Lance le démon : tâches en mémoire, commandes reçues sur une socket Unix.
+
+    Args:
+        args: Arguments de la CLI. Attendus : ``socket`` (ou None) et
+            ``flush_interval`` (secondes).
+    """
+    global ACTIVE_BACKEND  # pylint: disable=global-statement
+    import daemon  # pylint: disable=import-outside-toplevel
+
+    path = args.socket or socket_path(store_path())
+    backend = daemon.CachedBackend(get_backend())
+    print(f"Démon à l'écoute sur {path} ({len(backend.load())} tâches en mémoire).", flush=True)
+    ACTIVE_BACKEND = backend
+    try:
+        daemon.serve(path, backend, handle_request, args.flush_interval)
+    finally:
+        ACTIVE_BACKEND = None
+    print("Démon arrêté, écritures persistées.")
+
+
+def peek_store(argv: List[str]) -> Optional[str]:
+    """Extrait ``--store`` d'une ligne de commande sans construire le parseur.
+
+    Args:
+        argv: Arguments de la CLI.
+
+    Returns:
+        La spécification passée à ``--store``, sinon :data:`STORE_SPEC`.
+    """
+    for i, arg in enumerate(argv):
+        if arg == "--store" and i + 1 < len(argv):
+            return argv[i + 1]
+        if arg.startswith("--store="):
+            return arg.split("=", 1)[1]
+    return STORE_SPEC
+
+
+# ---------- CLI ----------
+def add_selection_arguments(parser: argparse.ArgumentParser) -> None:
+    """Ajoute les critères de sélection en masse à ``edit``/``delete``.
+
+    Args:
+        parser: Sous-commande à compléter.
+    """
+    parser.add_argument("--ids", type=parse_ids, metavar="1,2,3", help="Liste d'IDs")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--overdue", action="store_true", help="Tâches en retard")
+    group.add_argument("--due-in", type=int, metavar="JOURS", help="Tâches à échéance ≤ N jours")
+    parser.add_argument("--min-priority", type=int, metavar="P", help="Priorité ≥ P (1-5)")
+    parser.add_argument("--max-priority", type=int, metavar="P", help="Priorité ≤ P (1-5)")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="Afficher les tâches concernées sans rien modifier")
+
+
+def configure_add(p: argparse.ArgumentParser) -> None:
+    """Arguments de ``add``."""
+    p.add_argument("--title", required=True, help="Titre de la tâche")
+    p.add_argument("--desc", required=True, help="Description de la tâche")
+    p.add_argument("--priority", type=int, required=True, help="Priorité (1=haute,5=basse)")
+    p.add_argument("--due", required=True, help="Date limite (YYYY-MM-DD)")
+    p.add_argument("--repeat", metavar="RÈGLE",
+                   help="Répéter à partir de --due : daily, weekly, monthly "
+                        "ou Nd (tous les N jours)")
+    p.set_defaults(func=add_task)
+
+
+def add_listing_arguments(p: argparse.ArgumentParser) -> None:
+    """Ajoute tri, filtres de rappel, pagination et format à ``list``/``search``.
+
+    Args:
+        p: Sous-commande à compléter.
+    """
+    p.add_argument("--sort", choices=["priority", "date"], default="priority", help="Tri")
+    mg = p.add_mutually_exclusive_group()
+    mg.add_argument("--overdue", action="store_true",
+                    help="Afficher uniquement les tâches en retard")
+    mg.add_argument("--due-in", type=int, metavar="JOURS",
+                    help="Afficher les tâches à échéance ≤ N jours")
+    p.add_argument("--limit", type=parse_count, metavar="N", help="Afficher au plus N tâches")
+    p.add_argument("--offset", type=parse_count, default=0, metavar="N",
+                   help="Sauter les N premières tâches")
+    p.add_argument("--format", choices=FORMATS, default="table",
+                   help="Format de sortie : table lisible, ou jsonl/csv/tsv avec la colonne status")
+
+
+def configure_list(p: argparse.ArgumentParser) -> None:
+    """Arguments de ``list`` (à garder en phase avec :func:`parse_fast`)."""
+    add_listing_arguments(p)
+    p.add_argument("--jobs", type=parse_count, metavar="N",
+                   help="Lire le stockage journal avec N processus (0 = un par processeur)")
+    p.add_argument("--where", metavar="EXPR",
+                   help="Filtre, ex. 'priority<=2 and due<today+7' (voir le README)")
+    p.add_argument("--explain", action="store_true",
+                   help="Afficher le plan d'accès choisi et le nombre de tâches examinées")
+    p.add_argument("--include-archive", action="store_true",
+                   help="Inclure les tâches archivées (lecture de l'archive compressée)")
+    p.set_defaults(func=list_tasks)
+
+
+def configure_search(p: argparse.ArgumentParser) -> None:
+    """Arguments de ``search``."""
+    p.add_argument("terms", nargs="+", metavar="MOT",
+                   help="Mots recherchés dans le titre et la description (tous requis)")
+    add_listing_arguments(p)
+    p.set_defaults(func=search_tasks)
+
+
+def configure_delete(p: argparse.ArgumentParser) -> None:
+    """Arguments de ``delete``."""
+    p.add_argument("--id", type=int, help="ID de la tâche")
+    add_selection_arguments(p)
+    p.set_defaults(func=delete_task)
+
+
+def configure_edit(p: argparse.ArgumentParser) -> None:
+    """Arguments de ``edit``."""
+    p.add_argument("--id", type=int, help="ID de la tâche")
+    add_selection_arguments(p)
+    p.add_argument("--title", help="Nouveau titre")
+    p.add_argument("--desc", help="Nouvelle description")
+    p.add_argument("--priority", type=int, help="Nouvelle priorité (1-5)")
+    p.add_argument("--due", help="Nouvelle date (YYYY-MM-DD)")
+    p.add_argument("--repeat", metavar="RÈGLE",
+                   help="Nouvelle règle de répétition (daily, weekly, monthly, Nd ou none)")
+    p.set_defaults(func=edit_task)
+
+
+def configure_import(p: argparse.ArgumentParser) -> None:
+    """Arguments de ``import``."""
+    p.add_argument("file", help="Fichier à importer")
+    p.add_argument("--format", choices=["csv", "jsonl"],
+                   help="Format du fichier (déduit de l'extension par défaut)")
+    p.add_argument("--batch-size", type=int, default=0, metavar="N",
+                   help="Persister par lots de N tâches (défaut : une seule écriture)")
+    p.set_defaults(func=import_tasks)
+
+
+def configure_compact(p: argparse.ArgumentParser) -> None:
+    """Arguments de ``compact``."""
+    p.set_defaults(func=compact_store)
+
+
+def configure_cache(p: argparse.ArgumentParser) -> None:
+    """Arguments de ``cache``."""
+    p.add_argument("action", choices=["stats", "clear"],
+                   help="stats : compteurs et taille ; clear : vider le cache et les compteurs")
+    p.set_defaults(func=cache_command)
+
+
+def configure_stats(p: argparse.ArgumentParser) -> None:
+    """Arguments de ``stats``."""
+    from stats import HISTOGRAM_DAYS  # pylint: disable=import-outside-toplevel
+
+    p.add_argument("--today", type=parse_date, metavar="YYYY-MM-DD",
+                   help="Jour de référence des retards et de l'histogramme (défaut : aujourd'hui)")
+    p.add_argument("--days", type=parse_count, default=HISTOGRAM_DAYS, metavar="JOURS",
+                   help="Jours couverts par l'histogramme des échéances (défaut : %(default)s)")
+    p.add_argument("--format", choices=["table", "json"], default="table",
+                   help="Format de sortie")
+    p.add_argument("--recompute", action="store_true",
+                   help="Vérifier les compteurs par un parcours complet et les corriger")
+    p.set_defaults(func=stats_command)
+
+
+def configure_watch(p: argparse.ArgumentParser) -> None:
+    """Arguments de ``watch``."""
+    import watcher  # pylint: disable=import-outside-toplevel
+
+    p.add_argument("--due-in", type=parse_count, default=watcher.SOON_DAYS, metavar="JOURS",
+                   help="Signaler les tâches à échéance ≤ N jours (défaut : %(default)s)")
+    p.add_argument("--interval", type=float, default=watcher.POLL_INTERVAL, metavar="SECONDES",
+                   help="Délai maximal entre deux contrôles du stockage (défaut : %(default)s)")
+    p.add_argument("--exec", metavar="COMMANDE",
+                   help="Commande shell lancée à chaque notification "
+                        "(TASK_ID, TASK_TITLE, TASK_DUE, TASK_STATUS)")
+    p.set_defaults(func=watch_tasks)
+
+
+def configure_export(p: argparse.ArgumentParser) -> None:
+    """Arguments de ``export``."""
+    p.add_argument("file", help="Fichier de destination")
+    p.add_argument("--format", choices=SNAPSHOT_FORMATS,
+                   help="Format (défaut : binaire pour .bin, partitionné pour .d, JSON sinon)")
+    p.set_defaults(func=export_tasks)
+
+
+def configure_convert(p: argparse.ArgumentParser) -> None:
+    """Arguments de ``convert``."""
+    p.add_argument("source", help="Instantané à convertir (format détecté)")
+    p.add_argument("dest", help="Fichier de destination")
+    p.add_argument("--to", choices=SNAPSHOT_FORMATS, help="Format cible (défaut : l'autre format)")
+    p.set_defaults(func=convert_snapshot)
+
+
+def parse_policy(text: str) -> Any:
+    """Convertit la valeur de ``archive --policy`` (type ``argparse``).
+
+    Args:
+        text: Nombre de jours, ou ``off``.
+
+    Returns:
+        L'entier, ou ``"off"``.
+
+    Raises:
+        argparse.ArgumentTypeError: Si la valeur n'est ni ``off`` ni un entier ≥ 0.
+    """
+    return "off" if text == "off" else parse_count(text)
+
+
+def configure_archive(p: argparse.ArgumentParser) -> None:
+    """Arguments de ``archive``."""
+    from coldstore import CODECS  # pylint: disable=import-outside-toplevel
+
+    p.add_argument("--older-than", type=parse_count, metavar="JOURS",
+                   help="Archiver les tâches en retard depuis plus de N jours")
+    p.add_argument("--where", metavar="EXPR", help="Critère supplémentaire (voir list --where)")
+    p.add_argument("--codec", choices=sorted(CODECS),
+                   help="Compression d'une nouvelle archive (défaut : gzip)")
+    p.add_argument("--policy", type=parse_policy, metavar="JOURS|off",
+                   help="Archiver automatiquement, au premier ajout du jour, les tâches "
+                        "en retard depuis plus de N jours")
+    p.add_argument("--dry-run", action="store_true",
+                   help="Afficher les tâches concernées sans rien déplacer")
+    p.set_defaults(func=archive_tasks)
+
+
+def configure_serve(p: argparse.ArgumentParser) -> None:
+    """Arguments de ``serve``."""
+    from daemon import FLUSH_INTERVAL  # pylint: disable=import-outside-toplevel
+
+    p.add_argument("--socket", help="Chemin de la socket (défaut : <stockage>.sock)")
+    p.add_argument("--flush-interval", type=float, default=FLUSH_INTERVAL,
+                   metavar="SECONDES",
+                   help="Délai maximal avant persistance des écritures (0 = immédiate)")
+    p.set_defaults(func=serve_tasks)
+
+
+# Sous-commandes : aide affichée et fonction qui déclare leurs arguments.
+COMMANDS: Dict[str, Tuple[str, Callable[[Any], None]]] = {
+    "add": ("Ajouter une nouvelle tâche", configure_add),
+    "list": ("Lister les tâches", configure_list),
+    "search": ("Rechercher des tâches par mots du titre ou de la description", configure_search),
+    "delete": ("Supprimer une ou plusieurs tâches", configure_delete),
+    "edit": ("Modifier une ou plusieurs tâches", configure_edit),
+    "import": ("Importer des tâches depuis un CSV ou un JSONL", configure_import),
+    "compact": ("Replier le journal / compacter le stockage", configure_compact),
+    "archive": ("Déplacer les tâches anciennes vers l'archive compressée", configure_archive),
+    "cache": ("Statistiques du cache des résultats de list (ou le vider)", configure_cache),
+    "stats": ("Statistiques des tâches (priorités, retards, échéances à venir)", configure_stats),
+    "watch": ("Signaler les tâches qui deviennent proches ou en retard", configure_watch),
+    "export": ("Exporter le stockage (JSON ou binaire)", configure_export),
+    "convert": ("Convertir un instantané JSON ↔ binaire", configure_convert),
+    "serve": ("Lancer le démon (socket Unix)", configure_serve),
+}
+# Options globales suivies d'une valeur (pour repérer la sous-commande).
+GLOBAL_VALUE_OPTIONS = ("--store", "--profile-top")
+GLOBAL_FLAGS = ("--journal", "--group-commit", "--cache", "--profile")
+
+
+def build_parser(command: Optional[str] = None) -> argparse.ArgumentParser:
+    """Construit le parseur de la CLI et de ses sous-commandes.
+
+    Toutes les sous-commandes sont déclarées (pour l'aide et les erreurs),
+    mais seuls les arguments de *command* sont construits quand elle est
+    connue : c'est l'essentiel du coût de construction.
+
+    Args:
+        command: Sous-commande invoquée (None = toutes).
+
+    Returns:
+        Le parseur ``argparse``.
+    """
+    import argparse  # pylint: disable=import-outside-toplevel,redefined-outer-name
+
+    parser = argparse.ArgumentParser(description="Gestionnaire de tâches CLI")
+    parser.add_argument("--journal", action="store_true",
+                        help="Écrire les modifications dans un journal en ajout seul")
+    parser.add_argument("--store", metavar="TYPE:CHEMIN",
+                        help="Stockage json:, journal:, sqlite:, binary: ou partitioned:<chemin> "
+                             "(ou TASKS_STORE)")
+    parser.add_argument("--group-commit", action="store_true",
+                        help="Regrouper les écritures concurrentes (ou TASKS_GROUP_COMMIT=1)")
+    parser.add_argument("--cache", action="store_true",
+                        help="Mettre en cache les résultats de list (ou TASKS_CACHE=1)")
+    parser.add_argument("--profile", action="store_true",
+                        help="Afficher le temps passé par phase (sur la sortie d'erreur)")
+    parser.add_argument("--profile-top", type=parse_count, metavar="N",
+                        help="Avec --profile, ajouter les N fonctions les plus coûteuses "
+                             "(cProfile)")
+    subparsers = parser.add_subparsers(title="Commandes", dest="command")
+    for name, (help_text, configure) in COMMANDS.items():
+        sub = subparsers.add_parser(name, help=help_text)
+        if command is None or command == name:
+            configure(sub)
+    return parser
+
+
+def peek_command(argv: List[str]) -> Optional[str]:
+    """Repère la sous-commande d'une ligne de commande sans l'analyser.
+
+    Args:
+        argv: Arguments de la CLI.
+
+    Returns:
+        Le nom de la sous-commande, ou None en cas de doute (option globale
+        inconnue ou abrégée, aide…) : le parseur complet est alors construit.
+    """
+    args = iter(argv)
+    for arg in args:
+        if arg in GLOBAL_VALUE_OPTIONS:
+            next(args, None)
+        elif arg in GLOBAL_FLAGS or arg.split("=", 1)[0] in GLOBAL_VALUE_OPTIONS:
+            continue
+        else:
+            return arg if arg in COMMANDS else None
+    return None
+
+
+def parse_fast(argv: List[str]) -> Optional[SimpleNamespace]:
+    """Analyse sans :mod:`argparse` les formes courantes de ``list``.
+
+    C'est le point d'entrée léger des commandes de lecture fréquentes (une
+    invite de shell qui lance ``list --due-in 1`` à chaque affichage) :
+    ni :mod:`argparse` ni le parseur ne sont construits. Toute forme non
+    reconnue (autre commande, aide, option abrégée ou invalide) renvoie
+    None et passe par le parseur complet, seul juge des erreurs.
+
+    Args:
+        argv: Arguments de la CLI.
+
+    Returns:
+        Les arguments analysés, identiques à ceux d'``argparse``, ou None.
+    """
+    values: Dict[str, Any] = {"journal": False, "store": None, "group_commit": False,
+                              "cache": False, "profile": False, "profile_top": None,
+                              "command": None, "sort": "priority", "overdue": False, "due_in": None,
+                              "limit": None, "offset": 0, "format": "table", "jobs": None,
+                              "where": None, "explain": False, "include_archive": False}
+    args = iter(argv)
+    for arg in args:
+        name, sep, value = arg.partition("=") if arg.startswith("--") else (arg, "", "")
+        if values["command"] is None:
+            if arg == "list":
+                values["command"] = arg
+                continue
+            if arg in GLOBAL_FLAGS:
+                values[arg[2:].replace("-", "_")] = True
+                continue
+            if name != "--store":
+                return None
+        elif arg == "--overdue":
+            values["overdue"] = True
+            continue
+        elif name not in ("--sort", "--due-in", "--limit", "--offset", "--format"):
+            return None
+        if not sep:
+            value = next(args, None)
+        if value is None or value.startswith("-"):
+            return None
+        if name == "--store":
+            values["store"] = value
+        elif name == "--sort":
+            if value not in ("priority", "date"):
+                return None
+            values["sort"] = value
+        elif name == "--format":
+            if value not in FORMATS:
+                return None
+            values["format"] = value
+        else:
+            try:
+                number = int(value)
+            except ValueError:
+                return None
+            if name == "--due-in":
+                values["due_in"] = number
+            elif number < 0:
+                return None
+            else:
+                values[name[2:]] = number
+    if values["command"] is None or (values["overdue"] and values["due_in"] is not None):
+        return None
+    return SimpleNamespace(func=list_tasks, **values)
+
+
+def parse_command_line(argv: List[str]) -> Tuple[Optional[argparse.ArgumentParser], Any]:
+    """Analyse une ligne de commande, par le chemin le plus court possible.
+
+    Args:
+        argv: Arguments de la CLI.
+
+    Returns:
+        ``(parseur, arguments)`` ; le parseur vaut None si :func:`parse_fast`
+        a suffi.
+
+    Raises:
+        SystemExit: Erreur de syntaxe ou aide (comportement d'``argparse``).
+    """
+    args = parse_fast(argv)
+    if args is not None:
+        return None, args
+    parser = build_parser(peek_command(argv))
+    return parser, parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Point d'entrée de l'application CLI.
+
+    Si un démon tourne pour le stockage visé, la commande lui est transmise ;
+    sinon elle est exécutée directement sur les fichiers.
+
+    Args:
+        argv: Arguments (par défaut ``sys.argv[1:]``).
+    """
+    global USE_JOURNAL, STORE_SPEC, GROUP_COMMIT, QUERY_CACHE  # pylint: disable=global-statement
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if argv:
+        spec = peek_store(argv)
+        try:
+            path = open_backend(spec, TASKS_FILE).path if spec else TASKS_FILE
+        except ValueError:
+            path = None  # spécification invalide : l'erreur sera signalée plus bas
+        sock = socket_path(path) if path else None
+        response = None
+        if sock is not None and os.path.exists(sock):
+            import daemon  # pylint: disable=import-outside-toplevel
+
+            response = daemon.forward(sock, argv, spec)
+        if response is not None:
+            sys.stdout.write(response.get("stdout", ""))
+            sys.stderr.write(response.get("stderr", ""))
+            if response.get("exit") is not None:
+                raise SystemExit(response["exit"])
+            return
+
+    parser, args = parse_command_line(argv)
+    if args.journal:
+        USE_JOURNAL = True
+    if args.store:
+        STORE_SPEC = args.store
+    if args.group_commit:
+        GROUP_COMMIT = True
+    if args.cache:
+        QUERY_CACHE = True
+    if hasattr(args, "func"):
+        run_command(args)
     else:
-        parser.print_help()
+        (parser or build_parser()).print_help()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,284 @@
+"""Mode ``watch`` : rappels déclenchés aux changements d'état des tâches.
+
+Plutôt que de relancer ``list --overdue`` chaque minute (et de relire tout
+le stockage à chaque fois), :class:`Watcher` charge les tâches une fois et
+garde un tas des prochaines *transitions* de chaque tâche, selon les règles
+de ``is_due_within`` et ``is_overdue`` :
+
+- le jour ``échéance - due_in``, la tâche devient « bientôt » ;
+- le lendemain de l'échéance, elle passe « en retard ».
+
+Une tâche récurrente (:mod:`recurrence`) est suivie par sa prochaine
+occurrence (aujourd'hui ou plus tard) : chaque occurrence est annoncée
+« bientôt », comme ``list --due-in`` la montre, puis la série passe à la
+suivante le lendemain au lieu de rester « en retard ».
+
+La boucle (:meth:`Watcher.run`) dort jusqu'à la prochaine transition, en se
+réveillant au plus tous les *interval* secondes pour comparer la signature
+du stockage (:meth:`storage.Backend.version`, un ``stat``). Quand elle
+change, seules les écritures nouvelles sont relues si le format le
+permet : les lignes ajoutées au journal depuis le dernier passage. Les
+autres formats sont relus puis comparés à l'état connu. Au repos, le coût
+se limite donc à un ``stat`` par réveil.
+
+Ce module ne dépend pas de :mod:`task_manager` : l'affichage des
+notifications est fourni par l'appelant.
+"""
+
+from __future__ import annotations
+
+import heapq
+import os
+import time
+from datetime import date, datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from recurrence import is_recurring, next_occurrence
+from storage import Backend, JournalBackend
+
+# Fenêtre « bientôt » par défaut (jours), comme l'indicateur de ``list``.
+SOON_DAYS = 3
+# Délai maximal (secondes) entre deux contrôles du stockage.
+POLL_INTERVAL = 2.0
+SOON = "soon"
+OVERDUE = "overdue"
+# Libellés des états, identiques à ceux de ``status_flag``.
+STATUS_LABELS = {SOON: "⏳ soon", OVERDUE: "⚠️ OVERDUE"}
+
+Event = Dict[str, Any]
+
+
+def due_status(ordinal: int, today: int, due_in: int) -> str:
+    """Retourne l'état de rappel d'une échéance.
+
+    Args:
+        ordinal: Ordinal de l'échéance (0 si absente ou invalide).
+        today: Ordinal du jour.
+        due_in: Taille de la fenêtre « bientôt » (jours).
+
+    Returns:
+        :data:`OVERDUE`, :data:`SOON` ou une chaîne vide.
+    """
+    if not ordinal:
+        return ""
+    if ordinal < today:
+        return OVERDUE
+    if ordinal <= today + due_in:
+        return SOON
+    return ""
+
+
+def next_transition(ordinal: int, today: int, due_in: int) -> Optional[int]:
+    """Retourne le jour du prochain changement d'état d'une échéance.
+
+    Args:
+        ordinal: Ordinal de l'échéance (0 si absente ou invalide).
+        today: Ordinal du jour.
+        due_in: Taille de la fenêtre « bientôt » (jours).
+
+    Returns:
+        L'ordinal du jour de la transition, ou None si l'état est définitif.
+    """
+    if not ordinal or ordinal < today:
+        return None
+    if ordinal - due_in > today:
+        return ordinal - due_in
+    return ordinal + 1
+
+
+def run_hook(command: str, event: Event) -> int:
+    """Exécute la commande *command* pour une notification.
+
+    La commande est lancée par le shell avec les variables d'environnement
+    ``TASK_ID``, ``TASK_TITLE``, ``TASK_DUE`` et ``TASK_STATUS``.
+
+    Args:
+        command: Ligne de commande du shell.
+        event: Notification (voir :meth:`Watcher.refresh`).
+
+    Returns:
+        Le code de sortie de la commande.
+    """
+    import subprocess  # pylint: disable=import-outside-toplevel
+
+    env = dict(os.environ, TASK_ID=str(event["id"]), TASK_TITLE=str(event["title"]),
+               TASK_DUE=str(event["due"]), TASK_STATUS=event["status"])
+    return subprocess.run(command, shell=True, env=env, check=False).returncode
+
+
+class Watcher:
+    """Suit l'état de rappel des tâches d'un stockage.
+
+    Args:
+        backend: Stockage surveillé.
+        due_in: Taille de la fenêtre « bientôt » (jours).
+        today: Jour de départ (par défaut aujourd'hui).
+    """
+
+    def __init__(self, backend: Backend, due_in: int = SOON_DAYS,
+                 today: Optional[date] = None) -> None:
+        self.backend = backend
+        self.due_in = due_in
+        self.today = (today or date.today()).toordinal()
+        # ID -> (ordinal de l'échéance, état, tâche)
+        self._tasks: Dict[int, Tuple[int, str, Dict[str, Any]]] = {}
+        # (jour de la transition, ID) ; les entrées périmées sont ignorées au dépilage.
+        self._heap: List[Tuple[int, int]] = []
+        self._version: Optional[Tuple[int, int, int, int]] = None
+        self._journal_offset = 0
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    @property
+    def next_day(self) -> Optional[int]:
+        """Ordinal du jour de la prochaine transition (None s'il n'y en a pas)."""
+        return self._heap[0][0] if self._heap else None
+
+    def _event(self, task: Dict[str, Any], status: str, ordinal: int) -> Event:
+        """Construit la notification d'un changement d'état (d'une occurrence)."""
+        due = date.fromordinal(ordinal).isoformat() if is_recurring(task) else task.get("due")
+        return {"id": task["id"], "title": task.get("title", ""), "due": due,
+                "status": status, "day": date.fromordinal(self.today).isoformat()}
+
+    def _ordinal(self, task: Dict[str, Any]) -> int:
+        """Échéance suivie : celle de la tâche, ou la prochaine occurrence d'une série.
+
+        Args:
+            task: Tâche lue dans le stockage.
+
+        Returns:
+            L'ordinal de l'échéance (0 si absente, invalide ou sans
+            occurrence à venir).
+        """
+        return next_occurrence(task, self.today)
+
+    def _track(self, task: Dict[str, Any], notify: bool) -> Optional[Event]:
+        """Enregistre l'état d'une tâche nouvelle ou modifiée.
+
+        Args:
+            task: Tâche lue dans le stockage.
+            notify: Signaler un changement d'état (faux au chargement initial).
+
+        Returns:
+            La notification si la tâche vient d'entrer dans un état, sinon None.
+        """
+        ordinal = self._ordinal(task)
+        previous = self._tasks.get(task["id"])
+        status = due_status(ordinal, self.today, self.due_in)
+        self._tasks[task["id"]] = (ordinal, status, task)
+        if previous is None or previous[0] != ordinal:
+            day = next_transition(ordinal, self.today, self.due_in)
+            if day is not None:
+                heapq.heappush(self._heap, (day, task["id"]))
+        if notify and status and (previous is None or previous[1] != status):
+            return self._event(task, status, ordinal)
+        return None
+
+    def _apply(self, puts: Iterable[Dict[str, Any]], deletes: Iterable[int],
+               notify: bool) -> List[Event]:
+        """Applique un lot d'écritures à l'état suivi."""
+        events = [e for e in (self._track(t, notify) for t in puts) if e is not None]
+        for task_id in deletes:
+            self._tasks.pop(task_id, None)
+        if len(self._heap) > 2 * len(self._tasks) + 1024:
+            self._compact_heap()
+        return events
+
+    def _compact_heap(self) -> None:
+        """Reconstruit le tas sans ses entrées périmées."""
+        self._heap = []
+        for task_id, (ordinal, _, _) in self._tasks.items():
+            day = next_transition(ordinal, self.today, self.due_in)
+            if day is not None:
+                self._heap.append((day, task_id))
+        heapq.heapify(self._heap)
+
+    def refresh(self) -> List[Event]:
+        """Relit les écritures faites depuis le dernier passage.
+
+        Sans changement de signature, rien n'est lu. Pour le journal, seules
+        les lignes ajoutées sont décodées ; sinon (autre format, journal
+        replié, premier passage) le stockage est relu et comparé à l'état
+        connu.
+
+        Returns:
+            Les notifications des tâches entrées dans un état.
+        """
+        version = self.backend.version()
+        if version == self._version:
+            return []
+        first = self._version is None
+        incremental = (not first and isinstance(self.backend, JournalBackend)
+                       and version[:3] == self._version[:3]
+                       and version[3] >= self._journal_offset)
+        self._version = version
+        if incremental:
+            puts, deletes, self._journal_offset = self.backend.read_journal(self._journal_offset)
+            return self._apply(puts, deletes, notify=True)
+        self.backend.invalidate()
+        self._journal_offset = version[3]
+        tasks = list(self.backend.iter_tasks())
+        seen = {t["id"] for t in tasks}
+        return self._apply(tasks, [i for i in self._tasks if i not in seen], notify=not first)
+
+    def advance(self, today: date) -> List[Event]:
+        """Passe au jour *today* et signale les transitions échues.
+
+        Args:
+            today: Date courante.
+
+        Returns:
+            Les notifications, dans l'ordre des transitions.
+        """
+        self.today = max(self.today, today.toordinal())
+        events = []
+        while self._heap and self._heap[0][0] <= self.today:
+            _, task_id = heapq.heappop(self._heap)
+            if task_id not in self._tasks:
+                continue
+            previous, status, task = self._tasks[task_id]
+            ordinal = self._ordinal(task) if is_recurring(task) else previous
+            current = due_status(ordinal, self.today, self.due_in)
+            if (ordinal, current) == (previous, status):
+                continue  # entrée périmée (tâche modifiée depuis)
+            self._tasks[task_id] = (ordinal, current, task)
+            day = next_transition(ordinal, self.today, self.due_in)
+            if day is not None:
+                heapq.heappush(self._heap, (day, task_id))
+            if current and (current != status or ordinal != previous):
+                events.append(self._event(task, current, ordinal))
+        return events
+
+    def timeout(self, now: datetime, interval: float) -> float:
+        """Durée de sommeil avant le prochain réveil.
+
+        Args:
+            now: Heure courante.
+            interval: Délai maximal entre deux contrôles du stockage.
+
+        Returns:
+            Le délai en secondes jusqu'à minuit du jour de la prochaine
+            transition, borné par *interval*.
+        """
+        if self.next_day is None:
+            return interval
+        wake = datetime.combine(date.fromordinal(self.next_day), datetime.min.time())
+        return max(0.0, min(interval, (wake - now).total_seconds()))
+
+    def run(self, notify: Callable[[Event], None], interval: float = POLL_INTERVAL,
+            clock: Callable[[], datetime] = datetime.now,
+            sleep: Callable[[float], None] = time.sleep) -> None:
+        """Surveille le stockage jusqu'à interruption (Ctrl-C).
+
+        Args:
+            notify: Appelée pour chaque changement d'état.
+            interval: Délai maximal entre deux contrôles du stockage.
+            clock: Heure courante (remplaçable pour les tests).
+            sleep: Attente (remplaçable pour les tests).
+        """
+        while True:
+            now = clock()
+            for event in self.advance(now.date()) + self.refresh():
+                notify(event)
+            sleep(self.timeout(now, interval))
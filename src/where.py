@@ -0,0 +1,494 @@
+"""Langage d'expressions de ``list --where`` et planification des requêtes.
+
+Exemples::
+
+    priority<=2 and due<2026-11-01
+    title~"rapport" or desc~rapport
+    not priority=5 and due<=today+7
+
+Une expression est analysée une seule fois (:func:`parse`) en un arbre,
+compilé en un prédicat Python (une fermeture par nœud) appliqué ensuite à
+chaque tâche candidate.
+
+Le planificateur (:func:`plan`) extrait des conjonctions de premier niveau
+les plages sur ``id``, ``due`` et ``priority``, puis interroge les sources
+capables de lire directement une plage : le stockage et ses index (attribut
+``range_fields`` et méthodes ``range_count``/``iter_range``, voir
+:class:`storage.Backend`). Il retient celle qui lira le moins de tâches,
+sinon le parcours complet. Si la source parcourt la plage dans l'ordre du
+tri demandé, la lecture s'arrête dès que la page est remplie. Le prédicat
+complet est toujours réappliqué aux candidates.
+
+Grammaire (mots-clés insensibles à la casse)::
+
+    expr        := and_expr ("or" and_expr)*
+    and_expr    := not_expr ("and" not_expr)*
+    not_expr    := "not" not_expr | "(" expr ")" | comparaison
+    comparaison := CHAMP OP VALEUR
+
+Champs : ``id`` et ``priority`` (entiers), ``due`` (``YYYY-MM-DD``,
+``today``, ``today+N``, ``today-N``), ``title``, ``desc``, ``created`` et
+``repeat`` (texte, entre guillemets s'il contient des espaces). Opérateurs : ``=``,
+``!=``, ``<``, ``<=``, ``>``, ``>=`` et, pour le texte, ``~`` (contient,
+sans tenir compte de la casse ni des accents). Une échéance absente ou
+mal formée ne satisfait aucune comparaison sur ``due``.
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import operator
+import re
+from datetime import date
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from indexes import due_ordinal, fold
+from parallel import rank_key
+
+# Type de valeur de chaque champ interrogeable.
+FIELDS = {"id": "int", "priority": "int", "due": "date", "title": "text", "desc": "text",
+          "created": "text", "repeat": "text"}
+# Champs dont une plage peut servir de chemin d'accès.
+RANGE_FIELDS = ("id", "due", "priority")
+# Champ lu dans l'ordre du tri de ``list --sort``.
+SORT_FIELDS = {"priority": "priority", "date": "due"}
+MAX_ORDINAL = date.max.toordinal()
+
+_TOKEN = re.compile(r"""\s*(?:(?P<op><=|>=|!=|=|<|>|~)|(?P<paren>[()])"""
+                    r"""|"(?P<dq>(?:[^"\\]|\\.)*)"|'(?P<sq>(?:[^'\\]|\\.)*)'"""
+                    r"""|(?P<word>[^\s()<>=!~"']+))""")
+_ESCAPE = re.compile(r"\\(.)")
+_TODAY = re.compile(r"today(?:([+-])(\d+))?", re.IGNORECASE)
+_INT = re.compile(r"[+-]?\d+")
+_COMPARE: Dict[str, Callable[[Any, Any], bool]] = {
+    "=": operator.eq, "!=": operator.ne, "<": operator.lt, "<=": operator.le,
+    ">": operator.gt, ">=": operator.ge, "~": lambda actual, wanted: wanted in fold(actual),
+}
+
+# Nœuds : ("true",), ("cmp", champ, op, valeur), ("not", nœud),
+# ("and", [nœuds]), ("or", [nœuds]).
+Node = Tuple[Any, ...]
+Bounds = Tuple[Optional[int], Optional[int]]
+
+
+class Query:
+    """Expression analysée : arbre, prédicat compilé et plages exploitables.
+
+    Args:
+        text: Texte de l'expression.
+        node: Arbre produit par :func:`parse`.
+    """
+
+    def __init__(self, text: str, node: Node) -> None:
+        self.text = text
+        self.node = node
+        self.predicate = compile_predicate(node)
+        self.ranges = ranges(node)
+
+    def __str__(self) -> str:
+        return render(self.node)
+
+    def __and__(self, other: Query) -> Query:
+        """Conjonction de deux requêtes (le texte reste celui de la première)."""
+        nodes = [q.node for q in (self, other) if q.node[0] != "true"]
+        return Query(self.text, _combine("and", nodes) if nodes else ("true",))
+
+
+def _tokenize(text: str) -> List[Tuple[str, str, int]]:
+    """Découpe l'expression en lexèmes ``(type, valeur, position)``.
+
+    Raises:
+        ValueError: Sur un caractère inattendu (guillemet non fermé…).
+    """
+    tokens = []
+    pos = 0
+    while text[pos:].strip():
+        match = _TOKEN.match(text, pos)
+        if match is None:
+            start = len(text) - len(text[pos:].lstrip())
+            raise ValueError(f"Expression --where invalide : caractère inattendu "
+                             f"« {text[start]} » (position {start + 1})")
+        kind = match.lastgroup
+        value = match.group(kind)
+        start = match.start(kind)
+        if kind in ("dq", "sq"):
+            kind, value = "str", _ESCAPE.sub(r"\1", value)
+        tokens.append((kind, value, start + 1))
+        pos = match.end()
+    return tokens
+
+
+class _Parser:
+    """Analyseur récursif descendant de la grammaire du module."""
+
+    def __init__(self, text: str, today: int) -> None:
+        self.tokens = _tokenize(text)
+        self.pos = 0
+        self.today = today
+
+    def _peek(self) -> Optional[Tuple[str, str, int]]:
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def _keyword(self, word: str) -> bool:
+        """Consomme le mot-clé *word* s'il est le prochain lexème."""
+        token = self._peek()
+        if token and token[0] == "word" and token[1].lower() == word:
+            self.pos += 1
+            return True
+        return False
+
+    @staticmethod
+    def _error(message: str, token: Optional[Tuple[str, str, int]]) -> ValueError:
+        where = f" (position {token[2]})" if token else " (fin de l'expression)"
+        return ValueError(f"Expression --where invalide : {message}{where}")
+
+    def parse(self) -> Node:
+        """Analyse toute l'expression (vide = toujours vraie)."""
+        if not self.tokens:
+            return ("true",)
+        node = self._or()
+        if self._peek() is not None:
+            raise self._error(f"« {self._peek()[1]} » inattendu", self._peek())
+        return node
+
+    def _or(self) -> Node:
+        nodes = [self._and()]
+        while self._keyword("or"):
+            nodes.append(self._and())
+        return _combine("or", nodes)
+
+    def _and(self) -> Node:
+        nodes = [self._not()]
+        while self._keyword("and"):
+            nodes.append(self._not())
+        return _combine("and", nodes)
+
+    def _not(self) -> Node:
+        if self._keyword("not"):
+            return ("not", self._not())
+        token = self._peek()
+        if token and token[0] == "paren" and token[1] == "(":
+            self.pos += 1
+            node = self._or()
+            closing = self._peek()
+            if not closing or closing[:2] != ("paren", ")"):
+                raise self._error("parenthèse fermante attendue", closing)
+            self.pos += 1
+            return node
+        return self._comparison()
+
+    def _comparison(self) -> Node:
+        field = self._peek()
+        if not field or field[0] != "word" or field[1].lower() not in FIELDS:
+            raise self._error(f"champ attendu ({', '.join(FIELDS)})", field)
+        self.pos += 1
+        name = field[1].lower()
+        op = self._peek()
+        if not op or op[0] != "op":
+            raise self._error("opérateur attendu (=, !=, <, <=, >, >=, ~)", op)
+        self.pos += 1
+        value = self._peek()
+        if not value or value[0] not in ("word", "str"):
+            raise self._error("valeur attendue", value)
+        self.pos += 1
+        return ("cmp", name, op[1], self._value(name, op, value))
+
+    def _value(self, name: str, op: Tuple[str, str, int], token: Tuple[str, str, int]) -> Any:
+        """Convertit la valeur d'une comparaison selon le type du champ."""
+        kind = FIELDS[name]
+        raw = token[1]
+        if kind != "text" and op[1] == "~":
+            raise self._error(f"« ~ » ne s'applique qu'au texte, pas à {name}", op)
+        if kind == "int":
+            if not _INT.fullmatch(raw):
+                raise self._error(f"{name} attend un entier, pas « {raw} »", token)
+            return int(raw)
+        if kind == "date":
+            today = _TODAY.fullmatch(raw)
+            if today:
+                days = int(today.group(2) or 0) * (-1 if today.group(1) == "-" else 1)
+                return self.today + days
+            try:
+                return date.fromisoformat(raw).toordinal()
+            except ValueError:
+                raise self._error(f"date attendue (YYYY-MM-DD ou today±N), pas « {raw} »",
+                                  token) from None
+        return fold(raw) if op[1] == "~" else raw
+
+
+def _combine(kind: str, nodes: List[Node]) -> Node:
+    """Construit un nœud ``and``/``or`` aplati (un seul fils : le fils lui-même)."""
+    flat: List[Node] = []
+    for node in nodes:
+        flat.extend(node[1] if node[0] == kind else [node])
+    return flat[0] if len(flat) == 1 else (kind, flat)
+
+
+def parse(text: Optional[str], today: Optional[date] = None) -> Query:
+    """Analyse une expression ``--where``.
+
+    Args:
+        text: Expression (None ou vide = toutes les tâches).
+        today: Date de référence de ``today`` (aujourd'hui par défaut).
+
+    Returns:
+        La requête compilée.
+
+    Raises:
+        ValueError: Si l'expression est invalide (le message indique la position).
+    """
+    text = text or ""
+    return Query(text, _Parser(text, (today or date.today()).toordinal()).parse())
+
+
+def compile_predicate(node: Node) -> Callable[[Dict[str, Any]], bool]:
+    """Compile un arbre en prédicat sur une tâche.
+
+    Args:
+        node: Arbre produit par :func:`parse`.
+
+    Returns:
+        La fonction ``tâche -> bool``.
+    """
+    kind = node[0]
+    if kind == "true":
+        return lambda task: True
+    if kind == "not":
+        inner = compile_predicate(node[1])
+        return lambda task: not inner(task)
+    if kind in ("and", "or"):
+        parts = tuple(compile_predicate(child) for child in node[1])
+        combine = all if kind == "and" else any
+        return lambda task: combine(p(task) for p in parts)
+    _, field, op, value = node
+    compare = _COMPARE[op]
+    if field == "due":
+        def matches(task: Dict[str, Any]) -> bool:
+            ordinal = due_ordinal(task)
+            return bool(ordinal) and compare(ordinal, value)
+    elif FIELDS[field] == "int":
+        def matches(task: Dict[str, Any]) -> bool:
+            try:
+                actual = int(task.get(field))
+            except (TypeError, ValueError):
+                return False
+            return compare(actual, value)
+    else:
+        def matches(task: Dict[str, Any]) -> bool:
+            return compare(str(task.get(field) or ""), value)
+    return matches
+
+
+def ranges(node: Node) -> Dict[str, Bounds]:
+    """Extrait les plages imposées par les conjonctions de premier niveau.
+
+    Args:
+        node: Arbre produit par :func:`parse`.
+
+    Returns:
+        ``{champ: (min, max)}`` inclus (None = non borné) pour ``id``,
+        ``due`` (ordinaux, toujours bornés) et ``priority``.
+    """
+    found: Dict[str, Bounds] = {}
+    for child in node[1] if node[0] == "and" else [node]:
+        if child[0] != "cmp" or child[1] not in RANGE_FIELDS or child[2] in ("!=", "~"):
+            continue
+        _, field, op, value = child
+        low, high = found.get(field, (None, None))
+        new_low, new_high = {"=": (value, value), "<": (None, value - 1), "<=": (None, value),
+                             ">": (value + 1, None), ">=": (value, None)}[op]
+        if new_low is not None:
+            low = new_low if low is None else max(low, new_low)
+        if new_high is not None:
+            high = new_high if high is None else min(high, new_high)
+        found[field] = (low, high)
+    if "due" in found:
+        low, high = found["due"]
+        found["due"] = (max(1, low or 1), min(MAX_ORDINAL, MAX_ORDINAL if high is None else high))
+    return found
+
+
+def render(node: Node) -> str:
+    """Réécrit un arbre sous forme normalisée (pour ``--explain``)."""
+    kind = node[0]
+    if kind == "true":
+        return "(toutes)"
+    if kind == "not":
+        return f"not {render(node[1])}"
+    if kind in ("and", "or"):
+        # Seul un « or » sous un « and » a besoin de parenthèses.
+        parts = [f"({render(c)})" if kind == "and" and c[0] == "or" else render(c)
+                 for c in node[1]]
+        return f" {kind} ".join(parts)
+    _, field, op, value = node
+    if field == "due":
+        value = date.fromordinal(min(max(value, 1), MAX_ORDINAL)).isoformat()
+    elif FIELDS[field] == "text":
+        value = '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
+    return f"{field} {op} {value}"
+
+
+def _format_bound(field: str, value: Optional[int]) -> str:
+    if value is None or (field == "due" and value in (1, MAX_ORDINAL)):
+        return "…"
+    return date.fromordinal(value).isoformat() if field == "due" else str(value)
+
+
+class Plan:
+    """Chemin d'accès retenu pour une requête, puis mesures de son exécution.
+
+    Args:
+        source: Stockage ou index qui fournit les candidates.
+        field: Champ de la plage lue (None = parcours complet).
+        bounds: Plage ``(min, max)`` du champ.
+        estimate: Nombre de tâches que la source annonce lire.
+        ordered: True si la source parcourt la plage dans l'ordre ``(valeur, id)``.
+    """
+
+    def __init__(self, source: Any, field: Optional[str], bounds: Bounds, estimate: int,
+                 ordered: bool) -> None:
+        self.source = source
+        self.field = field
+        self.bounds = bounds
+        self.estimate = estimate
+        self.ordered = ordered
+        self.query: Optional[Query] = None
+        self.sort = "priority"
+        self.limit: Optional[int] = None
+        self.offset = 0
+        self.alternatives: List[Plan] = []
+        self.examined = 0
+        self.matched = 0
+        self.shown = 0
+        self.early_stop = False
+        self.notes: List[str] = []
+
+    def describe(self) -> str:
+        """Décrit le chemin d'accès en une ligne."""
+        source = type(self.source).__name__
+        if self.field is None:
+            path = f"parcours complet via {source}"
+        else:
+            label = {"id": "d'IDs", "due": "d'échéances", "priority": "de priorités"}[self.field]
+            low, high = (_format_bound(self.field, b) for b in self.bounds)
+            path = f"plage {label} [{low} → {high}] via {source}"
+        return f"{path} (estimé : {self.estimate} tâche(s))"
+
+    def candidates(self) -> Iterator[Dict[str, Any]]:
+        """Parcourt les tâches candidates de la source (vide si la plage l'est)."""
+        if self.field is None:
+            return self.source.iter_tasks()
+        low, high = self.bounds
+        if low is not None and high is not None and low > high:
+            return iter(())
+        return self.source.iter_range(self.field, low, high)
+
+    def run(self) -> List[Dict[str, Any]]:
+        """Exécute la requête : filtre, tri (clé puis ID) et pagination.
+
+        Returns:
+            Les tâches de la page, dans l'ordre de ``list``.
+        """
+        assert self.query is not None
+        predicate = self.query.predicate
+
+        def matching() -> Iterator[Dict[str, Any]]:
+            for task in self.candidates():
+                self.examined += 1
+                if predicate(task):
+                    self.matched += 1
+                    yield task
+
+        key = rank_key(self.sort)
+        stop = None if self.limit is None else self.offset + self.limit
+        self.early_stop = (stop is not None and self.ordered
+                           and self.field == SORT_FIELDS[self.sort])
+        if self.early_stop:
+            page = list(itertools.islice(matching(), self.offset, stop))
+        elif stop is None:
+            page = sorted(matching(), key=key)[self.offset:]
+        else:
+            page = heapq.nsmallest(stop, matching(), key=key)[self.offset:]
+        self.shown = len(page)
+        return page
+
+    def explain(self) -> List[str]:
+        """Décrit le plan et les mesures de sa dernière exécution (``--explain``).
+
+        Returns:
+            Les lignes à afficher.
+        """
+        lines = [f"Plan : {self.describe()}"]
+        for other in self.alternatives:
+            lines.append(f"  Écarté : {other.describe()}")
+        lines.append(f"  Filtre : {self.query}")
+        counts = (f"  Tâches examinées : {self.examined}, retenues : {self.matched}, "
+                  f"affichées : {self.shown}")
+        if self.early_stop:
+            counts += " (arrêt dès la page remplie : la source suit l'ordre du tri)"
+        lines.append(counts)
+        return lines + self.notes
+
+
+def plan(backend: Any, query: Query, sort: str = "priority", limit: Optional[int] = None,
+         offset: int = 0) -> Plan:
+    """Choisit le chemin d'accès le moins coûteux pour *query*.
+
+    Args:
+        backend: Stockage interrogé (ses observateurs peuvent fournir des plages).
+        query: Requête compilée.
+        sort: ``"priority"`` ou ``"date"``.
+        limit: Nombre maximal de tâches (None = toutes).
+        offset: Nombre de tâches à sauter.
+
+    Returns:
+        Le plan retenu (prêt pour :meth:`Plan.run`), avec les autres
+        chemins envisagés dans ``alternatives``.
+    """
+    options = [Plan(backend, None, (None, None), backend.range_count("id", None, None), False)]
+    sources = [backend] + [o for o in backend.observers if getattr(o, "range_fields", ())]
+    for field, bounds in query.ranges.items():
+        for source in sources:
+            if field in source.range_fields:
+                low, high = bounds
+                empty = low is not None and high is not None and low > high
+                estimate = 0 if empty else source.range_count(field, low, high)
+                options.append(Plan(source, field, bounds, estimate,
+                                    field in getattr(source, "ordered_ranges", ())))
+
+    # Une source qui suit l'ordre du tri s'arrête dès la page remplie : elle
+    # lit environ ``offset + limit`` tâches divisé par la part de sa plage qui
+    # satisfait la requête, estimée par la plus étroite des plages.
+    narrowest = max(1, min(o.estimate for o in options))
+
+    # À coût égal, une plage l'emporte sur le parcours complet : l'estimation
+    # d'une source (mois entiers d'un stockage partitionné…) n'est qu'un
+    # majorant, et la plage n'examine jamais plus de tâches.
+    def cost(option: Plan) -> Tuple[float, bool, bool]:
+        in_order = option.ordered and option.field == SORT_FIELDS[sort]
+        reads = float(option.estimate)
+        if in_order and limit is not None:
+            reads = min(reads, (offset + limit) * option.estimate / narrowest)
+        return (reads, not in_order, option.field is None)
+    chosen = min(options, key=cost)
+    chosen.alternatives = [o for o in options if o is not chosen]
+    chosen.query, chosen.sort, chosen.limit, chosen.offset = query, sort, limit, offset
+    return chosen
+
+
+def reminder_clause(overdue: bool, due_in: Optional[int]) -> str:
+    """Traduit ``--overdue`` / ``--due-in`` en expression ``--where``.
+
+    Args:
+        overdue: Filtre ``--overdue``.
+        due_in: Filtre ``--due-in`` (nombre de jours) ou None.
+
+    Returns:
+        L'expression équivalente, ou une chaîne vide.
+    """
+    if overdue:
+        return "due<today"
+    if due_in is not None:
+        return f"due>=today and due<=today{int(due_in):+d}"
+    return ""
@@ -0,0 +1,169 @@
+import os
+import sys
+import gzip
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from datetime import date, timedelta
+from unittest import mock
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+SRC_DIR = os.path.join(PROJECT_ROOT, 'src')
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+import task_manager as tm  # noqa: E402
+import coldstore  # noqa: E402
+import storage  # noqa: E402
+from coldstore import ColdStore  # noqa: E402
+from parallel import rank_key  # noqa: E402
+
+STORES = ('json', 'journal', 'sqlite', 'binary', 'partitioned')
+
+
+def d(delta_days: int) -> str:
+    return (date.today() + timedelta(days=delta_days)).strftime("%Y-%m-%d")
+
+
+def make_tasks(n):
+    return [{'id': i, 'title': f'Tâche {i}', 'desc': '', 'priority': 1 + i % 5,
+             'due': d(i * 3 - 60) if i % 7 else 'plus tard', 'created': ''}
+            for i in range(1, n + 1)]
+
+
+class TestColdStore(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, 'tasks.json')
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_members_are_appended_and_read_back(self):
+        for codec in coldstore.CODECS:
+            with self.subTest(codec=codec):
+                path = f'{self.path}.{codec}'
+                store = ColdStore(path)
+                store.set_codec(codec)
+                store.append(make_tasks(3))
+                ColdStore(path).append(make_tasks(5)[3:])
+                reread = ColdStore(path)
+                self.assertEqual((reread.codec, reread.count), (codec, 5))
+                self.assertEqual([t['id'] for t in reread.iter_tasks()], [1, 2, 3, 4, 5])
+                self.assertEqual(storage.id_floor(path), 6)
+                with self.assertRaises(ValueError):
+                    reread.set_codec('gzip' if codec == 'lzma' else 'lzma')
+
+    def test_truncated_tail_is_ignored(self):
+        store = ColdStore(self.path)
+        store.append(make_tasks(2))
+        with open(store.archive_path, 'ab') as f:
+            f.write(gzip.compress(b'{"id": 3}\n')[:12])
+        self.assertEqual([t['id'] for t in ColdStore(self.path).iter_tasks()], [1, 2])
+        self.assertEqual(list(ColdStore(self.path + '.absent').iter_tasks()), [])
+        self.assertEqual(storage.id_floor(self.path + '.absent'), 1)
+
+
+class TestArchiveCommand(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.tasks = make_tasks(30)
+
+    def tearDown(self):
+        tm.STORE_SPEC = None
+        tm.QUERY_CACHE = False
+        self.tmpdir.cleanup()
+
+    def use(self, kind):
+        tm.STORE_SPEC = f'{kind}:' + os.path.join(self.tmpdir.name, kind)
+        backend = tm.get_backend()
+        backend.save(self.tasks)
+        return backend
+
+    def run_cli(self, argv):
+        buf = StringIO()
+        with redirect_stdout(buf):
+            tm.main(argv)
+        return buf.getvalue()
+
+    def test_old_tasks_move_to_the_archive_and_ids_are_not_reused(self):
+        cutoff = date.today().toordinal() - 20
+        old = [t['id'] for t in self.tasks if t['due'] != 'plus tard'
+               and date.fromisoformat(t['due']).toordinal() < cutoff]
+        for kind in STORES:
+            with self.subTest(kind=kind):
+                backend = self.use(kind)
+                self.assertIn(f'{len(old)} tâche(s) seraient archivée(s)',
+                              self.run_cli(['archive', '--older-than', '20', '--dry-run']))
+                self.assertEqual(len(tm.get_backend().load()), 30)
+                out = self.run_cli(['archive', '--older-than', '20'])
+                self.assertIn(f'{len(old)} tâche(s) archivée(s).', out)
+                hot = {t['id'] for t in tm.get_backend().load()}
+                self.assertEqual(hot, {t['id'] for t in self.tasks} - set(old))
+                store = ColdStore(backend.path)
+                self.assertEqual(sorted(t['id'] for t in store.iter_tasks()), old)
+                self.run_cli(['archive', '--where', 'id>=29'])
+                self.assertIn('ID 31', self.run_cli(['add', '--title', 'N', '--desc', '',
+                                                     '--priority', '2', '--due', d(1)]))
+
+    def test_include_archive_merges_both_tiers(self):
+        for kind in ('json', 'sqlite'):
+            with self.subTest(kind=kind):
+                self.use(kind)
+                argv = ['list', '--sort', 'date', '--limit', '6', '--offset', '2',
+                        '--where', 'priority<=3']
+                before = self.run_cli(argv)
+                self.run_cli(['archive', '--older-than', '10'])
+                self.assertNotEqual(self.run_cli(argv), before)
+                self.assertEqual(self.run_cli(argv + ['--include-archive']), before)
+                self.assertEqual(self.run_cli(['list', '--include-archive', '--sort', 'priority']),
+                                 self.full_listing('priority'))
+
+    def test_current_version_wins_after_an_interrupted_archive(self):
+        backend = self.use('json')
+        self.run_cli(['archive', '--older-than', '10'])
+        hot = tm.get_backend().load()
+        ColdStore(backend.path).append([dict(t, title='Périmée') for t in hot[:12]])
+        out = self.run_cli(['list', '--include-archive', '--sort', 'priority', '--limit', '5'])
+        self.assertEqual(out.splitlines(), self.full_listing('priority').splitlines()[:5])
+        self.assertNotIn('Périmée', self.run_cli(['list', '--include-archive']))
+
+    def full_listing(self, sort):
+        buf = StringIO()
+        with redirect_stdout(buf):
+            tm.print_tasks(sorted(self.tasks, key=rank_key(sort)))
+        return buf.getvalue()
+
+    def test_hot_commands_never_read_the_archive(self):
+        self.use('json')
+        self.run_cli(['archive', '--older-than', '0'])
+        with mock.patch.object(ColdStore, 'iter_tasks', side_effect=AssertionError):
+            self.run_cli(['list'])
+            self.run_cli(['list', '--overdue', '--where', 'priority=1'])
+            self.run_cli(['search', 'tache'])
+        out = self.run_cli(['list', '--include-archive', '--explain', '--where', 'id<=3'])
+        self.assertIn('  Archive : ', out)
+        self.assertIn('ne se combine pas', self.run_cli(['list', '--include-archive', '--jobs', '2']))
+
+    def test_policy_runs_at_most_once_a_day(self):
+        backend = self.use('json')
+        self.assertIn('Indiquez --older-than', self.run_cli(['archive']))
+        out = self.run_cli(['archive', '--policy', '30', '--codec', 'lzma'])
+        self.assertIn('plus de 30 jour(s)', out)
+        store = ColdStore(backend.path)
+        self.assertEqual((store.codec, store.meta['last_run']),
+                         ('lzma', date.today().isoformat()))
+        self.run_cli(['add', '--title', 'Ancienne', '--desc', '', '--priority', '1',
+                      '--due', d(-40)])
+        self.assertIn('Ancienne', self.run_cli(['list']))
+        store.mark_run(date.today() - timedelta(days=1))
+        out = self.run_cli(['add', '--title', 'B', '--desc', '', '--priority', '1', '--due', d(1)])
+        self.assertIn('1 tâche(s) archivée(s) automatiquement', out)
+        self.assertNotIn('Ancienne', self.run_cli(['list']))
+        self.assertIn('désactivé', self.run_cli(['archive', '--policy', 'off']))
+        self.assertIsNone(ColdStore(backend.path).policy_pending(date.today()))
+
+
+if __name__ == '__main__':
+    unittest.main()
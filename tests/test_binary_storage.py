@@ -0,0 +1,126 @@
+import os
+import sys
+import json
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from datetime import date, timedelta
+from unittest import mock
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+SRC_DIR = os.path.join(PROJECT_ROOT, 'src')
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+import task_manager as tm  # noqa: E402
+import storage  # noqa: E402
+
+
+def d(delta_days: int) -> str:
+    return (date.today() + timedelta(days=delta_days)).strftime("%Y-%m-%d")
+
+
+def make_tasks(n):
+    return [{'id': i, 'title': f'Tâche {i}', 'desc': 'é' * (i % 3), 'priority': 1 + (i * 3) % 5,
+             'due': d(i % 9 - 4) if i % 7 else 'pas-une-date', 'created': ''}
+            for i in range(1, n + 1)]
+
+
+class TestBinaryStorage(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, 'tasks.bin')
+        tm.TASKS_FILE = os.path.join(self.tmpdir.name, 'tasks.json')
+
+    def tearDown(self):
+        tm.STORE_SPEC = None
+        self.tmpdir.cleanup()
+
+    def run_cli(self, argv):
+        buf = StringIO()
+        with redirect_stdout(buf):
+            tm.main(argv)
+        return buf.getvalue()
+
+    def test_round_trip_and_point_reads(self):
+        tasks = make_tasks(10) + [{'id': 42, 'title': 'extra', 'tags': ['x']}]
+        backend = storage.BinaryBackend(self.path)
+        backend.save(list(reversed(tasks)))
+        self.assertEqual(backend.load(), tasks)
+        self.assertEqual(list(backend.iter_tasks()), tasks)
+        self.assertEqual(backend.get_many([42, 3, 99]), [tasks[-1], tasks[2]])
+        self.assertEqual(backend.next_id(), 43)
+
+        backend.commit(puts=[dict(tasks[0], title='modifiée')], deletes=[42])
+        self.assertEqual(backend.get(1)['title'], 'modifiée')
+        self.assertIsNone(backend.get(42))
+        self.assertEqual(backend.next_id(), 43)  # les IDs ne sont pas réutilisés
+
+    def test_queries_match_the_json_path(self):
+        storage.BinaryBackend(self.path).save(make_tasks(60))
+        storage.JsonBackend(tm.TASKS_FILE).save(make_tasks(60))
+        for filters in ([], ['--overdue'], ['--due-in', '2']):
+            for extra in ([], ['--limit', '5', '--offset', '2']):
+                for sort in ('priority', 'date'):
+                    argv = ['list', '--sort', sort] + filters + extra
+                    tm.STORE_SPEC = None
+                    expected = self.run_cli(argv)
+                    tm.STORE_SPEC = 'binary:' + self.path
+                    with self.subTest(argv=argv):
+                        self.assertEqual(self.run_cli(argv), expected)
+
+    def test_query_only_decodes_the_page(self):
+        backend = storage.BinaryBackend(self.path)
+        backend.save(make_tasks(500))
+        with mock.patch.object(storage.json, 'loads', wraps=json.loads) as loads:
+            page = backend.query(False, None, 'priority', date.today(), limit=3)
+        self.assertEqual(len(page), 3)
+        loads.assert_called_once()
+        self.assertEqual(loads.call_args[0][0].count(b'"title"'), 3)
+
+    def test_due_ranges_bisect_the_rows_ordered_by_due(self):
+        tasks = make_tasks(60)
+        backend = storage.BinaryBackend(self.path)
+        backend.save(tasks)
+        today = date.today().toordinal()
+        for low, high in ((None, None), (None, today - 1), (today, today + 2),
+                          (today + 3, None), (today + 10, today + 20)):
+            expected = [t for t in tasks if tm.due_ordinal(t)
+                        and (low is None or tm.due_ordinal(t) >= low)
+                        and (high is None or tm.due_ordinal(t) <= high)]
+            with self.subTest(low=low, high=high):
+                self.assertEqual(list(backend.iter_range('due', low, high)), expected)
+                self.assertEqual(backend.range_count('due', low, high), len(expected))
+        with backend._columns() as cols:
+            dues = [cols.dues[r] for r in cols.by_due]
+        self.assertEqual(dues, sorted(dues))
+
+    def test_convert_and_export_between_formats(self):
+        storage.JsonBackend(tm.TASKS_FILE).save(make_tasks(5))
+        bin_path = os.path.join(self.tmpdir.name, 'copie.bin')
+        json_path = os.path.join(self.tmpdir.name, 'retour.json')
+
+        out = self.run_cli(['convert', tm.TASKS_FILE, bin_path])
+        self.assertIn('(json) →', out)
+        self.assertEqual(storage.detect_format(bin_path), 'binary')
+        self.run_cli(['convert', bin_path, json_path])
+        with open(json_path, encoding='utf-8') as f:
+            self.assertEqual(json.load(f), make_tasks(5))
+
+        tm.STORE_SPEC = 'binary:' + bin_path
+        exported = os.path.join(self.tmpdir.name, 'export.txt')
+        self.assertIn('5 tâche(s) exportée(s)', self.run_cli(['export', exported]))
+        with open(exported, encoding='utf-8') as f:
+            self.assertEqual(json.load(f), make_tasks(5))
+
+    def test_non_binary_file_is_reported(self):
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write('[]')
+        tm.STORE_SPEC = 'binary:' + self.path
+        self.assertIn("Erreur:", self.run_cli(['list']))
+        self.assertIn("Erreur:", self.run_cli(['convert', 'absent.json', 'x.bin']))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+import os
+import sys
+import json
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from datetime import date, timedelta
+from unittest import mock
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+SRC_DIR = os.path.join(PROJECT_ROOT, 'src')
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+import task_manager as tm  # noqa: E402
+import storage  # noqa: E402
+
+
+class TestBulkOperations(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        tm.TASKS_FILE = os.path.join(self.tmpdir.name, 'tasks.json')
+        tasks = [
+            {'id': 1, 'title': 'old1', 'desc': '', 'priority': 1, 'due': self.d(-5), 'created': ''},
+            {'id': 2, 'title': 'old2', 'desc': '', 'priority': 4, 'due': self.d(-1), 'created': ''},
+            {'id': 3, 'title': 'soon', 'desc': '', 'priority': 2, 'due': self.d(2), 'created': ''},
+            {'id': 4, 'title': 'far', 'desc': '', 'priority': 5, 'due': self.d(40), 'created': ''},
+        ]
+        with open(tm.TASKS_FILE, 'w', encoding='utf-8') as f:
+            json.dump(tasks, f)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def d(self, delta_days: int) -> str:
+        return (date.today() + timedelta(days=delta_days)).strftime("%Y-%m-%d")
+
+    def run_cli(self, argv):
+        saved_argv = sys.argv
+        sys.argv = ['prog'] + argv
+        buf = StringIO()
+        try:
+            with redirect_stdout(buf):
+                tm.main()
+        finally:
+            sys.argv = saved_argv
+        return buf.getvalue()
+
+    def titles(self):
+        return [t['title'] for t in tm.load_tasks()]
+
+    def test_delete_by_filter_in_a_single_write(self):
+        with mock.patch.object(storage.JsonBackend, '_write', autospec=True,
+                               side_effect=storage.JsonBackend._write) as write:
+            out = self.run_cli(['delete', '--overdue', '--max-priority', '3'])
+        self.assertEqual(write.call_count, 1)
+        self.assertIn("1 tâche(s) supprimée(s).", out)
+        self.assertEqual(self.titles(), ['old2', 'soon', 'far'])
+
+    def test_dry_run_lists_without_writing(self):
+        out = self.run_cli(['delete', '--overdue', '--dry-run'])
+        self.assertIn("2 tâche(s) seraient supprimée(s) (simulation) :", out)
+        self.assertIn("[1] old1", out)
+        self.assertIn("[2] old2", out)
+        self.assertEqual(len(self.titles()), 4)
+
+    def test_edit_ids_list(self):
+        out = self.run_cli(['edit', '--ids', '1,3,99', '--priority', '2'])
+        self.assertIn("2 tâche(s) mise(s) à jour.", out)
+        self.assertEqual([t['priority'] for t in tm.load_tasks()], [2, 4, 2, 5])
+
+    def test_edit_ids_combined_with_due_filter(self):
+        self.run_cli(['edit', '--ids', '1,3,4', '--due-in', '7', '--title', 'X'])
+        self.assertEqual(self.titles(), ['old1', 'old2', 'X', 'far'])
+
+    def test_bulk_edit_validates_before_writing(self):
+        out = self.run_cli(['edit', '--overdue', '--priority', '9'])
+        self.assertIn("Erreur: La priorité", out)
+        out = self.run_cli(['edit', '--overdue'])
+        self.assertIn("Erreur: Aucun champ à modifier", out)
+        self.assertEqual([t['priority'] for t in tm.load_tasks()], [1, 4, 2, 5])
+
+    def test_selector_is_required(self):
+        self.assertIn("Erreur: Indiquez --id", self.run_cli(['delete']))
+        with redirect_stdout(StringIO()), mock.patch('sys.stderr', new_callable=StringIO):
+            with self.assertRaises(SystemExit):
+                self.run_cli(['delete', '--ids', 'a,b'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,188 @@
+import os
+import sys
+import json
+import multiprocessing
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from unittest import mock
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+SRC_DIR = os.path.join(PROJECT_ROOT, 'src')
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+import task_manager as tm  # noqa: E402
+import storage  # noqa: E402
+from groupcommit import GroupCommit  # noqa: E402
+
+WORKERS = 4
+ADDS_PER_WORKER = 15
+
+
+def task(task_id, title='T', priority=3):
+    return {'id': task_id, 'title': title, 'desc': '', 'priority': priority,
+            'due': '2030-01-01', 'created': ''}
+
+
+def add_many(spec, group, worker):
+    """Processus enfant : ajoute des tâches via la CLI (``group='mixed'`` : un sur deux)."""
+    tm.STORE_SPEC = spec
+    tm.GROUP_COMMIT = bool(worker % 2) if group == 'mixed' else group
+    with redirect_stdout(StringIO()):
+        for i in range(ADDS_PER_WORKER):
+            tm.main(['add', '--title', f'w{worker}-{i}', '--desc', '', '--priority', '3',
+                     '--due', '2030-01-01'])
+
+
+@unittest.skipUnless(storage.fcntl is not None and 'fork' in multiprocessing.get_all_start_methods(),
+                     'fcntl et fork requis')
+class TestConcurrentWriters(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def run_writers(self, kind, group):
+        path = os.path.join(self.tmpdir.name, f'{kind}-{group}.db')
+        spec = f'{kind}:{path}'
+        ctx = multiprocessing.get_context('fork')
+        procs = [ctx.Process(target=add_many, args=(spec, group, w)) for w in range(WORKERS)]
+        with mock.patch.object(storage, 'FSYNC', False):
+            for proc in procs:
+                proc.start()
+            for proc in procs:
+                proc.join(60)
+        self.assertEqual([p.exitcode for p in procs], [0] * WORKERS)
+        return storage.open_backend(spec, path).load()
+
+    def test_no_update_is_lost(self):
+        for kind in ('json', 'journal', 'binary'):
+            for group in (False, True, 'mixed'):
+                with self.subTest(kind=kind, group=group):
+                    tasks = self.run_writers(kind, group)
+                    ids = [t['id'] for t in tasks]
+                    self.assertEqual(len(ids), WORKERS * ADDS_PER_WORKER)
+                    self.assertEqual(sorted(ids), list(range(1, len(ids) + 1)))
+                    self.assertEqual(len({t['title'] for t in tasks}), len(tasks))
+
+
+class TestGroupCommit(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.backend = storage.JournalBackend(os.path.join(self.tmpdir.name, 'tasks.json'))
+        self.backend.save([task(1), task(2)])
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_queued_changes_are_persisted_in_one_commit(self):
+        group = GroupCommit(self.backend)
+        self.assertEqual(group.submit(adds=[task(0, 'A'), task(0, 'B')]), [3, 4])
+        group.submit(patches={1: {'title': 'modifiée'}, 4: {'priority': 1}}, deletes=[2])
+        self.assertEqual(group.submit(adds=[task(0, 'C')]), [5])  # IDs réservés
+        with mock.patch.object(self.backend, 'commit', wraps=self.backend.commit) as commit:
+            self.assertEqual(group.flush(), 6)
+        commit.assert_called_once()
+        self.assertEqual(group.flush(), 0)
+
+        tasks = {t['id']: t for t in storage.JournalBackend(self.backend.path).load()}
+        self.assertEqual(sorted(tasks), [1, 3, 4, 5])
+        self.assertEqual(tasks[1]['title'], 'modifiée')
+        self.assertEqual((tasks[4]['title'], tasks[4]['priority']), ('B', 1))
+
+    def test_locked_writers_skip_queued_ids(self):
+        group = GroupCommit(self.backend)
+        self.assertEqual(group.submit(adds=[task(0, 'file')]), [3])
+        store = tm.TaskStore(self.backend)
+        self.assertEqual(store.add('verrou', '', 2, '2030-01-02')['id'], 4)
+        self.assertEqual(group.submit(adds=[task(0, 'file 2')]), [5])
+        group.flush()
+        titles = {t['id']: t['title'] for t in storage.JournalBackend(self.backend.path).load()}
+        self.assertEqual(titles, {1: 'T', 2: 'T', 3: 'file', 4: 'verrou', 5: 'file 2'})
+
+    def test_patch_removes_cleared_repeat(self):
+        self.backend.commit(puts=[dict(task(1), repeat='weekly')])
+        group = GroupCommit(self.backend)
+        group.write(patches={1: {'repeat': ''}})
+        self.assertNotIn('repeat', storage.JournalBackend(self.backend.path).get(1))
+
+    def test_cli_group_mode_keeps_messages(self):
+        tm.STORE_SPEC = 'journal:' + self.backend.path
+        tm.GROUP_COMMIT = True
+        try:
+            buf = StringIO()
+            with redirect_stdout(buf):
+                tm.main(['add', '--title', 'N', '--desc', '', '--priority', '2',
+                         '--due', '2030-01-02'])
+                tm.main(['edit', '--id', '3', '--title', 'Renommée'])
+                tm.main(['delete', '--id', '1'])
+        finally:
+            tm.STORE_SPEC = None
+            tm.GROUP_COMMIT = False
+        self.assertEqual(buf.getvalue().splitlines(),
+                         ['Tâche ajoutée (ID 3)', 'Tâche 3 mise à jour.', 'Tâche 1 supprimée.'])
+        titles = {t['id']: t['title'] for t in storage.JournalBackend(self.backend.path).load()}
+        self.assertEqual(titles, {2: 'T', 3: 'Renommée'})
+
+
+class TestDurableWrites(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, 'tasks.json')
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_json_save_is_atomic_and_synced(self):
+        backend = storage.JsonBackend(self.path)
+        with mock.patch.object(storage.os, 'fsync', wraps=os.fsync) as fsync:
+            backend.save([task(1)])
+        self.assertTrue(fsync.called)
+        with open(self.path, encoding='utf-8') as f:
+            self.assertEqual(json.load(f), [task(1)])
+        self.assertEqual([n for n in os.listdir(self.tmpdir.name) if n.startswith('.tmp')], [])
+
+    @unittest.skipIf(os.name == 'nt', 'permissions POSIX')
+    def test_rewrite_keeps_file_mode(self):
+        backend = storage.JsonBackend(self.path)
+        saved = os.umask(0o022)
+        try:
+            backend.save([task(1)])
+        finally:
+            os.umask(saved)
+        self.assertEqual(os.stat(self.path).st_mode & 0o777, 0o644)
+        os.chmod(self.path, 0o640)
+        backend.commit(puts=[task(2)])
+        self.assertEqual(os.stat(self.path).st_mode & 0o777, 0o640)
+        binary = storage.BinaryBackend(os.path.join(self.tmpdir.name, 'tasks.bin'))
+        binary.save([task(1)])
+        os.chmod(binary.path, 0o664)
+        binary.commit(puts=[task(2)])
+        self.assertEqual(os.stat(binary.path).st_mode & 0o777, 0o664)
+
+    def test_corrupt_file_is_not_treated_as_empty(self):
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write('[{"id": 1, "title"')
+        with self.assertRaises(ValueError):
+            storage.JsonBackend(self.path).load()
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write('\n')
+        self.assertEqual(storage.JsonBackend(self.path).load(), [])
+
+    def test_lock_is_reentrant_and_reloads(self):
+        backend = storage.JsonBackend(self.path)
+        backend.save([task(1)])
+        self.assertEqual(len(backend.load()), 1)
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump([task(1), task(2)], f)  # écriture d'un autre processus
+        with backend.lock():
+            self.assertEqual(len(backend.load()), 2)
+            backend.commit(puts=[task(3)])
+        self.assertEqual([t['id'] for t in backend.load()], [1, 2, 3])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,304 @@
+import os
+import sys
+import json
+import signal
+import socket
+import subprocess
+import tempfile
+import threading
+import time
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from unittest import mock
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+SRC_DIR = os.path.join(PROJECT_ROOT, 'src')
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+import task_manager as tm  # noqa: E402
+import daemon  # noqa: E402
+import storage  # noqa: E402
+
+
+def task(task_id, title='T', due='2030-01-01'):
+    return {'id': task_id, 'title': title, 'desc': '', 'priority': 3,
+            'due': due, 'created': ''}
+
+
+class TestCachedBackend(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, 'tasks.json')
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_writes_are_batched_until_flush(self):
+        inner = storage.JournalBackend(self.path)
+        inner.save([task(1)])
+        cached = daemon.CachedBackend(inner)
+        cached.commit(puts=[task(2)])
+        cached.commit(puts=[task(2, 'B')], deletes=[1])
+        self.assertEqual(cached.pending, 2)
+        self.assertEqual([t['id'] for t in storage.JournalBackend(self.path).load()], [1])
+
+        with mock.patch.object(inner, 'commit', wraps=inner.commit) as commit:
+            cached.flush()
+        commit.assert_called_once()
+        self.assertEqual(storage.JournalBackend(self.path).load(), [task(2, 'B')])
+        self.assertEqual(cached.pending, 0)
+
+    def test_reads_return_copies(self):
+        cached = daemon.CachedBackend(storage.JsonBackend(self.path))
+        cached.commit(puts=[task(1)])
+        cached.get(1)['title'] = 'modifié'
+        self.assertEqual(cached.get(1)['title'], 'T')
+
+    def test_external_writes_are_reloaded_under_lock(self):
+        storage.JsonBackend(self.path).save([task(1)])
+        cached = daemon.CachedBackend(storage.JsonBackend(self.path))
+        storage.JsonBackend(self.path).commit(puts=[task(2, 'locale')])
+        with cached.lock():
+            self.assertEqual(cached.next_id(), 3)
+            cached.commit(puts=[task(3)])
+        cached.flush()
+        self.assertEqual([t['title'] for t in storage.JsonBackend(self.path).load()],
+                         ['T', 'locale', 'T'])
+        self.assertFalse(cached.refresh())
+
+    def test_lock_is_held_until_pending_writes_are_flushed(self):
+        cached = daemon.CachedBackend(storage.JsonBackend(self.path))
+        cached.commit(puts=[task(1)])
+        seen = []
+
+        def writer():
+            other = storage.JsonBackend(self.path)
+            with other.lock():
+                seen.append(other.next_id())
+
+        thread = threading.Thread(target=writer)
+        thread.start()
+        thread.join(0.2)
+        self.assertEqual(seen, [])  # bloqué par le verrou du démon
+        cached.flush()
+        thread.join(5)
+        self.assertEqual(seen, [2])
+
+    def test_lock_is_released_without_writes(self):
+        cached = daemon.CachedBackend(storage.JsonBackend(self.path))
+        with cached.lock():
+            pass
+        with storage.file_lock(self.path + storage.LOCK_SUFFIX):
+            pass  # ne bloque pas
+
+
+@unittest.skipUnless(hasattr(socket, 'AF_UNIX'), 'sockets Unix requises')
+class TestServe(unittest.TestCase):
+    """``serve`` dans le processus de test, des clients dans un thread."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, 'tasks.json')
+        self.socket = storage.socket_path(self.path)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def serve(self, backend, dispatch, clients):
+        """Sert *dispatch* jusqu'à ce que *clients* ait fini, puis envoie SIGTERM."""
+        results = []
+        ready = threading.Event()
+
+        def run():
+            ready.wait(10)  # socket à l'écoute, pas seulement créée
+            try:
+                results.append(clients())
+            finally:
+                os.kill(os.getpid(), signal.SIGTERM)
+
+        thread = threading.Thread(target=run)
+        thread.start()
+        daemon.serve(self.socket, backend, dispatch, flush_interval=0.05, ready=ready)
+        thread.join(5)
+        return results[0] if results else None
+
+    def test_forward_without_daemon(self):
+        self.assertIsNone(daemon.forward(self.socket, ['list'], None))
+        with open(self.socket, 'w', encoding='utf-8'):
+            pass  # socket orpheline
+        self.assertIsNone(daemon.forward(self.socket, ['list'], None))
+
+    def test_requests_are_dispatched_and_flushed(self):
+        backend = daemon.CachedBackend(storage.JsonBackend(self.path))
+
+        def dispatch(request):
+            if request['argv'] == ['refus']:
+                return {'status': 'refused'}
+            backend.commit(puts=[task(backend.next_id(), request['argv'][0])])
+            return {'status': 'ok', 'stdout': f"{len(backend.load())}\n", 'stderr': '',
+                    'exit': None}
+
+        def clients():
+            return [daemon.forward(self.socket, ['A'], None),
+                    daemon.forward(self.socket, ['refus'], None),
+                    daemon.forward(self.socket, ['B'], 'json:' + self.path)]
+
+        responses = self.serve(backend, dispatch, clients)
+        self.assertEqual(responses[0]['stdout'], '1\n')
+        self.assertIsNone(responses[1])
+        self.assertEqual(responses[2]['stdout'], '2\n')
+        self.assertFalse(os.path.exists(self.socket))
+        self.assertEqual([t['title'] for t in storage.JsonBackend(self.path).load()],
+                         ['A', 'B'])
+
+    def test_slow_command_is_not_reported_as_failed(self):
+        backend = daemon.CachedBackend(storage.JsonBackend(self.path))
+
+        def dispatch(request):
+            time.sleep(0.3)
+            return {'status': 'ok', 'stdout': 'fini\n', 'stderr': '', 'exit': None}
+
+        with mock.patch.object(daemon, 'CLIENT_TIMEOUT', 0.05):
+            response = self.serve(backend, dispatch,
+                                  lambda: daemon.forward(self.socket, ['list'], None))
+        self.assertEqual(response['stdout'], 'fini\n')
+
+    def test_invalid_request_and_running_daemon(self):
+        backend = daemon.CachedBackend(storage.JsonBackend(self.path))
+
+        def clients():
+            with self.assertRaisesRegex(ValueError, 'Un démon écoute déjà'):
+                daemon.serve(self.socket, backend, lambda r: r)
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.connect(self.socket)
+                sock.sendall(b'pas du json\n')
+                return daemon._recv_json(sock)
+
+        response = self.serve(backend, lambda r: r, clients)
+        self.assertEqual(response['status'], 'error')
+
+    def test_starting_daemon_socket_is_not_taken_for_an_orphan(self):
+        backend = daemon.CachedBackend(storage.JsonBackend(self.path))
+        locked, release, ready = threading.Event(), threading.Event(), threading.Event()
+        seen = []
+
+        def starting():
+            # Démon en cours de démarrage : socket liée, pas encore à l'écoute.
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock, \
+                    storage.file_lock(self.socket + storage.LOCK_SUFFIX):
+                sock.bind(self.socket)
+                locked.set()
+                release.wait(10)
+                seen.append((os.path.exists(self.socket), ready.is_set()))
+                os.remove(self.socket)  # arrêté sans écouter
+            ready.wait(10)
+            try:
+                seen.append(daemon.forward(self.socket, ['list'], None))
+            finally:
+                os.kill(os.getpid(), signal.SIGTERM)
+
+        thread = threading.Thread(target=starting)
+        thread.start()
+        locked.wait(10)
+        threading.Timer(0.2, release.set).start()
+        daemon.serve(self.socket, backend, lambda r: {'status': 'ok', 'stdout': 'servi\n'},
+                     ready=ready)
+        thread.join(5)
+        self.assertEqual(seen[0], (True, False))  # attendu le verrou sans rien supprimer
+        self.assertEqual(seen[1]['stdout'], 'servi\n')
+
+
+@unittest.skipUnless(hasattr(socket, 'AF_UNIX'), 'sockets Unix requises')
+class TestDaemon(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, 'tasks.json')
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump([task(1, 'existante')], f)
+        self.spec = 'json:' + self.path
+        self.socket = storage.socket_path(self.path)
+        self.proc = subprocess.Popen(
+            [sys.executable, os.path.join(SRC_DIR, 'task_manager.py'), '--store', self.spec,
+             'serve', '--flush-interval', '60'],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        deadline = time.monotonic() + 10
+        while not daemon.listening(self.socket):
+            if time.monotonic() > deadline or self.proc.poll() is not None:
+                self.fail('le démon ne démarre pas')
+            time.sleep(0.02)
+        tm.STORE_SPEC = self.spec
+
+    def tearDown(self):
+        tm.STORE_SPEC = None
+        if self.proc.poll() is None:
+            self.proc.kill()
+        self.proc.wait()
+        self.tmpdir.cleanup()
+
+    def run_cli(self, argv):
+        buf = StringIO()
+        with redirect_stdout(buf):
+            tm.main(argv)
+        return buf.getvalue()
+
+    def stop(self):
+        self.proc.send_signal(signal.SIGTERM)
+        self.assertEqual(self.proc.wait(timeout=10), 0)
+
+    def test_commands_are_served_and_flushed_on_exit(self):
+        with mock.patch.object(tm, 'get_backend', side_effect=AssertionError):
+            self.run_cli(['add', '--title', 'Nouvelle', '--desc', 'D', '--priority', '1',
+                          '--due', '2030-01-02'])
+            out = self.run_cli(['list', '--sort', 'priority'])
+        self.assertIn('[2] Nouvelle', out.splitlines()[0])
+        with open(self.path, encoding='utf-8') as f:
+            self.assertEqual(len(json.load(f)), 1)  # écriture encore différée
+
+        self.stop()
+        self.assertFalse(os.path.exists(self.socket))
+        with open(self.path, encoding='utf-8') as f:
+            self.assertEqual([t['title'] for t in json.load(f)], ['existante', 'Nouvelle'])
+
+    def test_journal_commands_share_the_daemon_ids(self):
+        self.run_cli(['add', '--title', 'Démon', '--desc', '', '--priority', '1',
+                      '--due', '2030-01-02'])
+        self.run_cli(['--journal', 'add', '--title', 'LOCAL', '--desc', '', '--priority', '2',
+                      '--due', '2030-01-03'])
+        self.stop()
+        tasks = tm.get_backend().load()
+        self.assertEqual([(t['id'], t['title']) for t in tasks],
+                         [(1, 'existante'), (2, 'Démon'), (3, 'LOCAL')])
+
+    def test_direct_writer_waits_for_pending_writes(self):
+        self.run_cli(['add', '--title', 'Démon', '--desc', '', '--priority', '1',
+                      '--due', '2030-01-02'])
+        # Écrivain direct (démon injoignable pour lui) : il attend la persistance.
+        threading.Timer(0.3, self.proc.send_signal, (signal.SIGTERM,)).start()
+        with mock.patch.object(daemon, 'forward', return_value=None):
+            self.run_cli(['add', '--title', 'LOCAL', '--desc', '', '--priority', '2',
+                          '--due', '2030-01-03'])
+        self.assertEqual(self.proc.wait(timeout=10), 0)
+        tasks = storage.JsonBackend(self.path).load()
+        self.assertEqual([(t['id'], t['title']) for t in tasks],
+                         [(1, 'existante'), (2, 'Démon'), (3, 'LOCAL')])
+
+    def test_other_store_falls_back_to_direct_access(self):
+        other = os.path.join(self.tmpdir.name, 'autre.json')
+        out = self.run_cli(['--store', 'json:' + other, 'add', '--title', 'X', '--desc', '',
+                            '--priority', '2', '--due', '2030-01-01'])
+        self.assertIn('ajoutée', out)
+        with open(other, encoding='utf-8') as f:
+            self.assertEqual(json.load(f)[0]['title'], 'X')
+
+    def test_argparse_errors_are_relayed(self):
+        with redirect_stdout(StringIO()), self.assertRaises(SystemExit) as ctx, \
+                mock.patch('sys.stderr', new_callable=StringIO) as err:
+            tm.main(['add', '--priority', '9'])
+        self.assertEqual(ctx.exception.code, 2)
+        self.assertIn('--title', err.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+import os
+import sys
+import json
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from datetime import date, timedelta
+from unittest import mock
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+SRC_DIR = os.path.join(PROJECT_ROOT, 'src')
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+import task_manager as tm  # noqa: E402
+import indexes  # noqa: E402
+import storage  # noqa: E402
+
+
+def d(delta_days: int) -> str:
+    return (date.today() + timedelta(days=delta_days)).strftime("%Y-%m-%d")
+
+
+def task(task_id, due):
+    return {'id': task_id, 'title': f'T{task_id}', 'desc': '', 'priority': 3,
+            'due': due, 'created': ''}
+
+
+class TestDueIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, 'tasks.json')
+        tm.TASKS_FILE = self.path
+
+    def tearDown(self):
+        tm.USE_JOURNAL = False
+        self.tmpdir.cleanup()
+
+    def backend(self, cls=storage.JournalBackend):
+        backend = cls(self.path)
+        index = indexes.DueIndex(backend)
+        backend.observers.append(index)
+        return backend, index
+
+    def window(self, low, high):
+        today = date.today().toordinal()
+        return today + low, today + high
+
+    def test_lookup_is_a_range_query(self):
+        backend, index = self.backend()
+        backend.save([task(1, d(-2)), task(2, d(1)), task(3, d(3)), task(4, d(10)),
+                      task(5, 'pas-une-date')])
+        self.assertEqual(index.lookup(*self.window(0, 3)), [2, 3])
+        self.assertEqual(index.lookup(1, date.today().toordinal() - 1), [1])
+
+    def test_writes_update_the_index_incrementally(self):
+        backend, index = self.backend()
+        backend.save([task(1, d(1)), task(2, d(20))])
+        index.lookup(0, 0)  # index construit et à jour
+
+        backend.commit(puts=[task(2, d(2)), task(3, d(3))], deletes=[1])
+        self.assertTrue(index.is_fresh())
+        self.assertTrue(os.path.exists(index.delta_path))
+        with mock.patch.object(index, 'rebuild', side_effect=AssertionError):
+            self.assertEqual(index.lookup(*self.window(0, 3)), [2, 3])
+
+    def test_delta_is_folded_when_large(self):
+        backend, index = self.backend()
+        backend.save([task(1, d(1))])
+        with mock.patch.object(indexes, 'DELTA_MIN_FOLD', 0):
+            backend.commit(puts=[task(2, d(2))])
+        self.assertFalse(os.path.exists(index.delta_path))
+        self.assertEqual(index.lookup(*self.window(0, 3)), [1, 2])
+
+    def test_stale_or_missing_index_is_rebuilt(self):
+        backend, index = self.backend(storage.JsonBackend)
+        backend.save([task(1, d(1))])
+        self.assertFalse(os.path.exists(index.path))  # créé à la première requête
+        self.assertEqual(index.lookup(*self.window(0, 3)), [1])
+
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump([task(1, d(1)), task(2, d(2))], f)  # écriture externe
+        _, index = self.backend(storage.JsonBackend)  # nouvelle commande
+        self.assertFalse(index.is_fresh())
+        self.assertEqual(index.lookup(*self.window(0, 3)), [1, 2])
+
+    def test_read_only_store_falls_back_to_a_scan(self):
+        backend, index = self.backend(storage.JsonBackend)
+        backend.save([task(2, d(2)), task(1, d(1)), task(3, d(9))])
+        with mock.patch.object(storage, 'file_lock', side_effect=PermissionError(13, 'ro')):
+            self.assertEqual(index.lookup(*self.window(0, 3)), [1, 2])
+        self.assertFalse(os.path.exists(index.path))
+
+    def test_cli_due_in_only_reads_matching_tasks(self):
+        backend, _ = self.backend()
+        backend.save([task(i, d(i % 30)) for i in range(1, 61)])
+        tm.USE_JOURNAL = True
+        args = mock.Mock(sort='date', overdue=False, due_in=1, limit=None, offset=0)
+        buf = StringIO()
+        with redirect_stdout(buf):
+            tm.list_tasks(args)  # construit l'index
+        with mock.patch.object(storage.JournalBackend, 'load', side_effect=AssertionError), \
+                redirect_stdout(StringIO()) as out:
+            tm.list_tasks(args)
+        ids = [line.split()[0] for line in out.getvalue().splitlines()]
+        self.assertEqual(ids, ['[30]', '[60]', '[1]', '[31]'])
+        self.assertEqual(buf.getvalue(), out.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+import os
+import sys
+import csv
+import json
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from datetime import date, timedelta
+from unittest import mock
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+SRC_DIR = os.path.join(PROJECT_ROOT, 'src')
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+import task_manager as tm  # noqa: E402
+import formats  # noqa: E402
+
+
+def d(delta_days: int) -> str:
+    return (date.today() + timedelta(days=delta_days)).strftime("%Y-%m-%d")
+
+
+TASKS = [
+    {'id': 1, 'title': 'Réunion, "équipe"', 'desc': 'ligne 1\nligne 2', 'priority': 1,
+     'due': d(-1), 'created': '2030-01-01'},
+    {'id': 2, 'title': 'Courses', 'desc': 'a\tb', 'priority': 2, 'due': d(2), 'created': '',
+     'repeat': 'weekly'},
+    {'id': 3, 'title': 'Plus tard', 'desc': '', 'priority': 3, 'due': 'bientôt', 'created': ''},
+]
+STATUS = {1: 'overdue', 2: 'soon', 3: ''}
+
+
+class TestChunkedWriter(unittest.TestCase):
+    def test_writes_only_full_chunks_then_the_rest(self):
+        stream = mock.Mock()
+        chunks = []
+        with formats.ChunkedWriter(stream, capture=chunks, size=10) as out:
+            for _ in range(7):
+                out.write('abc')
+            self.assertEqual([c.args[0] for c in stream.write.call_args_list],
+                             ['abcabcabcabc'])
+        self.assertEqual(chunks, ['abcabcabcabc', 'abcabcabc'])
+        self.assertEqual(stream.write.call_count, 2)
+
+
+class TestListFormats(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        tm.TASKS_FILE = os.path.join(self.tmpdir.name, 'tasks.json')
+        tm.save_tasks(TASKS)
+
+    def tearDown(self):
+        tm.QUERY_CACHE = False
+        self.tmpdir.cleanup()
+
+    def run_cli(self, argv):
+        buf = StringIO()
+        with redirect_stdout(buf):
+            tm.main(argv)
+        return buf.getvalue()
+
+    def test_jsonl_has_one_object_per_task_with_status(self):
+        rows = [json.loads(line) for line in self.run_cli(['list', '--format', 'jsonl']).splitlines()]
+        self.assertEqual([list(r) for r in rows], [list(formats.COLUMNS)] * 3)
+        self.assertEqual({r['id']: r['status'] for r in rows}, STATUS)
+        self.assertEqual(rows[0]['title'], 'Réunion, "équipe"')
+        self.assertEqual(rows[0]['priority'], 1)
+
+    def test_csv_and_tsv_round_trip(self):
+        for fmt, dialect in (('csv', 'excel'), ('tsv', 'excel-tab')):
+            with self.subTest(fmt=fmt):
+                out = self.run_cli(['list', '--format', fmt, '--sort', 'date'])
+                rows = list(csv.DictReader(StringIO(out), dialect=dialect))
+                self.assertEqual([int(r['id']) for r in rows], [1, 2, 3])
+                self.assertEqual({int(r['id']): r['status'] for r in rows}, STATUS)
+                self.assertEqual(rows[0]['desc'], 'ligne 1\nligne 2')
+                self.assertEqual(rows[1]['desc'], 'a\tb')
+                self.assertEqual([r['repeat'] for r in rows], ['', 'weekly', ''])
+
+    def test_exports_can_be_imported_back(self):
+        for fmt in ('csv', 'jsonl'):
+            with self.subTest(fmt=fmt):
+                path = os.path.join(self.tmpdir.name, 'export.' + fmt)
+                with open(path, 'w', encoding='utf-8', newline='') as f:
+                    f.write(self.run_cli(['list', '--format', fmt, '--where', 'id<=2']))
+                tm.save_tasks([])
+                self.assertIn('2 tâche(s) importée(s)', self.run_cli(['import', path]))
+                self.assertEqual([(t['title'], t['due'], t.get('repeat')) for t in tm.load_tasks()],
+                                 [('Réunion, "équipe"', d(-1), None), ('Courses', d(2), 'weekly')])
+                tm.save_tasks(TASKS)
+
+    def test_empty_results_and_filters(self):
+        self.assertEqual(self.run_cli(['list', '--format', 'csv', '--due-in', '-5']),
+                         ','.join(formats.COLUMNS) + '\n')
+        self.assertEqual(self.run_cli(['list', '--format', 'jsonl', '--where', 'id>3']), '')
+        self.assertIn('Aucune tâche', self.run_cli(['list', '--due-in', '-5']))
+        out = self.run_cli(['search', 'courses', '--format', 'jsonl'])
+        self.assertEqual(json.loads(out)['id'], 2)
+
+    def test_explain_goes_to_stderr_and_cache_keys_on_format(self):
+        with mock.patch('sys.stderr', new_callable=StringIO) as err:
+            out = self.run_cli(['list', '--format', 'jsonl', '--where', 'id=2', '--explain'])
+        self.assertEqual(json.loads(out)['id'], 2)
+        self.assertIn('Plan : ', err.getvalue())
+        table = self.run_cli(['--cache', 'list'])
+        self.assertEqual(self.run_cli(['--cache', 'list']), table)
+        jsonl = self.run_cli(['--cache', 'list', '--format', 'jsonl'])
+        self.assertNotEqual(jsonl, table)
+        self.assertEqual(self.run_cli(['--cache', 'list', '--format', 'jsonl']), jsonl)
+
+
+if __name__ == '__main__':
+    unittest.main()
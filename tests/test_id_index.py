@@ -0,0 +1,68 @@
+import os
+import sys
+import json
+import tempfile
+import unittest
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+SRC_DIR = os.path.join(PROJECT_ROOT, 'src')
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+import storage  # noqa: E402
+
+
+def task(task_id, title='T'):
+    return {'id': task_id, 'title': title, 'desc': '', 'priority': 3,
+            'due': '2030-01-01', 'created': ''}
+
+
+class TestIdIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, 'tasks.json')
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_get_reads_snapshot_and_journal_positions(self):
+        backend = storage.JournalBackend(self.path)
+        backend.save([task(1, 'snap'), task(2, 'other')])
+        backend.commit(puts=[task(2, 'journal'), task(3, 'new')], deletes=[1])
+
+        fresh = storage.JournalBackend(self.path)
+        self.assertIsNone(fresh.get(1))
+        self.assertEqual(fresh.get(2)['title'], 'journal')
+        self.assertEqual(fresh.get(3)['title'], 'new')
+        self.assertIsNone(fresh.get(99))
+        self.assertEqual(fresh.next_id(), 4)
+
+    def test_next_id_is_a_counter_not_max_plus_one(self):
+        backend = storage.JournalBackend(self.path)
+        backend.commit(puts=[task(1), task(2)])
+        backend.commit(deletes=[2])
+        self.assertEqual(storage.JournalBackend(self.path).next_id(), 3)
+        # Le compteur survit au compactage
+        backend.compact()
+        self.assertEqual(storage.JournalBackend(self.path).next_id(), 3)
+
+    def test_stale_index_is_rebuilt(self):
+        storage.JournalBackend(self.path).commit(puts=[task(1)])
+        # Écriture externe au journal, sans passer par l'index
+        with open(self.path + storage.JOURNAL_SUFFIX, 'a', encoding='utf-8') as f:
+            f.write(json.dumps({'op': 'put', 'task': task(5, 'external')}) + '\n')
+        backend = storage.JournalBackend(self.path)
+        self.assertEqual(backend.get(5)['title'], 'external')
+        self.assertEqual(backend.next_id(), 6)
+
+    def test_legacy_indented_snapshot_is_migrated(self):
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump([task(1, 'legacy'), task(2)], f, indent=2)
+        backend = storage.JournalBackend(self.path)
+        self.assertEqual(backend.get(1)['title'], 'legacy')
+        with open(self.path, encoding='utf-8') as f:
+            self.assertEqual([t['id'] for t in json.load(f)], [1, 2])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+import os
+import sys
+import json
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from unittest import mock
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+SRC_DIR = os.path.join(PROJECT_ROOT, 'src')
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+import task_manager as tm  # noqa: E402
+import storage  # noqa: E402
+
+
+class TestImport(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        tm.TASKS_FILE = os.path.join(self.tmpdir.name, 'tasks.json')
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def write(self, name, text):
+        path = os.path.join(self.tmpdir.name, name)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        return path
+
+    def run_cli(self, argv):
+        saved_argv = sys.argv
+        sys.argv = ['prog'] + argv
+        buf = StringIO()
+        try:
+            with redirect_stdout(buf):
+                tm.main()
+        finally:
+            sys.argv = saved_argv
+        return buf.getvalue()
+
+    def test_csv_import_reports_rejected_rows(self):
+        path = self.write('in.csv', (
+            "title,desc,priority,due\n"
+            "Rapport,Section tests,1,2030-01-20\n"
+            "Mauvaise priorité,,9,2030-01-20\n"
+            "Mauvaise date,,2,20-01-2030\n"
+            ",sans titre,2,2030-01-20\n"
+            "Réunion,,3,2030-02-01\n"))
+        out = self.run_cli(['import', path])
+
+        self.assertIn("2 tâche(s) importée(s), 3 ligne(s) rejetée(s).", out)
+        self.assertIn("Ligne 3 rejetée : La priorité", out)
+        self.assertIn("Ligne 4 rejetée : Format de date invalide", out)
+        self.assertIn("Ligne 5 rejetée : Titre manquant", out)
+        tasks = tm.load_tasks()
+        self.assertEqual([(t['id'], t['title']) for t in tasks], [(1, 'Rapport'), (2, 'Réunion')])
+
+    def test_jsonl_import_continues_ids_with_a_single_write(self):
+        with open(tm.TASKS_FILE, 'w', encoding='utf-8') as f:
+            json.dump([{'id': 7, 'title': 'A', 'desc': '', 'priority': 1,
+                        'due': '2030-01-01', 'created': ''}], f)
+        path = self.write('in.jsonl', (
+            json.dumps({'id': 1, 'title': 'B', 'priority': 2, 'due': '2030-01-02'}) + "\n"
+            "{pas du json\n\n"
+            + json.dumps({'title': 'C', 'priority': '3', 'due': '2030-01-03'}) + "\n"))
+
+        with mock.patch.object(storage.JsonBackend, '_write',
+                               autospec=True, side_effect=storage.JsonBackend._write) as write:
+            out = self.run_cli(['import', path])
+        self.assertEqual(write.call_count, 1)
+        self.assertIn("Ligne 2 rejetée : JSON invalide", out)
+        self.assertEqual([t['id'] for t in tm.load_tasks()], [7, 8, 9])
+
+    def test_batch_size_bounds_each_write(self):
+        rows = "".join(json.dumps({'title': f'T{i}', 'priority': 3, 'due': '2030-01-01'}) + "\n"
+                       for i in range(5))
+        path = self.write('in.jsonl', rows)
+        with mock.patch.object(storage.JsonBackend, '_write',
+                               autospec=True, side_effect=storage.JsonBackend._write) as write:
+            self.run_cli(['import', path, '--batch-size', '2'])
+        self.assertEqual([len(c.args[1]) for c in write.call_args_list], [2, 2, 1])
+        self.assertEqual(len(tm.load_tasks()), 5)
+
+    def test_missing_file_is_an_error_message(self):
+        out = self.run_cli(['import', os.path.join(self.tmpdir.name, 'absent.csv')])
+        self.assertIn("Erreur: Impossible de lire", out)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,134 @@
+import os
+import sys
+import json
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from unittest import mock
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+SRC_DIR = os.path.join(PROJECT_ROOT, 'src')
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+import task_manager as tm  # noqa: E402
+import stats  # noqa: E402
+import storage  # noqa: E402
+
+
+class TestJournalStorage(unittest.TestCase):
+    def setUp(self):
+        self.tmpfile = tempfile.NamedTemporaryFile(delete=False, suffix='.json')
+        self.tmpfile.close()
+        tm.TASKS_FILE = self.tmpfile.name
+        self.journal = self.tmpfile.name + storage.JOURNAL_SUFFIX
+
+    def tearDown(self):
+        tm.USE_JOURNAL = False
+        for path in (self.tmpfile.name, self.journal, self.tmpfile.name + storage.INDEX_SUFFIX,
+                     self.tmpfile.name + stats.STATS_SUFFIX):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def run_cli(self, argv):
+        saved_argv = sys.argv
+        sys.argv = ['prog'] + argv
+        buf = StringIO()
+        try:
+            with redirect_stdout(buf):
+                tm.main()
+        finally:
+            sys.argv = saved_argv
+        return buf.getvalue()
+
+    def test_mutations_are_appended_to_journal(self):
+        with open(self.tmpfile.name, 'w', encoding='utf-8') as f:
+            f.write(storage.dump_lines([{'id': 1, 'title': 'A', 'desc': '', 'priority': 2,
+                                         'due': '2030-01-01', 'created': ''}]))
+        with open(self.tmpfile.name, encoding='utf-8') as f:
+            snapshot_before = f.read()
+
+        self.run_cli(['--journal', 'add', '--title', 'B', '--desc', 'D',
+                      '--priority', '1', '--due', '2030-01-02'])
+        self.run_cli(['edit', '--id', '1', '--title', 'A2'])
+        self.run_cli(['delete', '--id', '2'])
+
+        # L'instantané n'est pas réécrit, seul le journal grossit
+        with open(self.tmpfile.name, encoding='utf-8') as f:
+            self.assertEqual(f.read(), snapshot_before)
+        with open(self.journal, encoding='utf-8') as f:
+            ops = [json.loads(line)['op'] for line in f]
+        self.assertEqual(ops, ['put', 'put', 'delete'])
+
+        tasks = tm.load_tasks()
+        self.assertEqual([(t['id'], t['title']) for t in tasks], [(1, 'A2')])
+
+    def test_compact_folds_journal_into_plain_json(self):
+        tm.USE_JOURNAL = True
+        self.run_cli(['add', '--title', 'T', '--desc', 'D',
+                      '--priority', '3', '--due', '2030-01-01'])
+        out = self.run_cli(['compact'])
+        self.assertIn("1 tâches", out)
+
+        self.assertEqual(os.path.getsize(self.journal), 0)
+        with open(self.tmpfile.name, encoding='utf-8') as f:
+            data = json.load(f)  # reste un tasks.json classique
+        self.assertEqual(data[0]['title'], 'T')
+
+    def test_truncated_journal_line_is_ignored(self):
+        with open(self.journal, 'w', encoding='utf-8') as f:
+            f.write(json.dumps({'op': 'put', 'task': {'id': 1, 'title': 'ok'}}) + '\n')
+            f.write('{"op": "put", "task": {"id": 2')
+        tasks = storage.JournalBackend(self.tmpfile.name).load()
+        self.assertEqual([t['id'] for t in tasks], [1])
+
+    def test_write_after_a_torn_line_survives_compaction(self):
+        tm.USE_JOURNAL = True
+        self.run_cli(['add', '--title', 'A', '--desc', '', '--priority', '3',
+                      '--due', '2030-01-01'])
+        with open(self.journal, 'a', encoding='utf-8') as f:
+            f.write('{"op": "put", "task": {"id": 9, "ti')  # écriture interrompue
+        self.run_cli(['add', '--title', 'B', '--desc', '', '--priority', '3',
+                      '--due', '2030-01-02'])
+        self.assertIn("2 tâches", self.run_cli(['compact']))
+        self.assertEqual([t['title'] for t in tm.load_tasks()], ['A', 'B'])
+
+    def test_journal_is_compacted_automatically(self):
+        saved = storage.JOURNAL_MIN_COMPACT_BYTES
+        storage.JOURNAL_MIN_COMPACT_BYTES = 0
+        try:
+            backend = storage.JournalBackend(self.tmpfile.name)
+            backend.load()
+            backend.commit(puts=[{'id': 1, 'title': 'x' * 50}])
+        finally:
+            storage.JOURNAL_MIN_COMPACT_BYTES = saved
+        self.assertEqual(os.path.getsize(self.journal), 0)
+        self.assertEqual(storage.JournalBackend(self.tmpfile.name).load()[0]['id'], 1)
+
+    def test_auto_compaction_applies_each_write_once(self):
+        # La compaction suit l'application du lot par les observateurs : les
+        # compteurs de stats ne comptent pas deux fois les tâches ajoutées.
+        saved = storage.JOURNAL_MIN_COMPACT_BYTES
+        storage.JOURNAL_MIN_COMPACT_BYTES = 0
+        try:
+            store = tm.TaskStore.open('journal:' + self.tmpfile.name)
+            store.add('Première', '', 1, '2030-01-01')
+            store.stats()  # construit les compteurs
+            with mock.patch.object(storage.JournalBackend, 'compact', autospec=True,
+                                   side_effect=storage.JournalBackend.compact) as compact:
+                for i in range(2, 10):
+                    with self.subTest(adds=i):
+                        store.add(f'Tâche {i}', '', 1 + i % 5, f'2030-01-{i:02d}')
+                        self.assertEqual(stats.StatsIndex(store.backend).counters(),
+                                         stats.tally(store.backend.load()))
+                        self.assertEqual(store.stats()['total'], i)
+        finally:
+            storage.JOURNAL_MIN_COMPACT_BYTES = saved
+        self.assertGreaterEqual(compact.call_count, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import os
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from datetime import date, timedelta
+from unittest import mock
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+SRC_DIR = os.path.join(PROJECT_ROOT, 'src')
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+import task_manager as tm  # noqa: E402
+import storage  # noqa: E402
+
+
+def d(delta_days: int) -> str:
+    return (date.today() + timedelta(days=delta_days)).strftime("%Y-%m-%d")
+
+
+def make_tasks(n):
+    return [{'id': i, 'title': f'T{i}', 'desc': '', 'priority': 1 + (i * 7) % 5,
+             'due': d(i % 11 - 3), 'created': ''} for i in range(1, n + 1)]
+
+
+class TestListPagination(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, 'tasks.json')
+        tm.TASKS_FILE = self.path
+
+    def tearDown(self):
+        tm.STORE_SPEC = None
+        self.tmpdir.cleanup()
+
+    def run_cli(self, argv):
+        buf = StringIO()
+        with redirect_stdout(buf):
+            tm.main(argv)
+        return [line.split()[0] for line in buf.getvalue().splitlines()]
+
+    def test_pages_match_full_sort_on_every_store(self):
+        for kind in ('json', 'journal', 'sqlite'):
+            tm.STORE_SPEC = f'{kind}:{self.path}.{kind}'
+            tm.get_backend().save(make_tasks(40))
+            for filters in ([], ['--overdue'], ['--due-in', '4']):
+                for sort in ('priority', 'date'):
+                    argv = ['list', '--sort', sort] + filters
+                    full = self.run_cli(argv)
+                    with self.subTest(kind=kind, filters=filters, sort=sort):
+                        self.assertEqual(self.run_cli(argv + ['--limit', '5']), full[:5])
+                        self.assertEqual(
+                            self.run_cli(argv + ['--offset', '3', '--limit', '4']), full[3:7])
+                        self.assertEqual(self.run_cli(argv + ['--offset', '6']), full[6:])
+
+    def test_top_k_uses_a_bounded_heap(self):
+        storage.JournalBackend(self.path).save(make_tasks(30))
+        tm.STORE_SPEC = 'journal:' + self.path
+        with mock.patch.object(tm.heapq, 'nsmallest', wraps=tm.heapq.nsmallest) as nsmallest, \
+                mock.patch.object(storage.JournalBackend, 'load', side_effect=AssertionError):
+            ids = self.run_cli(['list', '--limit', '3'])
+        self.assertEqual(nsmallest.call_args[0][0], 3)
+        self.assertEqual(ids, ['[5]', '[10]', '[15]'])
+
+    def test_journal_streams_tasks_from_disk(self):
+        backend = storage.JournalBackend(self.path)
+        backend.save(make_tasks(5))
+        backend.commit(puts=[dict(make_tasks(2)[1], title='modifiée')], deletes=[3])
+        fresh = storage.JournalBackend(self.path)
+        with mock.patch.object(storage, '_read_json_list', side_effect=AssertionError):
+            streamed = list(fresh.iter_tasks())
+        self.assertEqual([t['id'] for t in streamed], [1, 2, 4, 5])
+        self.assertEqual(streamed[1]['title'], 'modifiée')
+
+    def test_negative_limit_is_rejected(self):
+        with redirect_stdout(StringIO()), mock.patch('sys.stderr', new_callable=StringIO), \
+                self.assertRaises(SystemExit):
+            tm.main(['list', '--limit', '-1'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+import os
+import sys
+import json
+import tempfile
+import time
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from unittest import mock
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+SRC_DIR = os.path.join(PROJECT_ROOT, 'src')
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+import task_manager as tm  # noqa: E402
+import metrics  # noqa: E402
+import storage  # noqa: E402
+
+
+class TestSpans(unittest.TestCase):
+    def test_nested_spans_count_their_own_time(self):
+        with metrics.recording() as rec:
+            with metrics.span('render'):
+                time.sleep(0.01)
+                for _ in metrics.timed('load', iter(lambda: time.sleep(0.01), 1)):
+                    break
+        self.assertEqual(rec.calls, {'render': 1, 'load': 1})
+        self.assertGreaterEqual(rec.totals['load'], 0.009)
+        self.assertAlmostEqual(sum(rec.totals.values()) + rec.other(), rec.elapsed, places=6)
+
+    def test_disabled_outside_recording(self):
+        items = [1, 2]
+        self.assertIs(metrics.timed('load', items), items)
+        with metrics.span('save'):
+            pass
+        self.assertIsNone(metrics._active)  # pylint: disable=protected-access
+
+
+class TestProfileFlag(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, 'tasks.json')
+        storage.JsonBackend(self.path).save(
+            [{'id': i, 'title': f'T{i}', 'desc': '', 'priority': 1 + i % 5,
+              'due': '2030-01-01', 'created': ''} for i in range(1, 21)])
+        tm.STORE_SPEC = 'json:' + self.path
+
+    def tearDown(self):
+        tm.STORE_SPEC = None
+        self.tmpdir.cleanup()
+
+    def run_cli(self, argv):
+        out, err = StringIO(), StringIO()
+        with redirect_stdout(out), mock.patch('sys.stderr', err):
+            tm.main(argv)
+        return out.getvalue(), err.getvalue()
+
+    def test_profile_prints_breakdown_on_stderr(self):
+        plain, _ = self.run_cli(['list', '--limit', '3'])
+        out, err = self.run_cli(['--profile', 'list', '--limit', '3'])
+        self.assertEqual(out, plain)
+        for phase in ('load', 'sort', 'render'):
+            self.assertIn(phase, err)
+        _, err = self.run_cli(['--profile-top', '3', 'list'])
+        self.assertIn('Profil', err)
+        self.assertIn('cumulative', err)
+
+    def test_metrics_file_gets_one_line_per_command(self):
+        sink = os.path.join(self.tmpdir.name, 'metrics.jsonl')
+        with mock.patch.dict(os.environ, {tm.METRICS_ENV: sink}):
+            _, err = self.run_cli(['list'])
+            self.run_cli(['add', '--title', 'N', '--desc', '', '--priority', '1',
+                          '--due', '2030-01-01'])
+        self.assertEqual(err, '')
+        with open(sink, encoding='utf-8') as f:
+            records = [json.loads(line) for line in f]
+        self.assertEqual([r['command'] for r in records], ['list', 'add'])
+        self.assertEqual(records[0]['spans']['load']['calls'], 21)
+        self.assertIn('validate', records[1]['spans'])
+        self.assertIn('save', records[1]['spans'])
+
+
+if __name__ == '__main__':
+    unittest.main()
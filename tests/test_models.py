@@ -0,0 +1,62 @@
+import os
+import sys
+import unittest
+from datetime import date, timedelta
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+SRC_DIR = os.path.join(PROJECT_ROOT, 'src')
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+import task_manager as tm  # noqa: E402
+import models  # noqa: E402
+
+
+def d(delta_days: int) -> str:
+    return (date.today() + timedelta(days=delta_days)).strftime("%Y-%m-%d")
+
+
+class TestTaskRecord(unittest.TestCase):
+    def test_round_trip_is_exact(self):
+        full = {'id': 1, 'title': 'A', 'desc': 'D', 'priority': 2, 'due': '2030-01-02',
+                'created': 'x', 'tags': ['a']}
+        partial = {'id': 2, 'title': 'B'}
+        for data in (full, partial):
+            self.assertEqual(models.Task.from_dict(data).to_dict(), data)
+        self.assertEqual(list(models.Task.from_dict(full).to_dict()), list(full))
+
+    def test_record_has_no_instance_dict_and_parses_due_once(self):
+        task = models.Task.from_dict({'id': 1, 'title': 'A', 'due': '2030-01-02'})
+        self.assertFalse(hasattr(task, '__dict__'))
+        self.assertEqual(task.due_ord, date(2030, 1, 2).toordinal())
+        self.assertEqual(models.Task.from_dict({'id': 2, 'due': 'bad'}).due_key, models.NO_DUE)
+
+
+class TestTaskTable(unittest.TestCase):
+    def setUp(self):
+        self.tasks = [
+            {'id': 1, 'title': 'A', 'priority': 3, 'due': d(5)},
+            {'id': 2, 'title': 'B', 'priority': 1, 'due': 'bad'},
+            {'id': 3, 'title': 'C', 'priority': 3, 'due': d(-1)},
+            {'id': 4, 'title': 'D', 'priority': 1, 'due': d(2)},
+        ]
+        self.table = models.TaskTable.from_tasks(iter(self.tasks))
+
+    def test_orders_match_the_dict_sort(self):
+        for sort in ('priority', 'date'):
+            expected = [t['id'] for t in sorted(self.tasks, key=tm.sort_key(sort))]
+            self.assertEqual(self.table.ordered_ids(sort), expected)
+
+    def test_columns_hold_native_values(self):
+        self.assertEqual(list(self.table.ids), [1, 2, 3, 4])
+        self.assertEqual(list(self.table.priorities), [3, 1, 3, 1])
+        self.assertEqual(self.table.dues[0], date.today().toordinal() + 5)
+        self.assertEqual(self.table.dues[1], 0)
+
+    def test_out_of_range_priority_is_clamped(self):
+        table = models.TaskTable.from_tasks([{'id': 1, 'priority': 1000}, {'id': 2}])
+        self.assertEqual(table.ordered_ids('priority'), [2, 1])
+
+
+if __name__ == '__main__':
+    unittest.main()
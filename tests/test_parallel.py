@@ -0,0 +1,132 @@
+import os
+import sys
+import json
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from datetime import date, timedelta
+from unittest import mock
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+SRC_DIR = os.path.join(PROJECT_ROOT, 'src')
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+import task_manager as tm  # noqa: E402
+import parallel  # noqa: E402
+import storage  # noqa: E402
+
+
+def d(delta_days: int) -> str:
+    return (date.today() + timedelta(days=delta_days)).strftime("%Y-%m-%d")
+
+
+def make_tasks(n):
+    # Beaucoup d'ex aequo (priorité, échéance) et quelques dates invalides.
+    return [{'id': i, 'title': f'Tâche {i}', 'desc': 'é' * (i % 7), 'priority': 1 + (i * 7) % 5,
+             'due': d((i * 13) % 50 - 20) if i % 11 else 'plus tard', 'created': ''}
+            for i in range(1, n + 1)]
+
+
+class TestChunks(unittest.TestCase):
+    def test_ranges_cover_the_file_on_line_boundaries(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'tasks.json')
+            storage.JournalBackend(path).save(make_tasks(50))
+            with open(path, 'rb') as f:
+                data = f.read()
+            for count in (1, 3, 8, 500):
+                with self.subTest(count=count):
+                    ranges = parallel.chunk_ranges(path, count)
+                    self.assertLessEqual(len(ranges), count)
+                    self.assertEqual(ranges[0][0], 0)
+                    self.assertEqual(ranges[-1][1], len(data))
+                    for (_, end), (start, _) in zip(ranges, ranges[1:]):
+                        self.assertEqual(end, start)
+                        self.assertEqual(data[start - 1:start], b'\n')
+                    tasks = [t for s, e in ranges
+                             for t in parallel.scan_chunk(path, s, e, None, 'priority', None,
+                                                          frozenset())]
+                    self.assertEqual(sorted(t['id'] for t in tasks), list(range(1, 51)))
+
+
+class TestParallelList(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, 'tasks.json')
+        tm.STORE_SPEC = 'journal:' + self.path
+        backend = storage.JournalBackend(self.path)
+        tasks = make_tasks(300)
+        backend.save(tasks)
+        # Modifications et suppressions encore dans le journal.
+        backend.commit(puts=[dict(tasks[4], priority=1, due=d(-3)), dict(tasks[9], id=301)],
+                       deletes=[8, 12])
+        patcher = mock.patch.object(parallel, 'PARALLEL_MIN_BYTES', 0)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        tm.STORE_SPEC = None
+        self.tmpdir.cleanup()
+
+    def run_cli(self, argv):
+        buf = StringIO()
+        with redirect_stdout(buf):
+            tm.main(argv)
+        return buf.getvalue()
+
+    def test_output_matches_the_serial_path(self):
+        for filters in ([], ['--overdue'], ['--due-in', '10']):
+            for sort in ('priority', 'date'):
+                for page in ([], ['--limit', '7', '--offset', '3']):
+                    argv = ['list', '--sort', sort] + filters + page
+                    expected = self.run_cli(argv)
+                    for jobs in ('1', '2'):  # en ligne, puis par le pool de processus
+                        with self.subTest(argv=argv, jobs=jobs):
+                            self.assertEqual(self.run_cli(argv + ['--jobs', jobs]), expected)
+        argv = ['list', '--sort', 'date', '--limit', '40']
+        self.assertEqual(self.run_cli(argv + ['--jobs', '3']), self.run_cli(argv))
+
+    def test_legacy_indented_snapshot_is_rewritten_before_the_split(self):
+        for name in (storage.JOURNAL_SUFFIX, storage.INDEX_SUFFIX):
+            os.remove(self.path + name)
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(make_tasks(29), f, indent=4, ensure_ascii=False)
+        parallel_out = self.run_cli(['list', '--jobs', '2'])  # avant toute migration
+        expected = self.run_cli(['list'])
+        self.assertEqual(len(expected.splitlines()), 29)
+        self.assertEqual(parallel_out, expected)
+
+    def test_small_stores_and_the_daemon_use_the_serial_path(self):
+        expected = self.run_cli(['list'])
+        with mock.patch.object(parallel, 'PARALLEL_MIN_BYTES', 1 << 40), \
+                mock.patch.object(parallel, '_runs', side_effect=AssertionError):
+            self.assertEqual(self.run_cli(['list', '--jobs', '4']), expected)
+        tm.ACTIVE_BACKEND = tm.get_backend()
+        buf = StringIO()
+        try:
+            with mock.patch.object(parallel, '_runs', side_effect=AssertionError), \
+                    redirect_stdout(buf):
+                tm.list_tasks(tm.build_parser().parse_args(['list', '--jobs', '2']))
+        finally:
+            tm.ACTIVE_BACKEND = None
+        self.assertEqual(buf.getvalue(), expected)
+
+    def test_concurrent_writes_force_a_locked_read(self):
+        backend = storage.JournalBackend(self.path)
+        backend.next_id()  # index vérifié avant de compter les verrous
+        versions = iter(range(100))
+        with mock.patch.object(backend, 'version', side_effect=lambda: (next(versions),) * 4), \
+                mock.patch.object(backend, 'lock', wraps=backend.lock) as lock:
+            page = parallel.parallel_page(backend, None, 'priority', limit=3, jobs=1)
+        self.assertEqual(lock.call_count, 1)
+        self.assertEqual([t['id'] for t in page], [5, 10, 15])
+
+    def test_other_stores_are_rejected(self):
+        tm.STORE_SPEC = 'json:' + os.path.join(self.tmpdir.name, 'autre.json')
+        self.assertIn('--jobs nécessite le stockage journal', self.run_cli(['list', '--jobs', '2']))
+
+
+if __name__ == '__main__':
+    unittest.main()
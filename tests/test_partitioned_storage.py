@@ -0,0 +1,131 @@
+import os
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from datetime import date, timedelta
+from unittest import mock
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+SRC_DIR = os.path.join(PROJECT_ROOT, 'src')
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+import task_manager as tm  # noqa: E402
+import storage  # noqa: E402
+
+
+def d(delta_days: int) -> str:
+    return (date.today() + timedelta(days=delta_days)).strftime("%Y-%m-%d")
+
+
+def make_tasks(n):
+    # Échéances étalées sur un an en arrière et quelques jours en avant.
+    return [{'id': i, 'title': f'Tâche {i}', 'desc': '', 'priority': 1 + (i * 3) % 5,
+             'due': d(5 - (i * 37) % 400) if i % 7 else 'pas-une-date', 'created': ''}
+            for i in range(1, n + 1)]
+
+
+class TestPartitionedStorage(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, 'tasks.d')
+        tm.TASKS_FILE = os.path.join(self.tmpdir.name, 'tasks.json')
+
+    def tearDown(self):
+        tm.STORE_SPEC = None
+        self.tmpdir.cleanup()
+
+    def run_cli(self, argv):
+        buf = StringIO()
+        with redirect_stdout(buf):
+            tm.main(argv)
+        return buf.getvalue()
+
+    def opened(self, backend, func):
+        """Retourne les partitions lues pendant *func*."""
+        with mock.patch.object(backend, '_read_partition',
+                               wraps=backend._read_partition) as read:  # pylint: disable=protected-access
+            func()
+        return sorted({call.args[0] for call in read.call_args_list})
+
+    def test_one_file_per_due_month(self):
+        backend = storage.PartitionedBackend(self.path)
+        backend.save([{'id': 1, 'due': '2024-01-31'}, {'id': 2, 'due': '2024-03-01'},
+                      {'id': 3, 'due': '2024-01-02'}, {'id': 4, 'due': 'bientôt'}])
+        self.assertEqual(sorted(os.listdir(self.path)),
+                         ['2024-01.json', '2024-03.json', 'ids.bin', 'manifest.json',
+                          'sans-echeance.json'])
+        self.assertEqual([t['id'] for t in backend.load()], [1, 2, 3, 4])
+        self.assertEqual(backend.get_many([4, 3, 9]), [{'id': 4, 'due': 'bientôt'},
+                                                       {'id': 3, 'due': '2024-01-02'}])
+        self.assertEqual(storage.detect_format(self.path), 'partitioned')
+
+    def test_edits_move_tasks_between_partitions(self):
+        backend = storage.PartitionedBackend(self.path)
+        backend.save([{'id': 1, 'due': '2024-01-31'}, {'id': 2, 'due': '2024-03-01'}])
+        touched = self.opened(backend, lambda: backend.commit(
+            puts=[{'id': 1, 'due': '2024-03-15'}, {'id': 3, 'due': '2024-05-01'}]))
+        self.assertEqual(touched, ['2024-01', '2024-03'])
+        self.assertEqual(sorted(os.listdir(self.path)),
+                         ['2024-03.json', '2024-05.json', 'ids.bin', 'manifest.json'])
+        reopened = storage.PartitionedBackend(self.path)
+        self.assertEqual(reopened.get(1), {'id': 1, 'due': '2024-03-15'})
+        self.assertEqual(reopened.next_id(), 4)
+
+        reopened.commit(deletes=[3, 1])
+        self.assertIsNone(reopened.get(3))
+        self.assertEqual(reopened.load(), [{'id': 2, 'due': '2024-03-01'}])
+        self.assertEqual(reopened.next_id(), 4)  # les IDs ne sont pas réutilisés
+
+    def test_reminder_queries_only_open_matching_months(self):
+        backend = storage.PartitionedBackend(self.path)
+        backend.save(make_tasks(400))
+        months = {storage.month_key(date.today().toordinal() + i) for i in range(4)}
+        touched = self.opened(backend, lambda: backend.query(False, 3, 'date', date.today()))
+        self.assertEqual(touched, sorted(months))
+        point = self.opened(backend, lambda: backend.get(10))
+        self.assertEqual(len(point), 1)
+
+    def test_queries_match_the_json_path(self):
+        storage.PartitionedBackend(self.path).save(make_tasks(80))
+        storage.JsonBackend(tm.TASKS_FILE).save(make_tasks(80))
+        for filters in ([], ['--overdue'], ['--due-in', '20']):
+            for extra in ([], ['--limit', '5', '--offset', '2']):
+                for sort in ('priority', 'date'):
+                    argv = ['list', '--sort', sort] + filters + extra
+                    tm.STORE_SPEC = None
+                    expected = self.run_cli(argv)
+                    tm.STORE_SPEC = 'partitioned:' + self.path
+                    with self.subTest(argv=argv):
+                        self.assertEqual(self.run_cli(argv), expected)
+
+    def test_stale_locator_is_rebuilt(self):
+        backend = storage.PartitionedBackend(self.path)
+        backend.save(make_tasks(20))
+        os.remove(backend.locator_path)
+        self.assertEqual(storage.PartitionedBackend(self.path).get(5)['id'], 5)
+        with open(backend.locator_path, 'r+b') as f:  # génération d'une autre écriture
+            f.write(b'TASKLOC1' + (99).to_bytes(8, 'little'))
+        self.assertEqual(storage.PartitionedBackend(self.path).get(8)['id'], 8)
+
+    def test_cli_round_trip_and_convert(self):
+        tm.STORE_SPEC = 'partitioned:' + self.path
+        self.run_cli(['add', '--title', 'Rapport', '--desc', '', '--priority', '2',
+                      '--due', d(1)])
+        self.run_cli(['edit', '--id', '1', '--due', d(-400)])
+        self.assertIn('Rapport', self.run_cli(['list', '--overdue']))
+        self.assertIn('Aucune tâche', self.run_cli(['list', '--due-in', '3']))
+        self.assertIn('Rapport', self.run_cli(['search', 'rapport']))
+        tm.STORE_SPEC = None
+        copy = os.path.join(self.tmpdir.name, 'copie.json')
+        self.run_cli(['convert', self.path, copy, '--to', 'json'])
+        self.run_cli(['convert', copy, os.path.join(self.tmpdir.name, 'copie.d'),
+                      '--to', 'partitioned'])
+        again = storage.PartitionedBackend(os.path.join(self.tmpdir.name, 'copie.d'))
+        self.assertEqual(again.load(), storage.PartitionedBackend(self.path).load())
+
+
+if __name__ == '__main__':
+    unittest.main()
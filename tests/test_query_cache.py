@@ -0,0 +1,158 @@
+import os
+import sys
+import json
+import tempfile
+import threading
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from datetime import date, timedelta
+from unittest import mock
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+SRC_DIR = os.path.join(PROJECT_ROOT, 'src')
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+import task_manager as tm  # noqa: E402
+import querycache  # noqa: E402
+import storage  # noqa: E402
+
+
+def d(delta_days: int) -> str:
+    return (date.today() + timedelta(days=delta_days)).strftime("%Y-%m-%d")
+
+
+class Tomorrow(date):
+    @classmethod
+    def today(cls):
+        return date.today() + timedelta(days=1)
+
+
+class TestQueryCache(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, 'tasks.json')
+        tm.TASKS_FILE = self.path
+        tm.save_tasks([{'id': i, 'title': f'T{i}', 'desc': '', 'priority': 1 + i % 5,
+                        'due': d(i - 3), 'created': ''} for i in range(1, 9)])
+        tm.QUERY_CACHE = True
+        self.cache_dir = self.path + querycache.CACHE_SUFFIX
+
+    def tearDown(self):
+        tm.QUERY_CACHE = False
+        self.tmpdir.cleanup()
+
+    def run_cli(self, argv):
+        buf = StringIO()
+        with redirect_stdout(buf):
+            tm.main(argv)
+        return buf.getvalue()
+
+    def stats(self):
+        return querycache.QueryCache(tm.get_backend()).stats()
+
+    def test_repeated_query_is_served_from_cache(self):
+        first = self.run_cli(['list', '--due-in', '3'])
+        with mock.patch.object(tm, 'page_tasks', side_effect=AssertionError):
+            self.assertEqual(self.run_cli(['list', '--due-in', '3']), first)
+        self.assertEqual(self.run_cli(['list', '--due-in', '3', '--sort', 'priority']), first)
+        self.assertNotEqual(self.run_cli(['list', '--overdue']), first)
+        stats = self.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['entries']), (2, 2, 2))
+
+    def test_writes_and_day_change_invalidate(self):
+        self.run_cli(['list'])
+        self.run_cli(['add', '--title', 'Nouvelle', '--desc', '', '--priority', '1',
+                      '--due', d(0)])
+        self.assertEqual(self.stats()['entries'], 0)  # vidé par l'écriture
+        self.assertIn('Nouvelle', self.run_cli(['list']))
+
+        with open(self.path, 'w', encoding='utf-8') as f:  # écriture externe
+            json.dump([{'id': 1, 'title': 'Externe', 'desc': '', 'priority': 1,
+                        'due': d(0), 'created': ''}], f)
+        self.assertIn('Externe', self.run_cli(['list']))
+
+        today = self.run_cli(['list'])  # seul succès : rien n'a changé
+        with mock.patch.object(tm, 'date', Tomorrow):
+            self.assertNotEqual(self.run_cli(['list']), today)  # indicateurs du lendemain
+        self.assertEqual(self.stats()['hits'], 1)
+
+    def test_least_recently_used_entries_are_evicted(self):
+        cache = querycache.QueryCache(storage.JsonBackend(self.path))
+        cache.put('a', 'x' * 100)
+        cache.put('b', 'y' * 100)
+        size = os.path.getsize(os.path.join(self.cache_dir, 'a.txt'))
+        os.utime(os.path.join(self.cache_dir, 'a.txt'), ns=(3, 3))  # lue récemment
+        os.utime(os.path.join(self.cache_dir, 'b.txt'), ns=(1, 1))
+        with mock.patch.object(querycache, 'CACHE_MAX_BYTES', 2 * size):
+            cache.put('c', 'z' * 100)
+        self.assertEqual(sorted(os.listdir(self.cache_dir)), ['a.txt', 'c.txt'])
+        self.assertEqual(cache.get('a'), 'x' * 100)
+        with mock.patch.object(querycache, 'CACHE_MAX_ENTRY', 10):
+            cache.put('d', 'trop long')
+        self.assertIsNone(cache.get('d'))
+
+    def test_where_expression_is_not_a_file_name(self):
+        for where in ('title~"a/b"', 'title~"' + 'a' * 300 + '"', 'title~"T1"'):
+            with self.subTest(where=where[:20]):
+                first = self.run_cli(['list', '--where', where])
+                with mock.patch.object(tm, 'page_tasks', side_effect=AssertionError):
+                    self.assertEqual(self.run_cli(['list', '--where', where]), first)
+        self.assertIn('[1] T1', first)
+        key = querycache.QueryCache.key('list', d(0), where='title~"a/b"')
+        self.assertRegex(key, r'^[0-9a-f]{40}$')
+
+    def test_unusable_cache_falls_back_to_listing(self):
+        tm.QUERY_CACHE = False
+        expected = self.run_cli(['list'])
+        tm.QUERY_CACHE = True
+        with mock.patch.object(querycache.QueryCache, 'get', side_effect=PermissionError), \
+                mock.patch.object(querycache.QueryCache, 'put', side_effect=OSError):
+            self.assertEqual(self.run_cli(['list']), expected)
+
+    def test_stats_and_clear_commands(self):
+        self.run_cli(['list'])
+        self.run_cli(['list'])
+        out = self.run_cli(['cache', 'stats'])
+        self.assertIn('Succès : 1  Échecs : 1  Taux de succès : 50 %', out)
+        self.assertIn('Entrées : 1', out)
+        self.assertIn('Cache vidé (1 entrée(s))', self.run_cli(['cache', 'clear']))
+        self.assertEqual(self.stats()['hits'] + self.stats()['misses'], 0)
+
+    def test_counters_keep_a_fixed_size(self):
+        cache = querycache.QueryCache(tm.get_backend())
+        cache.put('k', 'x' * 100)
+
+        def lookups():
+            for _ in range(100):
+                cache.get('k')
+                cache.get('absente')
+
+        threads = [threading.Thread(target=lookups) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        stats = cache.stats()
+        self.assertEqual((stats['hits'], stats['misses']), (400, 400))
+        counters = os.path.join(self.cache_dir, querycache.COUNTERS_FILE)
+        self.assertEqual(os.path.getsize(counters), querycache.COUNTERS.size)
+        entry = os.path.join(self.cache_dir, 'k' + querycache.ENTRY_SUFFIX)
+        self.assertEqual(stats['bytes'], os.path.getsize(entry))  # compteurs hors borne
+        with mock.patch.object(querycache, 'CACHE_MAX_BYTES', 0):
+            cache.put('k2', 'y')
+        self.assertTrue(os.path.exists(counters))
+
+    def test_disabled_by_default(self):
+        tm.QUERY_CACHE = False
+        self.run_cli(['list'])
+        self.assertFalse(os.path.exists(self.cache_dir))
+        self.assertIn('inactif', self.run_cli(['cache', 'stats']))
+        self.assertIn('n/a', self.run_cli(['cache', 'stats']))
+        self.run_cli(['--cache', 'list'])
+        self.assertTrue(os.path.isdir(self.cache_dir))
+
+
+if __name__ == '__main__':
+    unittest.main()
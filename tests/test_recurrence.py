@@ -0,0 +1,224 @@
+import os
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from datetime import date, timedelta
+from unittest import mock
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+SRC_DIR = os.path.join(PROJECT_ROOT, 'src')
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+import task_manager as tm  # noqa: E402
+import daemon  # noqa: E402
+import recurrence  # noqa: E402
+from parallel import rank_key  # noqa: E402
+
+STORES = ('json', 'journal', 'sqlite', 'binary', 'partitioned')
+
+
+def d(delta_days: int) -> str:
+    return (date.today() + timedelta(days=delta_days)).strftime("%Y-%m-%d")
+
+
+def o(text: str) -> int:
+    return date.fromisoformat(text).toordinal()
+
+
+def make_tasks(n):
+    tasks = [{'id': i, 'title': f'Tâche {i}', 'desc': '', 'priority': 1 + i % 5,
+              'due': d(i % 40 - 20), 'created': ''} for i in range(1, n + 1)]
+    for task, rule in zip(tasks[::7], ('daily', 'weekly', 'monthly', '3d', '10d')):
+        task['repeat'] = rule
+    return tasks
+
+
+class TestRules(unittest.TestCase):
+    def test_parse_rule(self):
+        self.assertEqual([recurrence.parse_rule(r) for r in ('Daily', '7d', '14d', 'monthly')],
+                         ['daily', 'weekly', '14d', 'monthly'])
+        self.assertEqual(recurrence.parse_rule('none'), '')
+        for bad in ('yearly', '0d', 'd', '-2d', ''):
+            with self.subTest(rule=bad), self.assertRaises(ValueError):
+                recurrence.parse_rule(bad)
+
+    def test_occurrences_stay_inside_the_window(self):
+        def dates(first, rule, low, high):
+            return [date.fromordinal(x).isoformat()
+                    for x in recurrence.occurrences(o(first), rule, o(low), o(high))]
+        self.assertEqual(dates('2025-01-01', 'weekly', '2025-03-01', '2025-03-20'),
+                         ['2025-03-05', '2025-03-12', '2025-03-19'])
+        self.assertEqual(dates('2025-01-10', '3d', '2024-01-01', '2025-01-16'),
+                         ['2025-01-10', '2025-01-13', '2025-01-16'])
+        self.assertEqual(dates('2025-01-31', 'monthly', '2025-02-01', '2025-05-31'),
+                         ['2025-02-28', '2025-03-31', '2025-04-30', '2025-05-31'])
+        self.assertEqual(dates('2024-01-31', 'monthly', '2024-02-01', '2024-02-29'),
+                         ['2024-02-29'])
+        self.assertEqual(dates('9999-12-31', 'monthly', '2025-01-01', '9999-12-31'),
+                         ['9999-12-31'])
+        # Fenêtre immense : le générateur saute à la fenêtre et reste paresseux.
+        lazy = recurrence.occurrences(o('2000-01-01'), 'daily', o('2030-01-01'),
+                                      date.max.toordinal())
+        self.assertEqual(next(lazy), o('2030-01-01'))
+
+
+class TestRecurringTasks(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.tasks = make_tasks(60)
+
+    def tearDown(self):
+        tm.STORE_SPEC = None
+        self.tmpdir.cleanup()
+
+    def use(self, kind):
+        tm.STORE_SPEC = f'{kind}:' + os.path.join(self.tmpdir.name, kind)
+        backend = tm.get_backend()
+        backend.save(self.tasks)
+        return backend
+
+    def run_cli(self, argv):
+        buf = StringIO()
+        with redirect_stdout(buf):
+            tm.main(argv)
+        return buf.getvalue()
+
+    def expected(self, low, high, sort, limit=None, offset=0, keep=lambda t: True):
+        """Référence : occurrences à venir des séries, comme si chacune était une ligne."""
+        rows = []
+        for task in self.tasks:
+            if recurrence.is_recurring(task):
+                rows.extend(recurrence.expand(task, max(low, date.today().toordinal()), high))
+            elif low <= o(task['due']) <= high:
+                rows.append(task)
+        rows = sorted(filter(keep, rows), key=rank_key(sort))
+        rows = rows[offset:None if limit is None else offset + limit]
+        buf = StringIO()
+        with redirect_stdout(buf):
+            tm.print_tasks(rows)
+        return buf.getvalue()
+
+    def test_windows_list_occurrences_like_separate_rows(self):
+        today = date.today().toordinal()
+        cases = [
+            (['--due-in', '30'], (today, today + 30)),
+            (['--overdue'], (1, today - 1)),
+        ]
+        for kind in STORES:
+            self.use(kind)
+            for flags, (low, high) in cases:
+                for sort in ('priority', 'date'):
+                    for page in ([], ['--limit', '7', '--offset', '5']):
+                        with self.subTest(kind=kind, flags=flags, sort=sort, page=page):
+                            limit, offset = (7, 5) if page else (None, 0)
+                            self.assertEqual(
+                                self.run_cli(['list', '--sort', sort] + flags + page),
+                                self.expected(low, high, sort, limit, offset))
+            with self.subTest(kind=kind, where=True):
+                out = self.run_cli(['list', '--sort', 'date', '--where',
+                                    'priority<=2 and due<=today+45', '--limit', '10'])
+                self.assertEqual(out, self.expected(1, today + 45, 'date', 10,
+                                                    keep=lambda t: t['priority'] <= 2))
+
+    def test_unbounded_list_shows_each_series_once(self):
+        self.use('journal')
+        out = self.run_cli(['list'])
+        self.assertEqual(len(out.splitlines()), 60)
+        self.assertIn('[1] Tâche 1 (Priorité: 2 – Due: ' + d(0) + ' – ↻ daily) ⏳ soon', out)
+        explain = self.run_cli(['list', '--due-in', '3', '--explain'])
+        self.assertIn('  Récurrences : 4 série(s) développée(s)', explain)
+        self.assertEqual(self.run_cli(['list', '--where', 'repeat=monthly']).count('↻'), 1)
+
+    def test_missed_occurrences_are_never_overdue(self):
+        # Série hebdomadaire commencée il y a 50 jours : 8 occurrences manquées.
+        self.tasks = [{'id': 1, 'title': 'Rapport', 'desc': '', 'priority': 1,
+                       'due': d(-50), 'created': '', 'repeat': 'weekly'},
+                      {'id': 2, 'title': 'Facture', 'desc': '', 'priority': 2,
+                       'due': d(-2), 'created': ''}]
+        for kind in STORES:
+            self.use(kind)
+            with self.subTest(kind=kind):
+                self.assertEqual(self.run_cli(['list', '--overdue']),
+                                 '[2] Facture (Priorité: 2 – Due: ' + d(-2) + ') ⚠️ OVERDUE\n')
+                self.assertEqual(self.run_cli(['list']).splitlines(), [
+                    '[1] Rapport (Priorité: 1 – Due: ' + d(6) + ' – ↻ weekly)',
+                    '[2] Facture (Priorité: 2 – Due: ' + d(-2) + ') ⚠️ OVERDUE'])
+                self.assertEqual(self.run_cli(['list', '--where', 'due>=today']).count(d(6)), 1)
+                self.assertIn('Récurrences : 1 série(s) sans occurrence à venir',
+                              self.run_cli(['list', '--overdue', '--where', 'priority<=5',
+                                            '--explain']))
+                self.assertEqual(self.run_cli(['list', '--format', 'csv']).splitlines()[1:],
+                                 ['1,Rapport,,1,' + d(6) + ',,weekly,',
+                                  '2,Facture,,2,' + d(-2) + ',,,overdue'])
+                self.assertIn('"due": "' + d(6) + '", "created": "", "repeat": "weekly", '
+                              '"status": ""',
+                              self.run_cli(['search', 'rapport', '--format', 'jsonl']))
+                self.assertEqual(tm.TaskStore(tm.get_backend()).stats()['overdue'], 1)
+                self.run_cli(['delete', '--overdue'])
+                self.assertEqual([t['id'] for t in tm.get_backend().load()], [1])
+
+    def test_series_are_found_through_the_index(self):
+        backend = self.use('journal')
+        self.run_cli(['list', '--due-in', '3'])  # construit les index
+        index = next(o for o in backend.observers if isinstance(o, recurrence.RecurrenceIndex))
+        self.assertEqual(index.lookup(date.max.toordinal()), [1, 8, 15, 22, 29])
+        self.run_cli(['add', '--title', 'Plantes', '--desc', '', '--priority', '1',
+                      '--due', d(2), '--repeat', '2d'])
+        self.run_cli(['edit', '--id', '8', '--repeat', 'none'])
+        self.run_cli(['delete', '--id', '15'])
+        with mock.patch.object(tm.JournalBackend, 'iter_tasks', side_effect=AssertionError):
+            out = self.run_cli(['list', '--due-in', '6', '--sort', 'date'])
+        self.assertEqual(out.count('Plantes'), 3)
+        self.assertNotIn('↻ weekly', out)
+        self.assertEqual(index.lookup(date.max.toordinal()), [1, 22, 29, 61])
+        self.assertNotIn('repeat', tm.get_backend().get(8))
+
+    def test_read_only_store_is_listed_without_indexes(self):
+        backend = self.use('json')
+        expected = self.run_cli(['list', '--due-in', '3'])
+        for observer in backend.observers:
+            if os.path.exists(observer.path):
+                os.remove(observer.path)
+        with mock.patch('storage.file_lock', side_effect=PermissionError(13, 'lecture seule')):
+            self.assertEqual(self.run_cli(['list', '--due-in', '3']), expected)
+            self.assertIn('Tâches : 60', self.run_cli(['stats']))
+        self.assertFalse(os.path.exists(backend.path + recurrence.REPEAT_SUFFIX))
+
+    def test_add_and_edit_validate_the_rule(self):
+        self.use('json')
+        self.assertIn('Règle de répétition invalide',
+                      self.run_cli(['add', '--title', 'x', '--desc', '', '--priority', '1',
+                                    '--due', d(0), '--repeat', 'yearly']))
+        self.assertIn('Règle de répétition invalide',
+                      self.run_cli(['edit', '--id', '2', '--repeat', '0d']))
+        self.run_cli(['edit', '--ids', '2,3', '--repeat', 'weekly'])
+        self.assertEqual([t.get('repeat') for t in tm.get_backend().get_many([2, 3])],
+                         ['weekly', 'weekly'])
+
+    def test_transaction_and_daemon_views_expand_series(self):
+        for kind in ('sqlite', 'memory'):
+            with self.subTest(kind=kind):
+                backend = self.use('sqlite')
+                if kind == 'memory':
+                    backend = daemon.CachedBackend(backend)
+                store = tm.TaskStore(backend)
+                with store.transaction():
+                    new = store.add('Arroser', '', 1, d(-1), repeat='daily')
+                    rows = [t for t in store.list('date', due_in=2) if t['id'] == new['id']]
+                self.assertEqual([t['due'] for t in rows], [d(0), d(1), d(2)])
+                self.assertEqual([t['due'] for t in store.list('date', due_in=2)
+                                  if t['id'] == new['id']], [d(0), d(1), d(2)])
+
+    def test_archive_keeps_series(self):
+        self.use('json')
+        self.run_cli(['archive', '--older-than', '5'])
+        hot = {t['id'] for t in tm.get_backend().load()}
+        self.assertTrue({1, 8, 15, 22, 29} <= hot)
+        self.assertNotIn(2, hot)
+
+
+if __name__ == '__main__':
+    unittest.main()
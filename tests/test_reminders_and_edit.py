@@ -1,5 +1,6 @@
 import os
 import sys
+import glob
 import json
 import tempfile
 import unittest
@@ -21,10 +22,12 @@ class TestRemindersAndEdit(unittest.TestCase):
         tm.TASKS_FILE = self.tmpfile.name
 
     def tearDown(self):
-        try:
-            os.remove(self.tmpfile.name)
-        except OSError:
-            pass
+        # Le fichier et ses index (.due, .due.delta)
+        for path in glob.glob(self.tmpfile.name + '*'):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
 
     def d(self, delta_days: int) -> str:
         return (date.today() + timedelta(days=delta_days)).strftime("%Y-%m-%d")
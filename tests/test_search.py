@@ -0,0 +1,161 @@
+import os
+import sys
+import json
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from datetime import date, timedelta
+from unittest import mock
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+SRC_DIR = os.path.join(PROJECT_ROOT, 'src')
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+import task_manager as tm  # noqa: E402
+import indexes  # noqa: E402
+import storage  # noqa: E402
+
+
+def d(delta_days: int) -> str:
+    return (date.today() + timedelta(days=delta_days)).strftime("%Y-%m-%d")
+
+
+def task(task_id, title, desc='', priority=3, due=None):
+    return {'id': task_id, 'title': title, 'desc': desc, 'priority': priority,
+            'due': due or d(10), 'created': ''}
+
+
+class TestTokenize(unittest.TestCase):
+    def test_case_accents_and_ligatures_are_folded(self):
+        self.assertEqual(indexes.tokenize("Réunion d'ÉQUIPE : œuvre naïve, Noël 2030"),
+                         ['reunion', 'd', 'equipe', 'oeuvre', 'naive', 'noel', '2030'])
+        self.assertEqual(indexes.tokenize("  -- "), [])
+
+    def test_intersect_sorted_postings(self):
+        self.assertEqual(indexes.intersect([[1, 3, 5, 7, 9], [3, 4, 9], [2, 3, 9, 10]]), [3, 9])
+        self.assertEqual(indexes.intersect([[1, 2], [3]]), [])
+        self.assertEqual(indexes.intersect([[4, 8]]), [4, 8])
+
+
+class TestSearchIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, 'tasks.json')
+        tm.TASKS_FILE = self.path
+
+    def tearDown(self):
+        tm.USE_JOURNAL = False
+        self.tmpdir.cleanup()
+
+    def backend(self, cls=storage.JournalBackend):
+        backend = cls(self.path)
+        index = indexes.SearchIndex(backend)
+        backend.observers.append(index)
+        return backend, index
+
+    def test_multi_term_lookup(self):
+        backend, index = self.backend()
+        backend.save([task(1, 'Réunion budget', 'avec le client'), task(2, 'Budget annuel'),
+                      task(3, 'Appeler le client', 'réunion de suivi')])
+        self.assertEqual(index.lookup(['budget']), [1, 2])
+        self.assertEqual(index.lookup(['reunion', 'client']), [1, 3])
+        self.assertEqual(index.lookup(['reunion', 'annuel']), [])
+        self.assertEqual(index.lookup(['inconnu']), [])
+
+    def test_writes_update_the_index_incrementally(self):
+        backend, index = self.backend()
+        backend.save([task(1, 'Rapport mensuel'), task(2, 'Facture client')])
+        index.lookup(['rapport'])  # index construit et à jour
+
+        backend.commit(puts=[task(2, 'Rapport client'), task(3, 'Rapport annuel')], deletes=[1])
+        self.assertTrue(index.is_fresh())
+        self.assertTrue(os.path.exists(index.delta_path))
+        with mock.patch.object(index, 'rebuild', side_effect=AssertionError):
+            self.assertEqual(index.lookup(['rapport']), [2, 3])
+            self.assertEqual(index.lookup(['facture']), [])
+
+    def test_delta_is_folded_when_large(self):
+        backend, index = self.backend()
+        backend.save([task(1, 'Rapport')])
+        index.lookup(['rapport'])
+        with mock.patch.object(indexes, 'DELTA_MIN_FOLD', 0):
+            backend.commit(puts=[task(2, 'Rapport annuel')], deletes=[1])
+        self.assertFalse(os.path.exists(index.delta_path))
+        self.assertEqual(index.lookup(['rapport']), [2])
+
+    def test_stale_or_missing_index_is_rebuilt(self):
+        backend, index = self.backend(storage.JsonBackend)
+        backend.save([task(1, 'Courriel')])
+        self.assertFalse(os.path.exists(index.path))  # créé à la première recherche
+        self.assertEqual(index.lookup(['courriel']), [1])
+
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump([task(1, 'Courriel'), task(2, 'Courriel urgent')], f)  # écriture externe
+        _, index = self.backend(storage.JsonBackend)
+        self.assertFalse(index.is_fresh())
+        self.assertEqual(index.lookup(['courriel']), [1, 2])
+
+    def test_read_only_store_falls_back_to_a_scan(self):
+        backend, index = self.backend(storage.JsonBackend)
+        backend.save([task(2, 'Courriel urgent'), task(1, 'Courriel'), task(3, 'Appel')])
+        with mock.patch.object(storage, 'file_lock', side_effect=PermissionError(13, 'ro')):
+            self.assertEqual(index.lookup(['courriel']), [1, 2])
+        self.assertFalse(os.path.exists(index.path))
+
+
+class TestSearchCommand(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, 'tasks.json')
+        tm.STORE_SPEC = 'journal:' + self.path
+        tm.get_backend().save([
+            task(1, 'Réunion équipe', 'Préparer le planning', 2, d(-3)),
+            task(2, 'Planning de livraison', '', 1, d(1)),
+            task(3, 'Revue du planning', 'avec l’équipe', 4, d(2)),
+            task(4, 'Sauvegarde', '', 3, d(5)),
+        ])
+
+    def tearDown(self):
+        tm.STORE_SPEC = None
+        self.tmpdir.cleanup()
+
+    def run_cli(self, argv):
+        buf = StringIO()
+        with redirect_stdout(buf):
+            tm.main(argv)
+        return buf.getvalue()
+
+    def ids(self, argv):
+        return [line.split()[0] for line in self.run_cli(argv).splitlines()]
+
+    def test_search_composes_with_filters_sort_and_pagination(self):
+        self.assertEqual(self.ids(['search', 'planning']), ['[2]', '[1]', '[3]'])
+        self.assertEqual(self.ids(['search', 'PLANNING', 'Equipe', '--sort', 'date']),
+                         ['[1]', '[3]'])
+        self.assertEqual(self.ids(['search', 'planning', '--due-in', '3']), ['[2]', '[3]'])
+        self.assertEqual(self.ids(['search', 'planning', '--overdue']), ['[1]'])
+        self.assertEqual(self.ids(['search', 'planning', '--limit', '1', '--offset', '1']),
+                         ['[1]'])
+        self.assertIn("Aucune tâche", self.run_cli(['search', 'introuvable']))
+        self.assertIn("Recherche vide", self.run_cli(['search', '--', '...']))
+
+    def test_cli_writes_keep_the_index_current(self):
+        self.run_cli(['search', 'planning'])  # construit l'index
+        self.run_cli(['add', '--title', 'Planning été', '--desc', '', '--priority', '5',
+                      '--due', d(20)])
+        self.run_cli(['edit', '--id', '2', '--title', 'Livraison'])
+        self.run_cli(['delete', '--id', '3'])
+        with mock.patch.object(indexes.SearchIndex, 'rebuild', side_effect=AssertionError):
+            self.assertEqual(self.ids(['search', 'planning']), ['[1]', '[5]'])
+            self.assertEqual(self.ids(['search', 'ete']), ['[5]'])
+
+    def test_without_index_tasks_are_scanned(self):
+        backend = tm.get_backend()
+        backend.observers.clear()
+        self.assertEqual([t['id'] for t in tm.search_backend(backend, ['equipe'])], [1, 3])
+
+
+if __name__ == '__main__':
+    unittest.main()
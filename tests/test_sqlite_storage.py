@@ -0,0 +1,109 @@
+import os
+import sys
+import sqlite3
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from datetime import date, timedelta
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+SRC_DIR = os.path.join(PROJECT_ROOT, 'src')
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+import task_manager as tm  # noqa: E402
+import storage  # noqa: E402
+
+
+class TestSqliteStorage(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db = os.path.join(self.tmpdir.name, 'tasks.db')
+
+    def tearDown(self):
+        tm.STORE_SPEC = None
+        self.tmpdir.cleanup()
+
+    def d(self, delta_days: int) -> str:
+        return (date.today() + timedelta(days=delta_days)).strftime("%Y-%m-%d")
+
+    def run_cli(self, argv):
+        saved_argv = sys.argv
+        sys.argv = ['prog', '--store', 'sqlite:' + self.db] + argv
+        buf = StringIO()
+        try:
+            with redirect_stdout(buf):
+                tm.main()
+        finally:
+            sys.argv = saved_argv
+        return buf.getvalue()
+
+    def add(self, title, priority, due):
+        return self.run_cli(['add', '--title', title, '--desc', '', '--priority',
+                             str(priority), '--due', due])
+
+    def test_cli_crud_on_sqlite(self):
+        self.assertIn("(ID 1)", self.add('A', 3, self.d(5)))
+        self.assertIn("(ID 2)", self.add('B', 1, self.d(1)))
+
+        self.assertIn("mise à jour", self.run_cli(['edit', '--id', '1', '--title', 'A2']))
+        self.assertIn("Tâche 2 supprimée", self.run_cli(['delete', '--id', '2']))
+        self.assertIn("Aucune tâche trouvée", self.run_cli(['delete', '--id', '2']))
+
+        tasks = storage.SqliteBackend(self.db).load()
+        self.assertEqual([(t['id'], t['title']) for t in tasks], [(1, 'A2')])
+
+    def test_reminder_filters_and_sort_are_pushed_to_sql(self):
+        self.add('old', 2, self.d(-3))
+        self.add('soon', 3, self.d(2))
+        self.add('urgent', 1, self.d(1))
+        self.add('far', 1, self.d(30))
+
+        out = self.run_cli(['list', '--overdue'])
+        self.assertIn("old", out)
+        self.assertNotIn("soon", out)
+
+        lines = self.run_cli(['list', '--due-in', '3', '--sort', 'date']).splitlines()
+        self.assertEqual([line.split()[1] for line in lines], ['urgent', 'soon'])
+
+        lines = self.run_cli(['list', '--sort', 'priority']).splitlines()
+        self.assertEqual([line.split()[0] for line in lines], ['[3]', '[4]', '[1]', '[2]'])
+
+    def test_due_filter_uses_index(self):
+        backend = storage.SqliteBackend(self.db)
+        backend.commit(puts=[{'id': 1, 'title': 'x', 'desc': '', 'priority': 1,
+                              'due': self.d(0), 'created': '', 'tags': ['a']}])
+        self.assertEqual(backend.get(1)['tags'], ['a'])  # champs hors colonnes conservés
+        with sqlite3.connect(self.db) as conn:
+            indexes = {row[1] for row in conn.execute("PRAGMA index_list(tasks)")}
+            plan = " ".join(str(row) for row in conn.execute(
+                "EXPLAIN QUERY PLAN SELECT * FROM tasks WHERE due BETWEEN '2025-01-01' AND '2025-01-04'"))
+        conn.close()
+        self.assertTrue({'idx_tasks_due', 'idx_tasks_priority'} <= indexes)
+        self.assertIn('idx_tasks_due', plan)
+
+    def test_deleted_ids_are_not_reused(self):
+        self.add('A', 1, self.d(0))
+        self.add('B', 1, self.d(0))
+        self.run_cli(['delete', '--id', '2'])
+        self.assertIn("(ID 3)", self.add('C', 1, self.d(0)))
+        backend = storage.SqliteBackend(self.db)
+        backend.save([{'id': 1, 'title': 'A', 'desc': '', 'priority': 1, 'due': '', 'created': ''}])
+        self.assertEqual(backend.next_id(), 4)
+        with sqlite3.connect(self.db) as conn:  # base créée avant la table meta
+            conn.execute("DROP TABLE meta")
+        conn.close()
+        self.assertEqual(storage.SqliteBackend(self.db).next_id(), 2)
+        self.assertEqual(storage.JsonBackend(os.path.join(self.tmpdir.name, 'x.json')).next_id(), 1)
+
+    def test_store_spec_from_environment_and_unknown_type(self):
+        tm.STORE_SPEC = 'sqlite:' + self.db
+        self.assertIsInstance(tm.get_backend(), storage.SqliteBackend)
+        tm.STORE_SPEC = 'nope:x'
+        with self.assertRaises(ValueError):
+            tm.get_backend()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+import os
+import sys
+import subprocess
+import tempfile
+import unittest
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+SRC_DIR = os.path.join(PROJECT_ROOT, 'src')
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+import task_manager as tm  # noqa: E402
+
+# Modules que le chemin rapide de ``list`` ne doit pas importer.
+DEFERRED_MODULES = {'argparse', 'sqlite3', 'socket', 'socketserver', 'tempfile', 'csv',
+                    'groupcommit', 'where', 'parallel', 'cProfile'}
+# Modules du projet que ``list`` importe (tout ajout doit être justifié).
+LIST_MODULES = {'formats', 'indexes', 'models', 'recurrence', 'storage', 'watcher'}
+# Modules propres à d'autres commandes ou options, importés à la demande.
+COMMAND_MODULES = {'daemon', 'coldstore', 'stats', 'querycache', 'metrics'}
+PROJECT_MODULES = {name[:-3] for name in os.listdir(SRC_DIR) if name.endswith('.py')}
+
+
+def import_times(args, env):
+    """Retourne ``{module: cumul en µs}`` des imports de premier niveau de *args*."""
+    proc = subprocess.run([sys.executable, '-X', 'importtime'] + args, env=env,
+                          capture_output=True, text=True, check=True)
+    times = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        times[name[1:].rstrip()] = int(cumulative)
+    return times
+
+
+def loaded_modules(args, env):
+    """Retourne les modules de ``sys.modules`` après ``main(args)`` dans un sous-processus."""
+    script = ('import sys, task_manager; task_manager.main(sys.argv[1:]); '
+              'print(*sorted(sys.modules), file=sys.stderr)')
+    proc = subprocess.run([sys.executable, '-c', script] + args, env=env, cwd=SRC_DIR,
+                          capture_output=True, text=True, check=True)
+    return set(proc.stderr.split())
+
+
+class TestFastPath(unittest.TestCase):
+    CASES = [
+        ['list'],
+        ['list', '--due-in', '1'],
+        ['list', '--due-in=3', '--sort', 'date'],
+        ['--journal', 'list', '--overdue', '--limit', '5', '--offset=2'],
+        ['--store', 'json:x.json', 'list', '--sort=priority'],
+        ['--store=sqlite:x.db', '--profile', 'list', '--limit', '0'],
+        ['list', '--format', 'jsonl', '--due-in', '2'],
+    ]
+
+    def test_matches_argparse(self):
+        for argv in self.CASES:
+            with self.subTest(argv=argv):
+                fast = tm.parse_fast(argv)
+                self.assertIsNotNone(fast)
+                self.assertEqual(vars(fast), vars(tm.build_parser().parse_args(argv)))
+
+    def test_unusual_forms_fall_back_to_argparse(self):
+        for argv in (['list', '--help'], ['list', '--due', '1'], ['list', '--limit', '-1'],
+                     ['list', '--overdue', '--due-in', '2'], ['list', '--sort', 'titre'], ['list', '--format=xml'],
+                     ['add', '--title', 'x'], ['list', '--store', 'x'], ['--sto', 'x', 'list'],
+                     ['list', '--due-in', '-2'], []):
+            with self.subTest(argv=argv):
+                self.assertIsNone(tm.parse_fast(argv))
+
+    def test_only_the_invoked_subcommand_is_built(self):
+        self.assertEqual(tm.peek_command(['--store', 'add', '--profile-top=3', 'list']), 'list')
+        self.assertIsNone(tm.peek_command(['--sto', 'add', 'list']))
+        parser = tm.build_parser('add')
+        args = parser.parse_args(['add', '--title', 'T', '--desc', '', '--priority', '1',
+                                  '--due', '2030-01-01'])
+        self.assertIs(args.func, tm.add_task)
+        self.assertIsNone(parser.parse_args(['list']).__dict__.get('func'))
+
+
+class TestImportBudget(unittest.TestCase):
+    def test_hot_list_imports_only_what_it_needs(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            env = dict(os.environ)
+            env.pop('TASKS_STORE', None)
+            args = [os.path.join(SRC_DIR, 'task_manager.py'), '--store',
+                    'json:' + os.path.join(tmp, 'tasks.json'), 'list', '--due-in', '1']
+            modules = {name.strip() for name in import_times(args, env)}
+        self.assertFalse(modules & DEFERRED_MODULES, 'imports non différés')
+        self.assertEqual(modules & PROJECT_MODULES, LIST_MODULES)
+
+    def test_command_modules_are_imported_on_demand(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            env = dict(os.environ)
+            for name in ('TASKS_STORE', 'TASKS_CACHE', tm.METRICS_ENV):
+                env.pop(name, None)
+            store = ['--store', 'json:' + os.path.join(tmp, 'tasks.json')]
+            cases = [([], set()), (['--cache'], {'querycache'}), (['--profile'], {'metrics'})]
+            for flags, expected in cases:
+                with self.subTest(flags=flags):
+                    modules = loaded_modules(store + flags + ['list'], env)
+                    self.assertEqual(modules & COMMAND_MODULES, expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
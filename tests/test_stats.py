@@ -0,0 +1,181 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from datetime import date, timedelta
+from unittest import mock
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+SRC_DIR = os.path.join(PROJECT_ROOT, 'src')
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+import task_manager as tm  # noqa: E402
+import daemon  # noqa: E402
+import recurrence  # noqa: E402
+import stats  # noqa: E402
+
+STORES = ('json', 'journal', 'sqlite', 'binary', 'partitioned')
+
+
+def d(delta_days: int) -> str:
+    return (date.today() + timedelta(days=delta_days)).strftime("%Y-%m-%d")
+
+
+def make_tasks(n):
+    tasks = [{'id': i, 'title': f'Tâche {i}', 'desc': '', 'priority': 1 + i % 5,
+              'due': d(i % 40 - 20), 'created': ''} for i in range(1, n + 1)]
+    for task, rule in zip(tasks[::7], ('daily', 'weekly', 'monthly', '3d', '10d')):
+        task['repeat'] = rule
+    tasks[-1]['due'] = ''
+    return tasks
+
+
+class TestStats(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        tm.STORE_SPEC = None
+        self.tmpdir.cleanup()
+
+    def use(self, kind, tasks):
+        tm.STORE_SPEC = f'{kind}:' + os.path.join(self.tmpdir.name, kind)
+        backend = tm.get_backend()
+        backend.save(tasks)
+        return backend
+
+    def run_cli(self, argv):
+        buf = StringIO()
+        with redirect_stdout(buf):
+            tm.main(argv)
+        return buf.getvalue()
+
+    def summary(self, *flags):
+        return json.loads(self.run_cli(['stats', '--format', 'json'] + list(flags)))
+
+    def test_counters_follow_writes_without_rescanning(self):
+        source = os.path.join(self.tmpdir.name, 'new.jsonl')
+        with open(source, 'w', encoding='utf-8') as f:
+            for i in range(3):
+                f.write(json.dumps({'title': f'Importée {i}', 'desc': '', 'priority': 2,
+                                    'due': d(i)}) + '\n')
+        writes = [
+            ['add', '--title', 'Neuve', '--desc', '', '--priority', '1', '--due', d(1)],
+            ['add', '--title', 'Série', '--desc', '', '--priority', '3', '--due', d(-4),
+             '--repeat', '2d'],
+            ['edit', '--id', '2', '--priority', '5', '--due', d(2)],
+            ['edit', '--id', '8', '--repeat', 'none'],
+            ['edit', '--id', '3', '--repeat', 'weekly'],
+            ['edit', '--ids', '4,5,6', '--priority', '1'],
+            ['delete', '--id', '15'],
+            ['delete', '--overdue', '--max-priority', '2'],
+            ['import', source],
+        ]
+        for kind in STORES:
+            self.use(kind, make_tasks(60))
+            self.run_cli(['stats'])  # construit les compteurs
+            for argv in writes:
+                with self.subTest(kind=kind, argv=argv):
+                    self.run_cli(argv)
+                    index = stats.StatsIndex(tm.get_backend())
+                    self.assertTrue(index.is_fresh())
+                    with mock.patch.object(stats.StatsIndex, 'rebuild',
+                                           side_effect=AssertionError):
+                        counters = index.counters()
+                    self.assertEqual(counters, stats.tally(tm.get_backend().iter_tasks()))
+            with self.subTest(kind=kind, argv='archive'):  # compacte : reconstruit ensuite
+                self.run_cli(['archive', '--older-than', '15'])
+                self.assertEqual(self.summary()['total'], len(tm.get_backend().load()))
+
+    def test_derived_counts_match_list(self):
+        for kind in ('json', 'sqlite'):
+            with self.subTest(kind=kind):
+                store = tm.TaskStore(self.use(kind, make_tasks(60)))
+                summary = self.summary('--days', '12')
+                self.assertEqual(summary['total'], 60)
+                self.assertEqual(summary['recurring'], 5)
+                self.assertEqual(summary['undated'], 1)
+                self.assertEqual(sum(summary['priority'].values()), 60)
+                self.assertEqual(summary['overdue'], len(store.list(overdue=True)))
+                self.assertEqual(summary['soon'], len(store.list(due_in=3)))
+                by_day = {}
+                for task in store.list(due_in=12):
+                    by_day[task['due']] = by_day.get(task['due'], 0) + 1
+                self.assertEqual(summary['due'], [[d(i), by_day.get(d(i), 0)]
+                                                  for i in range(13)])
+
+    def test_today_moves_the_window(self):
+        tasks = make_tasks(60)
+        self.use('journal', tasks)
+        for shift in (-30, 0, 45, 400):
+            today = date.today() + timedelta(days=shift)
+            with self.subTest(shift=shift):
+                summary = self.summary('--today', today.isoformat(), '--days', '5')
+                first = today.toordinal()
+                dues = []
+                for task in tasks:
+                    if recurrence.is_recurring(task):  # jamais en retard
+                        dues.extend(date.fromisoformat(t['due']).toordinal()
+                                    for t in recurrence.expand(task, first, first + 5))
+                    elif task['due']:
+                        dues.append(date.fromisoformat(task['due']).toordinal())
+                self.assertEqual(summary['overdue'], sum(x < first for x in dues))
+                self.assertEqual(summary['soon'], sum(first <= x <= first + 3 for x in dues))
+                self.assertEqual([n for _, n in summary['due']],
+                                 [dues.count(first + i) for i in range(6)])
+
+    def test_recompute_detects_and_fixes_drift(self):
+        backend = self.use('sqlite', make_tasks(30))
+        self.assertIn('Compteurs construits', self.run_cli(['stats', '--recompute']))
+        self.assertIn('conformes', self.run_cli(['stats', '--recompute']))
+        index = stats.StatsIndex(backend)
+        with open(index.path, encoding='utf-8') as f:
+            data = json.load(f)
+        data['counters']['total'] += 3
+        data['counters']['priority']['1'] += 3
+        with open(index.path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        self.assertEqual(self.summary()['total'], 33)
+        self.assertIn('2 compteur(s) corrigé(s)', self.run_cli(['stats', '--recompute']))
+        self.assertEqual(self.summary()['total'], 30)
+
+    def test_table_output(self):
+        self.use('json', make_tasks(60))
+        out = self.run_cli(['stats', '--days', '3'])
+        self.assertIn('Tâches : 60 (dont 5 récurrente(s), 1 sans échéance valide)', out)
+        self.assertIn('Par priorité : 1: 12  2: 12', out)
+        self.assertIn(f'Échéances du {d(0)} au {d(3)} :', out)
+        self.assertEqual(len(out.splitlines()), 8)
+        self.assertIn('█' * tm.STATS_BAR_WIDTH, out)
+        self.assertIn('invalid parse_date value', self.run_stderr(['stats', '--today', 'demain']))
+
+    def run_stderr(self, argv):
+        buf = StringIO()
+        with mock.patch('sys.stderr', buf), self.assertRaises(SystemExit):
+            tm.main(argv)
+        return buf.getvalue()
+
+    def test_transaction_and_daemon_views(self):
+        for kind in ('sqlite', 'memory'):
+            with self.subTest(kind=kind):
+                backend = self.use('sqlite', make_tasks(30))
+                if kind == 'memory':
+                    backend = daemon.CachedBackend(backend)
+                store = tm.TaskStore(backend)
+                before = store.stats()
+                with store.transaction():
+                    store.add('Urgente', '', 1, d(-1))
+                    store.delete(2)
+                    pending = store.stats()
+                self.assertEqual(pending['total'], before['total'])
+                self.assertEqual(pending['priority'][1], before['priority'][1] + 1)
+                self.assertEqual(pending['priority'][3], before['priority'][3] - 1)
+                self.assertEqual(store.stats(), pending)
+
+
+if __name__ == '__main__':
+    unittest.main()
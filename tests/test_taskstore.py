@@ -0,0 +1,132 @@
+import os
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from datetime import date, timedelta
+from unittest import mock
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+SRC_DIR = os.path.join(PROJECT_ROOT, 'src')
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+import task_manager as tm  # noqa: E402
+import storage  # noqa: E402
+
+STORES = ('json', 'journal', 'sqlite', 'binary', 'partitioned')
+
+
+def d(delta_days: int) -> str:
+    return (date.today() + timedelta(days=delta_days)).strftime("%Y-%m-%d")
+
+
+def make_tasks(n):
+    return [{'id': i, 'title': f'Tâche {i}', 'desc': '', 'priority': 1 + i % 5,
+             'due': d(i % 20 - 5), 'created': ''} for i in range(1, n + 1)]
+
+
+class TestTaskStore(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def open(self, kind, tasks=()):
+        spec = f'{kind}:' + os.path.join(self.tmpdir.name, kind)
+        store = tm.TaskStore.open(spec)
+        store.backend.save(list(tasks))
+        return store
+
+    def test_typed_operations_return_values(self):
+        store = self.open('json')
+        first = store.add('Rapport', 'Tests', 2, d(1))
+        second = store.add('Courses', '', 4, d(-2))
+        self.assertEqual((first['id'], second['id']), (1, 2))
+        self.assertEqual(store.get(1)['title'], 'Rapport')
+        self.assertEqual(store.edit(2, priority=1)['priority'], 1)
+        self.assertIsNone(store.edit(9, title='x'))
+        self.assertEqual([t['id'] for t in store.list()], [2, 1])
+        self.assertEqual([t['id'] for t in store.list('date', overdue=True)], [2])
+        self.assertEqual([t['id'] for t in store.select(max_priority=1)], [2])
+        with self.assertRaises(ValueError):
+            store.edit(1, priority=9)
+        with self.assertRaises(ValueError):
+            store.add('x', '', 1, 'demain')
+        self.assertTrue(store.delete(1))
+        self.assertFalse(store.delete(1))
+        self.assertEqual(store.get(1), None)
+        self.assertEqual([t['id'] for t in store.backend.load()], [2])
+
+    def test_transaction_reads_once_and_writes_once(self):
+        store = self.open('json', make_tasks(50))
+        with mock.patch.object(storage, '_read_json_list', wraps=storage._read_json_list) as reads, \
+                mock.patch.object(storage.JsonBackend, '_write',
+                                  wraps=store.backend._write) as writes:
+            with store.transaction():
+                for i in range(1, 41):
+                    store.edit(i, title=f'Modifiée {i}')
+                added = store.add('Nouvelle', '', 1, d(0))
+                store.delete(50)
+                store.delete_many(ids=[48, 49])
+        self.assertEqual(reads.call_count, 1)
+        self.assertEqual(writes.call_count, 1)
+        tasks = {t['id']: t for t in tm.TaskStore.open(
+            'json:' + os.path.join(self.tmpdir.name, 'json')).backend.load()}
+        self.assertEqual(added['id'], 51)
+        self.assertEqual(sorted(tasks), list(range(1, 48)) + [51])
+        self.assertEqual(tasks[40]['title'], 'Modifiée 40')
+        self.assertEqual(tasks[41]['title'], 'Tâche 41')
+
+    def test_reads_inside_a_transaction_see_pending_writes(self):
+        for kind in STORES:
+            with self.subTest(kind=kind):
+                store = self.open(kind, make_tasks(20))
+                with store.transaction():
+                    store.edit(3, due=d(-30), priority=1)
+                    store.delete(1)
+                    new = store.add('Urgent', '', 1, d(-1))
+                    self.assertIsNone(store.get(1))
+                    self.assertEqual(store.get(new['id'])['title'], 'Urgent')
+                    overdue = [t['id'] for t in store.list('date', overdue=True)]
+                    self.assertEqual(overdue[0], 3)
+                    self.assertIn(new['id'], overdue)
+                    self.assertNotIn(1, [t['id'] for t in store.list(where='id<5')])
+                    self.assertEqual([t['id'] for t in store.select(ids=[1, 3, new['id']])],
+                                     [3, new['id']])
+                    self.assertIn(new['id'], [t['id'] for t in store.select(max_priority=1)])
+                    store.delete(new['id'])
+                final = {t['id']: t for t in store.backend.load()}
+                self.assertEqual(sorted(final), list(range(2, 21)))
+                self.assertEqual(final[3]['due'], d(-30))
+
+    def test_failed_transaction_writes_nothing(self):
+        store = self.open('journal', make_tasks(5))
+        with self.assertRaises(RuntimeError):
+            with store.transaction():
+                store.edit(1, title='Perdue')
+                store.add('Perdue aussi', '', 1, d(0))
+                raise RuntimeError
+        self.assertEqual(store.get(1)['title'], 'Tâche 1')
+        self.assertEqual(len(store.list()), 5)
+
+    def test_cli_wrappers_use_the_store(self):
+        tm.STORE_SPEC = None
+        tm.TASKS_FILE = os.path.join(self.tmpdir.name, 'tasks.json')
+        tm.save_tasks(make_tasks(10))
+        buf = StringIO()
+        with redirect_stdout(buf):
+            tm.main(['edit', '--ids', '1,2', '--priority', '1'])
+            tm.main(['delete', '--overdue', '--dry-run'])
+            tm.main(['delete', '--id', '4'])
+        out = buf.getvalue()
+        self.assertIn('2 tâche(s) mise(s) à jour.', out)
+        self.assertIn('seraient supprimée(s) (simulation)', out)
+        self.assertIn('Tâche 4 supprimée.', out)
+        self.assertEqual([t['id'] for t in tm.TaskStore().select(max_priority=1)], [1, 2, 5, 10])
+
+
+if __name__ == '__main__':
+    unittest.main()
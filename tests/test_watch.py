@@ -0,0 +1,188 @@
+import os
+import sys
+import json
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from datetime import date, datetime, timedelta
+from unittest import mock
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+SRC_DIR = os.path.join(PROJECT_ROOT, 'src')
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+import task_manager as tm  # noqa: E402
+import storage  # noqa: E402
+import watcher  # noqa: E402
+
+START = date(2030, 3, 10)
+
+
+def day(delta_days: int) -> date:
+    return START + timedelta(days=delta_days)
+
+
+def task(task_id, delta_days, title=None):
+    return {'id': task_id, 'title': title or f'T{task_id}', 'desc': '', 'priority': 3,
+            'due': day(delta_days).isoformat(), 'created': ''}
+
+
+def summary(events):
+    return [(e['day'], e['id'], e['status']) for e in events]
+
+
+class TestTransitions(unittest.TestCase):
+    def test_status_and_next_transition_follow_the_reminder_rules(self):
+        today = START.toordinal()
+        cases = [(-1, 'overdue', None), (0, 'soon', today + 1), (3, 'soon', today + 4),
+                 (4, '', today + 1), (10, '', today + 7)]
+        for delta, status, nxt in cases:
+            with self.subTest(delta=delta):
+                self.assertEqual(watcher.due_status(today + delta, today, 3), status)
+                self.assertEqual(watcher.next_transition(today + delta, today, 3), nxt)
+        self.assertEqual(watcher.due_status(0, today, 3), '')
+        self.assertIsNone(watcher.next_transition(0, today, 3))
+
+
+class TestWatcher(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, 'tasks.json')
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_transitions_are_emitted_on_the_day_they_happen(self):
+        backend = storage.JsonBackend(self.path)
+        backend.save([task(1, 5), task(2, 1), task(3, -2), {'id': 4, 'title': 'x', 'due': 'bientôt'}])
+        watch = watcher.Watcher(backend, due_in=3, today=START)
+        self.assertEqual(watch.refresh(), [])  # état initial : pas de notification
+        self.assertEqual(watch.next_day, day(2).toordinal())
+        events = []
+        for delta in range(1, 8):
+            events += watch.advance(day(delta))
+        self.assertEqual(summary(events), [
+            (day(2).isoformat(), 1, 'soon'),
+            (day(2).isoformat(), 2, 'overdue'),
+            (day(6).isoformat(), 1, 'overdue'),
+        ])
+        self.assertIsNone(watch.next_day)
+
+    def test_recurring_series_announce_each_occurrence(self):
+        backend = storage.JsonBackend(self.path)
+        backend.save([dict(task(1, -10), repeat='weekly'), dict(task(2, -1), repeat='daily')])
+        watch = watcher.Watcher(backend, due_in=3, today=START)
+        self.assertEqual(watch.refresh(), [])
+        self.assertEqual(watch.next_day, day(1).toordinal())
+        events = []
+        for delta in range(1, 13):
+            events += watch.advance(day(delta))
+        weekly = [(e['day'], e['due']) for e in events if e['id'] == 1]
+        self.assertEqual(weekly, [(day(1).isoformat(), day(4).isoformat()),
+                                  (day(8).isoformat(), day(11).isoformat())])
+        daily = [e for e in events if e['id'] == 2]
+        self.assertEqual([e['due'] for e in daily], [day(d).isoformat() for d in range(1, 13)])
+        self.assertNotIn('overdue', {e['status'] for e in events})
+        self.assertEqual(watch.next_day, day(13).toordinal())
+
+    def test_journal_changes_are_read_incrementally(self):
+        backend = storage.JournalBackend(self.path)
+        backend.save([task(1, 10), task(2, 20)])
+        watch = watcher.Watcher(storage.JournalBackend(self.path), today=START)
+        watch.refresh()
+        with mock.patch.object(storage.JournalBackend, 'read_journal',
+                               side_effect=AssertionError):
+            self.assertEqual(watch.refresh(), [])  # rien n'a changé : aucune lecture
+
+        backend.commit(puts=[task(1, 2, 'Rapport'), task(3, -1)], deletes=[2])
+        with mock.patch.object(storage.JournalBackend, 'iter_tasks', side_effect=AssertionError):
+            events = watch.refresh()
+        self.assertEqual([(e['id'], e['status'], e['title']) for e in events],
+                         [(1, 'soon', 'Rapport'), (3, 'overdue', 'T3')])
+        self.assertEqual(len(watch), 2)
+        self.assertEqual(summary(watch.advance(day(30))), [(day(30).isoformat(), 1, 'overdue')])
+
+        backend.compact()  # instantané réécrit : relecture complète
+        backend.commit(puts=[task(4, 0)])
+        self.assertEqual(summary(watch.refresh()), [(day(30).isoformat(), 4, 'overdue')])
+
+    def test_external_rewrite_is_diffed_against_known_state(self):
+        backend = storage.JsonBackend(self.path)
+        backend.save([task(1, 10), task(2, 10)])
+        watch = watcher.Watcher(storage.JsonBackend(self.path), today=START)
+        watch.refresh()
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump([task(1, 10, 'Renommée'), task(5, 1)], f)
+        os.utime(self.path, ns=(1, 1))
+        self.assertEqual(summary(watch.refresh()), [(START.isoformat(), 5, 'soon')])
+        self.assertEqual(len(watch), 2)
+        events = watch.advance(day(11))  # la tâche 2 supprimée ne notifie plus
+        self.assertEqual([(e['id'], e['title']) for e in events], [(5, 'T5'), (1, 'Renommée')])
+
+    def test_run_sleeps_until_next_transition(self):
+        backend = storage.JsonBackend(self.path)
+        backend.save([task(1, 4)])
+        watch = watcher.Watcher(backend, today=START)
+        clock = iter([datetime(2030, 3, 10, 23, 59, 0), datetime(2030, 3, 11, 0, 0, 1)])
+        sleeps, notified = [], []
+
+        def sleep(seconds):
+            sleeps.append(seconds)
+            if len(sleeps) == 2:
+                raise KeyboardInterrupt
+
+        with self.assertRaises(KeyboardInterrupt):
+            watch.run(notified.append, interval=120, clock=lambda: next(clock), sleep=sleep)
+        self.assertEqual(sleeps, [60.0, 120])
+        self.assertEqual(summary(notified), [(day(1).isoformat(), 1, 'soon')])
+
+    def test_hook_receives_the_event(self):
+        out = os.path.join(self.tmpdir.name, 'hook.txt')
+        event = {'id': 7, 'title': 'Rapport', 'due': '2030-03-10', 'status': 'overdue'}
+        code = watcher.run_hook(f'echo "$TASK_ID $TASK_TITLE $TASK_DUE $TASK_STATUS" > "{out}"',
+                                event)
+        self.assertEqual(code, 0)
+        with open(out, encoding='utf-8') as f:
+            self.assertEqual(f.read(), '7 Rapport 2030-03-10 overdue\n')
+
+
+class TestWatchCommand(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        tm.TASKS_FILE = os.path.join(self.tmpdir.name, 'tasks.json')
+        tm.save_tasks([task(1, 1)])
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def run_cli(self, argv):
+        buf = StringIO()
+        with redirect_stdout(buf):
+            tm.main(argv)
+        return buf.getvalue()
+
+    def test_watch_prints_notifications_until_interrupted(self):
+        def run(watch, notify, interval):
+            self.assertEqual(interval, 0.5)
+            notify({'id': 1, 'title': 'T1', 'due': '2030-03-11', 'status': 'soon', 'day': 'J'})
+            raise KeyboardInterrupt
+
+        with mock.patch.object(watcher.Watcher, 'run', run), \
+                mock.patch.object(watcher, 'run_hook', return_value=3) as hook, \
+                mock.patch('sys.stderr', new_callable=StringIO) as err:
+            out = self.run_cli(['watch', '--interval', '0.5', '--exec', 'notify-send'])
+        self.assertIn('Surveillance de 1 tâche(s)', out)
+        self.assertIn('J [1] T1 : ⏳ soon (échéance 2030-03-11)', out)
+        self.assertIn('Surveillance arrêtée.', out)
+        self.assertEqual(hook.call_args.args[0], 'notify-send')
+        self.assertIn('code 3', err.getvalue())
+        self.assertIn('strictement positif', self.run_cli(['watch', '--interval', '0']))
+
+    def test_daemon_refuses_watch(self):
+        self.assertEqual(tm.handle_request({'argv': ['watch'], 'cwd': ''})['status'], 'refused')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,222 @@
+import os
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from datetime import date, timedelta
+from unittest import mock
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+SRC_DIR = os.path.join(PROJECT_ROOT, 'src')
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+import task_manager as tm  # noqa: E402
+import storage  # noqa: E402
+import where  # noqa: E402
+from indexes import DueIndex  # noqa: E402
+
+TODAY = date(2030, 3, 10)
+STORES = ('json', 'journal', 'sqlite', 'binary', 'partitioned')
+
+
+def d(delta_days: int) -> str:
+    return (date.today() + timedelta(days=delta_days)).strftime("%Y-%m-%d")
+
+
+def make_tasks(n):
+    return [{'id': i, 'title': f'Tâche {i}', 'desc': 'Réunion' if i % 4 == 0 else '',
+             'priority': 1 + (i * 7) % 5,
+             'due': d((i * 13) % 50 - 20) if i % 11 else 'plus tard', 'created': ''}
+            for i in range(1, n + 1)]
+
+
+class TestParser(unittest.TestCase):
+    def test_expressions_are_normalized(self):
+        cases = {
+            'priority<=2 AND due<2030-04-01': 'priority <= 2 and due < 2030-04-01',
+            'title~"Réunion d\'équipe" or desc ~ rapport':
+                'title ~ "reunion d\'equipe" or desc ~ "rapport"',
+            'not (priority=5) and (due<=today+7 or id>3)':
+                'not priority = 5 and (due <= 2030-03-17 or id > 3)',
+            "created='2030-01-01' and due>=today-2": 'created = "2030-01-01" and due >= 2030-03-08',
+            '  ': '(toutes)',
+        }
+        for text, expected in cases.items():
+            with self.subTest(text=text):
+                self.assertEqual(str(where.parse(text, TODAY)), expected)
+
+    def test_errors_report_the_position(self):
+        cases = {
+            'priority<=haute': 'priority attend un entier, pas « haute » (position 11)',
+            'owner=moi': 'champ attendu',
+            'due~2030': '« ~ » ne s\'applique qu\'au texte',
+            'due<demain': 'date attendue',
+            '(id=1': 'parenthèse fermante attendue (fin de l\'expression)',
+            'id=1 id=2': '« id » inattendu (position 6)',
+            'title="abc': 'caractère inattendu « " » (position 7)',
+            'id': 'opérateur attendu',
+        }
+        for text, message in cases.items():
+            with self.subTest(text=text):
+                with self.assertRaises(ValueError) as ctx:
+                    where.parse(text, TODAY)
+                self.assertIn(message, str(ctx.exception))
+
+    def test_ranges_come_from_top_level_conjuncts(self):
+        t = TODAY.toordinal()
+        q = where.parse('id>3 and id<=10 and id!=5 and priority=2 and due<today and due>=today-7',
+                        TODAY)
+        self.assertEqual(q.ranges, {'id': (4, 10), 'priority': (2, 2), 'due': (t - 7, t - 1)})
+        self.assertEqual(where.parse('due>today', TODAY).ranges['due'],
+                         (t + 1, where.MAX_ORDINAL))
+        self.assertEqual(where.parse('id=1 or id=2', TODAY).ranges, {})
+        self.assertEqual(where.parse('not id=1 and title~x', TODAY).ranges, {})
+
+
+class TestPredicate(unittest.TestCase):
+    def test_predicate_matches_fields_by_type(self):
+        tasks = [{'id': 1, 'title': 'Réunion d’équipe', 'priority': 1, 'due': '2030-03-09'},
+                 {'id': 2, 'title': 'Courses', 'priority': '4', 'due': 'bientôt'},
+                 {'id': 3, 'title': 'ŒUVRE', 'priority': 'x', 'due': '2030-03-12'}]
+        cases = {
+            'title~reunion': [1], 'title~oeuvre': [3], 'title="Courses"': [2],
+            'due<today': [1], 'due!=2030-03-09': [3], 'not due<today': [2, 3],
+            'priority>=2': [2], 'priority<5 or due>today': [1, 2, 3],
+            'id>1 and not (title~cour)': [3],
+        }
+        for text, expected in cases.items():
+            with self.subTest(text=text):
+                predicate = where.parse(text, TODAY).predicate
+                self.assertEqual([t['id'] for t in tasks if predicate(t)], expected)
+
+
+class TestPlanner(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.tasks = make_tasks(200)
+
+    def tearDown(self):
+        tm.STORE_SPEC = None
+        self.tmpdir.cleanup()
+
+    def backend(self, kind):
+        tm.STORE_SPEC = f'{kind}:' + os.path.join(self.tmpdir.name, kind)
+        backend = tm.get_backend()
+        backend.save(self.tasks)
+        return backend
+
+    def expected(self, text, sort, limit, offset):
+        predicate = where.parse(text).predicate
+        key = where.rank_key(sort)
+        rows = sorted((t for t in self.tasks if predicate(t)), key=key)
+        return [t['id'] for t in rows[offset:None if limit is None else offset + limit]]
+
+    def test_every_plan_returns_the_brute_force_result(self):
+        queries = ['', 'priority<=2', 'due>=today and due<today+10', 'id>=50 and id<60',
+                   'priority=3 and due<today or desc~reunion', 'id>500', 'due<today and due>today']
+        for kind in STORES:
+            backend = self.backend(kind)
+            for text in queries:
+                for sort in ('priority', 'date'):
+                    for limit, offset in ((None, 0), (5, 3)):
+                        with self.subTest(kind=kind, text=text, sort=sort, limit=limit):
+                            chosen = where.plan(backend, where.parse(text), sort, limit, offset)
+                            self.assertEqual([t['id'] for t in chosen.run()],
+                                             self.expected(text, sort, limit, offset))
+
+    def test_planner_uses_the_cheapest_range(self):
+        backend = self.backend('json')
+        chosen = where.plan(backend, where.parse('id>=10 and id<20 and due<today'), 'priority')
+        self.assertEqual((chosen.source, chosen.field, chosen.estimate), (backend, 'id', 10))
+        chosen.run()
+        self.assertEqual(chosen.examined, 10)
+
+        chosen = where.plan(backend, where.parse('due>=today and due<=today+2'), 'date', 3)
+        self.assertIsInstance(chosen.source, DueIndex)
+        self.assertEqual(len(chosen.run()), 3)
+        self.assertTrue(chosen.early_stop)
+        self.assertEqual(chosen.examined, 3)
+
+        chosen = where.plan(backend, where.parse('due<today and due>today'), 'priority')
+        with mock.patch.object(storage.JsonBackend, 'iter_tasks', side_effect=AssertionError):
+            self.assertEqual(chosen.run(), [])
+        self.assertEqual(chosen.estimate, 0)
+        with self.assertRaises(ValueError):
+            backend.range_count('due', 1, 2)  # plage que le stockage ne sait pas lire
+
+    def test_ties_prefer_a_range_over_the_full_scan(self):
+        self.tasks = [dict(t, due=f'2030-03-{1 + t["id"] % 28:02d}') for t in self.tasks]
+        backend = self.backend('partitioned')
+        for sort in ('priority', 'date'):
+            with self.subTest(sort=sort):
+                chosen = where.plan(backend, where.parse('due>=2030-03-01 and due<2030-04-01'), sort)
+                self.assertEqual((chosen.source, chosen.field), (backend, 'due'))
+                full = next(o for o in chosen.alternatives if o.field is None)
+                self.assertEqual(chosen.estimate, full.estimate)
+                self.assertEqual(len(chosen.run()), len(self.tasks))
+
+    def test_sqlite_reads_the_sort_order_from_its_index(self):
+        backend = self.backend('sqlite')
+        chosen = where.plan(backend, where.parse('priority<=2 and due<today+30'), 'date', 4)
+        self.assertEqual((chosen.field, chosen.early_stop), ('due', False))
+        chosen.run()
+        self.assertTrue(chosen.early_stop)
+        self.assertLess(chosen.examined, 20)
+        chosen = where.plan(backend, where.parse('title~tache'), 'priority')
+        self.assertIsNone(chosen.field)
+
+
+class TestListWhere(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        tm.TASKS_FILE = os.path.join(self.tmpdir.name, 'tasks.json')
+        tm.save_tasks(make_tasks(60))
+
+    def tearDown(self):
+        tm.QUERY_CACHE = False
+        self.tmpdir.cleanup()
+
+    def run_cli(self, argv):
+        buf = StringIO()
+        with redirect_stdout(buf):
+            tm.main(argv)
+        return buf.getvalue()
+
+    def test_reminder_filters_combine_with_where(self):
+        for filters in (['--overdue'], ['--due-in', '5']):
+            for sort in ('priority', 'date'):
+                argv = ['list', '--sort', sort, '--limit', '8'] + filters
+                with self.subTest(argv=argv):
+                    self.assertEqual(self.run_cli(argv + ['--where', '']), self.run_cli(argv))
+        out = self.run_cli(['list', '--overdue', '--where', 'priority=1 or priority=2'])
+        self.assertTrue(out.strip())
+        for line in out.splitlines():
+            self.assertIn('⚠️ OVERDUE', line)
+            self.assertRegex(line, r'Priorité: [12] ')
+
+    def test_explain_shows_the_plan_after_the_results(self):
+        out = self.run_cli(['list', '--where', 'id>=3 and id<=5', '--explain']).splitlines()
+        self.assertEqual(len(out), 3 + 4)
+        self.assertEqual(out[3],
+                         "Plan : plage d'IDs [3 → 5] via JsonBackend (estimé : 3 tâche(s))")
+        self.assertIn('Écarté : parcours complet', out[4])
+        self.assertEqual(out[5], '  Filtre : id >= 3 and id <= 5')
+        self.assertEqual(out[6], '  Tâches examinées : 3, retenues : 3, affichées : 3')
+
+    def test_cache_key_includes_the_expression(self):
+        first = self.run_cli(['--cache', 'list', '--where', 'id=1'])
+        with mock.patch.object(where, 'plan', side_effect=AssertionError):
+            self.assertEqual(self.run_cli(['--cache', 'list', '--where', 'id=1']), first)
+        self.assertNotEqual(self.run_cli(['--cache', 'list', '--where', 'id=2']), first)
+
+    def test_errors_are_reported(self):
+        self.assertIn('(fin de l\'expression)', self.run_cli(['list', '--where', 'id<']))
+        out = self.run_cli(['list', '--overdue', '--where', 'id=x'])
+        self.assertIn('pas « x » (position 4)', out)
+        self.assertIn('ne se combine pas', self.run_cli(['list', '--where', 'id=1', '--jobs', '1']))
+
+
+if __name__ == '__main__':
+    unittest.main()